@@ -2,13 +2,22 @@
 Điểm khởi đầu cho ứng dụng mô phỏng đàn chim én.
 """
 
-import pyglet
+import sys
 import time
-from pyglet.window import key
+from contextlib import nullcontext
+from utils.startup import StartupProfile
+
+# Cờ --profile-startup được xét trước argparse để đo được cả các import bên dưới
+startup_profile = StartupProfile() if '--profile-startup' in sys.argv else None
+if startup_profile:
+    startup_profile.install()
+
+import numpy as np
 from utils.config import *
-from view.renderer import SimpleRenderer
-from model.fruit import FruitManager
-from draw_temperature_map import draw_temperature_map
+from utils.log import get_logger, configure_logging
+from utils.rng import configure_rng, get_rng
+
+logger = get_logger("main")
 
 # Hàm giúp in an toàn với tiếng Việt
 def print_safe(text_vn, text_en=None):
@@ -29,18 +38,34 @@ def print_safe(text_vn, text_en=None):
             text = text.replace("đ", "d")
             print(text)
 
-# Thử import module thời tiết, nếu không được thì bỏ qua
-try:
-    from model.weather.main.weather_integration import WeatherIntegration
-    import numpy as np
-    print_safe("Module thời tiết đã được import thành công", "Weather module imported successfully")
-    WEATHER_AVAILABLE = True
-except ImportError as e:
-    print_safe(f"Không thể import module thời tiết: {e}", f"Cannot import weather module: {e}")
-    WEATHER_AVAILABLE = False
-except Exception as e:
-    print_safe(f"Lỗi không xác định khi import module thời tiết: {e}", f"Unknown error importing weather module: {e}")
-    WEATHER_AVAILABLE = False
+# Module thời tiết (solver C++, renderer heatmap) chỉ được import khi bật, xem load_weather_module
+WEATHER_AVAILABLE = False
+WeatherIntegration = None
+
+def load_weather_module():
+    """
+    Import module thời tiết khi cần thay vì lúc import main.py, để lần chạy
+    tắt thời tiết (--no_weather) hay chỉ xem --help khởi động nhanh.
+
+    Returns:
+        bool: True nếu import thành công (đặt luôn WEATHER_AVAILABLE)
+    """
+    global WeatherIntegration, WEATHER_AVAILABLE
+    try:
+        from model.weather.main.weather_integration import WeatherIntegration
+        print_safe("Module thời tiết đã được import thành công", "Weather module imported successfully")
+        WEATHER_AVAILABLE = True
+    except ImportError as e:
+        print_safe(f"Không thể import module thời tiết: {e}", f"Cannot import weather module: {e}")
+        WEATHER_AVAILABLE = False
+    except Exception as e:
+        print_safe(f"Lỗi không xác định khi import module thời tiết: {e}", f"Unknown error importing weather module: {e}")
+        WEATHER_AVAILABLE = False
+    return WEATHER_AVAILABLE
+
+def startup_phase(name):
+    """Đo giai đoạn khởi động name khi bật --profile-startup"""
+    return startup_profile.phase(name) if startup_profile else nullcontext()
 
 # Khởi tạo render và quản lý trái cây
 renderer = None
@@ -48,6 +73,10 @@ fruit_manager = None
 
 # Khởi tạo module thời tiết
 weather_integration = None
+# Giai đoạn ghép thời tiết vào chim và quả (None nếu tắt)
+weather_coupling = None
+# Bộ ghi quỹ đạo (None nếu không bật --record)
+recorder = None
 
 # Trạng thái hiển thị thời tiết
 show_weather = False
@@ -95,6 +124,7 @@ def update_bird_info_label():
             info_text += f"Năng lượng: {selected_bird.energy:.2f}\n"
             
         # Tạo label mới
+        import pyglet
         bird_info_label = pyglet.text.Label(
             info_text,
             font_name='Arial',
@@ -108,21 +138,37 @@ def update_bird_info_label():
 
 def update(dt):
     """Cập nhật trạng thái mô phỏng với phương pháp linh hoạt"""
-    global renderer, fruit_manager, selected_bird, weather_integration
+    global renderer, fruit_manager, selected_bird, weather_integration, weather_coupling, recorder
     current_time = time.time()
     
     # Cập nhật module thời tiết
     if WEATHER_AVAILABLE and weather_integration:
         try:
             weather_integration.update(dt)
+            # Dời vùng lưới mịn (nếu bật) về nơi chim và quả dày đặc nhất
+            if weather_integration.patch is not None and renderer and hasattr(renderer, 'birds'):
+                points = np.array([(bird.position.x, bird.position.y) for bird in renderer.birds],
+                                  dtype=float).reshape(-1, 2)
+                if fruit_manager:
+                    points = np.concatenate([points, fruit_manager.positions])
+                if len(points):
+                    weather_integration.focus_patch(points[:, 0], points[:, 1])
         except Exception as e:
-            try:
-                print(f"Lỗi khi cập nhật module thời tiết: {e}")
-            except UnicodeEncodeError:
-                print(f"Loi khi cap nhat module thoi tiet: {e}")
+            logger.error("Lỗi khi cập nhật module thời tiết: %s", e, extra={"key": "main.weather_update_error"})
+    # Ghép thời tiết một lần mỗi tick: gió thành lực lái của cả đàn (cộng dồn
+    # vào steering trước khi chim cập nhật), nhiệt độ thành tốc độ chín của quả
+    if weather_coupling and renderer:
+        weather_coupling.apply(renderer.birds, fruit_manager.store if fruit_manager else None)
     # Cập nhật trái cây
     if fruit_manager:
-        fruit_manager.update(current_time, dt)
+        if WEATHER_AVAILABLE and weather_integration:
+            # Quả mọc theo trường nhiệt độ; min/max lấy từ thống kê solver đã tính sẵn
+            statistics = weather_integration.statistics
+            fruit_manager.update(current_time, dt,
+                                 temperature_field=weather_integration.sample_temperature,
+                                 temp_range=(statistics["min_temp"], statistics["max_temp"]))
+        else:
+            fruit_manager.update(current_time, dt)
     
     # Cập nhật renderer và chim
     if renderer:
@@ -170,17 +216,13 @@ def update(dt):
                             # Đặt thời gian để phục hồi màu
                             bird.color_reset_time = current_time + 0.5  # 0.5 giây
                     
-                    # In thông báo để debug và kiểm tra giá trị hunger trước và sau
+                    # Ghi log giá trị hunger trước và sau (giới hạn tần suất theo khóa bird.ate)
                     if old_hunger is not None:
-                        print_safe(
-                            f"Chim đã ăn quả! Độ đói: {old_hunger:.2f} -> {bird.hunger:.2f} (giảm {bird.hunger - old_hunger:.2f})",
-                            f"Bird ate fruit! Hunger: {old_hunger:.2f} -> {bird.hunger:.2f} (reduced by {bird.hunger - old_hunger:.2f})"
-                        )
+                        logger.info("Chim đã ăn quả! Độ đói: %.2f -> %.2f", old_hunger, bird.hunger,
+                                    extra={"key": "bird.ate"})
                     else:
-                        print_safe(
-                            f"Chim đã ăn quả! Độ đói hiện tại: {bird.hunger if hasattr(bird, 'hunger') else 'N/A'}",
-                            f"Bird ate fruit! Current hunger: {bird.hunger if hasattr(bird, 'hunger') else 'N/A'}"
-                        )
+                        logger.info("Chim đã ăn quả! Độ đói hiện tại: %s", getattr(bird, 'hunger', 'N/A'),
+                                    extra={"key": "bird.ate"})
 
         # Khôi phục màu gốc cho chim sau khi hiệu ứng kết thúc
         if hasattr(renderer, 'birds'):
@@ -200,50 +242,106 @@ def update(dt):
                     # Nếu đây là chim được chọn, cập nhật thông tin ngay lập tức
                     if bird is selected_bird:
                         update_bird_info_label()
+        
+        # Ghi quỹ đạo (chỉ chụp mảng, nén và ghi đĩa ở luồng nền)
+        if recorder:
+            recorder.record(renderer.birds, weather_integration)
 
 def main():
     """Hàm chính để khởi chạy ứng dụng."""
     import argparse
-    global renderer, fruit_manager, weather_integration, WEATHER_AVAILABLE
+    global renderer, fruit_manager, weather_integration, weather_coupling, recorder, WEATHER_AVAILABLE
     global selected_bird, bird_info_label, flock_info_label
     global temp_map_detail_level, temp_data_update_interval, last_temp_update_time
 
     # Parse arguments
     parser = argparse.ArgumentParser(description='Bird Simulation')
     parser.add_argument('--heat_scenario', type=str, default='default',
-                        help="Kịch bản khởi tạo nhiệt độ: default, checkerboard, random_sources, stripe, uniform")
-    parser.add_argument('--weather_mode', type=str, default='parallel',
-                        help="Chế độ solver: parallel hoặc seq")
+                        help="Kịch bản khởi tạo nhiệt độ đăng ký trong model/weather/main/scenarios.py "
+                             "(tên không hợp lệ thì in danh sách và dùng 'default')")
+    parser.add_argument('--weather_mode', type=str, default='cpp-openmp',
+                        help="Chế độ solver: backend cpp-openmp, cpp-seq, process-pool, thread-pool; "
+                             "sơ đồ rk4, imex, semi_lagrangian, maccormack; float32; hoặc ghép như cpp-seq+imex+float32")
+    parser.add_argument('--weather_grid', type=str, default=None,
+                        help="Kích thước lưới thời tiết thô dạng CỘTxHÀNG, ví dụ 60x40 "
+                             "(mặc định GRID_SIZE_X x GRID_SIZE_Y, độc lập với kích thước cửa sổ)")
+    parser.add_argument('--weather_patch', action='store_true',
+                        help="Bật vùng lưới mịn lồng theo nơi chim/quả dày đặc (WEATHER_PATCH_*)")
+    parser.add_argument('--checkpoint', type=str, default=None,
+                        help="Tiếp tục từ file checkpoint .npz (F5 lưu, F9 nạp lại CHECKPOINT_PATH khi đang chạy)")
+    parser.add_argument('--record', type=str, default=None,
+                        help="Ghi quỹ đạo chim, sự kiện quả và khung nhiệt độ vào thư mục này")
+    parser.add_argument('--record_every', type=int, default=RECORD_DECIMATION,
+                        help="Chỉ ghi mỗi N tick khi bật --record")
+    parser.add_argument('--log_level', type=str, default=LOG_LEVEL,
+                        help="Mức log: DEBUG, INFO, WARNING, ERROR (DEBUG in cả thống kê thời tiết mỗi tick)")
+    parser.add_argument('--seed', type=int, default=RNG_SEED,
+                        help="Seed gốc cho mọi luồng ngẫu nhiên (chim, quả, gió, kịch bản) để tái lập lần chạy")
+    parser.add_argument('--no_weather', action='store_true',
+                        help="Không nạp module thời tiết (không import solver C++ và renderer heatmap)")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="Ghi log thời gian import từng module và từng giai đoạn khởi động")
     args = parser.parse_args()
+    configure_logging(args.log_level)
+    # Seed trước khi tạo chim, quả và trường gió; in ra để tái lập cả lần chạy không đặt --seed
+    logger.info("Seed: %d", configure_rng(args.seed))
     heat_scenario = args.heat_scenario
     weather_mode = args.weather_mode
-    valid_scenarios = ['default', 'checkerboard', 'random_sources', 'stripe', 'uniform']
-    if heat_scenario not in valid_scenarios:
-        print_safe(f"Kịch bản nhiệt không hợp lệ: {heat_scenario}. Chọn một trong: {valid_scenarios}",
-                   f"Invalid heat scenario: {heat_scenario}. Choose from: {valid_scenarios}")
-        heat_scenario = 'default'
-    # Tạo cửa sổ pyglet
-    window = pyglet.window.Window(
-        width=WINDOW_WIDTH,
-        height=WINDOW_HEIGHT,
-        caption=WINDOW_TITLE
-    )
+    weather_grid = None
+    if args.weather_grid:
+        try:
+            weather_grid = tuple(int(value) for value in args.weather_grid.lower().split('x'))
+            if len(weather_grid) != 2 or min(weather_grid) < 1:
+                raise ValueError(args.weather_grid)
+        except ValueError:
+            print_safe(f"Kích thước lưới không hợp lệ: {args.weather_grid}, dùng mặc định",
+                       f"Invalid weather grid: {args.weather_grid}, using default")
+            weather_grid = None
+    # Pyglet, renderer và các module mô hình chỉ import sau argparse: --help và
+    # lỗi tham số không phải trả giá nạp chúng
+    # Tạo cửa sổ pyglet (import pyglet.window nạp cả backend đồ họa nên để tới đây)
+    with startup_phase("cửa sổ"):
+        import pyglet
+        from pyglet.window import key
+        window = pyglet.window.Window(
+            width=WINDOW_WIDTH,
+            height=WINDOW_HEIGHT,
+            caption=WINDOW_TITLE
+        )
     
     # Khởi tạo renderer và fruit manager
-    renderer = SimpleRenderer(WINDOW_WIDTH, WINDOW_HEIGHT)
-    fruit_manager = FruitManager()
+    with startup_phase("chim và quả"):
+        from view.renderer import SimpleRenderer
+        from model.fruit import FruitManager
+        renderer = SimpleRenderer(WINDOW_WIDTH, WINDOW_HEIGHT)
+        fruit_manager = FruitManager()
+        
+        # Tạo một số trái cây ban đầu
+        fruit_manager.add_random_fruits(5)
     
-    # Tạo một số trái cây ban đầu
-    fruit_manager.add_random_fruits(5)
-    
-    # Khởi tạo module thởi tiết nếu có sẵn
+    # Khởi tạo module thởi tiết nếu được bật và import được
+    with startup_phase("import thời tiết"):
+        if not args.no_weather:
+            load_weather_module()
     if WEATHER_AVAILABLE:
+        from model.weather.main.scenarios import scenario_names
+        valid_scenarios = scenario_names()
+        if heat_scenario not in valid_scenarios:
+            print_safe(f"Kịch bản nhiệt không hợp lệ: {heat_scenario}. Chọn một trong: {valid_scenarios}",
+                       f"Invalid heat scenario: {heat_scenario}. Choose from: {valid_scenarios}")
+            heat_scenario = 'default'
         try:
             print_safe("Đang khởi tạo module thởi tiết...", "Initializing weather module...")
-            weather_integration = WeatherIntegration(WINDOW_WIDTH - INFO_PANEL_WIDTH, WINDOW_HEIGHT, mode=weather_mode)
-            # Gọi initialize_weather với kịch bản mong muốn
-            print("Current heat_scenario", heat_scenario)
-            weather_integration.initialize_weather(scenario=heat_scenario)
+            # Kịch bản nhiệt được dựng ngay trong hàm khởi tạo (đọc từ cache nếu có)
+            with startup_phase("khởi tạo thời tiết"):
+                weather_integration = WeatherIntegration(WINDOW_WIDTH - INFO_PANEL_WIDTH, WINDOW_HEIGHT,
+                                                         mode=weather_mode, grid_size=weather_grid,
+                                                         scenario=heat_scenario)
+            if args.weather_patch and weather_integration.patch is None:
+                weather_integration.enable_patch()
+            if WEATHER_COUPLING_ENABLED and weather_integration.initialized:
+                from model.weather_coupling import WeatherCoupling
+                weather_coupling = WeatherCoupling(weather_integration)
             # Thử gọi phương thức get_temperature_field() để kiểm tra hoạt động
             temp_field = weather_integration.get_temperature_field()
             if temp_field is not None:
@@ -260,6 +358,21 @@ def main():
             weather_integration = None
     else:
         weather_integration = None
+    
+    # Tiếp tục từ checkpoint nếu có
+    if args.checkpoint:
+        from model.checkpoint import load_checkpoint
+        try:
+            renderer.birds = load_checkpoint(args.checkpoint, fruit_manager, weather_integration) or []
+            print_safe(f"Đã nạp checkpoint {args.checkpoint}", f"Loaded checkpoint {args.checkpoint}")
+        except (OSError, ValueError, KeyError) as e:
+            print_safe(f"Không thể nạp checkpoint {args.checkpoint}: {e}",
+                       f"Could not load checkpoint {args.checkpoint}: {e}")
+    
+    if args.record:
+        from model.recorder import TrajectoryRecorder
+        recorder = TrajectoryRecorder(args.record, decimation=args.record_every)
+        recorder.attach(fruit_manager.store)
         
     # Trạng thái tạm dừng/chạy
     paused = False
@@ -298,6 +411,21 @@ def main():
             # Thêm 5 trái cây mới
             fruit_manager.add_random_fruits(5)
         
+        elif symbol == key.F5:
+            # Lưu checkpoint toàn bộ trạng thái
+            from model.checkpoint import save_checkpoint
+            save_checkpoint(CHECKPOINT_PATH, renderer.birds, fruit_manager, weather_integration)
+            print_safe(f"Đã lưu checkpoint {CHECKPOINT_PATH}", f"Saved checkpoint {CHECKPOINT_PATH}")
+        
+        elif symbol == key.F9:
+            # Nạp lại checkpoint đã lưu
+            from model.checkpoint import load_checkpoint
+            try:
+                renderer.birds = load_checkpoint(CHECKPOINT_PATH, fruit_manager, weather_integration) or []
+                print_safe(f"Đã nạp checkpoint {CHECKPOINT_PATH}", f"Loaded checkpoint {CHECKPOINT_PATH}")
+            except (OSError, ValueError, KeyError) as e:
+                print_safe(f"Không thể nạp checkpoint: {e}", f"Could not load checkpoint: {e}")
+        
         elif symbol == key.R:
             # Đặt lại mô phỏng
             renderer.birds = []
@@ -305,6 +433,8 @@ def main():
             
             # Cũng đặt lại trái cây
             fruit_manager = FruitManager()
+            if recorder:
+                recorder.attach(fruit_manager.store)
             fruit_manager.add_random_fruits(5)
             
         elif symbol == key.W:
@@ -458,7 +588,8 @@ def main():
                     last_temp_update_time = current_time
                     force_update = True
                 
-                # Gọi hàm vẽ với độ chi tiết và trạng thái cập nhật
+                # Gọi hàm vẽ với độ chi tiết và trạng thái cập nhật (import lần đầu bật bản đồ)
+                from draw_temperature_map import draw_temperature_map
                 draw_temperature_map(weather_integration, WEATHER_AVAILABLE, temp_map_detail_level, force_update)
                 
                 # Hiển thị thông tin độ chi tiết của bản đồ nhiệt độ
@@ -580,7 +711,7 @@ def main():
         
         # Cập nhật và vẽ label thông tin
         info_label.text = (f'Birds: {renderer.get_bird_count()} | '
-                          f'Fruits: {len(fruit_manager.fruits)} | '
+                          f'Fruits: {fruit_manager.count()} | '
                           f'{"PAUSED" if paused else "RUNNING"}')
         info_label.draw()
         
@@ -675,23 +806,21 @@ def main():
     
     def draw_fruits():
         """Vẽ tất cả trái cây từ fruit manager"""
-        for fruit in fruit_manager.fruits:
-            # Lấy màu sắc dựa trên độ chín
-            color = fruit.get_color()
-            
-            # Vẽ hình tròn đại diện cho trái cây
-            x, y = fruit.position.x, fruit.position.y
-            radius = fruit.radius
-            
-            # Tạo hình tròn với 16 đỉnh
+        # Đọc thẳng mảng vị trí và màu (theo độ chín) từ kho quả, vẽ chung một batch
+        batch = pyglet.graphics.Batch()
+        circles = []
+        for (x, y), (r, g, b, a) in zip(fruit_manager.positions.tolist(),
+                                        fruit_manager.store.colors().tolist()):
+            # Tạo hình tròn đại diện cho trái cây
             circle = pyglet.shapes.Circle(
                 x=x, y=y, 
-                radius=radius,
-                color=color[:3],  # RGB
-                batch=None
+                radius=FRUIT_RADIUS,
+                color=(r, g, b),
+                batch=batch
             )
-            circle.opacity = color[3]  # Alpha
-            circle.draw()
+            circle.opacity = a  # Alpha
+            circles.append(circle)
+        batch.draw()
     
     def update_with_pause(dt):
         if not paused:
@@ -709,15 +838,19 @@ def main():
     
     # Lập lịch tạo trái cây mới theo thời gian
     def spawn_random_fruit(dt):
-        if not paused and fruit_manager and len(fruit_manager.fruits) < 50:  # Giới hạn tối đa 50 trái cây
+        if not paused and fruit_manager and fruit_manager.count() < 50:  # Giới hạn tối đa 50 trái cây
             # 20% cơ hội tạo trái cây mới mỗi 2 giây
-            import random
-            if random.random() < 0.2:
+            if get_rng('fruit').random() < 0.2:
                 fruit_manager.add_random_fruits(1)
                 
     pyglet.clock.schedule_interval(spawn_random_fruit, 2.0)
     
+    if startup_profile:
+        startup_profile.uninstall()
+        startup_profile.report()
     pyglet.app.run()
+    if recorder:
+        recorder.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -2,6 +2,7 @@ import numpy as np
 import pyglet
 from utils.vector import Vector2D
 from utils.config import *
+from utils.rng import get_rng
 
 class Bird:
     """
@@ -11,17 +12,16 @@ class Bird:
     
     def __init__(self, x=None, y=None, velocity=None, max_lifespan=20000):
         """Khởi tạo chim với vị trí và vận tốc."""
+        rng = get_rng('birds')
         # Khởi tạo vị trí ngẫu nhiên nếu không được cung cấp
         if x is None or y is None:
-            x = np.random.uniform(0, WINDOW_WIDTH)
-            y = np.random.uniform(0, WINDOW_HEIGHT)
+            x, y = rng.uniform((0, 0), (WINDOW_WIDTH, WINDOW_HEIGHT)).tolist()
         self.position = Vector2D(x, y)
         
         # Khởi tạo vận tốc ngẫu nhiên nếu không được cung cấp
         if velocity is None:
-            vx = np.random.uniform(-1, 1)
-            vy = np.random.uniform(-1, 1)
-            velocity = Vector2D(vx, vy).normalize() * np.random.uniform(1, MAX_SPEED)
+            vx, vy = rng.uniform(-1, 1, 2).tolist()
+            velocity = Vector2D(vx, vy).normalize() * rng.uniform(1, MAX_SPEED)
         self.velocity = velocity
         self.max_speed = MAX_SPEED
         
@@ -58,8 +58,8 @@ class Bird:
         Args:
             dt (float): Thời gian trôi qua từ lần cập nhật trước
             nearby_birds (list): Danh sách các chim lân cận
-            food_positions (list): Danh sách vị trí các thức ăn
-            food_ripeness (list): Danh sách độ chín của thức ăn
+            food_positions: Vị trí các thức ăn, mảng (K, 2) hoặc danh sách (x, y)
+            food_ripeness: Độ chín của thức ăn, mảng hoặc danh sách
         """
         # Giới hạn lực lái
         self.steering = self.steering.limit(self.max_force)
@@ -79,7 +79,7 @@ class Bird:
         self.position = self.position + (self.velocity * dt)
         
         # Kiểm tra và tiêu thụ thức ăn nếu có
-        if food_positions and food_ripeness:
+        if food_positions is not None and food_ripeness is not None and len(food_positions) > 0:
             food_index = self.consume_food(food_positions, food_ripeness)
             if food_index >= 0:
                 # Chim đã ăn được thức ăn
@@ -105,21 +105,20 @@ class Bird:
         Tiêu thụ thức ăn nếu ở gần.
         Trả về chỉ số của thức ăn đã tiêu thụ hoặc -1.
         """
-        if not food_positions:
+        if food_positions is None or len(food_positions) == 0:
             return -1
-            
-        for i, pos in enumerate(food_positions):
-            if ripeness[i] >= 1.0:  # Chỉ có thể ăn quả đã chín
-                food_pos = Vector2D(pos[0], pos[1])
-                distance = self.position.distance_to(food_pos)
-                
-                if distance < food_radius:
-                    # Phục hồi năng lượng khi ăn
-                    self.hunger = min(1.0, self.hunger + 0.5)
-                    self.lifespan = min(self.max_lifespan, self.lifespan + 100)
-                    return i
-        
-        return -1
+        
+        # Quả đầu tiên đã chín (chỉ có thể ăn quả đã chín) nằm trong bán kính
+        food_positions = np.asarray(food_positions, dtype=np.float64).reshape(-1, 2)
+        distances = np.hypot(food_positions[:, 0] - self.position.x, food_positions[:, 1] - self.position.y)
+        edible = np.flatnonzero((np.asarray(ripeness) >= 1.0) & (distances < food_radius))
+        if len(edible) == 0:
+            return -1
+        
+        # Phục hồi năng lượng khi ăn
+        self.hunger = min(1.0, self.hunger + 0.5)
+        self.lifespan = min(self.max_lifespan, self.lifespan + 100)
+        return int(edible[0])
     
     def get_vertices(self):
         """Tính các đỉnh của hình tam giác đại diện cho chim."""
@@ -0,0 +1,232 @@
+"""
+Checkpoint toàn bộ trạng thái mô phỏng trong một file .npz không nén.
+
+Mỗi mảng là một mục riêng trong file (tên dạng "nhóm.tên", ví dụ
+"flock.position", "fruit.ripeness", "weather.temperature"); các giá trị vô
+hướng (thời gian, số bước, bộ đếm spawn, trạng thái RNG nhỏ) nằm trong mục
+"header" là một chuỗi JSON. Không dùng pickle, nên nạp lại chỉ là đọc các
+mảng NumPy liên tục, mất vài mili giây.
+
+Nội dung:
+    - flock: vị trí, vận tốc, lực lái và các chỉ số sức khỏe của từng con chim
+    - fruit: các cột của FruitStore và bộ đếm FruitSpawnStepper
+    - weather: trường nhiệt độ, trạng thái trường gió (gió, xoáy, tham số tiến
+      hóa, bộ sinh số ngẫu nhiên C++), WeatherIntegration.time và steps
+    - rng: trạng thái các luồng của utils.rng, random và numpy.random toàn cục
+
+HƯỚNG DẪN SỬ DỤNG:
+    save_checkpoint("run.npz", renderer.birds, fruit_manager, weather_integration)
+    # Tiếp tục chạy, hoặc tách nhiều thí nghiệm từ cùng một trạng thái
+    checkpoint = read_checkpoint("run.npz")
+    renderer.birds = apply_checkpoint(checkpoint, fruit_manager, weather_integration)
+"""
+
+import json
+import os
+import random
+import time
+
+import numpy as np
+
+from utils.vector import Vector2D
+from utils.rng import get_rng_service
+
+CHECKPOINT_FORMAT = "birdsim-checkpoint"
+CHECKPOINT_VERSION = 1
+
+# Thuộc tính số thực của Bird lưu thành một mảng (N,) mỗi thuộc tính
+_BIRD_SCALARS = ('speed', 'max_speed', 'max_force', 'health', 'energy', 'lifetime',
+                 'max_lifespan', 'lifespan', 'hunger', 'size')
+# Thuộc tính Vector2D của Bird lưu thành mảng (N, 2)
+_BIRD_VECTORS = ('position', 'velocity', 'steering')
+
+
+def capture_flock(birds):
+    """
+    Gom trạng thái đàn chim thành các mảng.
+
+    Args:
+        birds (list): Danh sách Bird
+
+    Returns:
+        dict: Tên thuộc tính -> mảng, theo thứ tự trong đàn
+    """
+    count = len(birds)
+    arrays = {}
+    for name in _BIRD_VECTORS:
+        arrays[name] = np.array([(getattr(bird, name).x, getattr(bird, name).y) for bird in birds],
+                                dtype=np.float64).reshape(count, 2)
+    for name in _BIRD_SCALARS:
+        arrays[name] = np.fromiter((getattr(bird, name) for bird in birds), dtype=np.float64, count=count)
+    arrays['is_dead'] = np.fromiter((bird.is_dead for bird in birds), dtype=bool, count=count)
+    # Màu gốc, không phải màu đang nháy sau khi ăn
+    arrays['color'] = np.array([tuple(getattr(bird, 'original_color', bird.color)) for bird in birds],
+                               dtype=np.int64).reshape(count, 4)
+    return arrays
+
+
+def restore_flock(arrays, bird_class=None):
+    """
+    Dựng lại đàn chim từ capture_flock.
+
+    Args:
+        arrays (dict): Các mảng đã lưu
+        bird_class (type, optional): Lớp chim, mặc định model.bird.Bird
+
+    Returns:
+        list: Danh sách chim mới
+    """
+    if bird_class is None:
+        from model.bird import Bird as bird_class
+    position, velocity, steering = (arrays[name].tolist() for name in _BIRD_VECTORS)
+    scalars = {name: arrays[name].tolist() for name in _BIRD_SCALARS}
+    birds = []
+    for index in range(len(position)):
+        bird = bird_class(position[index][0], position[index][1], Vector2D(*velocity[index]))
+        bird.steering = Vector2D(*steering[index])
+        for name in _BIRD_SCALARS:
+            setattr(bird, name, scalars[name][index])
+        bird.is_dead = bool(arrays['is_dead'][index])
+        bird.color = tuple(arrays['color'][index].tolist())
+        birds.append(bird)
+    return birds
+
+
+def capture_rng():
+    """
+    Returns:
+        tuple: (header, arrays) trạng thái các luồng utils.rng, random và numpy.random toàn cục
+    """
+    version, internal, gauss = random.getstate()
+    name, keys, position, has_gauss, cached_gaussian = np.random.get_state()
+    header = {
+        "python": {"version": version, "gauss": gauss},
+        "numpy": {"name": name, "pos": int(position), "has_gauss": int(has_gauss),
+                  "cached_gaussian": float(cached_gaussian)},
+        "streams": get_rng_service().get_state(),
+    }
+    arrays = {"python_state": np.array(internal, dtype=np.int64), "numpy_keys": np.array(keys)}
+    return header, arrays
+
+
+def restore_rng(header, arrays):
+    """Khôi phục các luồng utils.rng, random và numpy.random toàn cục từ capture_rng."""
+    random.setstate((header["python"]["version"], tuple(arrays["python_state"].tolist()),
+                     header["python"]["gauss"]))
+    numpy_state = header["numpy"]
+    np.random.set_state((numpy_state["name"], arrays["numpy_keys"], numpy_state["pos"],
+                         numpy_state["has_gauss"], numpy_state["cached_gaussian"]))
+    # Checkpoint cũ chưa có luồng utils.rng
+    if "streams" in header:
+        get_rng_service().set_state(header["streams"])
+
+
+def _flatten(prefix, arrays, out):
+    for name, value in arrays.items():
+        out[f"{prefix}.{name}"] = value
+
+
+def _group(arrays, prefix):
+    prefix = prefix + "."
+    return {key[len(prefix):]: value for key, value in arrays.items() if key.startswith(prefix)}
+
+
+def save_checkpoint(path, birds=None, fruit_manager=None, weather=None):
+    """
+    Ghi checkpoint ra path (.npz không nén). File được ghi vào file tạm rồi
+    đổi tên, nên bị ngắt giữa chừng cũng không làm hỏng checkpoint cũ.
+
+    Args:
+        path (str): Đường dẫn file
+        birds (list, optional): Danh sách Bird
+        fruit_manager (FruitManager, optional): Trình quản lý quả
+        weather (WeatherIntegration, optional): Mô hình thời tiết (bỏ qua nếu chưa khởi tạo)
+
+    Returns:
+        dict: Header đã ghi
+    """
+    header = {"format": CHECKPOINT_FORMAT, "version": CHECKPOINT_VERSION, "saved_at": time.time()}
+    arrays = {}
+    rng_header, rng_arrays = capture_rng()
+    header["rng"] = rng_header
+    _flatten("rng", rng_arrays, arrays)
+    if birds is not None:
+        header["flock"] = {"count": len(birds)}
+        _flatten("flock", capture_flock(birds), arrays)
+    if fruit_manager is not None:
+        header["fruit"] = {"spawn_counter": fruit_manager.spawn_stepper.counter,
+                           "spawn_interval": fruit_manager.spawn_stepper.interval}
+        _flatten("fruit", fruit_manager.store.get_state(), arrays)
+    state = weather.get_state() if weather is not None else None
+    if state is not None:
+        wind = state["wind"]
+        header["weather"] = {"grid_size": list(state["grid_size"]), "time": state["time"],
+                             "steps": state["steps"], "scenario": state["scenario"], "wind_rng": wind["rng"]}
+        arrays["weather.temperature"] = state["temperature"]
+        for name in ("wind_x", "wind_y", "vortices", "evolution"):
+            arrays[f"weather.wind.{name}"] = wind[name]
+    arrays["header"] = np.array(json.dumps(header))
+
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as stream:
+        np.savez(stream, **arrays)
+    os.replace(temporary, path)
+    return header
+
+
+def read_checkpoint(path):
+    """
+    Đọc checkpoint vào bộ nhớ (không áp dụng), để áp dụng nhiều lần cho các
+    thí nghiệm tách ra từ cùng một trạng thái.
+
+    Returns:
+        dict: {"header": dict, "arrays": dict tên -> mảng}
+
+    Raises:
+        ValueError: Nếu file không phải checkpoint hoặc khác phiên bản
+    """
+    with np.load(path, allow_pickle=False) as data:
+        arrays = {key: data[key] for key in data.files}
+    header = json.loads(str(arrays.pop("header")))
+    if header.get("format") != CHECKPOINT_FORMAT or header.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"{path} không phải checkpoint phiên bản {CHECKPOINT_VERSION}")
+    return {"header": header, "arrays": arrays}
+
+
+def apply_checkpoint(checkpoint, fruit_manager=None, weather=None, bird_class=None, restore_random=True):
+    """
+    Áp dụng checkpoint đã đọc lên các đối tượng mô phỏng.
+
+    Args:
+        checkpoint (dict): Kết quả của read_checkpoint
+        fruit_manager (FruitManager, optional): Nhận lại quả và bộ đếm spawn
+        weather (WeatherIntegration, optional): Nhận lại trường nhiệt độ, gió, thời gian
+        bird_class (type, optional): Lớp chim dùng khi dựng lại đàn
+        restore_random (bool): Khôi phục cả trạng thái random/numpy.random
+
+    Returns:
+        list: Đàn chim đã dựng lại, hoặc None nếu checkpoint không có đàn
+    """
+    header, arrays = checkpoint["header"], checkpoint["arrays"]
+    if restore_random:
+        restore_rng(header["rng"], _group(arrays, "rng"))
+    if fruit_manager is not None and "fruit" in header:
+        # Thời gian tạo quả là thời gian thực; dời theo khoảng từ lúc lưu
+        fruit_manager.store.set_state(_group(arrays, "fruit"), time.time() - header["saved_at"])
+        fruit_manager.spawn_stepper.counter = header["fruit"]["spawn_counter"]
+        fruit_manager.spawn_stepper.interval = header["fruit"]["spawn_interval"]
+    if weather is not None and "weather" in header:
+        state = dict(header["weather"])
+        wind = _group(arrays, "weather.wind")
+        wind["rng"] = state.pop("wind_rng")
+        state["wind"] = wind
+        state["temperature"] = arrays["weather.temperature"]
+        weather.set_state(state)
+    if "flock" in header:
+        return restore_flock(_group(arrays, "flock"), bird_class)
+    return None
+
+
+def load_checkpoint(path, fruit_manager=None, weather=None, bird_class=None, restore_random=True):
+    """read_checkpoint rồi apply_checkpoint; trả về đàn chim đã dựng lại."""
+    return apply_checkpoint(read_checkpoint(path), fruit_manager, weather, bird_class, restore_random)
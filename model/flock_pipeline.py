@@ -0,0 +1,198 @@
+"""
+Pipeline cập nhật đàn chim theo các giai đoạn đăng ký sẵn.
+
+Mỗi tick, SimpleRenderer chạy lần lượt các giai đoạn:
+    neighbors -> steering -> food -> integrate -> wrap -> eat -> cull
+trên một ngữ cảnh dùng chung (dict gồm birds, dt, food_positions,
+food_ripeness và kết quả của các giai đoạn trước, ví dụ neighbors).
+
+Chữ ký của hàm giai đoạn được đọc một lần khi đăng ký: tên tham số chính là
+khóa lấy từ ngữ cảnh, nên khi chạy chỉ còn tra dict, không cần inspect theo
+từng con chim. Giá trị trả về (nếu khai báo output) được ghi lại vào ngữ cảnh.
+Thời gian chạy từng giai đoạn được đo, và có thể thay một giai đoạn bằng bản
+vector hóa hoặc bản C++ qua replace() mà không đụng tới các giai đoạn khác.
+
+HƯỚNG DẪN SỬ DỤNG:
+    pipeline = default_flock_pipeline()
+    context = pipeline.run(birds=birds, dt=dt, food_positions=positions, food_ripeness=ripeness)
+    birds = context["birds"]
+    pipeline.replace("neighbors", my_native_neighbors, output="neighbors")
+    print(pipeline.timings)   # giây cho từng giai đoạn ở tick gần nhất
+"""
+
+import inspect
+import time
+
+import numpy as np
+
+from utils.config import SEPARATION_RADIUS, ALIGNMENT_RADIUS, COHESION_RADIUS, FOOD_WEIGHT
+from utils.spatial import neighbor_indices
+from model.steering import calculate_steering, seek_food
+from model.weather_coupling import gather_positions
+
+
+class FlockStage:
+    """Một giai đoạn của pipeline: hàm, các khóa ngữ cảnh cần truyền và khóa kết quả."""
+
+    def __init__(self, name, func, output=None):
+        """
+        Args:
+            name (str): Tên giai đoạn
+            func (callable): Hàm giai đoạn; tên tham số là khóa trong ngữ cảnh
+            output (str, optional): Khóa ngữ cảnh nhận giá trị trả về
+
+        Raises:
+            TypeError: Nếu hàm nhận *args/**kwargs (không suy ra được khóa ngữ cảnh)
+        """
+        self.name = name
+        self.func = func
+        self.output = output
+        self.required = []
+        self.optional = []
+        for parameter in inspect.signature(func).parameters.values():
+            if parameter.kind in (parameter.VAR_POSITIONAL, parameter.VAR_KEYWORD):
+                raise TypeError(f"Giai đoạn '{name}' không được dùng *args/**kwargs")
+            if parameter.default is parameter.empty:
+                self.required.append(parameter.name)
+            else:
+                self.optional.append(parameter.name)
+
+    def __call__(self, context):
+        kwargs = {key: context[key] for key in self.required}
+        for key in self.optional:
+            if key in context:
+                kwargs[key] = context[key]
+        result = self.func(**kwargs)
+        if self.output is not None:
+            context[self.output] = result
+        return result
+
+
+class FlockPipeline:
+    """Chuỗi giai đoạn có thứ tự, đo thời gian từng giai đoạn."""
+
+    def __init__(self):
+        self.stages = []
+        # Thời gian (giây) của từng giai đoạn ở tick gần nhất và cộng dồn
+        self.timings = {}
+        self.total_timings = {}
+        self.ticks = 0
+
+    def _index(self, name):
+        for index, stage in enumerate(self.stages):
+            if stage.name == name:
+                return index
+        raise KeyError(f"Không có giai đoạn '{name}'")
+
+    def register(self, name, func, output=None, before=None):
+        """
+        Thêm một giai đoạn (mặc định ở cuối, hoặc ngay trước giai đoạn before).
+
+        Raises:
+            ValueError: Nếu tên giai đoạn đã tồn tại
+        """
+        if any(stage.name == name for stage in self.stages):
+            raise ValueError(f"Giai đoạn '{name}' đã tồn tại")
+        stage = FlockStage(name, func, output)
+        if before is None:
+            self.stages.append(stage)
+        else:
+            self.stages.insert(self._index(before), stage)
+        return stage
+
+    def replace(self, name, func, output=None):
+        """Thay hàm của một giai đoạn, giữ nguyên vị trí trong pipeline."""
+        index = self._index(name)
+        self.stages[index] = FlockStage(name, func, output)
+        return self.stages[index]
+
+    def remove(self, name):
+        """Bỏ một giai đoạn."""
+        del self.stages[self._index(name)]
+
+    def names(self):
+        """Tên các giai đoạn theo thứ tự chạy."""
+        return [stage.name for stage in self.stages]
+
+    def run(self, **context):
+        """
+        Chạy mọi giai đoạn theo thứ tự trên cùng một ngữ cảnh.
+
+        Returns:
+            dict: Ngữ cảnh sau khi chạy (gồm kết quả các giai đoạn)
+        """
+        for stage in self.stages:
+            start = time.perf_counter()
+            stage(context)
+            elapsed = time.perf_counter() - start
+            self.timings[stage.name] = elapsed
+            self.total_timings[stage.name] = self.total_timings.get(stage.name, 0.0) + elapsed
+        self.ticks += 1
+        return context
+
+
+def build_neighbors(birds, radius=max(SEPARATION_RADIUS, ALIGNMENT_RADIUS, COHESION_RADIUS)):
+    """Danh sách láng giềng (kể cả chính nó, theo thứ tự trong đàn) của từng con chim."""
+    xs, ys = gather_positions(birds)
+    return [[birds[index] for index in indices.tolist()] for indices in neighbor_indices(xs, ys, radius)]
+
+
+def apply_flocking(birds, neighbors):
+    """Lực separation, alignment, cohesion và tránh biên, chỉ duyệt láng giềng."""
+    for bird, nearby in zip(birds, neighbors):
+        calculate_steering(bird, nearby, SEPARATION_RADIUS, ALIGNMENT_RADIUS, COHESION_RADIUS)
+
+
+def apply_food_seeking(birds, food_positions=None, food_ripeness=None):
+    """Lực hướng đến quả hấp dẫn nhất; mảng quả được chuyển một lần mỗi tick."""
+    if food_positions is None or food_ripeness is None or len(food_positions) == 0:
+        return
+    food_positions = np.asarray(food_positions, dtype=np.float64).reshape(-1, 2)
+    food_ripeness = np.asarray(food_ripeness, dtype=np.float64)
+    for bird in birds:
+        bird.apply_force(seek_food(bird, food_positions, food_ripeness) * FOOD_WEIGHT)
+
+
+def integrate(birds, dt):
+    """Cộng lực lái vào vận tốc, dời vị trí và cập nhật đói/tuổi thọ."""
+    for bird in birds:
+        bird.update(dt)
+
+
+def wrap_edges(birds):
+    """Bọc quanh biên màn hình."""
+    for bird in birds:
+        bird.edges()
+
+
+def eat_food(birds, food_positions=None, food_ripeness=None):
+    """Chim ở sát quả chín được hồi năng lượng (như Bird.update khi có thức ăn)."""
+    if food_positions is None or food_ripeness is None or len(food_positions) == 0:
+        return
+    food_positions = np.asarray(food_positions, dtype=np.float64).reshape(-1, 2)
+    food_ripeness = np.asarray(food_ripeness, dtype=np.float64)
+    for bird in birds:
+        if bird.consume_food(food_positions, food_ripeness) >= 0:
+            bird.eat(0.5)
+
+
+def cull(birds):
+    """Danh sách chim còn sống."""
+    return [bird for bird in birds if not bird.is_dead and bird.is_alive()]
+
+
+def default_flock_pipeline():
+    """
+    Returns:
+        FlockPipeline: Pipeline mặc định neighbors -> steering -> food ->
+            integrate -> wrap -> eat -> cull
+    """
+    pipeline = FlockPipeline()
+    pipeline.register("neighbors", build_neighbors, output="neighbors")
+    pipeline.register("steering", apply_flocking)
+    pipeline.register("food", apply_food_seeking)
+    pipeline.register("integrate", integrate)
+    pipeline.register("wrap", wrap_edges)
+    pipeline.register("eat", eat_food)
+    pipeline.register("cull", cull, output="birds")
+    return pipeline
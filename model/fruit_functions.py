@@ -21,10 +21,31 @@ class FruitSpawnStepper:
         return False
 
 
-import random
-import math
+import numpy as np
 from utils.vector import Vector2D
-from utils.config import WINDOW_WIDTH, WINDOW_HEIGHT, RIPENING_RATE, INFO_PANEL_WIDTH
+from utils.config import (
+    WINDOW_WIDTH, WINDOW_HEIGHT, RIPENING_RATE, INFO_PANEL_WIDTH, WEATHER_SAMPLING_MODE,
+    FRUIT_SPAWN_CANDIDATES, FRUIT_SPAWN_ATTEMPTS
+)
+from utils.rng import get_rng
+from model.weather.main.multires import WeatherGrid
+
+
+def sample_temperature_field(temperature_field, x, y):
+    """
+    Lấy nhiệt độ tại tọa độ màn hình từ trường nhiệt độ 2D bất kỳ kích thước,
+    nội suy theo WEATHER_SAMPLING_MODE như WeatherIntegration.
+    
+    Args:
+        temperature_field (np.ndarray): Mảng (H, W) phủ vùng mô phỏng
+        x, y: Tọa độ màn hình (vô hướng hoặc mảng)
+        
+    Returns:
+        float hoặc np.ndarray: Nhiệt độ tại các điểm
+    """
+    h, w = temperature_field.shape
+    grid = WeatherGrid(WINDOW_WIDTH - INFO_PANEL_WIDTH, WINDOW_HEIGHT, w, h)
+    return grid.sample(temperature_field, x, y, WEATHER_SAMPLING_MODE)
 
 def calculate_ripeness(time_existed):
     """
@@ -42,6 +63,45 @@ def calculate_ripeness(time_existed):
     # Giới hạn độ chín tối đa là 2.0
     return min(ripeness, 2.0)
 
+def generate_fruit_positions(count, location=None, temperature_field=None, num_samples=10, rng=None):
+    """
+    Tạo vị trí ngẫu nhiên cho count quả mới trong một lô NumPy. Nếu có trường
+    nhiệt độ, mỗi quả thử num_samples điểm và giữ điểm nóng nhất; nhiệt độ của
+    cả count * num_samples điểm được lấy mẫu bằng một lần gọi.
+    
+    Args:
+        count (int): Số vị trí cần tạo
+        location (tuple, optional): Vị trí trung tâm để tạo quả xung quanh
+        temperature_field (np.ndarray or callable, optional): Trường nhiệt độ 2D hoặc hàm
+            vector hóa trả về nhiệt độ tại các mảng (xs, ys)
+        num_samples (int): Số lượng điểm thử random cho mỗi quả (nếu dùng nhiệt độ)
+        rng (numpy.random.Generator, optional): Bộ sinh số ngẫu nhiên, mặc định luồng 'fruit' của utils.rng
+    Returns:
+        tuple: (xs, ys, temperatures) ba mảng độ dài count; temperatures là None
+            khi không có trường nhiệt độ
+    """
+    rng = get_rng('fruit') if rng is None else rng
+    padding = INFO_PANEL_WIDTH
+    samples = max(1, int(num_samples)) if temperature_field is not None else 1
+    shape = (int(count), samples)
+    if location:
+        center_x, center_y = location
+        radius = 100
+        r = radius * np.sqrt(rng.random(shape))
+        theta = rng.random(shape) * 2 * np.pi
+        xs = np.clip(center_x + r * np.cos(theta), 0, WINDOW_WIDTH - padding)
+        ys = np.minimum(center_y + r * np.sin(theta), WINDOW_HEIGHT)
+    else:
+        xs = rng.uniform(0, WINDOW_WIDTH - padding, shape)
+        ys = rng.uniform(0, WINDOW_HEIGHT, shape)
+    if temperature_field is None:
+        return xs[:, 0], ys[:, 0], None
+    temps = sample_temperatures(temperature_field, xs.ravel(), ys.ravel()).reshape(shape)
+    # Mỗi hàng giữ điểm nóng nhất, trùng thứ tự với vòng lặp tuần tự trước đây
+    best = np.argmax(temps, axis=1)
+    rows = np.arange(shape[0])
+    return xs[rows, best], ys[rows, best], temps[rows, best]
+
 def generate_fruit_position(location=None, temperature_field=None, num_samples=10):
     """
     Tạo vị trí ngẫu nhiên cho quả mới, ưu tiên nơi có nhiệt độ cao nếu có trường nhiệt độ.
@@ -53,63 +113,40 @@ def generate_fruit_position(location=None, temperature_field=None, num_samples=1
     Returns:
         Vector2D: Vị trí của quả mới
     """
-    padding = INFO_PANEL_WIDTH
-    best_pos = None
-    best_temp = -float('inf')
-    
-    def get_temp(x, y):
-        if temperature_field is None:
-            return 0
-        if callable(temperature_field):
-            return temperature_field(x, y)
-        else:
-            # Giả sử temperature_field là numpy array shape (H, W)
-            h, w = temperature_field.shape
-            ix = int(x / (WINDOW_WIDTH - padding) * (w-1))
-            iy = int(y / WINDOW_HEIGHT * (h-1))
-            ix = max(0, min(ix, w-1))
-            iy = max(0, min(iy, h-1))
-            return temperature_field[iy, ix]
+    xs, ys, _ = generate_fruit_positions(1, location, temperature_field, num_samples)
+    return Vector2D(float(xs[0]), float(ys[0]))
+
+def sample_temperatures(temperature_field, xs, ys):
+    """
+    Lấy nhiệt độ tại các mảng tọa độ từ trường nhiệt độ (mảng 2D) hoặc hàm
+    vector hóa (ví dụ WeatherIntegration.sample_temperature).
     
-    samples = num_samples if temperature_field is not None else 1
-    for _ in range(samples):
-        if location:
-            center_x, center_y = location
-            radius = 100
-            r = radius * math.sqrt(random.random())
-            theta = random.random() * 2 * math.pi
-            x = center_x + r * math.cos(theta)
-            y = center_y + r * math.sin(theta)
-            x = max(0, min(x, WINDOW_WIDTH - padding))
-            y = min(y, WINDOW_HEIGHT)
-        else:
-            x = random.uniform(0, WINDOW_WIDTH - padding)
-            y = random.uniform(0, WINDOW_HEIGHT)
-        temp = get_temp(x, y)
-        if temp > best_temp:
-            best_temp = temp
-            best_pos = (x, y)
-    return Vector2D(*best_pos)
+    Returns:
+        np.ndarray: Nhiệt độ, cùng hình dạng với xs
+    """
+    if callable(temperature_field):
+        return np.asarray(temperature_field(xs, ys), dtype=np.float64)
+    return np.asarray(sample_temperature_field(temperature_field, xs, ys), dtype=np.float64)
 
 def calculate_fruit_spawn_likelihood_at_point(temperature, temp_min, temp_max, weather=0.5, season=0):
     """
     Xác suất mọc quả tại một điểm, phụ thuộc nhiệt độ tại điểm đó, thời tiết, mùa.
     Args:
-        temperature (float): Nhiệt độ tại điểm spawn
+        temperature (float hoặc np.ndarray): Nhiệt độ tại (các) điểm spawn
         temp_min (float): Nhiệt độ thấp nhất trong trường nhiệt độ
         temp_max (float): Nhiệt độ cao nhất trong trường nhiệt độ
         weather (float): Chỉ số thời tiết (0-1)
         season (int): Mùa hiện tại (0: Xuân, 1: Hạ, 2: Thu, 3: Đông)
     Returns:
-        float: Xác suất mọc quả (0 đến 1)
+        float hoặc np.ndarray: Xác suất mọc quả (0 đến 1)
     """
     if temp_max - temp_min < 1e-8:
-        temp_norm = 0.0
+        temp_norm = np.zeros_like(temperature, dtype=np.float64)
     else:
-        temp_norm = (temperature - temp_min) / (temp_max - temp_min)
+        temp_norm = (np.asarray(temperature, dtype=np.float64) - temp_min) / (temp_max - temp_min)
     season_factors = [0.8, 1.0, 0.6, 0.2]
     likelihood = temp_norm * weather * season_factors[season]
-    return max(0.0, min(likelihood, 1.0))
+    return np.clip(likelihood, 0.0, 1.0)
 
 def calculate_fruit_spawn_likelihood(time, weather=0.5, season=0):
     """
@@ -133,4 +170,56 @@ def calculate_fruit_spawn_likelihood(time, weather=0.5, season=0):
     # day_factor = math.sin(time / 86400 * 2 * math.pi) * 0.2 + 0.8  # Chu kỳ ngày/đêm
     # likelihood *= day_factor
     
-    return max(0.0, min(likelihood, 1.0))  # Giới hạn trong khoảng [0, 1]
\ No newline at end of file
+    return max(0.0, min(likelihood, 1.0))  # Giới hạn trong khoảng [0, 1]
+
+
+class FruitSpawner:
+    """
+    Sinh quả mới theo lô: mỗi lượt thử attempts quả, mỗi quả chọn điểm nóng
+    nhất trong candidates điểm ngẫu nhiên rồi được chấp nhận với xác suất
+    calculate_fruit_spawn_likelihood_at_point tại điểm đó. Toàn bộ ứng viên
+    của một lượt được lấy mẫu nhiệt độ trong một lần gọi.
+    """
+    def __init__(self, candidates=FRUIT_SPAWN_CANDIDATES, attempts=FRUIT_SPAWN_ATTEMPTS, rng=None):
+        """
+        Args:
+            candidates (int): Số điểm thử cho mỗi quả
+            attempts (int): Số quả được thử mọc mỗi lượt
+            rng (numpy.random.Generator, optional): Bộ sinh số ngẫu nhiên, mặc định luồng 'fruit' của utils.rng
+        """
+        self.candidates = candidates
+        self.attempts = attempts
+        self.rng = get_rng('fruit') if rng is None else rng
+
+    def spawn(self, temperature_field=None, temp_range=None, weather=0.5, season=0, sim_time=0):
+        """
+        Chọn vị trí các quả mọc trong lượt này.
+        
+        Args:
+            temperature_field (np.ndarray or callable, optional): Trường nhiệt độ 2D hoặc
+                hàm vector hóa (xs, ys) -> nhiệt độ
+            temp_range (tuple, optional): (min, max) nhiệt độ đã tính sẵn (ví dụ
+                WeatherIntegration.statistics); nếu None thì duyệt mảng, hoặc (0, 1) với hàm
+            weather (float): Chỉ số thời tiết (0-1)
+            season (int): Mùa hiện tại (0: Xuân, 1: Hạ, 2: Thu, 3: Đông)
+            sim_time (float): Thời gian mô phỏng (giây)
+            
+        Returns:
+            tuple: (xs, ys) vị trí các quả được chấp nhận
+        """
+        xs, ys, temps = generate_fruit_positions(self.attempts, temperature_field=temperature_field,
+                                                 num_samples=self.candidates, rng=self.rng)
+        if temps is None:
+            # Không có trường nhiệt độ, dùng xác suất theo thời gian/thời tiết/mùa
+            likelihood = calculate_fruit_spawn_likelihood(sim_time, weather, season)
+        else:
+            if temp_range is not None:
+                temp_min, temp_max = temp_range
+            elif callable(temperature_field):
+                # Không lấy được min/max, dùng mặc định
+                temp_min, temp_max = 0.0, 1.0
+            else:
+                temp_min, temp_max = float(np.min(temperature_field)), float(np.max(temperature_field))
+            likelihood = calculate_fruit_spawn_likelihood_at_point(temps, temp_min, temp_max, weather, season)
+        accepted = self.rng.random(len(xs)) < likelihood
+        return xs[accepted], ys[accepted]
@@ -0,0 +1,311 @@
+"""
+Kho quả lưu theo cột trong các mảng NumPy cấp phát trước.
+
+Mỗi quả là một ô (slot) trong các mảng x, y, creation_time, ripeness,
+ripening_multiplier, last_update_time và mặt nạ alive. Ô của quả đã bị ăn hoặc
+quá chín được đưa vào danh sách ô trống và dùng lại cho quả mới (ô có chỉ số
+nhỏ nhất trước, để các quả sống dồn về đầu mảng); mảng chỉ tăng gấp đôi khi
+hết ô. Độ chín của mọi quả được cập nhật bằng một phép toán trên mảng, và
+steering/renderer đọc thẳng positions()/ripeness_values() thay vì dựng lại
+danh sách mỗi lần thêm quả.
+
+HƯỚNG DẪN SỬ DỤNG:
+    store = FruitStore()
+    store.add_many(xs, ys, time.time())
+    store.update(time.time())             # chín dần, loại quả quá chín
+    positions = store.positions()         # (K, 2), theo thứ tự ô
+    ripeness = store.ripeness_values()    # (K,)
+"""
+
+import heapq
+
+import numpy as np
+
+from utils.config import RIPENING_RATE
+
+# Độ chín tối đa: quả biến mất khi đạt mức này
+MAX_RIPENESS = 2.0
+
+# Các cột số thực của mỗi quả
+_COLUMNS = ('x', 'y', 'creation_time', 'last_update_time', 'ripeness', 'ripening_multiplier')
+
+
+def fruit_colors(ripeness):
+    """
+    Màu RGBA của quả theo độ chín (cùng quy tắc với Fruit.get_color trước đây):
+    xanh lá -> đỏ khi độ chín 0 -> 1, sau đó mờ dần khi quá chín (1 -> 2).
+
+    Args:
+        ripeness (numpy.ndarray): Độ chín của các quả
+
+    Returns:
+        numpy.ndarray: Mảng (K, 4) uint8
+    """
+    ripeness = np.asarray(ripeness, dtype=np.float64)
+    unripe = ripeness < 1.0
+    colors = np.empty((len(ripeness), 4), dtype=np.uint8)
+    colors[:, 0] = np.where(unripe, (255 * ripeness).astype(np.int64), 255)
+    colors[:, 1] = np.where(unripe, (255 * (1.0 - ripeness)).astype(np.int64), 0)
+    colors[:, 2] = 0
+    colors[:, 3] = np.where(unripe, 255, (255 * np.clip(MAX_RIPENESS - ripeness, 0.0, 1.0)).astype(np.int64))
+    return colors
+
+
+class FruitStore:
+    """Tập quả lưu theo mảng, thêm/xóa O(1) khấu hao và cập nhật vector hóa."""
+
+    def __init__(self, capacity=64):
+        """
+        Args:
+            capacity (int): Số ô cấp phát ban đầu
+        """
+        self.capacity = 0
+        # Số ô đã từng dùng (các ô >= size chưa bao giờ được cấp)
+        self.size = 0
+        self.count = 0
+        self._free = []
+        self._active = None
+        # Danh sách nhận sự kiện (loại, xs, ys) khi quả mọc/bị ăn/quá chín; None để tắt
+        self.event_log = None
+        self.x = np.empty(0)
+        self.y = np.empty(0)
+        self.creation_time = np.empty(0)
+        self.last_update_time = np.empty(0)
+        self.ripeness = np.empty(0)
+        self.ripening_multiplier = np.empty(0)
+        self.alive = np.zeros(0, dtype=bool)
+        self._grow(max(1, int(capacity)))
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self, capacity):
+        """Mở rộng các mảng lên capacity ô, giữ nguyên dữ liệu."""
+        for name in _COLUMNS:
+            array = np.zeros(capacity)
+            array[:self.capacity] = getattr(self, name)
+            setattr(self, name, array)
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:self.capacity] = self.alive
+        self.alive = alive
+        self.capacity = capacity
+
+    def _allocate(self, count):
+        """Lấy count ô: ô trống có chỉ số nhỏ nhất trước, sau đó ô mới ở cuối."""
+        reused = [heapq.heappop(self._free) for _ in range(min(count, len(self._free)))]
+        fresh = count - len(reused)
+        if self.size + fresh > self.capacity:
+            capacity = self.capacity
+            while self.size + fresh > capacity:
+                capacity *= 2
+            self._grow(capacity)
+        slots = np.concatenate([np.asarray(reused, dtype=np.intp),
+                                np.arange(self.size, self.size + fresh, dtype=np.intp)])
+        self.size += fresh
+        return slots
+
+    def add_many(self, xs, ys, creation_time):
+        """
+        Thêm nhiều quả trong một lần.
+
+        Args:
+            xs, ys (numpy.ndarray): Vị trí các quả
+            creation_time (float hoặc numpy.ndarray): Thời điểm tạo
+
+        Returns:
+            numpy.ndarray: Chỉ số ô của các quả mới
+        """
+        xs = np.atleast_1d(np.asarray(xs, dtype=np.float64))
+        ys = np.atleast_1d(np.asarray(ys, dtype=np.float64))
+        slots = self._allocate(len(xs))
+        self.x[slots] = xs
+        self.y[slots] = ys
+        self.creation_time[slots] = creation_time
+        self.last_update_time[slots] = creation_time
+        self.ripeness[slots] = 0.0
+        self.ripening_multiplier[slots] = 1.0
+        self.alive[slots] = True
+        self.count += len(slots)
+        self._active = None
+        if self.event_log is not None:
+            self.event_log.append(('spawn', xs.copy(), ys.copy()))
+        return slots
+
+    def add(self, x, y, creation_time):
+        """
+        Thêm một quả.
+
+        Returns:
+            int: Chỉ số ô của quả mới
+        """
+        return int(self.add_many(x, y, creation_time)[0])
+
+    def remove(self, slots, reason='removed'):
+        """
+        Xóa các quả (bị ăn hoặc quá chín) và trả ô về danh sách trống.
+
+        Args:
+            slots: Chỉ số ô (một số nguyên hoặc mảng)
+            reason (str): Loại sự kiện ghi vào event_log ('eaten', 'expired', ...)
+        """
+        slots = np.atleast_1d(np.asarray(slots, dtype=np.intp))
+        slots = slots[self.alive[slots]]
+        if len(slots) == 0:
+            return
+        if self.event_log is not None:
+            self.event_log.append((reason, self.x[slots].copy(), self.y[slots].copy()))
+        self.alive[slots] = False
+        self.count -= len(slots)
+        for slot in slots.tolist():
+            heapq.heappush(self._free, slot)
+        self._active = None
+
+    def clear(self):
+        """Xóa mọi quả."""
+        if self.event_log is not None and self.count:
+            slots = self.active_slots()
+            self.event_log.append(('removed', self.x[slots].copy(), self.y[slots].copy()))
+        self.alive[:] = False
+        self.size = 0
+        self.count = 0
+        self._free = []
+        self._active = None
+
+    def active_slots(self):
+        """
+        Returns:
+            numpy.ndarray: Chỉ số ô của các quả còn sống, tăng dần
+        """
+        if self._active is None:
+            self._active = np.flatnonzero(self.alive[:self.size])
+        return self._active
+
+    def positions(self):
+        """
+        Returns:
+            numpy.ndarray: Vị trí các quả còn sống (K, 2), theo active_slots()
+        """
+        slots = self.active_slots()
+        return np.column_stack((self.x[slots], self.y[slots]))
+
+    def ripeness_values(self):
+        """
+        Returns:
+            numpy.ndarray: Độ chín các quả còn sống (K,), theo active_slots()
+        """
+        return self.ripeness[self.active_slots()]
+
+    def colors(self):
+        """
+        Returns:
+            numpy.ndarray: Màu RGBA (K, 4) các quả còn sống, theo active_slots()
+        """
+        return fruit_colors(self.ripeness_values())
+
+    def set_ripening_multipliers(self, multipliers):
+        """
+        Đặt hệ số tốc độ chín cho các quả còn sống.
+
+        Args:
+            multipliers (numpy.ndarray): Hệ số theo thứ tự active_slots()
+        """
+        self.ripening_multiplier[self.active_slots()] = multipliers
+
+    def update(self, current_time):
+        """
+        Cộng độ chín RIPENING_RATE * ripening_multiplier * thời gian trôi qua cho
+        mọi quả còn sống, rồi loại các quả đạt MAX_RIPENESS.
+
+        Args:
+            current_time (float): Thời gian hiện tại
+
+        Returns:
+            int: Số quả đã bị loại
+        """
+        slots = self.active_slots()
+        if len(slots) == 0:
+            return 0
+        elapsed = np.maximum(current_time - self.last_update_time[slots], 0.0)
+        self.last_update_time[slots] = current_time
+        ripeness = np.minimum(
+            self.ripeness[slots] + RIPENING_RATE * self.ripening_multiplier[slots] * elapsed, MAX_RIPENESS
+        )
+        self.ripeness[slots] = ripeness
+        expired = slots[ripeness >= MAX_RIPENESS]
+        self.remove(expired, 'expired')
+        self.compact_if_sparse()
+        return len(expired)
+
+    def find_ripe_near(self, x, y, radius):
+        """
+        Tìm quả chín gần (x, y) nhất trong bán kính radius.
+
+        Returns:
+            int: Chỉ số ô, hoặc -1 nếu không có
+        """
+        slots = self.active_slots()
+        if len(slots) == 0:
+            return -1
+        distance = np.hypot(self.x[slots] - x, self.y[slots] - y)
+        candidates = (self.ripeness[slots] >= 1.0) & (distance < radius)
+        if not candidates.any():
+            return -1
+        return int(slots[np.flatnonzero(candidates)[np.argmin(distance[candidates])]])
+
+    def get_state(self):
+        """
+        Returns:
+            dict: Các cột tới size và mặt nạ alive, dùng cho checkpoint
+        """
+        state = {name: getattr(self, name)[:self.size].copy() for name in _COLUMNS}
+        state["alive"] = self.alive[:self.size].copy()
+        return state
+    
+    def set_state(self, state, time_offset=0.0):
+        """
+        Khôi phục từ get_state; danh sách ô trống được dựng lại từ các ô chết.
+        
+        Args:
+            state (dict): Trạng thái đã lưu
+            time_offset (float): Cộng vào creation_time/last_update_time, để
+                quả không chín vọt lên vì thời gian thực trôi qua giữa lúc lưu và lúc nạp
+        """
+        alive = np.asarray(state["alive"], dtype=bool)
+        size = len(alive)
+        self.clear()
+        if size > self.capacity:
+            self._grow(max(size, 2 * self.capacity))
+        for name in _COLUMNS:
+            getattr(self, name)[:size] = state[name]
+        self.creation_time[:size] += time_offset
+        self.last_update_time[:size] += time_offset
+        self.alive[:size] = alive
+        self.size = size
+        self.count = int(alive.sum())
+        self._free = np.flatnonzero(~alive).tolist()
+        heapq.heapify(self._free)
+        self._active = None
+        if self.event_log is not None and self.count:
+            slots = self.active_slots()
+            self.event_log.append(('spawn', self.x[slots].copy(), self.y[slots].copy()))
+    
+    def compact_if_sparse(self, min_fill=0.5):
+        """Dồn các quả sống về đầu mảng khi tỷ lệ ô dùng dưới min_fill."""
+        if self.size > 64 and self.count < min_fill * self.size:
+            self.compact()
+
+    def compact(self):
+        """
+        Dồn các quả sống về các ô 0..count-1 (giữ thứ tự) và bỏ danh sách ô
+        trống; chỉ số ô cũ không còn hợp lệ sau khi gọi.
+        """
+        slots = self.active_slots()
+        count = len(slots)
+        for name in _COLUMNS:
+            array = getattr(self, name)
+            array[:count] = array[slots]
+        self.alive[:] = False
+        self.alive[:count] = True
+        self.size = count
+        self._free = []
+        self._active = None
@@ -0,0 +1,451 @@
+"""
+Ghi quỹ đạo mô phỏng để phân tích ngoại tuyến mà không làm chậm vòng lặp.
+
+Mỗi tick được ghi (mỗi decimation tick một lần), luồng mô phỏng chỉ chụp vị
+trí, vận tốc, độ đói và mã của từng con chim thành một mảng float32 bằng một
+lượt duyệt, lấy các sự kiện quả (mọc / bị ăn / quá chín) từ FruitStore.event_log
+và, thưa hơn, một khung nhiệt độ và gió lấy mẫu thưa. Tick đầu của mỗi chunk
+kèm một khung khóa (vị trí mọi quả còn sống) để có thể dựng lại tập quả ở bất
+kỳ tick nào chỉ từ một chunk. Khi đủ chunk_ticks tick, các mảnh
+được chuyển sang luồng ghi nền qua hàng đợi có giới hạn: luồng ghi nối mảng,
+nén và ghi ra chunk_XXXXX.npz; nếu hàng đợi đầy, record() phải chờ (áp lực
+ngược) thay vì để bộ nhớ phình ra.
+
+Cấu trúc thư mục ghi:
+    manifest.json        tham số ghi và danh sách chunk
+    chunk_00000.npz      các mảng của một chunk (xem _build_chunk)
+
+Số chim thay đổi theo tick nên dữ liệu chim được trải phẳng: bird_offsets[i]
+đến bird_offsets[i + 1] là các hàng của tick thứ i trong chunk.
+
+HƯỚNG DẪN SỬ DỤNG:
+    recorder = TrajectoryRecorder("runs/exp1", decimation=2)
+    recorder.attach(fruit_manager.store)
+    # Mỗi tick
+    recorder.record(renderer.birds, weather_integration)
+    recorder.close()
+    for chunk in read_trajectory("runs/exp1"):
+        ...
+    # Truy cập ngẫu nhiên từng tick (xem lại, tua)
+    reader = TrajectoryReader("runs/exp1")
+    frame = reader.frame(reader.frame_at_tick(5000))
+"""
+
+import json
+import os
+import queue
+import shutil
+import threading
+import zipfile
+from collections import Counter, OrderedDict
+
+import numpy as np
+
+from utils.config import (
+    RECORD_DECIMATION, RECORD_CHUNK_TICKS, RECORD_TEMPERATURE_EVERY,
+    RECORD_TEMPERATURE_STRIDE, RECORD_MAX_PENDING_CHUNKS, REPLAY_OPEN_CHUNKS
+)
+
+RECORDING_FORMAT = "birdsim-trajectory"
+RECORDING_VERSION = 2
+
+# Cột của mảng bird_state
+BIRD_FIELDS = ('x', 'y', 'vx', 'vy', 'hunger')
+
+# Mã sự kiện quả trong mảng fruit_event_kind
+FRUIT_EVENT_KINDS = ('spawn', 'eaten', 'expired', 'removed')
+
+
+def _build_chunk(pieces):
+    """Nối các mảnh của một chunk thành các mảng (chạy trên luồng ghi)."""
+    bird_counts = [len(state) for state in pieces['bird_state']]
+    chunk = {
+        'tick': np.asarray(pieces['tick'], dtype=np.int64),
+        'bird_offsets': np.concatenate([[0], np.cumsum(bird_counts)]).astype(np.int64),
+        'bird_state': np.concatenate(pieces['bird_state']),
+        'bird_id': np.concatenate(pieces['bird_id']),
+    }
+    events = pieces['fruit_events']
+    chunk['fruit_event_tick'] = np.asarray([tick for tick, _, _, _ in events], dtype=np.int64)
+    chunk['fruit_event_kind'] = np.asarray([FRUIT_EVENT_KINDS.index(kind) for _, kind, _, _ in events],
+                                           dtype=np.int8)
+    chunk['fruit_event_xy'] = np.array([(x, y) for _, _, x, y in events], dtype=np.float32).reshape(-1, 2)
+    chunk['fruit_keyframe_xy'] = pieces['fruit_keyframe']
+    if pieces['field_tick']:
+        chunk['field_tick'] = np.asarray(pieces['field_tick'], dtype=np.int64)
+        chunk['temperature'] = np.stack(pieces['temperature'])
+        if len(pieces['wind']) == len(pieces['field_tick']):
+            chunk['wind'] = np.stack(pieces['wind'])
+    return chunk
+
+
+class TrajectoryRecorder:
+    """Ghi quỹ đạo theo chunk nén qua một luồng ghi nền."""
+
+    def __init__(self, directory, decimation=RECORD_DECIMATION, chunk_ticks=RECORD_CHUNK_TICKS,
+                 temperature_every=RECORD_TEMPERATURE_EVERY, temperature_stride=RECORD_TEMPERATURE_STRIDE,
+                 max_pending_chunks=RECORD_MAX_PENDING_CHUNKS):
+        """
+        Args:
+            directory (str): Thư mục ghi (tạo nếu chưa có)
+            decimation (int): Ghi mỗi decimation tick
+            chunk_ticks (int): Số tick đã ghi trong một chunk
+            temperature_every (int): Ghi khung nhiệt độ và gió mỗi temperature_every tick đã ghi; 0 để tắt
+            temperature_stride (int): Lấy mỗi temperature_stride ô lưới theo mỗi chiều
+            max_pending_chunks (int): Số chunk chờ ghi tối đa trước khi record() phải chờ
+        """
+        self.directory = directory
+        self.decimation = max(1, int(decimation))
+        self.chunk_ticks = max(1, int(chunk_ticks))
+        self.temperature_every = int(temperature_every)
+        self.temperature_stride = max(1, int(temperature_stride))
+        os.makedirs(directory, exist_ok=True)
+
+        self.tick = 0
+        self.recorded = 0
+        self.chunks = []
+        self.fruit_events = []
+        self._store = None
+        self._next_id = 0
+        self._pieces = self._empty_pieces()
+        self._error = None
+        self._closed = False
+        self._queue = queue.Queue(maxsize=max(1, int(max_pending_chunks)))
+        self._writer = threading.Thread(target=self._write_loop, name="trajectory-writer", daemon=True)
+        self._writer.start()
+        self._write_manifest()
+
+    @staticmethod
+    def _empty_pieces():
+        return {'tick': [], 'bird_state': [], 'bird_id': [], 'fruit_events': [],
+                'fruit_keyframe': np.empty((0, 2), dtype=np.float32),
+                'field_tick': [], 'temperature': [], 'wind': []}
+
+    def attach(self, store):
+        """
+        Nhận sự kiện quả từ một FruitStore (qua event_log), thay cho kho đã gắn
+        trước đó: quả của kho cũ được ghi là 'removed', quả sẵn có của kho mới
+        được ghi là 'spawn', nên tập quả dựng lại khi xem lại vẫn đúng.
+        """
+        self._detach()
+        store.event_log = self.fruit_events
+        self._store = store
+        if len(store):
+            xs, ys = store.positions().T
+            self.fruit_events.append(('spawn', xs.copy(), ys.copy()))
+
+    def _detach(self):
+        store, self._store = self._store, None
+        if store is None or store.event_log is not self.fruit_events:
+            return
+        if len(store):
+            xs, ys = store.positions().T
+            self.fruit_events.append(('removed', xs.copy(), ys.copy()))
+        store.event_log = None
+
+    def _bird_ids(self, birds):
+        """Mã ổn định của từng con chim, gán lần đầu gặp vào thuộc tính record_id."""
+        ids = np.fromiter((getattr(bird, 'record_id', -1) for bird in birds), dtype=np.int64, count=len(birds))
+        for index in np.flatnonzero(ids < 0).tolist():
+            birds[index].record_id = ids[index] = self._next_id
+            self._next_id += 1
+        return ids
+
+    def record(self, birds, weather=None):
+        """
+        Gọi mỗi tick; chỉ chụp dữ liệu ở các tick chia hết cho decimation.
+
+        Args:
+            birds (list): Đàn chim
+            weather (WeatherIntegration, optional): Mô hình thời tiết để lấy khung nhiệt độ
+
+        Raises:
+            RuntimeError: Nếu luồng ghi đã gặp lỗi
+        """
+        if self._error is not None:
+            raise RuntimeError(f"Luồng ghi quỹ đạo bị lỗi: {self._error}")
+        tick = self.tick
+        self.tick += 1
+        if tick % self.decimation:
+            return
+        pieces = self._pieces
+        first_in_chunk = not pieces['tick']
+        count = len(birds)
+        # Một lượt duyệt cho mọi trường số thực của đàn
+        state = np.fromiter(
+            (value for bird in birds
+             for value in (bird.position.x, bird.position.y, bird.velocity.x, bird.velocity.y, bird.hunger)),
+            dtype=np.float64, count=count * len(BIRD_FIELDS)
+        ).reshape(count, len(BIRD_FIELDS))
+        pieces['tick'].append(tick)
+        pieces['bird_state'].append(state.astype(np.float32))
+        pieces['bird_id'].append(self._bird_ids(birds))
+
+        # Sự kiện quả tích lũy từ lần ghi trước được gán vào tick này
+        if self.fruit_events:
+            for kind, xs, ys in self.fruit_events:
+                pieces['fruit_events'].extend((tick, kind, x, y) for x, y in zip(xs.tolist(), ys.tolist()))
+            self.fruit_events.clear()
+        if first_in_chunk and self._store is not None:
+            # Khung khóa: tập quả sau các sự kiện của tick này
+            pieces['fruit_keyframe'] = self._store.positions().astype(np.float32)
+
+        if (self.temperature_every > 0 and self.recorded % self.temperature_every == 0
+                and weather is not None and getattr(weather, 'initialized', False)):
+            stride = self.temperature_stride
+            field = weather.temp_field.get_temperature_view()
+            pieces['field_tick'].append(tick)
+            pieces['temperature'].append(np.array(field[::stride, ::stride], dtype=np.float32))
+            wind_x, wind_y = weather.get_wind_field()
+            if wind_x is not None:
+                pieces['wind'].append(np.array((wind_x[::stride, ::stride], wind_y[::stride, ::stride]),
+                                               dtype=np.float32))
+
+        self.recorded += 1
+        if len(pieces['tick']) >= self.chunk_ticks:
+            self.flush()
+
+    def flush(self):
+        """Chuyển các tick đang gom sang luồng ghi (chờ nếu hàng đợi đầy)."""
+        if not self._pieces['tick']:
+            return
+        index = len(self.chunks)
+        self.chunks.append(f"chunk_{index:05d}.npz")
+        self._queue.put((index, self._pieces))
+        self._pieces = self._empty_pieces()
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                index, pieces = item
+                if self._error is None:
+                    path = os.path.join(self.directory, f"chunk_{index:05d}.npz")
+                    with open(path + ".tmp", "wb") as stream:
+                        np.savez_compressed(stream, **_build_chunk(pieces))
+                    os.replace(path + ".tmp", path)
+                    # Manifest luôn liệt kê các chunk đã ghi xong, kể cả khi chương trình bị ngắt
+                    self._write_manifest(self.chunks[:index + 1])
+            except Exception as e:
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+    def _write_manifest(self, chunks=None):
+        manifest = {
+            "format": RECORDING_FORMAT, "version": RECORDING_VERSION,
+            "decimation": self.decimation, "chunk_ticks": self.chunk_ticks,
+            "temperature_every": self.temperature_every, "temperature_stride": self.temperature_stride,
+            "bird_fields": list(BIRD_FIELDS), "fruit_event_kinds": list(FRUIT_EVENT_KINDS),
+            "ticks": self.tick, "chunks": list(self.chunks if chunks is None else chunks),
+        }
+        path = os.path.join(self.directory, "manifest.json")
+        with open(path + ".tmp", "w", encoding="utf-8") as stream:
+            json.dump(manifest, stream, indent=2)
+        os.replace(path + ".tmp", path)
+
+    def close(self):
+        """
+        Ghi nốt phần còn lại, chờ luồng ghi xong và cập nhật manifest.
+
+        Raises:
+            RuntimeError: Nếu luồng ghi đã gặp lỗi
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self.flush()
+        self._queue.put(None)
+        self._writer.join()
+        if self._store is not None and self._store.event_log is self.fruit_events:
+            self._store.event_log = None
+        self._store = None
+        if self._error is not None:
+            raise RuntimeError(f"Luồng ghi quỹ đạo bị lỗi: {self._error}") from self._error
+        self._write_manifest()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def read_manifest(directory):
+    """
+    Returns:
+        dict: Nội dung manifest.json của một lần ghi
+
+    Raises:
+        ValueError: Nếu thư mục không phải bản ghi quỹ đạo
+    """
+    with open(os.path.join(directory, "manifest.json"), encoding="utf-8") as stream:
+        manifest = json.load(stream)
+    if manifest.get("format") != RECORDING_FORMAT or manifest.get("version") != RECORDING_VERSION:
+        raise ValueError(f"{directory} không phải bản ghi quỹ đạo phiên bản {RECORDING_VERSION}")
+    return manifest
+
+
+def read_trajectory(directory):
+    """
+    Duyệt các chunk của một lần ghi theo thứ tự.
+
+    Yields:
+        dict: Tên mảng -> mảng của một chunk
+    """
+    for name in read_manifest(directory)["chunks"]:
+        with np.load(os.path.join(directory, name), allow_pickle=False) as data:
+            yield {key: data[key] for key in data.files}
+
+
+class TrajectoryReader:
+    """
+    Truy cập ngẫu nhiên theo tick vào một bản ghi mà không nạp cả bản ghi.
+
+    Mỗi chunk chỉ được giải nén một lần, lần đầu cần đến: từng mảng trong
+    .npz được chép thẳng ra file .npy trong cache_directory rồi mở bằng
+    memory-map, nên nhảy tới tick bất kỳ chỉ chạm vào các trang cần đọc và
+    bộ nhớ không phụ thuộc độ dài bản ghi. Chỉ giữ tối đa open_chunks chunk
+    đang mở.
+    """
+
+    def __init__(self, directory, cache_directory=None, open_chunks=REPLAY_OPEN_CHUNKS):
+        """
+        Args:
+            directory (str): Thư mục bản ghi
+            cache_directory (str, optional): Nơi chứa các mảng đã giải nén, mặc định directory/replay_cache
+            open_chunks (int): Số chunk giữ mở cùng lúc
+
+        Raises:
+            ValueError: Nếu thư mục không phải bản ghi quỹ đạo
+        """
+        self.directory = directory
+        self.manifest = read_manifest(directory)
+        self.decimation = self.manifest["decimation"]
+        self.chunk_ticks = self.manifest["chunk_ticks"]
+        self.chunk_names = self.manifest["chunks"]
+        self.cache_directory = cache_directory or os.path.join(directory, "replay_cache")
+        self.open_chunks = max(1, int(open_chunks))
+        self._open = OrderedDict()
+        self.frame_count = 0
+        if self.chunk_names:
+            last = self._chunk(len(self.chunk_names) - 1)
+            self.frame_count = (len(self.chunk_names) - 1) * self.chunk_ticks + len(last['tick'])
+
+    def __len__(self):
+        return self.frame_count
+
+    def _extract(self, index):
+        """Giải nén các mảng của chunk index ra .npy (bỏ qua mảng đã có đủ kích thước)."""
+        name = self.chunk_names[index]
+        target = os.path.join(self.cache_directory, os.path.splitext(name)[0])
+        os.makedirs(target, exist_ok=True)
+        paths = {}
+        with zipfile.ZipFile(os.path.join(self.directory, name)) as archive:
+            for info in archive.infolist():
+                path = os.path.join(target, info.filename)
+                if not os.path.exists(path) or os.path.getsize(path) != info.file_size:
+                    with archive.open(info) as source, open(path + ".tmp", "wb") as stream:
+                        shutil.copyfileobj(source, stream)
+                    os.replace(path + ".tmp", path)
+                paths[os.path.splitext(info.filename)[0]] = path
+        return paths
+
+    def _chunk(self, index):
+        """Các mảng (memory-map) của chunk index, mở lại nếu đã bị đóng."""
+        chunk = self._open.get(index)
+        if chunk is not None:
+            self._open.move_to_end(index)
+            return chunk
+        chunk = {key: np.load(path, mmap_mode='r', allow_pickle=False)
+                 for key, path in self._extract(index).items()}
+        self._open[index] = chunk
+        while len(self._open) > self.open_chunks:
+            self._open.popitem(last=False)
+        return chunk
+
+    def tick_of(self, frame):
+        """Tick mô phỏng của khung thứ frame."""
+        return frame * self.decimation
+
+    def frame_at_tick(self, tick):
+        """Khung gần nhất không sau tick (giới hạn trong bản ghi)."""
+        return min(max(int(tick) // self.decimation, 0), self.frame_count - 1)
+
+    def chunk_of(self, frame):
+        """Chỉ số chunk chứa khung thứ frame."""
+        return frame // self.chunk_ticks
+
+    def frame(self, frame):
+        """
+        Dữ liệu của một khung.
+
+        Args:
+            frame (int): Chỉ số khung, 0 <= frame < len(reader)
+
+        Returns:
+            dict: tick, bird_state (N, 5) và bird_id (N,) đọc thẳng từ memory-map,
+                  fruit_xy (K, 2) tập quả dựng lại, temperature và wind (hoặc None)
+                  của khung trường gần nhất không sau tick
+
+        Raises:
+            IndexError: Nếu frame nằm ngoài bản ghi
+        """
+        if not 0 <= frame < self.frame_count:
+            raise IndexError(f"Khung {frame} nằm ngoài bản ghi ({self.frame_count} khung)")
+        index, row = divmod(frame, self.chunk_ticks)
+        chunk = self._chunk(index)
+        start, end = chunk['bird_offsets'][row:row + 2].tolist()
+        tick = int(chunk['tick'][row])
+        temperature, wind = self._fields(index, tick)
+        return {
+            'tick': tick,
+            'bird_state': chunk['bird_state'][start:end],
+            'bird_id': chunk['bird_id'][start:end],
+            'fruit_xy': self._fruits(chunk, tick),
+            'temperature': temperature,
+            'wind': wind,
+        }
+
+    def _fruits(self, chunk, tick):
+        """Tập quả tại tick: khung khóa của chunk cộng các sự kiện sau tick đầu chunk."""
+        event_ticks = chunk['fruit_event_tick']
+        first = np.searchsorted(event_ticks, chunk['tick'][0], side='right')
+        last = np.searchsorted(event_ticks, tick, side='right')
+        fruits = Counter(map(tuple, chunk['fruit_keyframe_xy'].tolist()))
+        spawn = FRUIT_EVENT_KINDS.index('spawn')
+        for kind, position in zip(chunk['fruit_event_kind'][first:last].tolist(),
+                                  map(tuple, chunk['fruit_event_xy'][first:last].tolist())):
+            if kind == spawn:
+                fruits[position] += 1
+            elif fruits[position] > 0:
+                fruits[position] -= 1
+        return np.array(list(fruits.elements()), dtype=np.float32).reshape(-1, 2)
+
+    def _fields(self, index, tick):
+        """Khung nhiệt độ/gió gần nhất không sau tick, tìm lùi qua các chunk trước."""
+        every = self.manifest["temperature_every"]
+        if every <= 0:
+            return None, None
+        # Hai khung trường cách nhau every khung, nên chỉ cần lùi ngần ấy chunk
+        for previous in range(index, max(index - every // self.chunk_ticks - 2, -1), -1):
+            chunk = self._chunk(previous)
+            if 'field_tick' not in chunk:
+                continue
+            position = np.searchsorted(chunk['field_tick'], tick, side='right') - 1
+            if position >= 0:
+                wind = chunk['wind'][position] if 'wind' in chunk else None
+                return chunk['temperature'][position], wind
+        return None, None
+
+    def close(self):
+        """Đóng các chunk đang mở (các file .npy giải nén vẫn được giữ để lần sau mở nhanh)."""
+        self._open.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
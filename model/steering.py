@@ -1,6 +1,9 @@
 from utils.vector import Vector2D
 import numpy as np
 from utils.config import *
+from utils.log import get_logger
+
+logger = get_logger("steering")
 
 def calculate_steering(bird, all_birds, separation_radius, alignment_radius, cohesion_radius, 
                        food_positions=None, food_ripeness=None):
@@ -19,8 +22,8 @@ def calculate_steering(bird, all_birds, separation_radius, alignment_radius, coh
     bird.apply_force(cohesion_force * COHESION_WEIGHT)
     bird.apply_force(edge_force * EDGE_WEIGHT)
     
-    # Nếu có thức ăn, cũng tính lực hướng đến thức ăn
-    if food_positions and food_ripeness and len(food_positions) > 0:
+    # Nếu có thức ăn, cũng tính lực hướng đến thức ăn (danh sách hoặc mảng của FruitStore)
+    if food_positions is not None and food_ripeness is not None and len(food_positions) > 0:
         food_force = seek_food(bird, food_positions, food_ripeness)
         bird.apply_force(food_force * FOOD_WEIGHT)  # Trọng số cho lực tìm thức ăn
 
@@ -112,38 +115,30 @@ def seek_food(bird, food_positions, ripeness, food_radius=150.0):
     
     Args:
         bird: Đối tượng Bird cần tìm thức ăn
-        food_positions: Danh sách vị trí của các quả
-        ripeness: Danh sách độ chín tương ứng với các quả
+        food_positions: Vị trí của các quả, mảng (K, 2) hoặc danh sách (x, y)
+        ripeness: Độ chín tương ứng với các quả
         food_radius: Phạm vi tìm kiếm thức ăn
         
     Returns:
         Vector2D: Lực steering hướng về quả hấp dẫn nhất
     """
-    if not food_positions or len(food_positions) == 0:
+    if food_positions is None or len(food_positions) == 0:
         return Vector2D()
     
-    # Tìm thức ăn phù hợp nhất dựa trên độ chín và khoảng cách
-    best_food_index = -1
-    best_food_score = -float('inf')  # Điểm số càng cao càng hấp dẫn
+    # Tính khoảng cách và điểm hấp dẫn cho mọi quả cùng lúc
+    food_positions = np.asarray(food_positions, dtype=np.float64).reshape(-1, 2)
+    ripeness = np.asarray(ripeness, dtype=np.float64)
+    distances = np.hypot(food_positions[:, 0] - bird.position.x, food_positions[:, 1] - bird.position.y)
     
-    for i, pos in enumerate(food_positions):
-        # Chỉ quan tâm đến quả có độ chín hợp lý (từ 0.7 đến 1.5)
-        if 0.7 <= ripeness[i] < 1.5:
-            food_pos = Vector2D(pos[0], pos[1])
-            distance = bird.position.distance_to(food_pos)
-            
-            if distance < food_radius:
-                # Tính điểm hấp dẫn của quả dựa trên độ chín và khoảng cách
-                # Quả chín hoàn toàn (ripeness=1) có điểm cao nhất
-                ripeness_score = 1.0 - abs(ripeness[i] - 1.0)
-                distance_score = 1.0 - (distance / food_radius)  # Càng gần càng tốt
-                
-                # Tổng hợp điểm số, có thể điều chỉnh trọng số
-                score = (ripeness_score * 0.7) + (distance_score * 0.3)
-                
-                if score > best_food_score:
-                    best_food_score = score
-                    best_food_index = i
+    # Chỉ quan tâm đến quả có độ chín hợp lý (từ 0.7 đến 1.5) trong phạm vi tìm kiếm
+    candidates = (ripeness >= 0.7) & (ripeness < 1.5) & (distances < food_radius)
+    best_food_index = -1
+    if candidates.any():
+        # Quả chín hoàn toàn (ripeness=1) và càng gần thì điểm càng cao
+        ripeness_score = 1.0 - np.abs(ripeness - 1.0)
+        distance_score = 1.0 - distances / food_radius
+        scores = np.where(candidates, ripeness_score * 0.7 + distance_score * 0.3, -np.inf)
+        best_food_index = int(np.argmax(scores))
     
     # Nếu tìm thấy quả phù hợp, tạo lực steering đến quả đó
     if best_food_index >= 0:
@@ -223,7 +218,7 @@ def avoid_edges(bird, margin):
 def constrain_to_screen(bird):
     """Ràng buộc trực tiếp vị trí của chim trong màn hình."""
     padding = 5  # Khoảng đệm nhỏ để tránh bám sát biên
-    print("BIRDS POSITION:", bird.position.x, bird.position.y)
+    logger.debug("BIRDS POSITION: %.1f %.1f", bird.position.x, bird.position.y, extra={"key": "steering.constrain"})
     # Ràng buộc trục X
     if bird.position.x < padding:
         bird.position.x = padding
@@ -1,82 +0,0 @@
-# CMAKE generated file: DO NOT EDIT!
-# Generated by "MinGW Makefiles" Generator, CMake Version 4.0
-
-# The generator used is:
-set(CMAKE_DEPENDS_GENERATOR "MinGW Makefiles")
-
-# The top level Makefile was generated from the following files:
-set(CMAKE_MAKEFILE_DEPENDS
-  "CMakeCache.txt"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/CMakeCInformation.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/CMakeCXXInformation.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/CMakeCheckCompilerFlagCommonPatterns.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/CMakeCommonLanguageInclude.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/CMakeGenericSystem.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/CMakeInitializeConfigs.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/CMakeLanguageInformation.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/CMakeParseImplicitLinkInfo.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/CMakeRCInformation.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/CMakeSystemSpecificInformation.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/CMakeSystemSpecificInitialize.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/CheckCXXCompilerFlag.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/CheckCXXSourceCompiles.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/Compiler/CMakeCommonCompilerMacros.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/Compiler/GNU-C.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/Compiler/GNU-CXX.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/Compiler/GNU.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/FindOpenMP.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/FindPackageHandleStandardArgs.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/FindPackageMessage.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/FindPython.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/FindPython/Support.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/Internal/CMakeCLinkerInformation.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/Internal/CMakeCXXLinkerInformation.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/Internal/CMakeCommonLinkerInformation.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/Internal/CheckCompilerFlag.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/Internal/CheckFlagCommonConfig.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/Internal/CheckSourceCompiles.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/Linker/GNU-C.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/Linker/GNU-CXX.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/Linker/GNU.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/Platform/Linker/GNU.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/Platform/Linker/Windows-GNU-C.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/Platform/Linker/Windows-GNU-CXX.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/Platform/Linker/Windows-GNU.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/Platform/Windows-GNU-C-ABI.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/Platform/Windows-GNU-C.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/Platform/Windows-GNU-CXX-ABI.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/Platform/Windows-GNU-CXX.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/Platform/Windows-GNU.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/Platform/Windows-Initialize.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/Platform/Windows-windres.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/Platform/Windows.cmake"
-  "C:/Program Files/CMake/share/cmake-4.0/Modules/Platform/WindowsPaths.cmake"
-  "C:/Users/ASUS/AppData/Local/Programs/Python/Python310/Lib/site-packages/pybind11/share/cmake/pybind11/pybind11Common.cmake"
-  "C:/Users/ASUS/AppData/Local/Programs/Python/Python310/Lib/site-packages/pybind11/share/cmake/pybind11/pybind11Config.cmake"
-  "C:/Users/ASUS/AppData/Local/Programs/Python/Python310/Lib/site-packages/pybind11/share/cmake/pybind11/pybind11NewTools.cmake"
-  "C:/Users/ASUS/AppData/Local/Programs/Python/Python310/Lib/site-packages/pybind11/share/cmake/pybind11/pybind11Targets.cmake"
-  "C:/Users/ASUS/AppData/Local/Programs/Python/Python310/lib/site-packages/pybind11/share/cmake/pybind11/pybind11ConfigVersion.cmake"
-  "C:/Users/ASUS/Desktop/BirdSimulations/model/weather/cpp/CMakeLists.txt"
-  "CMakeFiles/4.0.0/CMakeCCompiler.cmake"
-  "CMakeFiles/4.0.0/CMakeCXXCompiler.cmake"
-  "CMakeFiles/4.0.0/CMakeRCCompiler.cmake"
-  "CMakeFiles/4.0.0/CMakeSystem.cmake"
-  )
-
-# The corresponding makefile is:
-set(CMAKE_MAKEFILE_OUTPUTS
-  "Makefile"
-  "CMakeFiles/cmake.check_cache"
-  )
-
-# Byproducts of CMake generate step:
-set(CMAKE_MAKEFILE_PRODUCTS
-  "CMakeFiles/CMakeDirectoryInformation.cmake"
-  )
-
-# Dependency information for all targets:
-set(CMAKE_DEPEND_INFO_FILES
-  "CMakeFiles/cpp_weather.dir/DependInfo.cmake"
-  "CMakeFiles/solver_seq.dir/DependInfo.cmake"
-  "CMakeFiles/test_solver.dir/DependInfo.cmake"
-  )
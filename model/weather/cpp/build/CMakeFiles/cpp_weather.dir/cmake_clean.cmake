@@ -1,19 +0,0 @@
-file(REMOVE_RECURSE
-  "C:/Users/ASUS/Desktop/BirdSimulations/model/weather/python/cpp_weather.cp310-win_amd64.pyd"
-  "C:/Users/ASUS/Desktop/BirdSimulations/model/weather/python/cpp_weather.cp310-win_amd64.pyd.manifest"
-  "C:/Users/ASUS/Desktop/BirdSimulations/model/weather/python/cpp_weather.pdb"
-  "CMakeFiles/cpp_weather.dir/src/python_bindings.cpp.obj"
-  "CMakeFiles/cpp_weather.dir/src/python_bindings.cpp.obj.d"
-  "CMakeFiles/cpp_weather.dir/src/solver.cpp.obj"
-  "CMakeFiles/cpp_weather.dir/src/solver.cpp.obj.d"
-  "CMakeFiles/cpp_weather.dir/src/temperature_field.cpp.obj"
-  "CMakeFiles/cpp_weather.dir/src/temperature_field.cpp.obj.d"
-  "CMakeFiles/cpp_weather.dir/src/wind_field.cpp.obj"
-  "CMakeFiles/cpp_weather.dir/src/wind_field.cpp.obj.d"
-  "libcpp_weather.dll.a"
-)
-
-# Per-language clean rules from dependency scanning.
-foreach(lang CXX)
-  include(CMakeFiles/cpp_weather.dir/cmake_clean_${lang}.cmake OPTIONAL)
-endforeach()
@@ -1,11 +0,0 @@
-file(REMOVE_RECURSE
-  "CMakeFiles/solver_seq.dir/src/solver_seq.cpp.obj"
-  "CMakeFiles/solver_seq.dir/src/solver_seq.cpp.obj.d"
-  "libsolver_seq.a"
-  "libsolver_seq.pdb"
-)
-
-# Per-language clean rules from dependency scanning.
-foreach(lang CXX)
-  include(CMakeFiles/solver_seq.dir/cmake_clean_${lang}.cmake OPTIONAL)
-endforeach()
@@ -1,3 +0,0 @@
-file(REMOVE_RECURSE
-  "libsolver_seq.a"
-)
@@ -1,24 +0,0 @@
-
-# Consider dependencies only in project.
-set(CMAKE_DEPENDS_IN_PROJECT_ONLY OFF)
-
-# The set of languages for which implicit dependencies are needed:
-set(CMAKE_DEPENDS_LANGUAGES
-  )
-
-# The set of dependency files which are needed:
-set(CMAKE_DEPENDS_DEPENDENCY_FILES
-  "C:/Users/ASUS/Desktop/BirdSimulations/model/weather/cpp/src/main.cpp" "CMakeFiles/test_solver.dir/src/main.cpp.obj" "gcc" "CMakeFiles/test_solver.dir/src/main.cpp.obj.d"
-  "C:/Users/ASUS/Desktop/BirdSimulations/model/weather/cpp/src/solver.cpp" "CMakeFiles/test_solver.dir/src/solver.cpp.obj" "gcc" "CMakeFiles/test_solver.dir/src/solver.cpp.obj.d"
-  )
-
-# Targets to which this target links which contain Fortran sources.
-set(CMAKE_Fortran_TARGET_LINKED_INFO_FILES
-  )
-
-# Targets to which this target links which contain Fortran sources.
-set(CMAKE_Fortran_TARGET_FORWARD_LINKED_INFO_FILES
-  )
-
-# Fortran module output directory.
-set(CMAKE_Fortran_TARGET_MODULE_DIR "")
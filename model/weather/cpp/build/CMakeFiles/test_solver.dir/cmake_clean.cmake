@@ -1,15 +0,0 @@
-file(REMOVE_RECURSE
-  "CMakeFiles/test_solver.dir/src/main.cpp.obj"
-  "CMakeFiles/test_solver.dir/src/main.cpp.obj.d"
-  "CMakeFiles/test_solver.dir/src/solver.cpp.obj"
-  "CMakeFiles/test_solver.dir/src/solver.cpp.obj.d"
-  "libtest_solver.dll.a"
-  "test_solver.exe"
-  "test_solver.exe.manifest"
-  "test_solver.pdb"
-)
-
-# Per-language clean rules from dependency scanning.
-foreach(lang CXX)
-  include(CMakeFiles/test_solver.dir/cmake_clean_${lang}.cmake OPTIONAL)
-endforeach()
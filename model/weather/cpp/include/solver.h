@@ -14,6 +14,27 @@
  * 
  * 4. Hoặc, để giải trong một phạm vi hàng nhất định (cho đa luồng):
  *    solver.solveSubdomain(temperature, windX, windY, startRow, endRow, dt);
+ *
+ * 5. Với bước thời gian lớn (tua nhanh theo mùa), chọn sơ đồ IMEX: đối lưu
+ *    tường minh (RK4), khuếch tán ẩn (Crank-Nicolson ADI). Khi đó
+ *    computeCFLTimeStep chỉ còn giới hạn theo đối lưu:
+ *    solver.setScheme(Solver::IMEX);
+ *    solver.solveStep(temperature, windX, windY, dt);
+ *
+ * 6. Với gió mạnh, chọn sơ đồ bán Lagrange (ổn định vô điều kiện), có thể
+ *    bật hiệu chỉnh MacCormack để giảm khuếch tán số:
+ *    solver.setScheme(Solver::SEMI_LAGRANGIAN);
+ *    solver.setMacCormack(true);
+ *
+ * 7. Nguồn nhiệt duy trì (heat emitter) được cộng như số hạng nguồn
+ *    rate*exp(-d²/(2*radius²)) vào đạo hàm thời gian ở mọi sơ đồ:
+ *    int id = solver.addHeatEmitter(x, y, rate, radius);
+ *    solver.moveHeatEmitter(id, newX, newY);
+ *    solver.removeHeatEmitter(id);
+ *
+ * 8. Mọi lớp đều là template theo kiểu số thực: Solver (double) và
+ *    Solver32 (float) có cùng giao diện, Solver32 nhận std::vector<float>:
+ *    Solver32 solver32(width, height, dx, kappa);
  */
 
 #ifndef SOLVER_H
@@ -22,9 +43,59 @@
 #include <vector>
 #include <algorithm>
 #include <cmath>
+#include <limits>
+#include <stdexcept>
+#ifdef _OPENMP
 #include <omp.h>
+#endif
 
-class Solver {
+#include "temperature_field.h"
+
+/**
+ * @brief Phần không phụ thuộc kiểu số thực, dùng chung cho Solver và Solver32.
+ */
+class SolverBase {
+public:
+    /**
+     * @brief Sơ đồ tích phân thời gian.
+     */
+    enum Scheme {
+        EXPLICIT_RK4,  // RK4 tường minh cho cả đối lưu và khuếch tán
+        IMEX,          // Đối lưu tường minh (RK4), khuếch tán ẩn (Crank-Nicolson ADI)
+        SEMI_LAGRANGIAN  // Đối lưu bán Lagrange, khuếch tán ẩn (Crank-Nicolson ADI)
+    };
+
+    /**
+     * @brief Số Courant tối đa của sơ đồ bán Lagrange. Sơ đồ ổn định với mọi dt,
+     *        giới hạn này chỉ để giữ độ chính xác của phép truy vết ngược.
+     */
+    static constexpr double SEMI_LAGRANGIAN_COURANT = 5.0;
+
+    /**
+     * @brief Số hàng halo mỗi phía khi giải theo dải: stencil 5 điểm đọc một
+     *        hàng lân cận cho mỗi giai đoạn trong 4 giai đoạn RK4.
+     */
+    static const int SUBDOMAIN_HALO_ROWS = 4;
+
+    /**
+     * @brief Thống kê trường nhiệt độ sau bước giải gần nhất. Luôn cộng dồn
+     *        bằng double, kể cả với Solver32.
+     */
+    struct FieldStats {
+        double min;
+        double max;
+        double sum;
+        double sumSquares;
+        size_t count;  // 0 nếu chưa có bước giải nào
+        FieldStats() : min(0.0), max(0.0), sum(0.0), sumSquares(0.0), count(0) {}
+    };
+};
+
+/**
+ * @brief Solver theo kiểu số thực Real (double cho Solver, float cho Solver32).
+ */
+template <typename Real>
+class SolverT : public SolverBase {
 public:
     /**
      * @brief Khởi tạo solver với kích thước lưới và các tham số vật lý.
@@ -33,17 +104,81 @@ public:
      * @param dx Khoảng cách lưới
      * @param kappa Hệ số khuếch tán
      */
-    Solver(int width, int height, double dx, double kappa, bool parallel = true);
+    SolverT(int width, int height, Real dx, Real kappa, bool parallel = true);
     void setParallel(bool parallel);
     bool isParallel() const { return parallel_; }
+    int getWidth() const { return width_; }
+    int getHeight() const { return height_; }
+
+    /**
+     * @brief Chọn sơ đồ tích phân dùng cho solveStep và computeCFLTimeStep.
+     * @param scheme Sơ đồ tích phân
+     */
+    void setScheme(Scheme scheme) { scheme_ = scheme; }
+    Scheme getScheme() const { return scheme_; }
+
+    /**
+     * @brief Bật/tắt hiệu chỉnh MacCormack cho sơ đồ bán Lagrange.
+     * @param enabled true để bật
+     */
+    void setMacCormack(bool enabled) { macCormack_ = enabled; }
+    bool isMacCormack() const { return macCormack_; }
+
+    /**
+     * @brief Thêm một nguồn nhiệt duy trì, được cộng như số hạng nguồn
+     *        (đơn vị nhiệt độ / đơn vị thời gian) trong mỗi bước giải.
+     * @param x Tọa độ x (ô lưới)
+     * @param y Tọa độ y (ô lưới)
+     * @param rate Tốc độ cấp nhiệt tại tâm
+     * @param radius Bán kính ảnh hưởng
+     * @return Mã định danh của nguồn
+     */
+    int addHeatEmitter(Real x, Real y, Real rate, Real radius);
+
+    /**
+     * @brief Di chuyển một nguồn nhiệt duy trì.
+     * @param id Mã định danh trả về từ addHeatEmitter
+     * @param x Tọa độ x mới
+     * @param y Tọa độ y mới
+     * @return false nếu không tìm thấy nguồn
+     */
+    bool moveHeatEmitter(int id, Real x, Real y);
+
+    /**
+     * @brief Xóa một nguồn nhiệt duy trì.
+     * @param id Mã định danh trả về từ addHeatEmitter
+     * @return false nếu không tìm thấy nguồn
+     */
+    bool removeHeatEmitter(int id);
+
+    /**
+     * @brief Xóa mọi nguồn nhiệt duy trì.
+     */
+    void clearHeatEmitters();
+    size_t getHeatEmitterCount() const { return emitters_.size(); }
+
+    /**
+     * @brief Số hạng nguồn đã raster hóa từ các nguồn nhiệt duy trì.
+     * @return Mảng width*height, rỗng nếu không có nguồn
+     */
+    const std::vector<Real>& getSourceTerm() const { return sourceTerm_; }
+
+    /**
+     * @brief Đặt trực tiếp số hạng nguồn, ví dụ phần cắt từ solver toàn lưới
+     *        cho một dải khi phân rã miền. Bị ghi đè khi danh sách nguồn thay đổi.
+     * @param source Mảng width*height, hoặc rỗng để bỏ số hạng nguồn
+     */
+    void setSourceTerm(const std::vector<Real>& source);
 
     /**
      * @brief Tính toán bước thời gian ổn định dựa trên điều kiện CFL.
+     *        Với sơ đồ IMEX, giới hạn khuếch tán được bỏ qua; với sơ đồ bán
+     *        Lagrange, chỉ còn giới hạn độ chính xác SEMI_LAGRANGIAN_COURANT.
      * @param windX Thành phần X của trường gió
      * @param windY Thành phần Y của trường gió
      * @return Bước thời gian ổn định tối đa
      */
-    double computeCFLTimeStep(const std::vector<double>& windX, const std::vector<double>& windY);
+    Real computeCFLTimeStep(const std::vector<Real>& windX, const std::vector<Real>& windY);
 
     /**
      * @brief Cập nhật trường nhiệt độ sử dụng phương pháp Runge-Kutta bậc 4.
@@ -52,31 +187,218 @@ public:
      * @param windY Thành phần Y của trường gió
      * @param dt Bước thời gian
      */
-    void solveRK4Step(std::vector<double>& temperature, 
-                      const std::vector<double>& windX, 
-                      const std::vector<double>& windY, 
-                      double dt);
+    void solveRK4Step(std::vector<Real>& temperature, 
+                      const std::vector<Real>& windX, 
+                      const std::vector<Real>& windY, 
+                      Real dt);
+
+    /**
+     * @brief Cập nhật trường nhiệt độ một bước theo sơ đồ đã chọn (setScheme).
+     * @param temperature Trường nhiệt độ
+     * @param windX Thành phần X của trường gió
+     * @param windY Thành phần Y của trường gió
+     * @param dt Bước thời gian
+     */
+    void solveStep(std::vector<Real>& temperature,
+                   const std::vector<Real>& windX,
+                   const std::vector<Real>& windY,
+                   Real dt);
 
     /**
-     * @brief Giải phương trình trong một phạm vi hàng cụ thể (cho đa luồng).
+     * @brief Cập nhật trường nhiệt độ theo sơ đồ IMEX (tách Strang):
+     *        khuếch tán ẩn dt/2 -> đối lưu RK4 dt -> khuếch tán ẩn dt/2.
+     *        Khuếch tán ổn định vô điều kiện, chỉ đối lưu bị giới hạn CFL.
      * @param temperature Trường nhiệt độ
      * @param windX Thành phần X của trường gió
      * @param windY Thành phần Y của trường gió
+     * @param dt Bước thời gian
+     */
+    void solveIMEXStep(std::vector<Real>& temperature,
+                       const std::vector<Real>& windX,
+                       const std::vector<Real>& windY,
+                       Real dt);
+
+    /**
+     * @brief Cập nhật trường nhiệt độ theo sơ đồ bán Lagrange (tách Strang):
+     *        khuếch tán ẩn dt/2 -> đối lưu bán Lagrange dt -> khuếch tán ẩn dt/2.
+     *        Đối lưu truy vết ngược theo gió (điểm giữa) và nội suy song tuyến
+     *        tính, có hiệu chỉnh MacCormack nếu được bật.
+     * @param temperature Trường nhiệt độ
+     * @param windX Thành phần X của trường gió
+     * @param windY Thành phần Y của trường gió
+     * @param dt Bước thời gian
+     */
+    void solveSemiLagrangianStep(std::vector<Real>& temperature,
+                                 const std::vector<Real>& windX,
+                                 const std::vector<Real>& windY,
+                                 Real dt);
+
+    /**
+     * @brief Giải một bước RK4 trong một phạm vi hàng cụ thể (cho đa luồng).
+     *        Dải được giải kèm SUBDOMAIN_HALO_ROWS hàng halo mỗi phía lấy tuần
+     *        hoàn theo toàn lưới, nên kết quả trùng khớp từng bit với solveRK4Step.
+     * @param temperature Trường nhiệt độ, các hàng [startRow, endRow] được ghi đè
+     * @param windX Thành phần X của trường gió
+     * @param windY Thành phần Y của trường gió
      * @param startRow Hàng bắt đầu
-     * @param endRow Hàng kết thúc
+     * @param endRow Hàng kết thúc (tính cả)
      * @param dt Bước thời gian
      */
-    void solveSubdomain(std::vector<double>& temperature, 
-                        const std::vector<double>& windX, 
-                        const std::vector<double>& windY, 
-                        int startRow, int endRow, double dt);
+    void solveSubdomain(std::vector<Real>& temperature, 
+                        const std::vector<Real>& windX, 
+                        const std::vector<Real>& windY, 
+                        int startRow, int endRow, Real dt);
+
+    /**
+     * @brief Như solveSubdomain nhưng đọc từ temperature và ghi các hàng
+     *        [startRow, endRow] vào result (cùng kích thước lưới), không sửa
+     *        trạng thái solver nên nhiều luồng có thể gọi đồng thời trên các
+     *        dải rời nhau của cùng bộ đệm.
+     * @param temperature Trường nhiệt độ hiện tại (width*height)
+     * @param windX Thành phần X của trường gió (width*height)
+     * @param windY Thành phần Y của trường gió (width*height)
+     * @param result Bộ đệm kết quả (width*height)
+     * @param startRow Hàng bắt đầu
+     * @param endRow Hàng kết thúc (tính cả)
+     * @param dt Bước thời gian
+     * @return false nếu phạm vi hàng không hợp lệ
+     */
+    bool solveSubdomain(const Real* temperature, const Real* windX, const Real* windY,
+                        Real* result, int startRow, int endRow, Real dt) const;
+
+    /**
+     * @brief Thống kê (min, max, tổng, tổng bình phương) của trường nhiệt độ
+     *        sau lần gọi solveStep/solveRK4Step/solveIMEXStep/solveSemiLagrangianStep
+     *        gần nhất. Được tính ngay trong vòng lặp ghi kết quả cuối cùng
+     *        (phép reduction OpenMP) nên không tốn thêm một lượt duyệt lưới.
+     * @return Thống kê của bước gần nhất
+     */
+    const FieldStats& getLastStats() const { return lastStats_; }
 
 private:
     int width_;        // Chiều rộng lưới
     int height_;       // Chiều cao lưới
-    double spacing_;   // Khoảng cách lưới
-    double kappa_;     // Hệ số khuếch tán
+    Real spacing_;     // Khoảng cách lưới
+    Real kappa_;       // Hệ số khuếch tán
     bool parallel_;    // Chế độ song song (true) hoặc tuần tự (false)
+    Scheme scheme_;    // Sơ đồ tích phân thời gian
+    bool macCormack_;  // Hiệu chỉnh MacCormack cho sơ đồ bán Lagrange
+    FieldStats lastStats_;  // Thống kê sau bước giải gần nhất
+
+    /**
+     * @brief Nguồn nhiệt duy trì.
+     */
+    struct HeatEmitter {
+        int id;
+        Real x, y;
+        Real rate;
+        Real radius;
+    };
+
+    std::vector<HeatEmitter> emitters_;  // Các nguồn nhiệt duy trì
+    int nextEmitterId_;                  // Mã định danh cho nguồn kế tiếp
+    std::vector<Real> sourceTerm_;       // Số hạng nguồn đã raster hóa, rỗng nếu không có nguồn
+
+    /**
+     * @brief Hệ ba đường chéo tuần hoàn (I - r/2 * δ²) của một chiều lưới.
+     *        Hệ số là hằng số nên phân rã Thomas và nghiệm Sherman-Morrison
+     *        được tính một lần và dùng lại cho đến khi r thay đổi.
+     */
+    struct PeriodicTridiagonal {
+        int n;
+        Real r;
+        Real offDiag;       // Phần tử ngoài đường chéo a = -r/2
+        Real gamma;         // Tham số Sherman-Morrison
+        Real correction;    // 1 / (1 + z[0] + a*z[n-1]/gamma)
+        std::vector<Real> cPrime;                // Hệ số c' của thuật toán Thomas
+        std::vector<Real> inverseDenominator;    // 1 / mẫu số ở mỗi hàng
+        std::vector<Real> z;                     // Nghiệm của T z = u
+        PeriodicTridiagonal() : n(0), r(-1.0), offDiag(0.0), gamma(0.0), correction(0.0) {}
+    };
+
+    PeriodicTridiagonal adiX_;         // Hệ theo chiều x (độ dài width)
+    PeriodicTridiagonal adiY_;         // Hệ theo chiều y (độ dài height)
+    std::vector<Real> adiBuffer_;      // Trường trung gian giữa hai nửa bước ADI
+    std::vector<Real> slForward_;      // Kết quả truy vết xuôi của bán Lagrange
+    std::vector<Real> slBackward_;     // Kết quả truy vết ngược (MacCormack)
+    std::vector<Real> slMin_;          // Chặn dưới của bộ giới hạn MacCormack
+    std::vector<Real> slMax_;          // Chặn trên của bộ giới hạn MacCormack
+
+    /**
+     * @brief Nội suy song tuyến tính tuần hoàn tại tọa độ lưới (gx, gy).
+     * @param field Trường cần nội suy
+     * @param gx Tọa độ x theo đơn vị ô lưới
+     * @param gy Tọa độ y theo đơn vị ô lưới
+     * @param low Nếu khác nullptr, nhận giá trị nhỏ nhất của 4 ô lân cận
+     * @param high Nếu khác nullptr, nhận giá trị lớn nhất của 4 ô lân cận
+     * @return Giá trị nội suy
+     */
+    Real sampleBilinear(const std::vector<Real>& field, Real gx, Real gy,
+                          Real* low = nullptr, Real* high = nullptr) const;
+
+    /**
+     * @brief Một lần đối lưu bán Lagrange: result(x) = source(điểm khởi hành).
+     * @param source Trường nguồn
+     * @param windX Thành phần X của trường gió
+     * @param windY Thành phần Y của trường gió
+     * @param dt Bước thời gian (âm để truy vết xuôi cho MacCormack)
+     * @param result Kết quả (output)
+     * @param low Nếu khác nullptr, nhận chặn dưới tại điểm khởi hành
+     * @param high Nếu khác nullptr, nhận chặn trên tại điểm khởi hành
+     */
+    void advectSemiLagrangian(const std::vector<Real>& source,
+                              const std::vector<Real>& windX,
+                              const std::vector<Real>& windY,
+                              Real dt, std::vector<Real>& result,
+                              std::vector<Real>* low = nullptr,
+                              std::vector<Real>* high = nullptr);
+
+    /**
+     * @brief Chuẩn bị (hoặc dùng lại) phân rã của hệ ba đường chéo tuần hoàn.
+     * @param system Hệ cần chuẩn bị
+     * @param n Số ẩn
+     * @param r Hệ số kappa*dt/dx²
+     */
+    void prepareTridiagonal(PeriodicTridiagonal& system, int n, Real r);
+
+    /**
+     * @brief Giải tại chỗ hệ ba đường chéo tuần hoàn đã chuẩn bị.
+     * @param system Hệ đã chuẩn bị
+     * @param x Vế phải (input), nghiệm (output)
+     */
+    void solveTridiagonal(const PeriodicTridiagonal& system, Real* x) const;
+
+    /**
+     * @brief Raster hóa lại sourceTerm_ từ danh sách nguồn (chỉ gọi khi danh sách thay đổi).
+     */
+    void rebuildSourceTerm();
+
+    /**
+     * @brief Lưu kết quả reduction vào lastStats_.
+     */
+    void storeStats(double minValue, double maxValue, double sum, double sumSquares, size_t count);
+
+    /**
+     * @brief Tính lại thống kê bằng một lượt duyệt riêng (chỉ dùng khi bước
+     *        giải không có vòng lặp ghi cuối để gộp reduction).
+     * @param temperature Trường nhiệt độ
+     */
+    void computeStats(const std::vector<Real>& temperature);
+
+    /**
+     * @brief Khuếch tán ẩn một bước dt bằng ADI Peaceman-Rachford (Crank-Nicolson).
+     * @param temperature Trường nhiệt độ (cập nhật tại chỗ)
+     * @param dt Bước thời gian
+     */
+    void applyImplicitDiffusion(std::vector<Real>& temperature, Real dt);
+
+    /**
+     * @brief Tích phân RK4 một bước, có hoặc không có số hạng khuếch tán.
+     */
+    void advanceRK4(std::vector<Real>& temperature,
+                    const std::vector<Real>& windX,
+                    const std::vector<Real>& windY,
+                    Real dt, bool includeDiffusion);
 
     /**
      * @brief Tính toán các gradient không gian.
@@ -84,17 +406,17 @@ private:
      * @param gradX Gradient theo X (output)
      * @param gradY Gradient theo Y (output)
      */
-    void computeGradients(const std::vector<double>& temperature,
-                          std::vector<double>& gradX,
-                          std::vector<double>& gradY);
+    void computeGradients(const std::vector<Real>& temperature,
+                          std::vector<Real>& gradX,
+                          std::vector<Real>& gradY);
 
     /**
      * @brief Tính toán Laplacian.
      * @param temperature Trường nhiệt độ
      * @param laplacian Laplacian (output)
      */
-    void computeLaplacian(const std::vector<double>& temperature,
-                         std::vector<double>& laplacian);
+    void computeLaplacian(const std::vector<Real>& temperature,
+                         std::vector<Real>& laplacian);
 
     /**
      * @brief Đánh giá đạo hàm thời gian của phương trình đối lưu-khuếch tán.
@@ -102,11 +424,16 @@ private:
      * @param windX Thành phần X của trường gió
      * @param windY Thành phần Y của trường gió
      * @param result Kết quả đánh giá (output)
+     * @param includeDiffusion Có cộng số hạng khuếch tán kappa*∇²T hay không
      */
-    void evaluateTimeDerivative(const std::vector<double>& temperature,
-                               const std::vector<double>& windX,
-                               const std::vector<double>& windY,
-                               std::vector<double>& result);
+    void evaluateTimeDerivative(const std::vector<Real>& temperature,
+                               const std::vector<Real>& windX,
+                               const std::vector<Real>& windY,
+                               std::vector<Real>& result,
+                               bool includeDiffusion = true);
 };
 
+typedef SolverT<double> Solver;   // Độ chính xác kép (mặc định)
+typedef SolverT<float> Solver32;  // Độ chính xác đơn: nửa băng thông bộ nhớ, gấp đôi độ rộng SIMD
+
 #endif // SOLVER_H
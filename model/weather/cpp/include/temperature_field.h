@@ -13,9 +13,13 @@
  *      tempField.setGradient(minTemp, maxTemp, direction);
  *    - Nguồn nhiệt điểm:
  *      tempField.addHeatSource(x, y, strength, radius);
+ *    - Nhiều nguồn nhiệt một lúc:
+ *      tempField.addHeatSources(xs, ys, strengths, radii);
  * 
  * 3. Lấy dữ liệu trường nhiệt độ:
  *    const std::vector<double>& temp = tempField.getTemperature();
+ *
+ * 4. Phiên bản độ chính xác đơn TemperatureField32 có cùng giao diện với float.
  */
 
 #ifndef TEMPERATURE_FIELD_H
@@ -25,8 +29,12 @@
 #include <cmath>
 #include <algorithm>
 #include <string>
+#include <limits>
 
-class TemperatureField {
+/**
+ * @brief Phần không phụ thuộc kiểu số thực, dùng chung cho TemperatureField và TemperatureField32.
+ */
+class TemperatureFieldBase {
 public:
     /**
      * @brief Hướng gradient nhiệt độ có sẵn.
@@ -39,19 +47,27 @@ public:
         RADIAL_IN,    // Trung tâm (lạnh) -> Biên (nóng)
         RADIAL_OUT    // Trung tâm (nóng) -> Biên (lạnh)
     };
+};
+
+/**
+ * @brief Trường nhiệt độ theo kiểu số thực Real (double hoặc float).
+ */
+template <typename Real>
+class TemperatureFieldT : public TemperatureFieldBase {
+public:
 
     /**
      * @brief Khởi tạo trường nhiệt độ với kích thước lưới.
      * @param width Chiều rộng lưới
      * @param height Chiều cao lưới
      */
-    TemperatureField(int width, int height);
+    TemperatureFieldT(int width, int height);
 
     /**
      * @brief Thiết lập nhiệt độ đồng nhất trên toàn bộ lưới.
      * @param temperature Giá trị nhiệt độ
      */
-    void setUniform(double temperature);
+    void setUniform(Real temperature);
 
     /**
      * @brief Thiết lập gradient nhiệt độ.
@@ -59,7 +75,7 @@ public:
      * @param maxTemp Nhiệt độ tối đa
      * @param direction Hướng gradient
      */
-    void setGradient(double minTemp, double maxTemp, GradientDirection direction);
+    void setGradient(Real minTemp, Real maxTemp, GradientDirection direction);
 
     /**
      * @brief Thiết lập gradient nhiệt độ với hướng tùy chỉnh.
@@ -67,29 +83,57 @@ public:
      * @param maxTemp Nhiệt độ tối đa
      * @param angleInDegrees Góc (theo độ) của gradient, 0° = Đông, tăng ngược chiều kim đồng hồ
      */
-    void setCustomGradient(double minTemp, double maxTemp, double angleInDegrees);
+    void setCustomGradient(Real minTemp, Real maxTemp, Real angleInDegrees);
 
     /**
-     * @brief Thêm nguồn nhiệt điểm.
+     * @brief Thêm nguồn nhiệt điểm. Chỉ duyệt các ô trong hình vuông bao
+     *        bán kính HEAT_SOURCE_CUTOFF * radius quanh nguồn.
      * @param x Tọa độ x của nguồn nhiệt
      * @param y Tọa độ y của nguồn nhiệt
      * @param strength Cường độ nguồn nhiệt
      * @param radius Bán kính ảnh hưởng
      */
-    void addHeatSource(double x, double y, double strength, double radius);
+    void addHeatSource(Real x, Real y, Real strength, Real radius);
+
+    /**
+     * @brief Thêm nhiều nguồn nhiệt điểm trong một lần gọi.
+     * @param xs Tọa độ x của các nguồn nhiệt
+     * @param ys Tọa độ y của các nguồn nhiệt
+     * @param strengths Cường độ của các nguồn nhiệt
+     * @param radii Bán kính ảnh hưởng của các nguồn nhiệt
+     * @return true nếu bốn vector cùng kích thước, ngược lại false
+     */
+    bool addHeatSources(const std::vector<Real>& xs, const std::vector<Real>& ys,
+                        const std::vector<Real>& strengths, const std::vector<Real>& radii);
+
+    /**
+     * @brief Cộng một phân phối Gaussian strength*exp(-d²/(2*radius²)) vào
+     *        field, chỉ trong vùng d <= HEAT_SOURCE_CUTOFF * radius.
+     * @param field Trường cần cộng (kích thước width*height)
+     * @param width Chiều rộng lưới
+     * @param height Chiều cao lưới
+     * @param x Tọa độ x của tâm
+     * @param y Tọa độ y của tâm
+     * @param strength Biên độ
+     * @param radius Bán kính (độ lệch chuẩn)
+     */
+    static void addGaussian(std::vector<Real>& field, int width, int height,
+                            Real x, Real y, Real strength, Real radius);
+
+    static const int HEAT_SOURCE_CUTOFF = 3;  // Bán kính cắt tính theo số lần radius
 
     /**
      * @brief Lấy dữ liệu trường nhiệt độ.
      * @return Vector chứa dữ liệu nhiệt độ
      */
-    const std::vector<double>& getTemperature() const { return temperature_; }
+    const std::vector<Real>& getTemperature() const { return temperature_; }
 
     /**
      * @brief Thiết lập dữ liệu trường nhiệt độ trực tiếp.
      * @param temperature Vector chứa dữ liệu nhiệt độ
      * @return true nếu kích thước vector phù hợp, ngược lại false
      */
-    bool setTemperature(const std::vector<double>& temperature);
+    bool setTemperature(const std::vector<Real>& temperature);
 
     /**
      * @brief Truy cập giá trị nhiệt độ tại một điểm cụ thể.
@@ -97,7 +141,7 @@ public:
      * @param y Tọa độ y
      * @return Giá trị nhiệt độ tại điểm (x,y)
      */
-    double getValueAt(int x, int y) const;
+    Real getValueAt(int x, int y) const;
 
     /**
      * @brief Lấy chiều rộng lưới.
@@ -114,7 +158,10 @@ public:
 private:
     int width_;                  // Chiều rộng lưới
     int height_;                 // Chiều cao lưới
-    std::vector<double> temperature_;  // Dữ liệu nhiệt độ
+    std::vector<Real> temperature_;    // Dữ liệu nhiệt độ
 };
 
+typedef TemperatureFieldT<double> TemperatureField;
+typedef TemperatureFieldT<float> TemperatureField32;
+
 #endif // TEMPERATURE_FIELD_H
@@ -3,8 +3,10 @@
  * @brief Mô phỏng và tạo trường gió cho mô hình thời tiết.
  * 
  * HƯỚNG DẪN SỬ DỤNG:
- * 1. Tạo đối tượng WindField với kích thước lưới:
+ * 1. Tạo đối tượng WindField với kích thước lưới (thêm seed để tái lập được;
+ *    không có seed thì lấy theo thời gian):
  *    WindField windField(width, height);
+ *    WindField windField(width, height, seed);
  * 
  * 2. Tạo trường gió với các phương pháp khác nhau:
  *    - Trường gió Gaussian:
@@ -14,35 +16,93 @@
  *    - Trường gió xoáy:
  *      windField.generateVortexField(centers, strengths, radiuses);
  * 
- * 3. Lấy các thành phần của trường gió:
+ * 3. Cho trường gió Gaussian tiến hóa mượt theo thời gian (tâm xoáy trôi,
+ *    cường độ tăng/giảm theo vòng đời) thay vì tạo lại từ đầu:
+ *    windField.setEvolution(driftSpeed, lifetime);
+ *    windField.evolve(dt);
+ *
+ * 4. Lấy các thành phần của trường gió:
  *    const std::vector<double>& windX = windField.getWindX();
  *    const std::vector<double>& windY = windField.getWindY();
+ *
+ * 5. Lưu/khôi phục toàn bộ trạng thái (checkpoint): getVortexState,
+ *    getEvolutionState, getRngState cùng windX/windY, và các hàm set tương ứng.
+ *
+ * 6. Phiên bản độ chính xác đơn WindField32 có cùng giao diện với float.
  */
 
 #ifndef WIND_FIELD_H
 #define WIND_FIELD_H
 
 #include <vector>
+#include <cstdint>
 #include <random>
+#include <string>
 #include <cmath>
+#ifdef _OPENMP
 #include <omp.h>
+#endif
 
-class WindField {
+/**
+ * @brief Trường gió theo kiểu số thực Real (double cho WindField, float cho WindField32).
+ */
+template <typename Real>
+class WindFieldT {
 public:
     /**
      * @brief Khởi tạo trường gió với kích thước lưới.
      * @param width Chiều rộng lưới
      * @param height Chiều cao lưới
      */
-    WindField(int width, int height);
+    WindFieldT(int width, int height);
+
+    /**
+     * @brief Khởi tạo trường gió với seed cố định cho bộ sinh số ngẫu nhiên,
+     *        để các lần chạy cùng seed tạo cùng các xoáy.
+     * @param width Chiều rộng lưới
+     * @param height Chiều cao lưới
+     * @param seed Seed của bộ sinh mt19937
+     */
+    WindFieldT(int width, int height, std::uint32_t seed);
 
     /**
-     * @brief Tạo trường gió Gaussian.
+     * @brief Đặt lại seed của bộ sinh số ngẫu nhiên.
+     * @param seed Seed của bộ sinh mt19937
+     */
+    void seed(std::uint32_t seed);
+
+    /**
+     * @brief Tạo trường gió Gaussian. Mỗi xoáy chỉ được cộng trong vùng
+     *        GAUSSIAN_CUTOFF_SIGMAS bán kính quanh tâm, ngoài đó đóng góp
+     *        không đáng kể (< e^-8). Các xoáy được lưu lại để dùng cho evolve.
      * @param numVortices Số lượng xoáy
      * @param strength Cường độ trung bình của xoáy
      * @param radius Bán kính trung bình của xoáy
      */
-    void generateGaussianField(int numVortices, double strength, double radius);
+    void generateGaussianField(int numVortices, Real strength, Real radius);
+
+    /**
+     * @brief Thiết lập tham số tiến hóa cho trường gió Gaussian.
+     * @param driftSpeed Tốc độ trôi của tâm xoáy (ô lưới / đơn vị thời gian)
+     * @param lifetime Vòng đời của một xoáy (đơn vị thời gian)
+     */
+    void setEvolution(Real driftSpeed, Real lifetime);
+
+    /**
+     * @brief Tiến hóa trường gió Gaussian thêm một bước dt. Xoáy trôi theo vận
+     *        tốc riêng, cường độ tăng dần khi sinh ra và giảm dần về 0 khi hết
+     *        vòng đời, sau đó được thay bằng một xoáy mới nên trường gió thay
+     *        đổi liên tục, không nhảy cóc. Không làm gì nếu chưa gọi
+     *        generateGaussianField.
+     * @param dt Bước thời gian
+     */
+    void evolve(Real dt);
+
+    /**
+     * @brief Số xoáy Gaussian đang được theo dõi.
+     * @return Số xoáy
+     */
+    size_t getVortexCount() const { return vortices_.size(); }
 
     /**
      * @brief Tạo trường gió Perlin.
@@ -50,7 +110,7 @@ public:
      * @param octaves Số lượng octaves
      * @param persistence Độ bền vững giữa các octave
      */
-    void generatePerlinField(double scale, int octaves, double persistence);
+    void generatePerlinField(Real scale, int octaves, Real persistence);
 
     /**
      * @brief Tạo trường gió xoáy.
@@ -58,29 +118,117 @@ public:
      * @param strengths Vector chứa cường độ của mỗi xoáy
      * @param radiuses Vector chứa bán kính của mỗi xoáy
      */
-    void generateVortexField(const std::vector<double>& centers, 
-                           const std::vector<double>& strengths, 
-                           const std::vector<double>& radiuses);
+    void generateVortexField(const std::vector<Real>& centers, 
+                           const std::vector<Real>& strengths, 
+                           const std::vector<Real>& radiuses);
 
     /**
      * @brief Lấy thành phần X của trường gió.
      * @return Vector thành phần X của trường gió
      */
-    const std::vector<double>& getWindX() const { return windX_; }
+    const std::vector<Real>& getWindX() const { return windX_; }
 
     /**
      * @brief Lấy thành phần Y của trường gió.
      * @return Vector thành phần Y của trường gió
      */
-    const std::vector<double>& getWindY() const { return windY_; }
+    const std::vector<Real>& getWindY() const { return windY_; }
+
+    /**
+     * @brief Đặt trực tiếp hai thành phần gió (khôi phục checkpoint).
+     * @param windX Thành phần X, width*height phần tử
+     * @param windY Thành phần Y, width*height phần tử
+     * @return false nếu kích thước không khớp lưới (trường không đổi)
+     */
+    bool setWind(const std::vector<Real>& windX, const std::vector<Real>& windY);
+
+    /**
+     * @brief Trạng thái các xoáy Gaussian, 7 số mỗi xoáy:
+     *        x, y, vx, vy, strength, radius, age.
+     * @return Vector phẳng 7 * getVortexCount() phần tử
+     */
+    std::vector<Real> getVortexState() const;
+
+    /**
+     * @brief Khôi phục các xoáy từ getVortexState (không dựng lại trường gió).
+     * @param state Vector phẳng 7 số mỗi xoáy
+     * @return false nếu độ dài không chia hết cho 7
+     */
+    bool setVortexState(const std::vector<Real>& state);
+
+    /**
+     * @brief Tham số sinh/tiến hóa xoáy: meanStrength, meanRadius, driftSpeed, lifetime.
+     * @return Vector 4 phần tử
+     */
+    std::vector<Real> getEvolutionState() const;
+
+    /**
+     * @brief Khôi phục tham số từ getEvolutionState.
+     * @param state Vector 4 phần tử
+     * @return false nếu độ dài khác 4
+     */
+    bool setEvolutionState(const std::vector<Real>& state);
+
+    /**
+     * @brief Trạng thái bộ sinh số ngẫu nhiên mt19937 dạng văn bản.
+     * @return Chuỗi trạng thái (định dạng operator<< của std::mt19937)
+     */
+    std::string getRngState() const;
+
+    /**
+     * @brief Khôi phục bộ sinh số ngẫu nhiên từ getRngState.
+     * @param state Chuỗi trạng thái
+     * @return false nếu chuỗi không hợp lệ (bộ sinh không đổi)
+     */
+    bool setRngState(const std::string& state);
 
 private:
     int width_;          // Chiều rộng lưới
     int height_;         // Chiều cao lưới
-    std::vector<double> windX_;  // Thành phần X của trường gió
-    std::vector<double> windY_;  // Thành phần Y của trường gió
+    std::vector<Real> windX_;    // Thành phần X của trường gió
+    std::vector<Real> windY_;    // Thành phần Y của trường gió
     std::mt19937 rng_;   // Bộ sinh số ngẫu nhiên
 
+    /**
+     * @brief Một xoáy Gaussian đang tồn tại của trường gió.
+     */
+    struct Vortex {
+        Real x, y;        // Tâm xoáy
+        Real vx, vy;      // Vận tốc trôi của tâm
+        Real strength;    // Cường độ (dấu quyết định chiều quay)
+        Real radius;      // Bán kính (độ lệch chuẩn của Gaussian)
+        Real age;         // Tuổi hiện tại, trong [0, lifetime)
+    };
+
+    static const int GAUSSIAN_CUTOFF_SIGMAS = 4;  // Bán kính cắt tính theo số lần radius
+
+    std::vector<Vortex> vortices_;  // Các xoáy Gaussian hiện tại
+    Real meanStrength_;  // Cường độ trung bình dùng khi sinh xoáy mới
+    Real meanRadius_;    // Bán kính trung bình dùng khi sinh xoáy mới
+    Real driftSpeed_;    // Tốc độ trôi của tâm xoáy
+    Real lifetime_;      // Vòng đời của xoáy
+
+    /**
+     * @brief Sinh ngẫu nhiên một xoáy mới.
+     * @param vortex Xoáy cần khởi tạo (output)
+     * @param age Tuổi ban đầu
+     */
+    void spawnVortex(Vortex& vortex, Real age);
+
+    /**
+     * @brief Hệ số cường độ theo tuổi: tăng mượt từ 0 trong 20% đầu vòng đời,
+     *        bằng 1 ở giữa, giảm mượt về 0 trong 20% cuối.
+     * @param age Tuổi của xoáy
+     * @return Hệ số trong [0, 1]
+     */
+    Real envelope(Real age);
+
+    /**
+     * @brief Dựng lại trường gió từ danh sách xoáy, mỗi xoáy chỉ duyệt vùng
+     *        bao quanh bán kính cắt.
+     */
+    void rebuildGaussianField();
+
     /**
      * @brief Tạo nhiễu Perlin.
      * @param x Tọa độ x
@@ -88,7 +236,7 @@ private:
      * @param scale Kích thước scale
      * @return Giá trị nhiễu
      */
-    double perlinNoise(double x, double y, double scale);
+    Real perlinNoise(Real x, Real y, Real scale);
 
     /**
      * @brief Hàm nội suy tuyến tính.
@@ -97,14 +245,14 @@ private:
      * @param t Tham số nội suy [0, 1]
      * @return Giá trị nội suy
      */
-    double lerp(double a, double b, double t);
+    Real lerp(Real a, Real b, Real t);
 
     /**
      * @brief Hàm làm mượt gradient.
      * @param t Giá trị đầu vào
      * @return Giá trị làm mượt
      */
-    double smoothstep(double t);
+    Real smoothstep(Real t);
 
     /**
      * @brief Tạo giá trị gradient ngẫu nhiên.
@@ -112,7 +260,10 @@ private:
      * @param iy Chỉ số y
      * @return Giá trị gradient ngẫu nhiên
      */
-    double randomGradient(int ix, int iy);
+    Real randomGradient(int ix, int iy);
 };
 
+typedef WindFieldT<double> WindField;
+typedef WindFieldT<float> WindField32;
+
 #endif // WIND_FIELD_H
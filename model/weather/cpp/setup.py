@@ -0,0 +1,77 @@
+"""
+Build module C++ cpp_weather bằng setuptools + pybind11 (Linux, macOS, Windows).
+
+HƯỚNG DẪN SỬ DỤNG:
+    # Build vào cache theo mã băm mã nguồn (model/weather/main/native.py tự tìm thấy)
+    python -m model.weather.python.utils.build_cpp_module
+    # Hoặc cài như một gói, hay build wheel để mang sang máy khác
+    pip install ./model/weather/cpp
+    CPP_WEATHER_NATIVE_ARCH=0 pip wheel ./model/weather/cpp
+
+Biến môi trường:
+    CPP_WEATHER_NATIVE_ARCH=0   Bỏ -march=native (wheel dùng cho máy có CPU khác)
+    CPP_WEATHER_OPENMP=0        Không dùng OpenMP
+
+Cờ -ffp-contract=off ngăn trình biên dịch gộp nhân-cộng thành FMA khi có
+-march=native, để kết quả trùng từng bit với solver NumPy (numpy_weather.py).
+"""
+
+import os
+import tempfile
+
+from setuptools import setup
+from pybind11.setup_helpers import Pybind11Extension, build_ext
+
+SOURCES = [
+    'src/solver.cpp',
+    'src/wind_field.cpp',
+    'src/temperature_field.cpp',
+    'src/python_bindings.cpp',
+]
+
+
+def _enabled(name):
+    return os.environ.get(name, '1') != '0'
+
+
+class BuildExt(build_ext):
+    """Thêm cờ tối ưu theo trình biên dịch; -march=native và OpenMP chỉ bật khi biên dịch thử thành công."""
+
+    def build_extensions(self):
+        for extension in self.extensions:
+            if self.compiler.compiler_type == 'msvc':
+                extension.extra_compile_args += ['/O2', '/fp:precise']
+                if _enabled('CPP_WEATHER_OPENMP'):
+                    extension.extra_compile_args.append('/openmp')
+                continue
+            extension.extra_compile_args += ['-O3', '-ffp-contract=off']
+            if _enabled('CPP_WEATHER_NATIVE_ARCH') and self._accepts('-march=native'):
+                extension.extra_compile_args.append('-march=native')
+            if _enabled('CPP_WEATHER_OPENMP') and self._accepts('-fopenmp', '#include <omp.h>\n', link=True):
+                extension.extra_compile_args.append('-fopenmp')
+                extension.extra_link_args.append('-fopenmp')
+        super().build_extensions()
+
+    def _accepts(self, flag, prelude='', link=False):
+        """Biên dịch (và liên kết) thử một chương trình rỗng với cờ flag."""
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, 'check.cpp')
+            with open(source, 'w') as stream:
+                stream.write(prelude + 'int main() { return 0; }\n')
+            try:
+                objects = self.compiler.compile([source], output_dir=directory, extra_postargs=[flag])
+                if link:
+                    self.compiler.link_executable(objects, os.path.join(directory, 'check'), extra_postargs=[flag])
+            except Exception:
+                return False
+        return True
+
+
+setup(
+    name='cpp_weather',
+    version='1.0.0',
+    description='Solver đối lưu-khuếch tán nhiệt và trường gió cho mô phỏng đàn chim',
+    ext_modules=[Pybind11Extension('cpp_weather', SOURCES, include_dirs=['include'], cxx_std=11)],
+    cmdclass={'build_ext': BuildExt},
+    zip_safe=False,
+)
@@ -5,6 +5,8 @@
  * HƯỚNG DẪN SỬ DỤNG:
  * - File này tạo một module Python "cpp_weather" có thể import từ Python
  * - Nó bọc các lớp C++ Solver, WindField, và TemperatureField cho Python
+ * - Các lớp Solver32, WindField32, TemperatureField32 là bản float32 có cùng
+ *   giao diện, nhận và trả về mảng numpy float32
  * - Module này cần được build thành một file .pyd (Windows) hoặc .so (Linux/Mac)
  * - Sau khi build, import module từ Python: `import cpp_weather`
  */
@@ -33,73 +35,287 @@ py::array_t<T> vector_to_numpy(const std::vector<T>& vec, const std::vector<ssiz
     return py::array_t<T>(shape, vec.data());
 }
 
-PYBIND11_MODULE(cpp_weather, m) {
-    m.doc() = "C++ backend for the BirdSimulations weather model";
+// Helper tạo view numpy chỉ đọc lên bộ nhớ của std::vector (không sao chép).
+// owner giữ đối tượng C++ sống chừng nào view còn tồn tại.
+template <typename T>
+py::array_t<T> vector_view(const std::vector<T>& vec, const std::vector<ssize_t>& shape, py::handle owner) {
+    py::array_t<T> view(shape, vec.data(), owner);
+    view.attr("flags").attr("writeable") = false;
+    return view;
+}
+
+// Bọc các phương thức của Solver cho một kiểu số thực Real
+template <typename Real>
+void bind_solver(py::class_<SolverT<Real>>& cls) {
+    typedef SolverT<Real> SolverType;
 
-    // Expose Solver class
-    py::class_<Solver>(m, "Solver")
-        .def(py::init<int, int, double, double, bool>(), py::arg("width"), py::arg("height"), py::arg("dx"), py::arg("kappa"), py::arg("parallel") = true)
-        .def(py::init<int, int, double, double>())
-        .def("compute_cfl_time_step", [](Solver& solver, py::array_t<double> windX, py::array_t<double> windY) {
+    cls
+        .def(py::init<int, int, Real, Real, bool>(), py::arg("width"), py::arg("height"), py::arg("dx"), py::arg("kappa"), py::arg("parallel") = true)
+        .def(py::init<int, int, Real, Real>())
+        .def("set_scheme", &SolverType::setScheme)
+        .def("get_scheme", &SolverType::getScheme)
+        .def("set_maccormack", &SolverType::setMacCormack)
+        .def("is_maccormack", &SolverType::isMacCormack)
+        .def("add_heat_emitter", &SolverType::addHeatEmitter, py::arg("x"), py::arg("y"), py::arg("rate"), py::arg("radius"))
+        .def("move_heat_emitter", &SolverType::moveHeatEmitter, py::arg("emitter_id"), py::arg("x"), py::arg("y"))
+        .def("remove_heat_emitter", &SolverType::removeHeatEmitter, py::arg("emitter_id"))
+        .def("clear_heat_emitters", &SolverType::clearHeatEmitters)
+        .def("get_heat_emitter_count", &SolverType::getHeatEmitterCount)
+        // Số hạng nguồn phẳng (width*height), None nếu không có nguồn
+        .def("get_source_term", [](const SolverType& solver) -> py::object {
+            const std::vector<Real>& source = solver.getSourceTerm();
+            if (source.empty()) {
+                return py::none();
+            }
+            return vector_to_numpy(source, {static_cast<ssize_t>(source.size())});
+        })
+        .def("set_source_term", [](SolverType& solver, py::object source) {
+            solver.setSourceTerm(source.is_none() ? std::vector<Real>()
+                                                  : numpy_to_vector(source.cast<py::array_t<Real>>()));
+        }, py::arg("source"))
+        .def("compute_cfl_time_step", [](SolverType& solver, py::array_t<Real> windX, py::array_t<Real> windY) {
             return solver.computeCFLTimeStep(numpy_to_vector(windX), numpy_to_vector(windY));
         })
-        .def("solve_rk4_step", [](Solver& solver, py::array_t<double> temp, py::array_t<double> windX, 
-                                py::array_t<double> windY, double dt) {
+        .def("solve_rk4_step", [](SolverType& solver, py::array_t<Real> temp, py::array_t<Real> windX, 
+                                py::array_t<Real> windY, Real dt) {
             auto temp_vec = numpy_to_vector(temp);
-            solver.solveRK4Step(temp_vec, numpy_to_vector(windX), numpy_to_vector(windY), dt);
+            const auto windX_vec = numpy_to_vector(windX);
+            const auto windY_vec = numpy_to_vector(windY);
+            {
+                py::gil_scoped_release release;
+                solver.solveRK4Step(temp_vec, windX_vec, windY_vec, dt);
+            }
             
             // Trả về numpy array từ đầu ra C++
             py::buffer_info buf = temp.request();
             return vector_to_numpy(temp_vec, {buf.shape[0], buf.shape[1]});
         })
-        .def("solve_subdomain", [](Solver& solver, py::array_t<double> temp, py::array_t<double> windX,
-                                py::array_t<double> windY, int startRow, int endRow, double dt) {
+        .def("solve_step", [](SolverType& solver, py::array_t<Real> temp, py::array_t<Real> windX,
+                            py::array_t<Real> windY, Real dt) {
+            auto temp_vec = numpy_to_vector(temp);
+            const auto windX_vec = numpy_to_vector(windX);
+            const auto windY_vec = numpy_to_vector(windY);
+            {
+                py::gil_scoped_release release;
+                solver.solveStep(temp_vec, windX_vec, windY_vec, dt);
+            }
+
+            py::buffer_info buf = temp.request();
+            return vector_to_numpy(temp_vec, {buf.shape[0], buf.shape[1]});
+        })
+        .def("solve_imex_step", [](SolverType& solver, py::array_t<Real> temp, py::array_t<Real> windX,
+                                 py::array_t<Real> windY, Real dt) {
+            auto temp_vec = numpy_to_vector(temp);
+            const auto windX_vec = numpy_to_vector(windX);
+            const auto windY_vec = numpy_to_vector(windY);
+            {
+                py::gil_scoped_release release;
+                solver.solveIMEXStep(temp_vec, windX_vec, windY_vec, dt);
+            }
+
+            py::buffer_info buf = temp.request();
+            return vector_to_numpy(temp_vec, {buf.shape[0], buf.shape[1]});
+        })
+        .def("solve_semi_lagrangian_step", [](SolverType& solver, py::array_t<Real> temp, py::array_t<Real> windX,
+                                            py::array_t<Real> windY, Real dt) {
+            auto temp_vec = numpy_to_vector(temp);
+            const auto windX_vec = numpy_to_vector(windX);
+            const auto windY_vec = numpy_to_vector(windY);
+            {
+                py::gil_scoped_release release;
+                solver.solveSemiLagrangianStep(temp_vec, windX_vec, windY_vec, dt);
+            }
+
+            py::buffer_info buf = temp.request();
+            return vector_to_numpy(temp_vec, {buf.shape[0], buf.shape[1]});
+        })
+        .def("solve_subdomain", [](SolverType& solver, py::array_t<Real> temp, py::array_t<Real> windX,
+                                py::array_t<Real> windY, int startRow, int endRow, Real dt) {
             auto temp_vec = numpy_to_vector(temp);
-            solver.solveSubdomain(temp_vec, numpy_to_vector(windX), numpy_to_vector(windY),
-                               startRow, endRow, dt);
+            const auto windX_vec = numpy_to_vector(windX);
+            const auto windY_vec = numpy_to_vector(windY);
+            {
+                py::gil_scoped_release release;
+                solver.solveSubdomain(temp_vec, windX_vec, windY_vec, startRow, endRow, dt);
+            }
                                
             py::buffer_info buf = temp.request();
             return vector_to_numpy(temp_vec, {buf.shape[0], buf.shape[1]});
+        })
+        // Giải dải [start_row, end_row] từ temp vào các hàng tương ứng của out,
+        // không sao chép và không giữ GIL, để nhiều luồng giải các dải song song
+        .def("solve_subdomain_into", [](const SolverType& solver,
+                                        py::array_t<Real, py::array::c_style> temp,
+                                        py::array_t<Real, py::array::c_style> windX,
+                                        py::array_t<Real, py::array::c_style> windY,
+                                        py::array_t<Real, py::array::c_style> out,
+                                        int startRow, int endRow, Real dt) {
+            const ssize_t size = static_cast<ssize_t>(solver.getWidth()) * solver.getHeight();
+            if (temp.size() != size || windX.size() != size || windY.size() != size || out.size() != size) {
+                throw py::value_error("solve_subdomain_into: temp, wind_x, wind_y, out phải có width*height phần tử");
+            }
+            const Real* tempPtr = temp.data();
+            const Real* windXPtr = windX.data();
+            const Real* windYPtr = windY.data();
+            Real* outPtr = out.mutable_data();
+            bool ok;
+            {
+                py::gil_scoped_release release;
+                ok = solver.solveSubdomain(tempPtr, windXPtr, windYPtr, outPtr, startRow, endRow, dt);
+            }
+            if (!ok) {
+                throw py::value_error("solve_subdomain_into: phạm vi hàng không hợp lệ");
+            }
+        }, py::arg("temp"), py::arg("wind_x"), py::arg("wind_y"), py::arg("out").noconvert(),
+           py::arg("start_row"), py::arg("end_row"), py::arg("dt"))
+        // Thống kê của bước giải gần nhất, None nếu chưa giải bước nào
+        .def("last_stats", [](const SolverType& solver) -> py::object {
+            const SolverBase::FieldStats& stats = solver.getLastStats();
+            if (stats.count == 0) {
+                return py::none();
+            }
+            const double mean = stats.sum / stats.count;
+            const double variance = std::max(0.0, stats.sumSquares / stats.count - mean * mean);
+            py::dict result;
+            result["min"] = stats.min;
+            result["max"] = stats.max;
+            result["mean"] = mean;
+            result["std"] = std::sqrt(variance);
+            result["sum"] = stats.sum;
+            result["sum_sq"] = stats.sumSquares;
+            result["count"] = stats.count;
+            return result;
         });
+}
 
-    // Expose WindField class
-    py::class_<WindField>(m, "WindField")
+// Bọc WindField cho một kiểu số thực Real
+template <typename Real>
+void bind_wind_field(py::module& m, const char* name) {
+    typedef WindFieldT<Real> WindFieldType;
+
+    py::class_<WindFieldType>(m, name)
         .def(py::init<int, int>())
-        .def("generate_gaussian_field", &WindField::generateGaussianField)
-        .def("generate_perlin_field", &WindField::generatePerlinField)
-        .def("generate_vortex_field", &WindField::generateVortexField)
-        .def("get_wind_x", [](const WindField& wf) {
+        // Seed cố định cho bộ sinh số ngẫu nhiên của xoáy, để tái lập lần chạy
+        .def(py::init<int, int, std::uint32_t>(), py::arg("width"), py::arg("height"), py::arg("seed"))
+        .def("seed", &WindFieldType::seed, py::arg("seed"))
+        .def("generate_gaussian_field", &WindFieldType::generateGaussianField)
+        .def("set_evolution", &WindFieldType::setEvolution, py::arg("drift_speed"), py::arg("lifetime"))
+        .def("evolve", &WindFieldType::evolve, py::arg("dt"))
+        .def("get_vortex_count", &WindFieldType::getVortexCount)
+        .def("generate_perlin_field", &WindFieldType::generatePerlinField)
+        .def("generate_vortex_field", &WindFieldType::generateVortexField)
+        .def("get_wind_x", [](const WindFieldType& wf) {
             return vector_to_numpy(wf.getWindX(), {static_cast<ssize_t>(wf.getWindX().size())});
         })
-        .def("get_wind_y", [](const WindField& wf) {
+        .def("get_wind_y", [](const WindFieldType& wf) {
             return vector_to_numpy(wf.getWindY(), {static_cast<ssize_t>(wf.getWindY().size())});
-        });
+        })
+        // View chỉ đọc, không sao chép; phản ánh các lần generate_* sau đó
+        .def("get_wind_x_view", [](py::object self) {
+            const auto& wf = self.cast<const WindFieldType&>();
+            return vector_view(wf.getWindX(), {static_cast<ssize_t>(wf.getWindX().size())}, self);
+        })
+        .def("get_wind_y_view", [](py::object self) {
+            const auto& wf = self.cast<const WindFieldType&>();
+            return vector_view(wf.getWindY(), {static_cast<ssize_t>(wf.getWindY().size())}, self);
+        })
+        // Toàn bộ trạng thái (gió, xoáy, tham số tiến hóa, bộ sinh số ngẫu nhiên) cho checkpoint
+        .def("get_state", [](const WindFieldType& wf) {
+            std::vector<Real> vortices = wf.getVortexState();
+            py::dict state;
+            state["wind_x"] = vector_to_numpy(wf.getWindX(), {static_cast<ssize_t>(wf.getWindX().size())});
+            state["wind_y"] = vector_to_numpy(wf.getWindY(), {static_cast<ssize_t>(wf.getWindY().size())});
+            state["vortices"] = vector_to_numpy(vortices, {static_cast<ssize_t>(vortices.size() / 7), 7});
+            std::vector<Real> evolution = wf.getEvolutionState();
+            state["evolution"] = vector_to_numpy(evolution, {static_cast<ssize_t>(evolution.size())});
+            state["rng"] = wf.getRngState();
+            return state;
+        })
+        .def("set_state", [](WindFieldType& wf, py::dict state) {
+            if (!wf.setWind(numpy_to_vector(state["wind_x"].cast<py::array_t<Real>>()),
+                            numpy_to_vector(state["wind_y"].cast<py::array_t<Real>>()))) {
+                throw py::value_error("set_state: wind_x, wind_y phải có width*height phần tử");
+            }
+            if (!wf.setVortexState(numpy_to_vector(state["vortices"].cast<py::array_t<Real>>()))) {
+                throw py::value_error("set_state: vortices phải có 7 cột");
+            }
+            if (!wf.setEvolutionState(numpy_to_vector(state["evolution"].cast<py::array_t<Real>>()))) {
+                throw py::value_error("set_state: evolution phải có 4 phần tử");
+            }
+            if (!wf.setRngState(state["rng"].cast<std::string>())) {
+                throw py::value_error("set_state: trạng thái rng không hợp lệ");
+            }
+        }, py::arg("state"));
+}
 
-    // Expose TemperatureField class
-    py::enum_<TemperatureField::GradientDirection>(m, "GradientDirection")
-        .value("NORTH_SOUTH", TemperatureField::NORTH_SOUTH)
-        .value("SOUTH_NORTH", TemperatureField::SOUTH_NORTH)
-        .value("EAST_WEST", TemperatureField::EAST_WEST)
-        .value("WEST_EAST", TemperatureField::WEST_EAST)
-        .value("RADIAL_IN", TemperatureField::RADIAL_IN)
-        .value("RADIAL_OUT", TemperatureField::RADIAL_OUT)
-        .export_values();
+// Bọc TemperatureField cho một kiểu số thực Real
+template <typename Real>
+void bind_temperature_field(py::module& m, const char* name) {
+    typedef TemperatureFieldT<Real> TemperatureFieldType;
 
-    py::class_<TemperatureField>(m, "TemperatureField")
+    py::class_<TemperatureFieldType>(m, name)
         .def(py::init<int, int>())
-        .def("set_uniform", &TemperatureField::setUniform)
-        .def("set_gradient", &TemperatureField::setGradient)
-        .def("set_custom_gradient", &TemperatureField::setCustomGradient)
-        .def("add_heat_source", &TemperatureField::addHeatSource)
-        .def("get_temperature", [](const TemperatureField& tf) {
+        .def("set_uniform", &TemperatureFieldType::setUniform)
+        .def("set_gradient", &TemperatureFieldType::setGradient)
+        .def("set_custom_gradient", &TemperatureFieldType::setCustomGradient)
+        .def("add_heat_source", &TemperatureFieldType::addHeatSource)
+        .def("add_heat_sources", [](TemperatureFieldType& tf, py::array_t<Real> xs, py::array_t<Real> ys,
+                                  py::array_t<Real> strengths, py::array_t<Real> radii) {
+            if (!tf.addHeatSources(numpy_to_vector(xs), numpy_to_vector(ys),
+                                   numpy_to_vector(strengths), numpy_to_vector(radii))) {
+                throw py::value_error("add_heat_sources: xs, ys, strengths, radii phải cùng kích thước");
+            }
+        }, py::arg("xs"), py::arg("ys"), py::arg("strengths"), py::arg("radii"))
+        .def("get_temperature", [](const TemperatureFieldType& tf) {
             const auto& temp = tf.getTemperature();
             return vector_to_numpy(temp, {static_cast<ssize_t>(tf.getHeight()), 
                                           static_cast<ssize_t>(tf.getWidth())});
         })
-        .def("set_temperature", [](TemperatureField& tf, py::array_t<double> temp) {
+        // View chỉ đọc (H, W), không sao chép; phản ánh các lần cập nhật sau đó
+        .def("get_temperature_view", [](py::object self) {
+            const auto& tf = self.cast<const TemperatureFieldType&>();
+            return vector_view(tf.getTemperature(), {static_cast<ssize_t>(tf.getHeight()),
+                                                     static_cast<ssize_t>(tf.getWidth())}, self);
+        })
+        .def("set_temperature", [](TemperatureFieldType& tf, py::array_t<Real> temp) {
             return tf.setTemperature(numpy_to_vector(temp));
         })
-        .def("get_value_at", &TemperatureField::getValueAt)
-        .def("get_width", &TemperatureField::getWidth)
-        .def("get_height", &TemperatureField::getHeight);
+        .def("get_value_at", &TemperatureFieldType::getValueAt)
+        .def("get_width", &TemperatureFieldType::getWidth)
+        .def("get_height", &TemperatureFieldType::getHeight);
+}
+
+PYBIND11_MODULE(cpp_weather, m) {
+    m.doc() = "C++ backend for the BirdSimulations weather model";
+
+    // Expose Solver class (float64) và Solver32 (float32), dùng chung enum Scheme
+    py::class_<Solver> solver(m, "Solver");
+    py::class_<Solver32> solver32(m, "Solver32");
+
+    py::enum_<SolverBase::Scheme>(solver, "Scheme")
+        .value("EXPLICIT_RK4", SolverBase::EXPLICIT_RK4)
+        .value("IMEX", SolverBase::IMEX)
+        .value("SEMI_LAGRANGIAN", SolverBase::SEMI_LAGRANGIAN)
+        .export_values();
+    solver32.attr("Scheme") = solver.attr("Scheme");
+
+    bind_solver(solver);
+    bind_solver(solver32);
+
+    // Expose WindField class
+    bind_wind_field<double>(m, "WindField");
+    bind_wind_field<float>(m, "WindField32");
+
+    // Expose TemperatureField class
+    py::enum_<TemperatureFieldBase::GradientDirection>(m, "GradientDirection")
+        .value("NORTH_SOUTH", TemperatureFieldBase::NORTH_SOUTH)
+        .value("SOUTH_NORTH", TemperatureFieldBase::SOUTH_NORTH)
+        .value("EAST_WEST", TemperatureFieldBase::EAST_WEST)
+        .value("WEST_EAST", TemperatureFieldBase::WEST_EAST)
+        .value("RADIAL_IN", TemperatureFieldBase::RADIAL_IN)
+        .value("RADIAL_OUT", TemperatureFieldBase::RADIAL_OUT)
+        .export_values();
+
+    bind_temperature_field<double>(m, "TemperatureField");
+    bind_temperature_field<float>(m, "TemperatureField32");
 }
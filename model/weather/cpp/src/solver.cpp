@@ -6,43 +6,123 @@
 #include "../include/solver.h"
 #include <iostream>
 
-Solver::Solver(int width, int height, double dx, double kappa, bool parallel)
-    : width_(width), height_(height), spacing_(dx), kappa_(kappa), parallel_(parallel) {}
+template <typename Real>
+SolverT<Real>::SolverT(int width, int height, Real dx, Real kappa, bool parallel)
+    : width_(width), height_(height), spacing_(dx), kappa_(kappa), parallel_(parallel),
+      scheme_(EXPLICIT_RK4), macCormack_(false), nextEmitterId_(0) {}
 
+template <typename Real>
+int SolverT<Real>::addHeatEmitter(Real x, Real y, Real rate, Real radius) {
+    HeatEmitter emitter;
+    emitter.id = nextEmitterId_++;
+    emitter.x = x;
+    emitter.y = y;
+    emitter.rate = rate;
+    emitter.radius = radius;
+    emitters_.push_back(emitter);
+    rebuildSourceTerm();
+    return emitter.id;
+}
+
+template <typename Real>
+bool SolverT<Real>::moveHeatEmitter(int id, Real x, Real y) {
+    for (size_t i = 0; i < emitters_.size(); ++i) {
+        if (emitters_[i].id == id) {
+            emitters_[i].x = x;
+            emitters_[i].y = y;
+            rebuildSourceTerm();
+            return true;
+        }
+    }
+    return false;
+}
+
+template <typename Real>
+bool SolverT<Real>::removeHeatEmitter(int id) {
+    for (size_t i = 0; i < emitters_.size(); ++i) {
+        if (emitters_[i].id == id) {
+            emitters_.erase(emitters_.begin() + i);
+            rebuildSourceTerm();
+            return true;
+        }
+    }
+    return false;
+}
+
+template <typename Real>
+void SolverT<Real>::clearHeatEmitters() {
+    emitters_.clear();
+    sourceTerm_.clear();
+}
+
+template <typename Real>
+void SolverT<Real>::setSourceTerm(const std::vector<Real>& source) {
+    if (!source.empty() && source.size() != static_cast<size_t>(width_ * height_)) {
+        throw std::invalid_argument("Solver::setSourceTerm - Kích thước số hạng nguồn không khớp lưới");
+    }
+    sourceTerm_ = source;
+}
 
-double Solver::computeCFLTimeStep(const std::vector<double>& windX, const std::vector<double>& windY) {
+template <typename Real>
+void SolverT<Real>::rebuildSourceTerm() {
+    if (emitters_.empty()) {
+        sourceTerm_.clear();
+        return;
+    }
+    sourceTerm_.assign(width_ * height_, Real(0.0));
+    for (size_t i = 0; i < emitters_.size(); ++i) {
+        const HeatEmitter& emitter = emitters_[i];
+        TemperatureFieldT<Real>::addGaussian(sourceTerm_, width_, height_,
+                                             emitter.x, emitter.y, emitter.rate, emitter.radius);
+    }
+}
+
+
+template <typename Real>
+Real SolverT<Real>::computeCFLTimeStep(const std::vector<Real>& windX, const std::vector<Real>& windY) {
     // Tìm vận tốc lớn nhất trong trường gió
-    double maxVelocity = 0.0;
+    Real maxVelocity = Real(0.0);
     
-    #pragma omp parallel for reduction(max:maxVelocity)
+    #pragma omp parallel for if(parallel_) reduction(max:maxVelocity)
     for (size_t i = 0; i < windX.size(); ++i) {
-        double velocity = std::sqrt(windX[i] * windX[i] + windY[i] * windY[i]);
+        Real velocity = std::sqrt(windX[i] * windX[i] + windY[i] * windY[i]);
         maxVelocity = std::max(maxVelocity, velocity);
     }
     
     // Tránh chia cho 0
-    if (maxVelocity < 1e-10) {
-        maxVelocity = 1e-10;
+    if (maxVelocity < Real(1e-10)) {
+        maxVelocity = Real(1e-10);
     }
 
     // Điều kiện CFL: dt <= dx / max_velocity
     // Thêm hệ số an toàn 0.8
-    double dt_advection = 0.8 * spacing_ / maxVelocity;
+    Real dt_advection = Real(0.8) * spacing_ / maxVelocity;
+    
+    // Khuếch tán ẩn ổn định vô điều kiện: chỉ còn giới hạn đối lưu
+    if (scheme_ == IMEX) {
+        return dt_advection;
+    }
+    
+    // Bán Lagrange ổn định với mọi dt, chỉ giới hạn độ dài truy vết
+    if (scheme_ == SEMI_LAGRANGIAN) {
+        return static_cast<Real>(SEMI_LAGRANGIAN_COURANT) * spacing_ / maxVelocity;
+    }
     
     // Điều kiện ổn định cho phương trình khuếch tán: dt <= dx^2 / (2*kappa)
-    double dt_diffusion = 0.8 * spacing_ * spacing_ / (2.0 * kappa_);
+    Real dt_diffusion = Real(0.8) * spacing_ * spacing_ / (Real(2.0) * kappa_);
     
     // Trả về bước thời gian nhỏ hơn (giới hạn chặt chẽ hơn)
     return std::min(dt_advection, dt_diffusion);
 }
 
-void Solver::computeGradients(const std::vector<double>& temperature,
-                           std::vector<double>& gradX,
-                           std::vector<double>& gradY) {
-    gradX.resize(width_ * height_, 0.0);
-    gradY.resize(width_ * height_, 0.0);
+template <typename Real>
+void SolverT<Real>::computeGradients(const std::vector<Real>& temperature,
+                           std::vector<Real>& gradX,
+                           std::vector<Real>& gradY) {
+    gradX.resize(width_ * height_, Real(0.0));
+    gradY.resize(width_ * height_, Real(0.0));
     
-    #pragma omp parallel for collapse(2)
+    #pragma omp parallel for collapse(2) if(parallel_)
     for (int y = 0; y < height_; ++y) {
         for (int x = 0; x < width_; ++x) {
             int idx = y * width_ + x;
@@ -50,16 +130,17 @@ void Solver::computeGradients(const std::vector<double>& temperature,
             int xm1 = (x - 1 + width_) % width_;
             int yp1 = (y + 1) % height_;
             int ym1 = (y - 1 + height_) % height_;
-            gradX[idx] = (temperature[y * width_ + xp1] - temperature[y * width_ + xm1]) / (2.0 * spacing_);
-            gradY[idx] = (temperature[yp1 * width_ + x] - temperature[ym1 * width_ + x]) / (2.0 * spacing_);
+            gradX[idx] = (temperature[y * width_ + xp1] - temperature[y * width_ + xm1]) / (Real(2.0) * spacing_);
+            gradY[idx] = (temperature[yp1 * width_ + x] - temperature[ym1 * width_ + x]) / (Real(2.0) * spacing_);
         }
     }
 }
 
-void Solver::computeLaplacian(const std::vector<double>& temperature,
-                           std::vector<double>& laplacian) {
-    laplacian.resize(width_ * height_, 0.0);
-    #pragma omp parallel for collapse(2)
+template <typename Real>
+void SolverT<Real>::computeLaplacian(const std::vector<Real>& temperature,
+                           std::vector<Real>& laplacian) {
+    laplacian.resize(width_ * height_, Real(0.0));
+    #pragma omp parallel for collapse(2) if(parallel_)
     for (int y = 0; y < height_; ++y) {
         for (int x = 0; x < width_; ++x) {
             int idx = y * width_ + x;
@@ -72,130 +153,455 @@ void Solver::computeLaplacian(const std::vector<double>& temperature,
                 temperature[y * width_ + xm1] +
                 temperature[yp1 * width_ + x] +
                 temperature[ym1 * width_ + x] -
-                4.0 * temperature[idx]
+                Real(4.0) * temperature[idx]
             ) / (spacing_ * spacing_);
         }
     }
 }
 
-void Solver::evaluateTimeDerivative(const std::vector<double>& temperature,
-                                 const std::vector<double>& windX,
-                                 const std::vector<double>& windY,
-                                 std::vector<double>& result) {
+template <typename Real>
+void SolverT<Real>::evaluateTimeDerivative(const std::vector<Real>& temperature,
+                                 const std::vector<Real>& windX,
+                                 const std::vector<Real>& windY,
+                                 std::vector<Real>& result,
+                                 bool includeDiffusion) {
     // Cấp phát bộ nhớ cho kết quả
-    result.resize(width_ * height_, 0.0);
+    result.resize(width_ * height_, Real(0.0));
     
     // Tính toán gradient và Laplacian
-    std::vector<double> gradX, gradY, laplacian;
+    std::vector<Real> gradX, gradY, laplacian;
     computeGradients(temperature, gradX, gradY);
-    computeLaplacian(temperature, laplacian);
+    if (includeDiffusion) {
+        computeLaplacian(temperature, laplacian);
+    }
     
-    // Tính toán đạo hàm thời gian: dT/dt = -u*dT/dx - v*dT/dy + kappa*∇²T
-    #pragma omp parallel for collapse(2)
+    // Tính toán đạo hàm thời gian: dT/dt = -u*dT/dx - v*dT/dy + kappa*∇²T + S
+    const bool hasSource = !sourceTerm_.empty();
+    #pragma omp parallel for collapse(2) if(parallel_)
     for (int y = 0; y < height_; ++y) {
         for (int x = 0; x < width_; ++x) {
             int idx = y * width_ + x;
             
             // Đối lưu: -u*dT/dx - v*dT/dy
-            double advection = -windX[idx] * gradX[idx] - windY[idx] * gradY[idx];
+            Real advection = -windX[idx] * gradX[idx] - windY[idx] * gradY[idx];
             
-            // Khuếch tán: kappa*∇²T
-            double diffusion = kappa_ * laplacian[idx];
+            // Khuếch tán: kappa*∇²T (bỏ qua khi khuếch tán được giải ẩn)
+            Real diffusion = includeDiffusion ? kappa_ * laplacian[idx] : Real(0.0);
+            
+            // Nguồn nhiệt duy trì S
+            Real source = hasSource ? sourceTerm_[idx] : Real(0.0);
             
             // Đạo hàm thời gian tổng hợp
-            result[idx] = advection + diffusion;
+            result[idx] = advection + diffusion + source;
         }
     }
 }
 
-void Solver::solveRK4Step(std::vector<double>& temperature, 
-                       const std::vector<double>& windX, 
-                       const std::vector<double>& windY, 
-                       double dt) {
+template <typename Real>
+void SolverT<Real>::solveRK4Step(std::vector<Real>& temperature, 
+                       const std::vector<Real>& windX, 
+                       const std::vector<Real>& windY, 
+                       Real dt) {
+    advanceRK4(temperature, windX, windY, dt, true);
+}
+
+template <typename Real>
+void SolverT<Real>::advanceRK4(std::vector<Real>& temperature,
+                        const std::vector<Real>& windX,
+                        const std::vector<Real>& windY,
+                        Real dt, bool includeDiffusion) {
     size_t n = temperature.size();
-    std::vector<double> k1(n), k2(n), k3(n), k4(n);
-    std::vector<double> temp(n);
+    std::vector<Real> k1(n), k2(n), k3(n), k4(n);
+    std::vector<Real> temp(n);
     
     // Bước 1: k1 = f(T_n)
-    evaluateTimeDerivative(temperature, windX, windY, k1);
+    evaluateTimeDerivative(temperature, windX, windY, k1, includeDiffusion);
     
     // Bước 2: k2 = f(T_n + dt/2 * k1)
-    #pragma omp parallel for
+    #pragma omp parallel for if(parallel_)
     for (size_t i = 0; i < n; ++i) {
-        temp[i] = temperature[i] + dt * 0.5 * k1[i];
+        temp[i] = temperature[i] + dt * Real(0.5) * k1[i];
     }
-    evaluateTimeDerivative(temp, windX, windY, k2);
+    evaluateTimeDerivative(temp, windX, windY, k2, includeDiffusion);
     
     // Bước 3: k3 = f(T_n + dt/2 * k2)
-    #pragma omp parallel for
+    #pragma omp parallel for if(parallel_)
     for (size_t i = 0; i < n; ++i) {
-        temp[i] = temperature[i] + dt * 0.5 * k2[i];
+        temp[i] = temperature[i] + dt * Real(0.5) * k2[i];
     }
-    evaluateTimeDerivative(temp, windX, windY, k3);
+    evaluateTimeDerivative(temp, windX, windY, k3, includeDiffusion);
     
     // Bước 4: k4 = f(T_n + dt * k3)
-    #pragma omp parallel for
+    #pragma omp parallel for if(parallel_)
     for (size_t i = 0; i < n; ++i) {
         temp[i] = temperature[i] + dt * k3[i];
     }
-    evaluateTimeDerivative(temp, windX, windY, k4);
+    evaluateTimeDerivative(temp, windX, windY, k4, includeDiffusion);
     
-    // Cập nhật: T_{n+1} = T_n + dt/6 * (k1 + 2*k2 + 2*k3 + k4)
-    #pragma omp parallel for
+    // Cập nhật: T_{n+1} = T_n + dt/6 * (k1 + 2*k2 + 2*k3 + k4),
+    // đồng thời tính thống kê của trường mới trong cùng vòng lặp
+    double minValue = std::numeric_limits<double>::max();
+    double maxValue = std::numeric_limits<double>::lowest();
+    double sum = 0.0;
+    double sumSquares = 0.0;
+    #pragma omp parallel for if(parallel_) reduction(min:minValue) reduction(max:maxValue) reduction(+:sum, sumSquares)
     for (size_t i = 0; i < n; ++i) {
-        temperature[i] += dt / 6.0 * (k1[i] + 2.0 * k2[i] + 2.0 * k3[i] + k4[i]);
+        const Real value = temperature[i] + dt / Real(6.0) * (k1[i] + Real(2.0) * k2[i] + Real(2.0) * k3[i] + k4[i]);
+        temperature[i] = value;
+        minValue = std::min(minValue, static_cast<double>(value));
+        maxValue = std::max(maxValue, static_cast<double>(value));
+        sum += value;
+        sumSquares += static_cast<double>(value) * value;
     }
+    storeStats(minValue, maxValue, sum, sumSquares, n);
 }
 
-void Solver::solveSubdomain(std::vector<double>& temperature, 
-                         const std::vector<double>& windX, 
-                         const std::vector<double>& windY, 
-                         int startRow, int endRow, double dt) {
-    // Kiểm tra tham số đầu vào
-    if (startRow < 0 || endRow >= height_ || startRow > endRow) {
-        std::cerr << "Invalid subdomain range: [" << startRow << ", " << endRow << "]" << std::endl;
-        return;
+template <typename Real>
+void SolverT<Real>::storeStats(double minValue, double maxValue, double sum, double sumSquares, size_t count) {
+    lastStats_.min = minValue;
+    lastStats_.max = maxValue;
+    lastStats_.sum = sum;
+    lastStats_.sumSquares = sumSquares;
+    lastStats_.count = count;
+}
+
+template <typename Real>
+void SolverT<Real>::computeStats(const std::vector<Real>& temperature) {
+    const int n = static_cast<int>(temperature.size());
+    double minValue = std::numeric_limits<double>::max();
+    double maxValue = std::numeric_limits<double>::lowest();
+    double sum = 0.0;
+    double sumSquares = 0.0;
+    #pragma omp parallel for if(parallel_) reduction(min:minValue) reduction(max:maxValue) reduction(+:sum, sumSquares)
+    for (int i = 0; i < n; ++i) {
+        const double value = temperature[i];
+        minValue = std::min(minValue, value);
+        maxValue = std::max(maxValue, value);
+        sum += value;
+        sumSquares += value * value;
+    }
+    storeStats(minValue, maxValue, sum, sumSquares, temperature.size());
+}
+
+template <typename Real>
+void SolverT<Real>::solveStep(std::vector<Real>& temperature,
+                       const std::vector<Real>& windX,
+                       const std::vector<Real>& windY,
+                       Real dt) {
+    switch (scheme_) {
+        case IMEX:
+            solveIMEXStep(temperature, windX, windY, dt);
+            break;
+        case SEMI_LAGRANGIAN:
+            solveSemiLagrangianStep(temperature, windX, windY, dt);
+            break;
+        case EXPLICIT_RK4:
+        default:
+            solveRK4Step(temperature, windX, windY, dt);
+            break;
     }
+}
+
+template <typename Real>
+void SolverT<Real>::solveIMEXStep(std::vector<Real>& temperature,
+                           const std::vector<Real>& windX,
+                           const std::vector<Real>& windY,
+                           Real dt) {
+    // Tách Strang để giữ độ chính xác bậc 2: D(dt/2) -> A(dt) -> D(dt/2)
+    applyImplicitDiffusion(temperature, Real(0.5) * dt);
+    advanceRK4(temperature, windX, windY, dt, false);
+    applyImplicitDiffusion(temperature, Real(0.5) * dt);
+}
+
+template <typename Real>
+void SolverT<Real>::solveSemiLagrangianStep(std::vector<Real>& temperature,
+                                     const std::vector<Real>& windX,
+                                     const std::vector<Real>& windY,
+                                     Real dt) {
+    applyImplicitDiffusion(temperature, Real(0.5) * dt);
     
-    // Sao chép phần địa phương của vùng và thêm ghost cells
-    int subHeight = endRow - startRow + 1;
-    int subSize = subHeight * width_;
-    std::vector<double> subTemp(subSize);
+    if (!macCormack_) {
+        advectSemiLagrangian(temperature, windX, windY, dt, slForward_);
+        temperature.swap(slForward_);
+    } else {
+        // MacCormack: T^ = SL(T, dt), T~ = SL(T^, -dt), T = T^ + (T - T~) / 2
+        advectSemiLagrangian(temperature, windX, windY, dt, slForward_, &slMin_, &slMax_);
+        advectSemiLagrangian(slForward_, windX, windY, -dt, slBackward_);
+        
+        const int n = static_cast<int>(temperature.size());
+        #pragma omp parallel for if(parallel_)
+        for (int i = 0; i < n; ++i) {
+            Real corrected = slForward_[i] + Real(0.5) * (temperature[i] - slBackward_[i]);
+            // Giới hạn về khoảng giá trị tại điểm khởi hành để tránh dao động
+            temperature[i] = std::min(slMax_[i], std::max(slMin_[i], corrected));
+        }
+    }
     
-    // Sao chép dữ liệu từ vùng lớn
-    for (int y = startRow; y <= endRow; ++y) {
-        for (int x = 0; x < width_; ++x) {
-            int srcIdx = y * width_ + x;
-            int dstIdx = (y - startRow) * width_ + x;
-            subTemp[dstIdx] = temperature[srcIdx];
+    // Nguồn nhiệt duy trì: tích phân Euler trong bước đối lưu
+    if (!sourceTerm_.empty()) {
+        const int n = static_cast<int>(temperature.size());
+        #pragma omp parallel for if(parallel_)
+        for (int i = 0; i < n; ++i) {
+            temperature[i] += dt * sourceTerm_[i];
         }
     }
     
-    // Tạo các trường gió con
-    std::vector<double> subWindX(subSize);
-    std::vector<double> subWindY(subSize);
+    applyImplicitDiffusion(temperature, Real(0.5) * dt);
+}
+
+template <typename Real>
+Real SolverT<Real>::sampleBilinear(const std::vector<Real>& field, Real gx, Real gy,
+                              Real* low, Real* high) const {
+    Real fx = std::floor(gx);
+    Real fy = std::floor(gy);
+    Real tx = gx - fx;
+    Real ty = gy - fy;
+    
+    // Wrap tuần hoàn, kể cả khi điểm khởi hành cách xa nhiều chu kỳ
+    int x0 = static_cast<int>(std::fmod(fx, static_cast<Real>(width_)));
+    int y0 = static_cast<int>(std::fmod(fy, static_cast<Real>(height_)));
+    if (x0 < 0) x0 += width_;
+    if (y0 < 0) y0 += height_;
+    int x1 = (x0 + 1) % width_;
+    int y1 = (y0 + 1) % height_;
+    
+    Real v00 = field[y0 * width_ + x0];
+    Real v10 = field[y0 * width_ + x1];
+    Real v01 = field[y1 * width_ + x0];
+    Real v11 = field[y1 * width_ + x1];
+    
+    if (low) *low = std::min(std::min(v00, v10), std::min(v01, v11));
+    if (high) *high = std::max(std::max(v00, v10), std::max(v01, v11));
     
-    for (int y = startRow; y <= endRow; ++y) {
+    return (Real(1.0) - ty) * ((Real(1.0) - tx) * v00 + tx * v10) +
+           ty * ((Real(1.0) - tx) * v01 + tx * v11);
+}
+
+template <typename Real>
+void SolverT<Real>::advectSemiLagrangian(const std::vector<Real>& source,
+                                  const std::vector<Real>& windX,
+                                  const std::vector<Real>& windY,
+                                  Real dt, std::vector<Real>& result,
+                                  std::vector<Real>* low,
+                                  std::vector<Real>* high) {
+    result.resize(source.size());
+    if (low) low->resize(source.size());
+    if (high) high->resize(source.size());
+    
+    // Quãng đường truy vết theo đơn vị ô lưới
+    const Real courant = dt / spacing_;
+    
+    #pragma omp parallel for collapse(2) if(parallel_)
+    for (int y = 0; y < height_; ++y) {
         for (int x = 0; x < width_; ++x) {
-            int srcIdx = y * width_ + x;
-            int dstIdx = (y - startRow) * width_ + x;
-            subWindX[dstIdx] = windX[srcIdx];
-            subWindY[dstIdx] = windY[srcIdx];
+            int idx = y * width_ + x;
+            
+            // Truy vết ngược bằng phương pháp điểm giữa
+            Real midX = x - Real(0.5) * courant * windX[idx];
+            Real midY = y - Real(0.5) * courant * windY[idx];
+            Real departX = x - courant * sampleBilinear(windX, midX, midY);
+            Real departY = y - courant * sampleBilinear(windY, midX, midY);
+            
+            result[idx] = sampleBilinear(source, departX, departY,
+                                         low ? &(*low)[idx] : nullptr,
+                                         high ? &(*high)[idx] : nullptr);
         }
     }
+}
+
+template <typename Real>
+void SolverT<Real>::prepareTridiagonal(PeriodicTridiagonal& system, int n, Real r) {
+    if (system.n == n && system.r == r) {
+        return;  // Phân rã cũ vẫn dùng được
+    }
     
-    // Tạo solver con với kích thước phù hợp
-    Solver subSolver(width_, subHeight, spacing_, kappa_);
+    system.n = n;
+    system.r = r;
+    system.offDiag = -Real(0.5) * r;
+    if (n < 3) {
+        return;  // n = 1, 2 được giải trực tiếp trong solveTridiagonal
+    }
     
-    // Giải phương trình trên miền con
-    subSolver.solveRK4Step(subTemp, subWindX, subWindY, dt);
+    const Real a = system.offDiag;
+    const Real b = Real(1.0) + r;
+    
+    // Sherman-Morrison: A = T + u v^T, với u = (gamma, 0, ..., 0, a),
+    // v = (1, 0, ..., 0, a/gamma). T là ma trận ba đường chéo không tuần hoàn.
+    system.gamma = -b;
+    system.cPrime.assign(n, Real(0.0));
+    system.inverseDenominator.assign(n, Real(0.0));
+    system.z.assign(n, Real(0.0));
+    
+    // Phân rã Thomas của T (đường chéo chỉ khác b ở hai đầu)
+    for (int i = 0; i < n; ++i) {
+        Real diag = b;
+        if (i == 0) diag = b - system.gamma;
+        if (i == n - 1) diag = b - a * a / system.gamma;
+        Real denom = (i == 0) ? diag : diag - a * system.cPrime[i - 1];
+        system.inverseDenominator[i] = Real(1.0) / denom;
+        system.cPrime[i] = a * system.inverseDenominator[i];
+    }
+    
+    // Giải T z = u một lần, vì u không phụ thuộc vế phải
+    system.z[0] = system.gamma;
+    system.z[n - 1] = a;
+    system.correction = Real(0.0);
+    solveTridiagonal(system, system.z.data());
+    system.correction = Real(1.0) / (Real(1.0) + system.z[0] + a * system.z[n - 1] / system.gamma);
+}
+
+template <typename Real>
+void SolverT<Real>::solveTridiagonal(const PeriodicTridiagonal& system, Real* x) const {
+    const int n = system.n;
+    const Real a = system.offDiag;
+    
+    if (n == 1) {
+        return;  // δ²T = 0 trên lưới một ô
+    }
+    if (n == 2) {
+        // Hai láng giềng tuần hoàn trùng nhau: [[b, 2a], [2a, b]]
+        const Real b = Real(1.0) + system.r;
+        const Real det = b * b - Real(4.0) * a * a;
+        const Real x0 = (b * x[0] - Real(2.0) * a * x[1]) / det;
+        const Real x1 = (b * x[1] - Real(2.0) * a * x[0]) / det;
+        x[0] = x0;
+        x[1] = x1;
+        return;
+    }
+    
+    // Thuật toán Thomas với phân rã đã tính sẵn
+    x[0] *= system.inverseDenominator[0];
+    for (int i = 1; i < n; ++i) {
+        x[i] = (x[i] - a * x[i - 1]) * system.inverseDenominator[i];
+    }
+    for (int i = n - 2; i >= 0; --i) {
+        x[i] -= system.cPrime[i] * x[i + 1];
+    }
+    
+    // Hiệu chỉnh Sherman-Morrison cho phần tử góc tuần hoàn
+    if (system.correction != Real(0.0)) {
+        const Real factor = (x[0] + a * x[n - 1] / system.gamma) * system.correction;
+        for (int i = 0; i < n; ++i) {
+            x[i] -= factor * system.z[i];
+        }
+    }
+}
+
+template <typename Real>
+void SolverT<Real>::applyImplicitDiffusion(std::vector<Real>& temperature, Real dt) {
+    const Real r = kappa_ * dt / (spacing_ * spacing_);
+    if (r <= Real(0.0)) {
+        // Không khuếch tán: trường không đổi nhưng vẫn giữ thống kê đúng
+        computeStats(temperature);
+        return;
+    }
     
-    // Sao chép kết quả trở lại trường lớn
-    for (int y = startRow; y <= endRow; ++y) {
+    prepareTridiagonal(adiX_, width_, r);
+    prepareTridiagonal(adiY_, height_, r);
+    adiBuffer_.resize(temperature.size());
+    
+    // Nửa bước 1: (I - r/2 δx²) T* = (I + r/2 δy²) T^n
+    #pragma omp parallel for if(parallel_)
+    for (int y = 0; y < height_; ++y) {
+        int yp1 = (y + 1) % height_;
+        int ym1 = (y - 1 + height_) % height_;
+        Real* row = &adiBuffer_[y * width_];
         for (int x = 0; x < width_; ++x) {
-            int dstIdx = y * width_ + x;
-            int srcIdx = (y - startRow) * width_ + x;
-            temperature[dstIdx] = subTemp[srcIdx];
+            row[x] = (Real(1.0) - r) * temperature[y * width_ + x] +
+                     Real(0.5) * r * (temperature[yp1 * width_ + x] + temperature[ym1 * width_ + x]);
+        }
+        solveTridiagonal(adiX_, row);
+    }
+    
+    // Nửa bước 2: (I - r/2 δy²) T^{n+1} = (I + r/2 δx²) T*,
+    // thống kê của trường mới được tính khi ghi từng cột
+    double minValue = std::numeric_limits<double>::max();
+    double maxValue = std::numeric_limits<double>::lowest();
+    double sum = 0.0;
+    double sumSquares = 0.0;
+    #pragma omp parallel if(parallel_)
+    {
+        std::vector<Real> column(height_);
+        #pragma omp for reduction(min:minValue) reduction(max:maxValue) reduction(+:sum, sumSquares)
+        for (int x = 0; x < width_; ++x) {
+            int xp1 = (x + 1) % width_;
+            int xm1 = (x - 1 + width_) % width_;
+            for (int y = 0; y < height_; ++y) {
+                const Real* row = &adiBuffer_[y * width_];
+                column[y] = (Real(1.0) - r) * row[x] + Real(0.5) * r * (row[xp1] + row[xm1]);
+            }
+            solveTridiagonal(adiY_, column.data());
+            for (int y = 0; y < height_; ++y) {
+                const Real value = column[y];
+                temperature[y * width_ + x] = value;
+                minValue = std::min(minValue, static_cast<double>(value));
+                maxValue = std::max(maxValue, static_cast<double>(value));
+                sum += value;
+                sumSquares += static_cast<double>(value) * value;
+            }
         }
     }
+    storeStats(minValue, maxValue, sum, sumSquares, temperature.size());
+}
+
+template <typename Real>
+void SolverT<Real>::solveSubdomain(std::vector<Real>& temperature, 
+                         const std::vector<Real>& windX, 
+                         const std::vector<Real>& windY, 
+                         int startRow, int endRow, Real dt) {
+    // Đọc từ bản sao để các hàng halo không bị chính kết quả ghi đè
+    const std::vector<Real> current(temperature);
+    solveSubdomain(current.data(), windX.data(), windY.data(), temperature.data(),
+                   startRow, endRow, dt);
 }
+
+template <typename Real>
+bool SolverT<Real>::solveSubdomain(const Real* temperature, const Real* windX, const Real* windY,
+                                   Real* result, int startRow, int endRow, Real dt) const {
+    // Kiểm tra tham số đầu vào
+    if (startRow < 0 || endRow >= height_ || startRow > endRow) {
+        std::cerr << "Invalid subdomain range: [" << startRow << ", " << endRow << "]" << std::endl;
+        return false;
+    }
+    
+    // Sao chép dải kèm halo, chỉ số hàng quấn tuần hoàn theo toàn lưới
+    const int halo = SUBDOMAIN_HALO_ROWS;
+    const int subHeight = endRow - startRow + 1 + 2 * halo;
+    const int subSize = subHeight * width_;
+    std::vector<Real> subTemp(subSize);
+    std::vector<Real> subWindX(subSize);
+    std::vector<Real> subWindY(subSize);
+    std::vector<Real> subSource;
+    if (!sourceTerm_.empty()) {
+        subSource.resize(subSize);
+    }
+    
+    for (int j = 0; j < subHeight; ++j) {
+        const int y = ((startRow - halo + j) % height_ + height_) % height_;
+        const int srcOffset = y * width_;
+        const int dstOffset = j * width_;
+        std::copy(temperature + srcOffset, temperature + srcOffset + width_, subTemp.begin() + dstOffset);
+        std::copy(windX + srcOffset, windX + srcOffset + width_, subWindX.begin() + dstOffset);
+        std::copy(windY + srcOffset, windY + srcOffset + width_, subWindY.begin() + dstOffset);
+        if (!subSource.empty()) {
+            std::copy(sourceTerm_.begin() + srcOffset, sourceTerm_.begin() + srcOffset + width_,
+                      subSource.begin() + dstOffset);
+        }
+    }
+    
+    // Solver con đơn luồng: song song hóa nằm ở cấp các dải
+    SolverT subSolver(width_, subHeight, spacing_, kappa_, false);
+    subSolver.sourceTerm_.swap(subSource);
+    
+    // Giải phương trình trên miền con
+    subSolver.solveRK4Step(subTemp, subWindX, subWindY, dt);
+    
+    // Chỉ chép lại các hàng bên trong (bỏ halo)
+    std::copy(subTemp.begin() + halo * width_, subTemp.end() - halo * width_,
+              result + startRow * width_);
+    return true;
+}
+
+// Khởi tạo tường minh cho hai độ chính xác được xuất ra Python
+template class SolverT<double>;
+template class SolverT<float>;
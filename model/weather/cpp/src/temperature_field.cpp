@@ -7,67 +7,70 @@
 #include <iostream>
 #include <stdexcept>
 
-TemperatureField::TemperatureField(int width, int height)
+template <typename Real>
+TemperatureFieldT<Real>::TemperatureFieldT(int width, int height)
     : width_(width), height_(height) {
     // Khởi tạo trường nhiệt độ với kích thước phù hợp
-    temperature_.resize(width * height, 0.0);
+    temperature_.resize(width * height, Real(0.0));
 }
 
-void TemperatureField::setUniform(double temperature) {
+template <typename Real>
+void TemperatureFieldT<Real>::setUniform(Real temperature) {
     #pragma omp parallel for
     for (size_t i = 0; i < temperature_.size(); ++i) {
         temperature_[i] = temperature;
     }
 }
 
-void TemperatureField::setGradient(double minTemp, double maxTemp, GradientDirection direction) {
+template <typename Real>
+void TemperatureFieldT<Real>::setGradient(Real minTemp, Real maxTemp, GradientDirection direction) {
     #pragma omp parallel for collapse(2)
     for (int y = 0; y < height_; ++y) {
         for (int x = 0; x < width_; ++x) {
             int idx = y * width_ + x;
-            double normalizedPosition;
+            Real normalizedPosition;
             
             switch (direction) {
                 case NORTH_SOUTH: // Bắc (lạnh) -> Nam (nóng)
-                    normalizedPosition = static_cast<double>(y) / (height_ - 1);
+                    normalizedPosition = static_cast<Real>(y) / (height_ - 1);
                     break;
                     
                 case SOUTH_NORTH: // Nam (lạnh) -> Bắc (nóng)
-                    normalizedPosition = 1.0 - static_cast<double>(y) / (height_ - 1);
+                    normalizedPosition = Real(1.0) - static_cast<Real>(y) / (height_ - 1);
                     break;
                     
                 case EAST_WEST: // Đông (lạnh) -> Tây (nóng)
-                    normalizedPosition = 1.0 - static_cast<double>(x) / (width_ - 1);
+                    normalizedPosition = Real(1.0) - static_cast<Real>(x) / (width_ - 1);
                     break;
                     
                 case WEST_EAST: // Tây (lạnh) -> Đông (nóng)
-                    normalizedPosition = static_cast<double>(x) / (width_ - 1);
+                    normalizedPosition = static_cast<Real>(x) / (width_ - 1);
                     break;
                     
                 case RADIAL_IN: { // Trung tâm (lạnh) -> Biên (nóng)
-                    double centerX = width_ / 2.0;
-                    double centerY = height_ / 2.0;
-                    double dx = x - centerX;
-                    double dy = y - centerY;
-                    double distance = std::sqrt(dx * dx + dy * dy);
-                    double maxDistance = std::sqrt(centerX * centerX + centerY * centerY);
+                    Real centerX = width_ / Real(2.0);
+                    Real centerY = height_ / Real(2.0);
+                    Real dx = x - centerX;
+                    Real dy = y - centerY;
+                    Real distance = std::sqrt(dx * dx + dy * dy);
+                    Real maxDistance = std::sqrt(centerX * centerX + centerY * centerY);
                     normalizedPosition = distance / maxDistance;
                     break;
                 }
                     
                 case RADIAL_OUT: { // Trung tâm (nóng) -> Biên (lạnh)
-                    double centerX = width_ / 2.0;
-                    double centerY = height_ / 2.0;
-                    double dx = x - centerX;
-                    double dy = y - centerY;
-                    double distance = std::sqrt(dx * dx + dy * dy);
-                    double maxDistance = std::sqrt(centerX * centerX + centerY * centerY);
-                    normalizedPosition = 1.0 - distance / maxDistance;
+                    Real centerX = width_ / Real(2.0);
+                    Real centerY = height_ / Real(2.0);
+                    Real dx = x - centerX;
+                    Real dy = y - centerY;
+                    Real distance = std::sqrt(dx * dx + dy * dy);
+                    Real maxDistance = std::sqrt(centerX * centerX + centerY * centerY);
+                    normalizedPosition = Real(1.0) - distance / maxDistance;
                     break;
                 }
                     
                 default:
-                    normalizedPosition = 0.5;
+                    normalizedPosition = Real(0.5);
                     break;
             }
             
@@ -77,33 +80,34 @@ void TemperatureField::setGradient(double minTemp, double maxTemp, GradientDirec
     }
 }
 
-void TemperatureField::setCustomGradient(double minTemp, double maxTemp, double angleInDegrees) {
+template <typename Real>
+void TemperatureFieldT<Real>::setCustomGradient(Real minTemp, Real maxTemp, Real angleInDegrees) {
     // Chuyển đổi góc từ độ sang radian
-    double angleInRadians = angleInDegrees * M_PI / 180.0;
+    Real angleInRadians = angleInDegrees * M_PI / Real(180.0);
     
     // Tính vector định hướng
-    double dirX = std::cos(angleInRadians);
-    double dirY = std::sin(angleInRadians);
+    Real dirX = std::cos(angleInRadians);
+    Real dirY = std::sin(angleInRadians);
     
     // Tính điểm góc của lưới (để xác định range)
-    double corners[4][2] = {
-        {0, 0},                  // Góc trái-dưới
-        {width_ - 1, 0},         // Góc phải-dưới
-        {0, height_ - 1},        // Góc trái-trên
-        {width_ - 1, height_ - 1} // Góc phải-trên
+    Real corners[4][2] = {
+        {Real(0), Real(0)},                                                // Góc trái-dưới
+        {static_cast<Real>(width_ - 1), Real(0)},                          // Góc phải-dưới
+        {Real(0), static_cast<Real>(height_ - 1)},                         // Góc trái-trên
+        {static_cast<Real>(width_ - 1), static_cast<Real>(height_ - 1)}   // Góc phải-trên
     };
     
     // Tìm giá trị chiếu nhỏ nhất và lớn nhất
-    double minProj = std::numeric_limits<double>::max();
-    double maxProj = std::numeric_limits<double>::lowest();
+    Real minProj = std::numeric_limits<Real>::max();
+    Real maxProj = std::numeric_limits<Real>::lowest();
     
     for (int i = 0; i < 4; ++i) {
-        double proj = corners[i][0] * dirX + corners[i][1] * dirY;
+        Real proj = corners[i][0] * dirX + corners[i][1] * dirY;
         minProj = std::min(minProj, proj);
         maxProj = std::max(maxProj, proj);
     }
     
-    double projRange = maxProj - minProj;
+    Real projRange = maxProj - minProj;
     
     #pragma omp parallel for collapse(2)
     for (int y = 0; y < height_; ++y) {
@@ -111,10 +115,10 @@ void TemperatureField::setCustomGradient(double minTemp, double maxTemp, double
             int idx = y * width_ + x;
             
             // Chiếu điểm lên vector định hướng
-            double proj = x * dirX + y * dirY;
+            Real proj = x * dirX + y * dirY;
             
             // Chuẩn hóa phép chiếu
-            double normalizedPosition = (proj - minProj) / projRange;
+            Real normalizedPosition = (proj - minProj) / projRange;
             
             // Nội suy tuyến tính nhiệt độ
             temperature_[idx] = minTemp + normalizedPosition * (maxTemp - minTemp);
@@ -122,27 +126,59 @@ void TemperatureField::setCustomGradient(double minTemp, double maxTemp, double
     }
 }
 
-void TemperatureField::addHeatSource(double x, double y, double strength, double radius) {
-    #pragma omp parallel for collapse(2)
-    for (int py = 0; py < height_; ++py) {
-        for (int px = 0; px < width_; ++px) {
-            int idx = py * width_ + px;
-            
+template <typename Real>
+void TemperatureFieldT<Real>::addHeatSource(Real x, Real y, Real strength, Real radius) {
+    addGaussian(temperature_, width_, height_, x, y, strength, radius);
+}
+
+template <typename Real>
+bool TemperatureFieldT<Real>::addHeatSources(const std::vector<Real>& xs, const std::vector<Real>& ys,
+                                             const std::vector<Real>& strengths, const std::vector<Real>& radii) {
+    if (ys.size() != xs.size() || strengths.size() != xs.size() || radii.size() != xs.size()) {
+        return false;
+    }
+    
+    // Các nguồn có thể chồng lên nhau nên cộng lần lượt, song song bên trong mỗi nguồn
+    for (size_t i = 0; i < xs.size(); ++i) {
+        addGaussian(temperature_, width_, height_, xs[i], ys[i], strengths[i], radii[i]);
+    }
+    return true;
+}
+
+template <typename Real>
+void TemperatureFieldT<Real>::addGaussian(std::vector<Real>& field, int width, int height,
+                                          Real x, Real y, Real strength, Real radius) {
+    if (radius <= Real(0.0)) {
+        return;
+    }
+    
+    // Vùng bao quanh nguồn, cắt theo biên lưới
+    const Real cutoff = HEAT_SOURCE_CUTOFF * radius;
+    const Real cutoffSquared = cutoff * cutoff;
+    const Real inverseTwoRadiusSquared = Real(1.0) / (Real(2.0) * radius * radius);
+    const int xMin = std::max(0, static_cast<int>(std::ceil(x - cutoff)));
+    const int xMax = std::min(width - 1, static_cast<int>(std::floor(x + cutoff)));
+    const int yMin = std::max(0, static_cast<int>(std::ceil(y - cutoff)));
+    const int yMax = std::min(height - 1, static_cast<int>(std::floor(y + cutoff)));
+    
+    #pragma omp parallel for
+    for (int py = yMin; py <= yMax; ++py) {
+        for (int px = xMin; px <= xMax; ++px) {
             // Tính khoảng cách từ điểm tới nguồn nhiệt
-            double dx = px - x;
-            double dy = py - y;
-            double distance = std::sqrt(dx * dx + dy * dy);
+            Real dx = px - x;
+            Real dy = py - y;
+            Real distanceSquared = dx * dx + dy * dy;
             
-            // Áp dụng nguồn nhiệt theo phân phối Gaussian
-            if (distance <= radius * 3.0) { // Cắt ở khoảng 3 lần bán kính để tiết kiệm tính toán
-                double factor = strength * std::exp(-(distance * distance) / (2.0 * radius * radius));
-                temperature_[idx] += factor;
+            // Áp dụng nguồn nhiệt theo phân phối Gaussian, cắt ở HEAT_SOURCE_CUTOFF lần bán kính
+            if (distanceSquared <= cutoffSquared) {
+                field[py * width + px] += strength * std::exp(-distanceSquared * inverseTwoRadiusSquared);
             }
         }
     }
 }
 
-bool TemperatureField::setTemperature(const std::vector<double>& temperature) {
+template <typename Real>
+bool TemperatureFieldT<Real>::setTemperature(const std::vector<Real>& temperature) {
     if (temperature.size() != width_ * height_) {
         return false;
     }
@@ -151,7 +187,8 @@ bool TemperatureField::setTemperature(const std::vector<double>& temperature) {
     return true;
 }
 
-double TemperatureField::getValueAt(int x, int y) const {
+template <typename Real>
+Real TemperatureFieldT<Real>::getValueAt(int x, int y) const {
     // Kiểm tra tọa độ có hợp lệ
     if (x < 0 || x >= width_ || y < 0 || y >= height_) {
         throw std::out_of_range("TemperatureField::getValueAt - Tọa độ ngoài phạm vi");
@@ -159,3 +196,7 @@ double TemperatureField::getValueAt(int x, int y) const {
     
     return temperature_[y * width_ + x];
 }
+
+// Khởi tạo tường minh cho hai độ chính xác được xuất ra Python
+template class TemperatureFieldT<double>;
+template class TemperatureFieldT<float>;
@@ -6,75 +6,181 @@
 #include "../include/wind_field.h"
 #include <iostream>
 #include <chrono>
+#include <sstream>
 
-WindField::WindField(int width, int height)
-    : width_(width), height_(height) {
+template <typename Real>
+WindFieldT<Real>::WindFieldT(int width, int height)
+    // Không có seed: lấy từ thời gian, mỗi lần chạy một khác
+    : WindFieldT(width, height,
+                 static_cast<std::uint32_t>(std::chrono::system_clock::now().time_since_epoch().count())) {
+}
+
+template <typename Real>
+WindFieldT<Real>::WindFieldT(int width, int height, std::uint32_t seed)
+    : width_(width), height_(height), rng_(seed), meanStrength_(0.0), meanRadius_(1.0),
+      driftSpeed_(0.0), lifetime_(100.0) {
     // Khởi tạo mảng trường gió với kích thước phù hợp
-    windX_.resize(width * height, 0.0);
-    windY_.resize(width * height, 0.0);
-    
-    // Khởi tạo bộ sinh số ngẫu nhiên với seed từ thời gian
-    unsigned seed = std::chrono::system_clock::now().time_since_epoch().count();
+    windX_.resize(width * height, Real(0.0));
+    windY_.resize(width * height, Real(0.0));
+}
+
+template <typename Real>
+void WindFieldT<Real>::seed(std::uint32_t seed) {
     rng_.seed(seed);
 }
 
-void WindField::generateGaussianField(int numVortices, double strength, double radius) {
-    // Reset trường gió về 0
-    std::fill(windX_.begin(), windX_.end(), 0.0);
-    std::fill(windY_.begin(), windY_.end(), 0.0);
+template <typename Real>
+void WindFieldT<Real>::generateGaussianField(int numVortices, Real strength, Real radius) {
+    meanStrength_ = strength;
+    meanRadius_ = radius;
+    
+    // Tạo các xoáy; tuổi nằm giữa vòng đời để cường độ đầy đủ ngay từ đầu
+    // và các xoáy không cùng hết hạn một lúc khi evolve
+    std::uniform_real_distribution<Real> ageDist(Real(0.2) * lifetime_, Real(0.8) * lifetime_);
+    vortices_.resize(std::max(0, numVortices));
+    for (size_t i = 0; i < vortices_.size(); ++i) {
+        spawnVortex(vortices_[i], ageDist(rng_));
+    }
+    
+    rebuildGaussianField();
+}
+
+template <typename Real>
+void WindFieldT<Real>::setEvolution(Real driftSpeed, Real lifetime) {
+    driftSpeed_ = driftSpeed;
+    lifetime_ = std::max(Real(1e-6), lifetime);
+    for (size_t i = 0; i < vortices_.size(); ++i) {
+        Vortex& vortex = vortices_[i];
+        Real speed = std::sqrt(vortex.vx * vortex.vx + vortex.vy * vortex.vy);
+        if (speed > Real(0.0)) {
+            vortex.vx *= driftSpeed_ / speed;
+            vortex.vy *= driftSpeed_ / speed;
+        }
+        vortex.age = std::min(vortex.age, Real(0.8) * lifetime_);
+    }
+}
+
+template <typename Real>
+void WindFieldT<Real>::evolve(Real dt) {
+    if (vortices_.empty() || dt <= Real(0.0)) {
+        return;
+    }
+    
+    for (size_t i = 0; i < vortices_.size(); ++i) {
+        Vortex& vortex = vortices_[i];
+        vortex.x += vortex.vx * dt;
+        vortex.y += vortex.vy * dt;
+        vortex.age += dt;
+        // Hết vòng đời: cường độ đã về 0 nên thay xoáy mới không gây nhảy cóc
+        if (vortex.age >= lifetime_) {
+            spawnVortex(vortex, Real(0.0));
+        }
+    }
     
+    rebuildGaussianField();
+}
+
+template <typename Real>
+void WindFieldT<Real>::spawnVortex(Vortex& vortex, Real age) {
     // Phân phối ngẫu nhiên
-    std::uniform_real_distribution<double> xDist(0, width_ - 1);
-    std::uniform_real_distribution<double> yDist(0, height_ - 1);
-    std::normal_distribution<double> strengthDist(strength, strength * 0.3);
-    std::normal_distribution<double> radiusDist(radius, radius * 0.2);
-    
-    // Tạo các xoáy
-    for (int i = 0; i < numVortices; ++i) {
-        double centerX = xDist(rng_);
-        double centerY = yDist(rng_);
-        double vortexStrength = strengthDist(rng_);
-        double vortexRadius = std::max(1.0, radiusDist(rng_));
-        
-        // Dấu của vortexStrength quyết định hướng xoáy (CW/CCW)
-        if (std::uniform_real_distribution<double>(0, 1)(rng_) < 0.5) {
-            vortexStrength = -vortexStrength;
+    std::uniform_real_distribution<Real> xDist(0, width_ - 1);
+    std::uniform_real_distribution<Real> yDist(0, height_ - 1);
+    std::normal_distribution<Real> strengthDist(meanStrength_, meanStrength_ * Real(0.3));
+    std::normal_distribution<Real> radiusDist(meanRadius_, meanRadius_ * Real(0.2));
+    std::uniform_real_distribution<Real> angleDist(0, Real(2.0 * M_PI));
+    
+    vortex.x = xDist(rng_);
+    vortex.y = yDist(rng_);
+    vortex.strength = strengthDist(rng_);
+    vortex.radius = std::max(Real(1.0), radiusDist(rng_));
+    
+    // Dấu của vortexStrength quyết định hướng xoáy (CW/CCW)
+    if (std::uniform_real_distribution<Real>(0, 1)(rng_) < Real(0.5)) {
+        vortex.strength = -vortex.strength;
+    }
+    
+    Real angle = angleDist(rng_);
+    vortex.vx = driftSpeed_ * std::cos(angle);
+    vortex.vy = driftSpeed_ * std::sin(angle);
+    vortex.age = age;
+}
+
+template <typename Real>
+Real WindFieldT<Real>::envelope(Real age) {
+    const Real ramp = Real(0.2) * lifetime_;
+    Real t = Real(1.0);
+    if (age < ramp) {
+        t = age / ramp;
+    } else if (age > lifetime_ - ramp) {
+        t = (lifetime_ - age) / ramp;
+    }
+    t = std::min(Real(1.0), std::max(Real(0.0), t));
+    return smoothstep(t);
+}
+
+template <typename Real>
+void WindFieldT<Real>::rebuildGaussianField() {
+    // Reset trường gió về 0
+    std::fill(windX_.begin(), windX_.end(), Real(0.0));
+    std::fill(windY_.begin(), windY_.end(), Real(0.0));
+    
+    for (size_t i = 0; i < vortices_.size(); ++i) {
+        const Vortex& vortex = vortices_[i];
+        const Real vortexStrength = vortex.strength * envelope(vortex.age);
+        if (vortexStrength == Real(0.0)) {
+            continue;
         }
         
+        // Vùng ảnh hưởng: hình tròn bán kính cutoff, cắt theo biên lưới
+        const Real cutoff = GAUSSIAN_CUTOFF_SIGMAS * vortex.radius;
+        const Real cutoffSquared = cutoff * cutoff;
+        const Real inverseTwoSigmaSquared = Real(1.0) / (Real(2.0) * vortex.radius * vortex.radius);
+        const int xMin = std::max(0, static_cast<int>(std::ceil(vortex.x - cutoff)));
+        const int xMax = std::min(width_ - 1, static_cast<int>(std::floor(vortex.x + cutoff)));
+        const int yMin = std::max(0, static_cast<int>(std::ceil(vortex.y - cutoff)));
+        const int yMax = std::min(height_ - 1, static_cast<int>(std::floor(vortex.y + cutoff)));
+        
         // Áp dụng xoáy lên trường gió
-        #pragma omp parallel for collapse(2)
-        for (int y = 0; y < height_; ++y) {
-            for (int x = 0; x < width_; ++x) {
+        #pragma omp parallel for
+        for (int y = yMin; y <= yMax; ++y) {
+            for (int x = xMin; x <= xMax; ++x) {
                 int idx = y * width_ + x;
                 
                 // Tính khoảng cách từ điểm tới tâm xoáy
-                double dx = x - centerX;
-                double dy = y - centerY;
-                double distance = std::sqrt(dx * dx + dy * dy);
+                Real dx = x - vortex.x;
+                Real dy = y - vortex.y;
+                Real distanceSquared = dx * dx + dy * dy;
+                if (distanceSquared > cutoffSquared) {
+                    continue;
+                }
+                Real distance = std::sqrt(distanceSquared);
                 
                 // Sử dụng hàm mũ Gaussian để tính cường độ
-                double factor = vortexStrength * std::exp(-distance * distance / (2 * vortexRadius * vortexRadius));
+                Real factor = vortexStrength * std::exp(-distanceSquared * inverseTwoSigmaSquared);
                 
                 // Góc 90 độ để tạo chuyển động xoáy
-                windX_[idx] += factor * (-dy) / (distance + 1e-10);
-                windY_[idx] += factor * dx / (distance + 1e-10);
+                windX_[idx] += factor * (-dy) / (distance + Real(1e-10));
+                windY_[idx] += factor * dx / (distance + Real(1e-10));
             }
         }
     }
 }
 
 // Hàm nội suy tuyến tính
-double WindField::lerp(double a, double b, double t) {
+template <typename Real>
+Real WindFieldT<Real>::lerp(Real a, Real b, Real t) {
     return a + t * (b - a);
 }
 
 // Hàm làm mượt gradient
-double WindField::smoothstep(double t) {
+template <typename Real>
+Real WindFieldT<Real>::smoothstep(Real t) {
     return t * t * (3 - 2 * t);
 }
 
 // Tạo giá trị gradient ngẫu nhiên
-double WindField::randomGradient(int ix, int iy) {
+template <typename Real>
+Real WindFieldT<Real>::randomGradient(int ix, int iy) {
     // Sử dụng phương pháp hash ngẫu nhiên
     const unsigned w = 8 * sizeof(unsigned);
     const unsigned s = w / 2;
@@ -84,12 +190,13 @@ double WindField::randomGradient(int ix, int iy) {
     a *= 2048419325;
     
     // Chuyển đổi sang góc
-    float random = a * (3.14159265 / ~(~0u >> 1));
+    float random = a * (Real(3.14159265) / ~(~0u >> 1));
     return random;
 }
 
 // Tạo nhiễu Perlin
-double WindField::perlinNoise(double x, double y, double scale) {
+template <typename Real>
+Real WindFieldT<Real>::perlinNoise(Real x, Real y, Real scale) {
     // Scale đầu vào
     x /= scale;
     y /= scale;
@@ -101,57 +208,58 @@ double WindField::perlinNoise(double x, double y, double scale) {
     int y1 = y0 + 1;
     
     // Xác định vị trí tương đối trong ô
-    double sx = x - (double)x0;
-    double sy = y - (double)y0;
+    Real sx = x - (Real)x0;
+    Real sy = y - (Real)y0;
     
     // Làm mượt vị trí để giảm artifacts
-    double u = smoothstep(sx);
-    double v = smoothstep(sy);
+    Real u = smoothstep(sx);
+    Real v = smoothstep(sy);
     
     // Tính các gradient ngẫu nhiên
-    double n0 = randomGradient(x0, y0);
-    double n1 = randomGradient(x1, y0);
-    double ix0 = lerp(n0, n1, u);
+    Real n0 = randomGradient(x0, y0);
+    Real n1 = randomGradient(x1, y0);
+    Real ix0 = lerp(n0, n1, u);
     
     n0 = randomGradient(x0, y1);
     n1 = randomGradient(x1, y1);
-    double ix1 = lerp(n0, n1, u);
+    Real ix1 = lerp(n0, n1, u);
     
     // Nội suy theo y
-    double value = lerp(ix0, ix1, v);
+    Real value = lerp(ix0, ix1, v);
     
     // Chuẩn hóa sang [-1, 1]
-    return value * 2.0 - 1.0;
+    return value * Real(2.0) - Real(1.0);
 }
 
-void WindField::generatePerlinField(double scale, int octaves, double persistence) {
+template <typename Real>
+void WindFieldT<Real>::generatePerlinField(Real scale, int octaves, Real persistence) {
     #pragma omp parallel for collapse(2)
     for (int y = 0; y < height_; ++y) {
         for (int x = 0; x < width_; ++x) {
             int idx = y * width_ + x;
             
-            double amplitude = 1.0;
-            double frequency = 1.0;
-            double windX = 0.0;
-            double windY = 0.0;
-            double totalAmplitude = 0.0;
+            Real amplitude = Real(1.0);
+            Real frequency = Real(1.0);
+            Real windX = Real(0.0);
+            Real windY = Real(0.0);
+            Real totalAmplitude = Real(0.0);
             
             // Kết hợp nhiều octave để tạo chi tiết
             for (int o = 0; o < octaves; ++o) {
                 // Offset để các octave không trùng nhau
-                double offsetX = o * 4.0;
-                double offsetY = o * 4.0;
+                Real offsetX = o * Real(4.0);
+                Real offsetY = o * Real(4.0);
                 
                 // Tạo hai nhiễu Perlin khác nhau cho X và Y
-                double perlinX = perlinNoise((x + offsetX) / frequency, (y + offsetY) / frequency, scale);
-                double perlinY = perlinNoise((x + offsetY + 31.41) / frequency, (y + offsetX + 27.18) / frequency, scale);
+                Real perlinX = perlinNoise((x + offsetX) / frequency, (y + offsetY) / frequency, scale);
+                Real perlinY = perlinNoise((x + offsetY + Real(31.41)) / frequency, (y + offsetX + Real(27.18)) / frequency, scale);
                 
                 windX += perlinX * amplitude;
                 windY += perlinY * amplitude;
                 
                 totalAmplitude += amplitude;
                 amplitude *= persistence;
-                frequency *= 2.0;
+                frequency *= Real(2.0);
             }
             
             // Chuẩn hóa
@@ -161,9 +269,10 @@ void WindField::generatePerlinField(double scale, int octaves, double persistenc
     }
 }
 
-void WindField::generateVortexField(const std::vector<double>& centers, 
-                                 const std::vector<double>& strengths, 
-                                 const std::vector<double>& radiuses) {
+template <typename Real>
+void WindFieldT<Real>::generateVortexField(const std::vector<Real>& centers, 
+                                 const std::vector<Real>& strengths, 
+                                 const std::vector<Real>& radiuses) {
     // Kiểm tra số lượng tham số đầu vào
     size_t numVortices = strengths.size();
     if (centers.size() != numVortices * 2 || radiuses.size() != numVortices) {
@@ -172,15 +281,15 @@ void WindField::generateVortexField(const std::vector<double>& centers,
     }
     
     // Reset trường gió về 0
-    std::fill(windX_.begin(), windX_.end(), 0.0);
-    std::fill(windY_.begin(), windY_.end(), 0.0);
+    std::fill(windX_.begin(), windX_.end(), Real(0.0));
+    std::fill(windY_.begin(), windY_.end(), Real(0.0));
     
     // Áp dụng từng xoáy
     for (size_t i = 0; i < numVortices; ++i) {
-        double centerX = centers[i * 2];
-        double centerY = centers[i * 2 + 1];
-        double vortexStrength = strengths[i];
-        double vortexRadius = radiuses[i];
+        Real centerX = centers[i * 2];
+        Real centerY = centers[i * 2 + 1];
+        Real vortexStrength = strengths[i];
+        Real vortexRadius = radiuses[i];
         
         // Áp dụng xoáy lên trường gió
         #pragma omp parallel for collapse(2)
@@ -189,24 +298,111 @@ void WindField::generateVortexField(const std::vector<double>& centers,
                 int idx = y * width_ + x;
                 
                 // Tính khoảng cách từ điểm tới tâm xoáy
-                double dx = x - centerX;
-                double dy = y - centerY;
-                double distance = std::sqrt(dx * dx + dy * dy);
+                Real dx = x - centerX;
+                Real dy = y - centerY;
+                Real distance = std::sqrt(dx * dx + dy * dy);
                 
                 // Sử dụng profile xoáy hình chuông
-                double profile;
+                Real profile;
                 if (distance < vortexRadius) {
                     profile = distance / vortexRadius; // Tăng tuyến tính tới bán kính
                 } else {
                     profile = vortexRadius / distance; // Giảm đi khi ra xa
                 }
                 
-                double factor = vortexStrength * profile;
+                Real factor = vortexStrength * profile;
                 
                 // Góc 90 độ để tạo chuyển động xoáy
-                windX_[idx] += factor * (-dy) / (distance + 1e-10);
-                windY_[idx] += factor * dx / (distance + 1e-10);
+                windX_[idx] += factor * (-dy) / (distance + Real(1e-10));
+                windY_[idx] += factor * dx / (distance + Real(1e-10));
             }
         }
     }
 }
+
+template <typename Real>
+bool WindFieldT<Real>::setWind(const std::vector<Real>& windX, const std::vector<Real>& windY) {
+    if (windX.size() != windX_.size() || windY.size() != windY_.size()) {
+        return false;
+    }
+    windX_ = windX;
+    windY_ = windY;
+    return true;
+}
+
+template <typename Real>
+std::vector<Real> WindFieldT<Real>::getVortexState() const {
+    std::vector<Real> state;
+    state.reserve(vortices_.size() * 7);
+    for (size_t i = 0; i < vortices_.size(); ++i) {
+        const Vortex& v = vortices_[i];
+        Real values[7] = {v.x, v.y, v.vx, v.vy, v.strength, v.radius, v.age};
+        state.insert(state.end(), values, values + 7);
+    }
+    return state;
+}
+
+template <typename Real>
+bool WindFieldT<Real>::setVortexState(const std::vector<Real>& state) {
+    if (state.size() % 7 != 0) {
+        return false;
+    }
+    vortices_.resize(state.size() / 7);
+    for (size_t i = 0; i < vortices_.size(); ++i) {
+        const Real* values = &state[i * 7];
+        Vortex& v = vortices_[i];
+        v.x = values[0];
+        v.y = values[1];
+        v.vx = values[2];
+        v.vy = values[3];
+        v.strength = values[4];
+        v.radius = values[5];
+        v.age = values[6];
+    }
+    return true;
+}
+
+template <typename Real>
+std::vector<Real> WindFieldT<Real>::getEvolutionState() const {
+    std::vector<Real> state(4);
+    state[0] = meanStrength_;
+    state[1] = meanRadius_;
+    state[2] = driftSpeed_;
+    state[3] = lifetime_;
+    return state;
+}
+
+template <typename Real>
+bool WindFieldT<Real>::setEvolutionState(const std::vector<Real>& state) {
+    if (state.size() != 4) {
+        return false;
+    }
+    meanStrength_ = state[0];
+    meanRadius_ = state[1];
+    driftSpeed_ = state[2];
+    lifetime_ = state[3];
+    return true;
+}
+
+template <typename Real>
+std::string WindFieldT<Real>::getRngState() const {
+    std::ostringstream out;
+    out << rng_;
+    return out.str();
+}
+
+template <typename Real>
+bool WindFieldT<Real>::setRngState(const std::string& state) {
+    std::istringstream in(state);
+    std::mt19937 rng;
+    in >> rng;
+    if (in.fail()) {
+        return false;
+    }
+    rng_ = rng;
+    return true;
+}
+
+// Khởi tạo tường minh cho hai độ chính xác được xuất ra Python
+template class WindFieldT<double>;
+template class WindFieldT<float>;
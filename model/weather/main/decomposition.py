@@ -0,0 +1,96 @@
+"""
+Phân rã miền theo hàng cho solver RK4 tường minh.
+
+Stencil 5 điểm của Solver đọc một hàng lân cận mỗi phía, và mỗi giai đoạn
+RK4 (k1..k4) lại áp stencil lên kết quả giai đoạn trước, nên một bước đầy đủ
+phụ thuộc vào 4 hàng mỗi phía. Một dải được giải độc lập cùng HALO_ROWS = 4
+hàng halo lấy tuần hoàn theo toàn lưới (hàng 0 kề hàng height-1). Phép quấn
+tuần hoàn bên trong Solver của dải chỉ làm sai các hàng halo, còn các hàng
+bên trong được tính bằng đúng các phép toán như Solver một tiến trình, nên
+kết quả trùng khớp từng bit.
+
+HƯỚNG DẪN SỬ DỤNG:
+    for start_row, end_row in split_rows(height, num_parts):
+        solver = cpp_weather.Solver(width, strip_height(start_row, end_row), dx, kappa)
+        result[start_row:end_row + 1] = solve_strip(
+            solver, temperature, wind_x, wind_y, start_row, end_row, dt
+        )
+"""
+
+import numpy as np
+
+# Số hàng halo mỗi phía cho một bước RK4 (4 giai đoạn x 1 hàng stencil)
+HALO_ROWS = 4
+
+
+def split_rows(height, num_parts):
+    """
+    Chia đều các hàng của lưới thành các dải liên tiếp.
+
+    Args:
+        height (int): Số hàng của lưới
+        num_parts (int): Số dải mong muốn
+
+    Returns:
+        list: Danh sách (start_row, end_row), end_row tính cả hai đầu
+    """
+    num_parts = max(1, min(num_parts, height))
+    rows_per_part, remainder = divmod(height, num_parts)
+    subdomains = []
+    start_row = 0
+    for i in range(num_parts):
+        rows = rows_per_part + (1 if i < remainder else 0)
+        subdomains.append((start_row, start_row + rows - 1))
+        start_row += rows
+    return subdomains
+
+
+def strip_height(start_row, end_row):
+    """
+    Số hàng của Solver dùng cho dải [start_row, end_row], tính cả halo.
+
+    Args:
+        start_row (int): Hàng bắt đầu
+        end_row (int): Hàng kết thúc (tính cả)
+
+    Returns:
+        int: Chiều cao dải kèm halo
+    """
+    return end_row - start_row + 1 + 2 * HALO_ROWS
+
+
+def halo_rows(start_row, end_row, height):
+    """
+    Chỉ số hàng (trong lưới toàn cục) của dải kèm halo, quấn tuần hoàn.
+
+    Args:
+        start_row (int): Hàng bắt đầu
+        end_row (int): Hàng kết thúc (tính cả)
+        height (int): Số hàng của lưới toàn cục
+
+    Returns:
+        numpy.ndarray: Mảng chỉ số độ dài strip_height(start_row, end_row)
+    """
+    return np.arange(start_row - HALO_ROWS, end_row + 1 + HALO_ROWS) % height
+
+
+def solve_strip(solver, temperature, wind_x, wind_y, start_row, end_row, dt, rows=None):
+    """
+    Giải một bước RK4 cho dải [start_row, end_row].
+
+    Args:
+        solver: cpp_weather.Solver (hoặc Solver32) có chiều cao strip_height(start_row, end_row)
+        temperature (numpy.ndarray): Trường nhiệt độ toàn cục (height, width)
+        wind_x, wind_y (numpy.ndarray): Trường gió toàn cục (height, width)
+        start_row (int): Hàng bắt đầu
+        end_row (int): Hàng kết thúc (tính cả)
+        dt (float): Bước thời gian
+        rows (numpy.ndarray, optional): Kết quả halo_rows đã tính sẵn
+
+    Returns:
+        numpy.ndarray: Nhiệt độ mới của các hàng start_row..end_row, (rows, width)
+    """
+    if rows is None:
+        rows = halo_rows(start_row, end_row, temperature.shape[0])
+    result = solver.solve_rk4_step(temperature[rows], wind_x[rows].ravel(), wind_y[rows].ravel(), dt)
+    return result[HALO_ROWS:HALO_ROWS + end_row - start_row + 1]
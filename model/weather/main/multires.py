@@ -0,0 +1,376 @@
+"""
+Lưới thời tiết đa độ phân giải, tách khỏi kích thước cửa sổ.
+
+Mô hình thời tiết chạy trên một lưới thô cấu hình được (GRID_SIZE_X x
+GRID_SIZE_Y), còn chim, quả và renderer truy vấn trường qua tọa độ thế giới
+(pixel) bằng WeatherGrid.sample, nội suy song tuyến tính (hoặc lân cận gần
+nhất) theo tâm ô và quấn tuần hoàn như Solver. Nhờ vậy độ phân giải lưới
+(tốc độ) và độ phân giải hiển thị chọn độc lập với nhau.
+
+NestedPatch là một lưới mịn lồng một chiều (one-way nesting) đặt trên vùng
+chim/quả dày đặc: gió và số hạng nguồn được nội suy từ lưới thô, HALO_CELLS ô
+biên mỗi phía được làm mới mỗi bước con từ nhiệt độ lưới thô (nội suy theo
+thời gian giữa đầu và cuối bước thô), phần bên trong được giải bằng RK4 với
+dx / refinement và số bước con theo CFL của lưới mịn. Lưới mịn không ghi ngược
+về lưới thô.
+
+HƯỚNG DẪN SỬ DỤNG:
+    grid = WeatherGrid(world_width, world_height, grid_width, grid_height)
+    temps = grid.sample(temperature, xs, ys)          # mảng theo từng điểm
+
+    patch = NestedPatch(grid, solver_class, dx, kappa, (24, 20), refinement=4)
+    patch.reset_from(temperature)
+    patch.step(temperature_before, temperature_after, wind_x, wind_y, dt)
+    temps = patch.sample(xs, ys, grid.sample(temperature, xs, ys))
+"""
+
+import math
+
+import numpy as np
+
+# Số ô halo mỗi phía của lưới mịn cho một bước RK4 (4 giai đoạn x 1 ô stencil),
+# cùng lý do với HALO_ROWS trong decomposition.py
+HALO_CELLS = 4
+
+SAMPLING_MODES = ('bilinear', 'nearest')
+
+
+def sample_bilinear(field, gx, gy, periodic=True):
+    """
+    Nội suy song tuyến tính trường 2D tại tọa độ lưới thực.
+
+    Tọa độ (gx, gy) tính theo chỉ số ô: (i, j) là tâm ô field[j, i].
+
+    Args:
+        field (numpy.ndarray): Mảng (height, width)
+        gx, gy (numpy.ndarray): Tọa độ lưới theo cột và hàng
+        periodic (bool): True để quấn tuần hoàn, False để kẹp ở biên
+
+    Returns:
+        numpy.ndarray: Giá trị nội suy, cùng hình dạng với gx
+    """
+    height, width = field.shape
+    gx = np.asarray(gx, dtype=np.float64)
+    gy = np.asarray(gy, dtype=np.float64)
+    if not periodic:
+        gx = np.clip(gx, 0.0, width - 1)
+        gy = np.clip(gy, 0.0, height - 1)
+    x0 = np.floor(gx)
+    y0 = np.floor(gy)
+    fx = gx - x0
+    fy = gy - y0
+    x0 = x0.astype(np.intp)
+    y0 = y0.astype(np.intp)
+    if periodic:
+        x0 %= width
+        y0 %= height
+        x1 = (x0 + 1) % width
+        y1 = (y0 + 1) % height
+    else:
+        x1 = np.minimum(x0 + 1, width - 1)
+        y1 = np.minimum(y0 + 1, height - 1)
+    top = field[y0, x0] * (1.0 - fx) + field[y0, x1] * fx
+    bottom = field[y1, x0] * (1.0 - fx) + field[y1, x1] * fx
+    return top * (1.0 - fy) + bottom * fy
+
+
+def sample_nearest(field, gx, gy, periodic=True):
+    """
+    Lấy giá trị của ô có tâm gần nhất.
+
+    Args:
+        field (numpy.ndarray): Mảng (height, width)
+        gx, gy (numpy.ndarray): Tọa độ lưới theo cột và hàng (tâm ô là số nguyên)
+        periodic (bool): True để quấn tuần hoàn, False để kẹp ở biên
+
+    Returns:
+        numpy.ndarray: Giá trị tại ô gần nhất, cùng hình dạng với gx
+    """
+    height, width = field.shape
+    ix = np.floor(np.asarray(gx, dtype=np.float64) + 0.5).astype(np.intp)
+    iy = np.floor(np.asarray(gy, dtype=np.float64) + 0.5).astype(np.intp)
+    if periodic:
+        return field[iy % height, ix % width]
+    return field[np.clip(iy, 0, height - 1), np.clip(ix, 0, width - 1)]
+
+
+def sample_field(field, gx, gy, mode='bilinear', periodic=True):
+    """
+    Lấy mẫu trường 2D theo chế độ 'bilinear' hoặc 'nearest'.
+
+    Raises:
+        ValueError: Nếu mode không hợp lệ
+    """
+    if mode == 'bilinear':
+        return sample_bilinear(field, gx, gy, periodic)
+    if mode == 'nearest':
+        return sample_nearest(field, gx, gy, periodic)
+    raise ValueError(f"Chế độ lấy mẫu không hợp lệ: {mode!r} (hỗ trợ: {', '.join(SAMPLING_MODES)})")
+
+
+class WeatherGrid:
+    """Ánh xạ giữa tọa độ thế giới (pixel) và lưới thời tiết thô."""
+
+    def __init__(self, world_width, world_height, grid_width, grid_height):
+        """
+        Args:
+            world_width (float): Chiều rộng vùng mô phỏng (pixel)
+            world_height (float): Chiều cao vùng mô phỏng (pixel)
+            grid_width (int): Số ô lưới theo chiều ngang
+            grid_height (int): Số ô lưới theo chiều dọc
+        """
+        self.world_width = float(world_width)
+        self.world_height = float(world_height)
+        self.grid_width = int(grid_width)
+        self.grid_height = int(grid_height)
+        self.cell_width = self.world_width / self.grid_width
+        self.cell_height = self.world_height / self.grid_height
+
+    def to_grid(self, xs, ys):
+        """
+        Chuyển tọa độ thế giới sang tọa độ lưới thực (tâm ô là số nguyên).
+
+        Returns:
+            tuple: (gx, gy) mảng float
+        """
+        gx = np.asarray(xs, dtype=np.float64) / self.cell_width - 0.5
+        gy = np.asarray(ys, dtype=np.float64) / self.cell_height - 0.5
+        return gx, gy
+
+    def cell_index(self, xs, ys):
+        """
+        Chỉ số ô chứa điểm, kẹp trong lưới (dùng cho chuột, nguồn nhiệt).
+
+        Returns:
+            tuple: (ix, iy) số nguyên nếu đầu vào vô hướng, mảng nếu là mảng
+        """
+        ix = np.clip(np.floor(np.asarray(xs, dtype=np.float64) / self.cell_width), 0, self.grid_width - 1)
+        iy = np.clip(np.floor(np.asarray(ys, dtype=np.float64) / self.cell_height), 0, self.grid_height - 1)
+        if ix.ndim == 0:
+            return int(ix), int(iy)
+        return ix.astype(np.intp), iy.astype(np.intp)
+
+    def sample(self, field, xs, ys, mode='bilinear'):
+        """
+        Lấy mẫu trường lưới thô tại các điểm trong tọa độ thế giới.
+
+        Args:
+            field (numpy.ndarray): Mảng (grid_height, grid_width) hoặc phẳng
+            xs, ys: Tọa độ thế giới (vô hướng hoặc mảng)
+            mode (str): 'bilinear' hoặc 'nearest'
+
+        Returns:
+            numpy.ndarray: Giá trị tại các điểm, cùng hình dạng với xs
+        """
+        field = np.asarray(field).reshape(self.grid_height, self.grid_width)
+        gx, gy = self.to_grid(xs, ys)
+        return sample_field(field, gx, gy, mode)
+
+    def resample(self, field, columns, rows, mode='bilinear'):
+        """
+        Lấy mẫu trường lên một lưới hiển thị columns x rows phủ toàn vùng,
+        độc lập với độ phân giải của lưới thời tiết.
+
+        Returns:
+            numpy.ndarray: Mảng (rows, columns)
+        """
+        xs = (np.arange(columns) + 0.5) * (self.world_width / columns)
+        ys = (np.arange(rows) + 0.5) * (self.world_height / rows)
+        return self.sample(field, xs[np.newaxis, :], ys[:, np.newaxis], mode)
+
+
+class NestedPatch:
+    """Lưới mịn lồng một chiều trên một vùng chữ nhật của lưới thô."""
+
+    def __init__(self, grid, solver_class, dx, kappa, size, refinement=4, dtype=np.float64):
+        """
+        Args:
+            grid (WeatherGrid): Lưới thô
+            solver_class: cpp_weather.Solver hoặc Solver32
+            dx (float): Khoảng cách lưới thô
+            kappa (float): Hệ số khuếch tán
+            size (tuple): (số cột, số hàng) của vùng mịn tính theo ô thô
+            refinement (int): Số ô mịn trên mỗi ô thô theo mỗi chiều
+
+        Raises:
+            ValueError: Nếu vùng mịn lớn hơn lưới thô hoặc refinement < 1
+        """
+        columns, rows = int(size[0]), int(size[1])
+        if not (0 < columns <= grid.grid_width and 0 < rows <= grid.grid_height):
+            raise ValueError(
+                f"Vùng mịn {columns}x{rows} không nằm trong lưới {grid.grid_width}x{grid.grid_height}"
+            )
+        if refinement < 1:
+            raise ValueError(f"refinement phải >= 1, nhận được {refinement}")
+        self.grid = grid
+        self.columns = columns
+        self.rows = rows
+        self.refinement = int(refinement)
+        self.dtype = np.dtype(dtype)
+        self.fine_width = columns * self.refinement + 2 * HALO_CELLS
+        self.fine_height = rows * self.refinement + 2 * HALO_CELLS
+        self.solver = solver_class(self.fine_width, self.fine_height, dx / self.refinement, kappa, False)
+        self.origin = (0, 0)
+        self.temperature = np.zeros((self.fine_height, self.fine_width), dtype=self.dtype)
+
+        # Vành halo HALO_CELLS ô quanh phần bên trong
+        self._halo = np.ones((self.fine_height, self.fine_width), dtype=bool)
+        self._halo[HALO_CELLS:-HALO_CELLS, HALO_CELLS:-HALO_CELLS] = False
+        self._place(self.origin)
+
+    def _place(self, origin):
+        """Đặt góc dưới trái của vùng mịn tại ô thô origin = (cột, hàng)."""
+        column = min(max(int(origin[0]), 0), self.grid.grid_width - self.columns)
+        row = min(max(int(origin[1]), 0), self.grid.grid_height - self.rows)
+        self.origin = (column, row)
+        # Tọa độ lưới thô của tâm từng ô mịn (kể cả halo)
+        offsets_x = (np.arange(self.fine_width) - HALO_CELLS + 0.5) / self.refinement - 0.5
+        offsets_y = (np.arange(self.fine_height) - HALO_CELLS + 0.5) / self.refinement - 0.5
+        self._coarse_gx, self._coarse_gy = np.meshgrid(column + offsets_x, row + offsets_y)
+        self._halo_gx = self._coarse_gx[self._halo]
+        self._halo_gy = self._coarse_gy[self._halo]
+
+    def _interpolate(self, coarse):
+        """Nội suy trường thô lên toàn bộ lưới mịn (kể cả halo)."""
+        coarse = np.asarray(coarse).reshape(self.grid.grid_height, self.grid.grid_width)
+        return sample_bilinear(coarse, self._coarse_gx, self._coarse_gy).astype(self.dtype)
+
+    def bounds(self):
+        """
+        Returns:
+            tuple: (x_min, y_min, x_max, y_max) của vùng mịn trong tọa độ thế giới
+        """
+        column, row = self.origin
+        return (column * self.grid.cell_width, row * self.grid.cell_height,
+                (column + self.columns) * self.grid.cell_width,
+                (row + self.rows) * self.grid.cell_height)
+
+    def contains(self, xs, ys):
+        """
+        Returns:
+            numpy.ndarray: Mặt nạ bool các điểm nằm trong vùng mịn
+        """
+        x_min, y_min, x_max, y_max = self.bounds()
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        return (xs >= x_min) & (xs < x_max) & (ys >= y_min) & (ys < y_max)
+
+    def reset_from(self, coarse_temperature):
+        """
+        Khởi tạo lại nhiệt độ lưới mịn bằng nội suy từ lưới thô.
+
+        Args:
+            coarse_temperature (numpy.ndarray): Trường nhiệt độ thô
+        """
+        self.temperature = self._interpolate(coarse_temperature)
+
+    def move_to(self, origin, coarse_temperature):
+        """
+        Dời vùng mịn tới ô thô origin và khởi tạo lại từ lưới thô.
+
+        Returns:
+            bool: True nếu vùng mịn đã dời
+        """
+        previous = self.origin
+        self._place(origin)
+        if self.origin == previous:
+            return False
+        self.reset_from(coarse_temperature)
+        return True
+
+    def focus(self, xs, ys, coarse_temperature, hysteresis=1.25):
+        """
+        Dời vùng mịn tới cửa sổ columns x rows chứa nhiều điểm (chim/quả) nhất.
+        Chỉ dời khi cửa sổ mới chứa nhiều hơn hysteresis lần số điểm trong vùng
+        hiện tại, để vùng mịn không nhảy qua lại giữa hai đàn ngang nhau.
+
+        Args:
+            xs, ys: Tọa độ thế giới của các điểm
+            coarse_temperature (numpy.ndarray): Trường nhiệt độ thô để khởi tạo lại
+            hysteresis (float): Tỷ lệ tối thiểu để dời vùng
+
+        Returns:
+            bool: True nếu vùng mịn đã dời
+        """
+        xs = np.asarray(xs, dtype=np.float64).ravel()
+        ys = np.asarray(ys, dtype=np.float64).ravel()
+        if xs.size == 0:
+            return False
+        ix, iy = self.grid.cell_index(xs, ys)
+        counts = np.zeros((self.grid.grid_height, self.grid.grid_width), dtype=np.int64)
+        np.add.at(counts, (iy, ix), 1)
+
+        # Tổng theo cửa sổ rows x columns qua bảng tổng tích lũy 2D
+        summed = np.zeros((self.grid.grid_height + 1, self.grid.grid_width + 1), dtype=np.int64)
+        summed[1:, 1:] = counts.cumsum(axis=0).cumsum(axis=1)
+        windows = (summed[self.rows:, self.columns:] - summed[:-self.rows, self.columns:]
+                   - summed[self.rows:, :-self.columns] + summed[:-self.rows, :-self.columns])
+        row, column = np.unravel_index(np.argmax(windows), windows.shape)
+        current = windows[self.origin[1], self.origin[0]]
+        if windows[row, column] <= current * hysteresis:
+            return False
+        return self.move_to((column, row), coarse_temperature)
+
+    def step(self, coarse_before, coarse_after, wind_x, wind_y, dt, source=None):
+        """
+        Tiến lưới mịn theo một bước dt của lưới thô.
+
+        Args:
+            coarse_before (numpy.ndarray): Nhiệt độ thô đầu bước
+            coarse_after (numpy.ndarray): Nhiệt độ thô cuối bước
+            wind_x, wind_y (numpy.ndarray): Trường gió thô
+            dt (float): Bước thời gian của lưới thô
+            source (numpy.ndarray, optional): Số hạng nguồn thô (None nếu không có)
+
+        Returns:
+            int: Số bước con của lưới mịn
+        """
+        fine_wind_x = self._interpolate(wind_x)
+        fine_wind_y = self._interpolate(wind_y)
+        self.solver.set_source_term(None if source is None else self._interpolate(source).ravel())
+
+        # Số bước con để thỏa CFL của lưới mịn (dx nhỏ hơn refinement lần)
+        fine_dt = self.solver.compute_cfl_time_step(fine_wind_x.ravel(), fine_wind_y.ravel())
+        substeps = max(1, int(math.ceil(dt / fine_dt)))
+        sub_dt = dt / substeps
+
+        shape = (self.grid.grid_height, self.grid.grid_width)
+        halo_before = sample_bilinear(np.asarray(coarse_before).reshape(shape), self._halo_gx, self._halo_gy)
+        halo_after = sample_bilinear(np.asarray(coarse_after).reshape(shape), self._halo_gx, self._halo_gy)
+        fine_wind_x = fine_wind_x.ravel()
+        fine_wind_y = fine_wind_y.ravel()
+
+        temperature = self.temperature
+        for substep in range(substeps):
+            alpha = substep / substeps
+            temperature[self._halo] = (1.0 - alpha) * halo_before + alpha * halo_after
+            temperature = np.asarray(
+                self.solver.solve_rk4_step(temperature, fine_wind_x, fine_wind_y, sub_dt)
+            ).reshape(self.fine_height, self.fine_width)
+        temperature[self._halo] = halo_after
+        self.temperature = temperature
+        return substeps
+
+    def sample(self, xs, ys, fallback, mode='bilinear'):
+        """
+        Lấy mẫu nhiệt độ, dùng lưới mịn cho các điểm trong vùng mịn.
+
+        Args:
+            xs, ys: Tọa độ thế giới
+            fallback (numpy.ndarray): Giá trị từ lưới thô tại các điểm
+            mode (str): 'bilinear' hoặc 'nearest'
+
+        Returns:
+            numpy.ndarray: Giá trị tại các điểm, cùng hình dạng với xs
+        """
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        result = np.array(fallback, dtype=np.float64)
+        inside = self.contains(xs, ys)
+        if not inside.any():
+            return result
+        # Tọa độ theo ô mịn: ô thô origin bắt đầu tại chỉ số HALO_CELLS
+        fx = (xs[inside] / self.grid.cell_width - self.origin[0]) * self.refinement + HALO_CELLS - 0.5
+        fy = (ys[inside] / self.grid.cell_height - self.origin[1]) * self.refinement + HALO_CELLS - 0.5
+        result[inside] = sample_field(self.temperature, fx, fy, mode, periodic=False)
+        return result
@@ -0,0 +1,139 @@
+"""
+Nạp module C++ cpp_weather, hoặc solver NumPy thay thế khi không có bản biên dịch.
+
+Thứ tự tìm:
+    1. cpp_weather đã có trong sys.modules (đã nạp trước đó trong tiến trình).
+    2. Bản build trong CPP_WEATHER_CACHE_DIR/<mã băm mã nguồn>, do
+       build_cpp_module tạo ra. Mã băm gồm mã nguồn C++, setup.py và phiên
+       bản Python, nên sửa mã C++ mà chưa build lại thì không nạp nhầm bản cũ.
+    3. cpp_weather import được từ sys.path hoặc thư mục model/weather/python
+       (pip install ./model/weather/cpp, bản .pyd có sẵn).
+    4. numpy_weather (cùng giao diện, xem docstring của module đó) nếu
+       CPP_WEATHER_FALLBACK bật, kèm cảnh báo trong log.
+
+HƯỚNG DẪN SỬ DỤNG:
+    python -m model.weather.python.utils.build_cpp_module   # build vào cache
+    cpp_weather = load_cpp_weather()
+    solver = cpp_weather.Solver(width, height, dx, kappa)
+"""
+
+import hashlib
+import importlib
+import importlib.util
+import os
+import platform
+import sys
+import sysconfig
+
+from utils.config import CPP_WEATHER_CACHE_DIR, CPP_WEATHER_FALLBACK
+from utils.log import get_logger
+
+logger = get_logger("weather.native")
+
+CPP_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'cpp'))
+PYTHON_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'python'))
+MODULE_NAME = 'cpp_weather'
+
+
+def extension_filename():
+    """Tên file module mở rộng của phiên bản Python này, vd cpp_weather.cpython-311-x86_64-linux-gnu.so."""
+    return MODULE_NAME + sysconfig.get_config_var('EXT_SUFFIX')
+
+
+def source_files(cpp_dir=CPP_DIR):
+    """
+    Returns:
+        list: Đường dẫn các file quyết định nội dung module (header, mã nguồn, setup.py), đã sắp xếp
+    """
+    files = [os.path.join(cpp_dir, 'setup.py')]
+    for folder, extensions in (('include', ('.h', '.hpp')), ('src', ('.cpp',))):
+        directory = os.path.join(cpp_dir, folder)
+        files.extend(os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(extensions))
+    return sorted(files)
+
+
+def source_hash(cpp_dir=CPP_DIR):
+    """
+    Returns:
+        str: Mã băm 16 ký tự của mã nguồn C++, phiên bản Python và kiến trúc máy
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{extension_filename()}|{platform.machine()}".encode("utf-8"))
+    for path in source_files(cpp_dir):
+        digest.update(os.path.relpath(path, cpp_dir).replace(os.sep, '/').encode("utf-8"))
+        with open(path, 'rb') as stream:
+            digest.update(stream.read())
+    return digest.hexdigest()[:16]
+
+
+def cached_build_path(cache_dir=CPP_WEATHER_CACHE_DIR):
+    """Đường dẫn module đã build trong cache ứng với mã nguồn hiện tại."""
+    return os.path.join(os.path.expanduser(cache_dir), source_hash(), extension_filename())
+
+
+def _import_from_path(path):
+    spec = importlib.util.spec_from_file_location(MODULE_NAME, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    # Các lần import cpp_weather sau (kể cả trong tiến trình con fork ra) dùng lại bản này
+    sys.modules[MODULE_NAME] = module
+    return module
+
+
+def find_cpp_weather(cache_dir=CPP_WEATHER_CACHE_DIR, fallback=CPP_WEATHER_FALLBACK):
+    """
+    Tìm module cpp_weather theo thứ tự trong docstring của module này.
+
+    Args:
+        cache_dir (str, optional): Thư mục cache bản build; None để bỏ qua cache
+        fallback (bool): Trả về solver NumPy khi không nạp được bản C++
+
+    Returns:
+        module: cpp_weather, hoặc numpy_weather nếu dùng bản thay thế
+
+    Raises:
+        ImportError: Nếu không nạp được bản C++ và fallback tắt
+    """
+    module = sys.modules.get(MODULE_NAME)
+    if module is not None:
+        return module
+
+    errors = []
+    if cache_dir:
+        path = cached_build_path(cache_dir)
+        if os.path.exists(path):
+            try:
+                return _import_from_path(path)
+            except ImportError as e:
+                errors.append(f"{path}: {e}")
+
+    if PYTHON_DIR not in sys.path:
+        sys.path.append(PYTHON_DIR)
+    try:
+        return importlib.import_module(MODULE_NAME)
+    except ImportError as e:
+        errors.append(str(e))
+
+    message = "; ".join(errors)
+    if not fallback:
+        raise ImportError(message)
+    logger.warning("Không nạp được module C++ cpp_weather (%s), dùng solver NumPy chậm hơn. "
+                   "Build bằng: python -m model.weather.python.utils.build_cpp_module", message)
+    from . import numpy_weather
+    return numpy_weather
+
+
+_module = None
+
+
+def load_cpp_weather():
+    """find_cpp_weather với cấu hình mặc định, chỉ tìm một lần mỗi tiến trình."""
+    global _module
+    if _module is None:
+        _module = find_cpp_weather()
+    return _module
+
+
+def is_native(module):
+    """True nếu module là bản C++ biên dịch, không phải solver NumPy."""
+    return module.__name__ == MODULE_NAME
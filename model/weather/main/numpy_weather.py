@@ -0,0 +1,627 @@
+"""
+Bản NumPy của module C++ cpp_weather, được native.load_cpp_weather dùng tự
+động khi không nạp được bản biên dịch.
+
+Giao diện trùng với binding pybind11 ở những phần mô phỏng dùng đến:
+Solver/Solver32 (cùng Solver.Scheme), TemperatureField/TemperatureField32,
+WindField/WindField32 và GradientDirection. Solver đi đúng thứ tự phép toán
+của solver.cpp trên cùng kiểu số thực, nên với cùng nhiệt độ, gió và số hạng
+nguồn, một bước RK4 trùng từng bit với bản C++ biên dịch không gộp FMA
+(setup.py đặt -ffp-contract=off). Vì vậy Solver cũng là bản tham chiếu để
+kiểm tra bản C++ và các backend song song (tests/test_numpy_weather.py).
+
+Stencil tuần hoàn tính bằng cắt lát thay cho np.roll, mọi phép toán ghi vào
+bộ đệm dựng sẵn qua out=, nên một bước RK4 không cấp phát mảng trung gian nào
+ngoài kết quả trả về.
+
+Khác biệt với bản C++:
+- exp của NumPy có thể lệch vài ulp so với libm, nên nguồn nhiệt Gaussian
+  (add_heat_source, add_heat_emitter) và xoáy gió chỉ khớp gần đúng.
+- Xoáy gió rút từ numpy.random thay cho std::mt19937: cùng seed vẫn tái lập
+  được giữa các lần chạy, nhưng không cho cùng các xoáy như bản C++.
+- Chưa hỗ trợ sơ đồ IMEX, bán Lagrange, generate_perlin_field và
+  generate_vortex_field.
+"""
+
+import enum
+import json
+import math
+import threading
+
+import numpy as np
+
+# Bán kính cắt của nguồn nhiệt, tính theo số lần radius (HEAT_SOURCE_CUTOFF)
+HEAT_SOURCE_CUTOFF = 3
+# Bán kính cắt của xoáy gió, tính theo số lần radius (GAUSSIAN_CUTOFF_SIGMAS)
+GAUSSIAN_CUTOFF_SIGMAS = 4
+# Số hàng halo mỗi phía khi giải theo dải (SUBDOMAIN_HALO_ROWS)
+SUBDOMAIN_HALO_ROWS = 4
+
+
+class GradientDirection(enum.IntEnum):
+    NORTH_SOUTH = 0
+    SOUTH_NORTH = 1
+    EAST_WEST = 2
+    WEST_EAST = 3
+    RADIAL_IN = 4
+    RADIAL_OUT = 5
+
+
+# Như export_values() của binding: cpp_weather.NORTH_SOUTH, ...
+NORTH_SOUTH, SOUTH_NORTH, EAST_WEST, WEST_EAST, RADIAL_IN, RADIAL_OUT = GradientDirection
+
+
+class Scheme(enum.IntEnum):
+    EXPLICIT_RK4 = 0
+    IMEX = 1
+    SEMI_LAGRANGIAN = 2
+
+
+def _reject_scheme(scheme):
+    """Báo lỗi cho sơ đồ Solver NumPy chưa hỗ trợ (mọi sơ đồ trừ EXPLICIT_RK4)."""
+    raise ValueError(f"Solver NumPy chỉ hỗ trợ EXPLICIT_RK4, không hỗ trợ {Scheme(int(scheme)).name}")
+
+
+def _add_gaussian(field, x, y, strength, radius):
+    """
+    field (H, W) += strength*exp(-d²/(2*radius²)) trong vùng d <= HEAT_SOURCE_CUTOFF*radius
+    (TemperatureField::addGaussian).
+    """
+    real = field.dtype.type
+    x, y, strength, radius = real(x), real(y), real(strength), real(radius)
+    if radius <= 0:
+        return
+    height, width = field.shape
+    cutoff = real(HEAT_SOURCE_CUTOFF) * radius
+    inverse_two_radius_squared = real(1.0) / (real(2.0) * radius * radius)
+    x_min, x_max = max(0, int(math.ceil(x - cutoff))), min(width - 1, int(math.floor(x + cutoff)))
+    y_min, y_max = max(0, int(math.ceil(y - cutoff))), min(height - 1, int(math.floor(y + cutoff)))
+    if x_min > x_max or y_min > y_max:
+        return
+    dx = np.arange(x_min, x_max + 1).astype(field.dtype) - x
+    dy = (np.arange(y_min, y_max + 1).astype(field.dtype) - y)[:, None]
+    distance_squared = dx * dx + dy * dy
+    region = field[y_min:y_max + 1, x_min:x_max + 1]
+    np.add(region, strength * np.exp(-distance_squared * inverse_two_radius_squared), out=region,
+           where=distance_squared <= cutoff * cutoff)
+
+
+def _neighbour_op(ufunc, field, out, axis):
+    """
+    out[i] = ufunc(field[i+1], field[i-1]) theo trục axis, chỉ số quấn tuần
+    hoàn bằng cắt lát (không tạo bản sao như np.roll).
+    """
+    def along(index):
+        return (slice(None), index) if axis == 1 else (index, slice(None))
+
+    size = field.shape[axis]
+    if size < 3:
+        indices = np.arange(size)
+        ufunc(np.take(field, (indices + 1) % size, axis=axis), np.take(field, (indices - 1) % size, axis=axis),
+              out=out)
+        return out
+    ufunc(field[along(slice(2, None))], field[along(slice(None, -2))], out=out[along(slice(1, -1))])
+    ufunc(field[along(slice(1, 2))], field[along(slice(-1, None))], out=out[along(slice(None, 1))])
+    ufunc(field[along(slice(None, 1))], field[along(slice(-2, -1))], out=out[along(slice(-1, None))])
+    return out
+
+
+def _add_row_shifted(out, field, shift):
+    """out[y] += field[(y + shift) % H] với shift là 1 hoặc -1."""
+    if shift > 0:
+        out[:-1] += field[1:]
+        out[-1] += field[0]
+    else:
+        out[1:] += field[:-1]
+        out[0] += field[-1]
+
+
+class _Workspace:
+    """Bộ đệm dựng sẵn cho một kích thước lưới, dùng lại giữa các bước giải."""
+
+    def __init__(self, shape, dtype, strip=False):
+        (self.k1, self.k2, self.k3, self.k4, self.stage, self.grad_x, self.grad_y, self.laplacian,
+         self.scratch, self.negative_wind_x) = (np.empty(shape, dtype=dtype) for _ in range(10))
+        if strip:
+            # Bản sao dải hàng kèm halo của các trường vào
+            self.temperature, self.wind_x, self.wind_y, self.source = (
+                np.empty(shape, dtype=dtype) for _ in range(4))
+
+
+def _read_only(array):
+    """View chỉ đọc, không sao chép (như get_*_view của binding)."""
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+
+class _TemperatureField:
+    """Trường nhiệt độ (H, W), xem TemperatureFieldT trong temperature_field.h."""
+
+    _real = np.float64
+
+    def __init__(self, width, height):
+        self._width = int(width)
+        self._height = int(height)
+        self._temperature = np.zeros((self._height, self._width), dtype=self._real)
+
+    def set_uniform(self, temperature):
+        self._temperature.fill(self._real(temperature))
+
+    def set_gradient(self, min_temp, max_temp, direction):
+        real = self._real
+        min_temp, max_temp = real(min_temp), real(max_temp)
+        ys = np.arange(self._height).astype(real)[:, None]
+        xs = np.arange(self._width).astype(real)[None, :]
+        direction = GradientDirection(int(direction))
+        if direction == GradientDirection.NORTH_SOUTH:
+            position = ys / real(self._height - 1)
+        elif direction == GradientDirection.SOUTH_NORTH:
+            position = real(1.0) - ys / real(self._height - 1)
+        elif direction == GradientDirection.EAST_WEST:
+            position = real(1.0) - xs / real(self._width - 1)
+        elif direction == GradientDirection.WEST_EAST:
+            position = xs / real(self._width - 1)
+        else:
+            center_x, center_y = real(self._width) / real(2.0), real(self._height) / real(2.0)
+            dx, dy = xs - center_x, ys - center_y
+            distance = np.sqrt(dx * dx + dy * dy) / np.sqrt(center_x * center_x + center_y * center_y)
+            position = distance if direction == GradientDirection.RADIAL_IN else real(1.0) - distance
+        self._temperature[...] = min_temp + position * (max_temp - min_temp)
+
+    def set_custom_gradient(self, min_temp, max_temp, angle_in_degrees):
+        real = self._real
+        angle = real(angle_in_degrees * math.pi / 180.0)
+        direction_x, direction_y = real(math.cos(angle)), real(math.sin(angle))
+        corners = [(0, 0), (self._width - 1, 0), (0, self._height - 1), (self._width - 1, self._height - 1)]
+        projections = [real(x) * direction_x + real(y) * direction_y for x, y in corners]
+        min_projection = min(projections)
+        projection_range = max(projections) - min_projection
+        ys = np.arange(self._height).astype(real)[:, None]
+        xs = np.arange(self._width).astype(real)[None, :]
+        position = (xs * direction_x + ys * direction_y - min_projection) / projection_range
+        self._temperature[...] = real(min_temp) + position * (real(max_temp) - real(min_temp))
+
+    def add_heat_source(self, x, y, strength, radius):
+        _add_gaussian(self._temperature, x, y, strength, radius)
+
+    def add_heat_sources(self, xs, ys, strengths, radii):
+        xs, ys, strengths, radii = (np.asarray(values, dtype=self._real).ravel()
+                                    for values in (xs, ys, strengths, radii))
+        if not len(xs) == len(ys) == len(strengths) == len(radii):
+            raise ValueError("add_heat_sources: xs, ys, strengths, radii phải cùng kích thước")
+        # Các nguồn có thể chồng lên nhau nên cộng lần lượt như bản C++
+        for x, y, strength, radius in zip(xs, ys, strengths, radii):
+            _add_gaussian(self._temperature, x, y, strength, radius)
+
+    def get_temperature(self):
+        return self._temperature.copy()
+
+    def get_temperature_view(self):
+        return _read_only(self._temperature)
+
+    def set_temperature(self, temperature):
+        temperature = np.asarray(temperature, dtype=self._real)
+        if temperature.size != self._temperature.size:
+            return False
+        # Ghi tại chỗ để các view đã phát vẫn phản ánh trường mới
+        self._temperature.reshape(-1)[:] = temperature.ravel()
+        return True
+
+    def get_value_at(self, x, y):
+        if not (0 <= x < self._width and 0 <= y < self._height):
+            raise IndexError("TemperatureField::getValueAt - Tọa độ ngoài phạm vi")
+        return float(self._temperature[y, x])
+
+    def get_width(self):
+        return self._width
+
+    def get_height(self):
+        return self._height
+
+
+class TemperatureField(_TemperatureField):
+    _real = np.float64
+
+
+class TemperatureField32(_TemperatureField):
+    _real = np.float32
+
+
+class _WindField:
+    """
+    Trường gió từ các xoáy Gaussian trôi và tắt dần, xem WindFieldT trong
+    wind_field.h. Mỗi xoáy là một hàng (x, y, vx, vy, strength, radius, age).
+    """
+
+    _real = np.float64
+
+    def __init__(self, width, height, seed=None):
+        self._width = int(width)
+        self._height = int(height)
+        # Không có seed: lấy từ entropy hệ điều hành, mỗi lần chạy một khác
+        self._rng = np.random.Generator(np.random.PCG64(seed))
+        self._wind_x = np.zeros(self._width * self._height, dtype=self._real)
+        self._wind_y = np.zeros_like(self._wind_x)
+        self._vortices = np.zeros((0, 7), dtype=self._real)
+        self._mean_strength = self._real(0.0)
+        self._mean_radius = self._real(1.0)
+        self._drift_speed = self._real(0.0)
+        self._lifetime = self._real(100.0)
+
+    def seed(self, seed):
+        self._rng.bit_generator.state = np.random.PCG64(seed).state
+
+    def _spawn(self, ages):
+        """Sinh ngẫu nhiên len(ages) xoáy mới (WindFieldT::spawnVortex)."""
+        count = len(ages)
+        rng = self._rng
+        strength = rng.normal(self._mean_strength, abs(self._mean_strength) * 0.3, count)
+        # Dấu của cường độ quyết định chiều quay
+        strength = np.where(rng.random(count) < 0.5, -strength, strength)
+        angle = rng.uniform(0.0, 2.0 * math.pi, count)
+        vortices = np.column_stack([
+            rng.uniform(0.0, self._width - 1, count),
+            rng.uniform(0.0, self._height - 1, count),
+            self._drift_speed * np.cos(angle),
+            self._drift_speed * np.sin(angle),
+            strength,
+            np.maximum(1.0, rng.normal(self._mean_radius, abs(self._mean_radius) * 0.2, count)),
+            ages,
+        ])
+        return vortices.astype(self._real)
+
+    def generate_gaussian_field(self, num_vortices, strength, radius):
+        self._mean_strength = self._real(strength)
+        self._mean_radius = self._real(radius)
+        # Tuổi nằm giữa vòng đời để cường độ đầy đủ ngay từ đầu và các xoáy
+        # không cùng hết hạn một lúc
+        count = max(0, int(num_vortices))
+        self._vortices = self._spawn(self._rng.uniform(0.2 * self._lifetime, 0.8 * self._lifetime, count))
+        self._rebuild()
+
+    def set_evolution(self, drift_speed, lifetime):
+        self._drift_speed = self._real(drift_speed)
+        self._lifetime = self._real(max(1e-6, lifetime))
+        velocity = self._vortices[:, 2:4]
+        speed = np.sqrt((velocity * velocity).sum(axis=1))
+        moving = speed > 0
+        velocity[moving] *= (self._drift_speed / speed[moving])[:, None]
+        np.minimum(self._vortices[:, 6], self._real(0.8) * self._lifetime, out=self._vortices[:, 6])
+
+    def evolve(self, dt):
+        dt = self._real(dt)
+        if not len(self._vortices) or dt <= 0:
+            return
+        self._vortices[:, 0:2] += self._vortices[:, 2:4] * dt
+        self._vortices[:, 6] += dt
+        # Hết vòng đời: cường độ đã về 0 nên thay xoáy mới không gây nhảy cóc
+        expired = self._vortices[:, 6] >= self._lifetime
+        if expired.any():
+            self._vortices[expired] = self._spawn(np.zeros(int(expired.sum())))
+        self._rebuild()
+
+    def get_vortex_count(self):
+        return len(self._vortices)
+
+    def _envelope(self, age):
+        """Hệ số cường độ theo tuổi: tăng mượt trong 20% đầu, giảm mượt trong 20% cuối vòng đời."""
+        ramp = self._real(0.2) * self._lifetime
+        t = np.where(age < ramp, age / ramp, np.where(age > self._lifetime - ramp, (self._lifetime - age) / ramp, 1.0))
+        t = np.clip(t, 0.0, 1.0)
+        return t * t * (3 - 2 * t)
+
+    def _rebuild(self):
+        """Dựng lại trường gió, mỗi xoáy chỉ duyệt vùng bao quanh bán kính cắt."""
+        real = self._real
+        self._wind_x.fill(0.0)
+        self._wind_y.fill(0.0)
+        wind_x = self._wind_x.reshape(self._height, self._width)
+        wind_y = self._wind_y.reshape(self._height, self._width)
+        strengths = self._vortices[:, 4] * self._envelope(self._vortices[:, 6])
+        for (x, y, _, _, _, radius, _), strength in zip(self._vortices, strengths.astype(real)):
+            if strength == 0:
+                continue
+            cutoff = real(GAUSSIAN_CUTOFF_SIGMAS) * radius
+            x_min, x_max = max(0, int(math.ceil(x - cutoff))), min(self._width - 1, int(math.floor(x + cutoff)))
+            y_min, y_max = max(0, int(math.ceil(y - cutoff))), min(self._height - 1, int(math.floor(y + cutoff)))
+            if x_min > x_max or y_min > y_max:
+                continue
+            dx = np.arange(x_min, x_max + 1).astype(real) - x
+            dy = (np.arange(y_min, y_max + 1).astype(real) - y)[:, None]
+            distance_squared = dx * dx + dy * dy
+            inside = distance_squared <= cutoff * cutoff
+            distance = np.sqrt(distance_squared) + real(1e-10)
+            factor = strength * np.exp(-distance_squared * (real(1.0) / (real(2.0) * radius * radius)))
+            # Góc 90 độ để tạo chuyển động xoáy
+            for field, component in ((wind_x, -dy * factor / distance), (wind_y, dx * factor / distance)):
+                region = field[y_min:y_max + 1, x_min:x_max + 1]
+                np.add(region, component, out=region, where=inside)
+
+    def get_wind_x(self):
+        return self._wind_x.copy()
+
+    def get_wind_y(self):
+        return self._wind_y.copy()
+
+    def get_wind_x_view(self):
+        return _read_only(self._wind_x)
+
+    def get_wind_y_view(self):
+        return _read_only(self._wind_y)
+
+    def get_state(self):
+        return {
+            "wind_x": self._wind_x.copy(),
+            "wind_y": self._wind_y.copy(),
+            "vortices": self._vortices.copy(),
+            "evolution": np.array([self._mean_strength, self._mean_radius, self._drift_speed, self._lifetime],
+                                  dtype=self._real),
+            "rng": json.dumps(self._rng.bit_generator.state),
+        }
+
+    def set_state(self, state):
+        wind_x = np.asarray(state["wind_x"], dtype=self._real).ravel()
+        wind_y = np.asarray(state["wind_y"], dtype=self._real).ravel()
+        if wind_x.size != self._wind_x.size or wind_y.size != self._wind_y.size:
+            raise ValueError("set_state: wind_x, wind_y phải có width*height phần tử")
+        vortices = np.asarray(state["vortices"], dtype=self._real)
+        if vortices.size % 7:
+            raise ValueError("set_state: vortices phải có 7 cột")
+        evolution = np.asarray(state["evolution"], dtype=self._real).ravel()
+        if evolution.size != 4:
+            raise ValueError("set_state: evolution phải có 4 phần tử")
+        try:
+            rng_state = json.loads(state["rng"])
+            rng = np.random.Generator(np.random.PCG64())
+            rng.bit_generator.state = rng_state
+        except (TypeError, ValueError, KeyError) as e:
+            raise ValueError("set_state: trạng thái rng không hợp lệ") from e
+        self._wind_x[:] = wind_x
+        self._wind_y[:] = wind_y
+        self._vortices = vortices.reshape(-1, 7).copy()
+        self._mean_strength, self._mean_radius, self._drift_speed, self._lifetime = evolution
+        self._rng.bit_generator.state = rng_state
+
+
+class WindField(_WindField):
+    _real = np.float64
+
+
+class WindField32(_WindField):
+    _real = np.float32
+
+
+class _Solver:
+    """
+    Solver đối lưu-khuếch tán RK4 trên lưới tuần hoàn, xem SolverT trong
+    solver.h. Mảng vào được chuyển sang kiểu số thực của solver như binding.
+    """
+
+    _real = np.float64
+    Scheme = Scheme
+    EXPLICIT_RK4, IMEX, SEMI_LAGRANGIAN = Scheme
+
+    def __init__(self, width, height, dx, kappa, parallel=True):
+        self._width = int(width)
+        self._height = int(height)
+        self._dx = self._real(dx)
+        self._kappa = self._real(kappa)
+        self._scheme = Scheme.EXPLICIT_RK4
+        self._maccormack = False
+        # Mã -> (x, y, rate, radius), giữ thứ tự thêm như std::vector
+        self._emitters = {}
+        self._next_emitter_id = 0
+        self._source = None
+        self._stats = None
+        # Bộ đệm theo luồng: ThreadPoolBackend gọi solve_subdomain_into song song trên cùng solver
+        self._local = threading.local()
+
+    def set_scheme(self, scheme):
+        if Scheme(int(scheme)) != Scheme.EXPLICIT_RK4:
+            _reject_scheme(scheme)
+        self._scheme = Scheme.EXPLICIT_RK4
+
+    def get_scheme(self):
+        return self._scheme
+
+    def set_maccormack(self, enabled):
+        self._maccormack = bool(enabled)
+
+    def is_maccormack(self):
+        return self._maccormack
+
+    def add_heat_emitter(self, x, y, rate, radius):
+        emitter_id = self._next_emitter_id
+        self._next_emitter_id += 1
+        self._emitters[emitter_id] = (x, y, rate, radius)
+        self._rebuild_source_term()
+        return emitter_id
+
+    def move_heat_emitter(self, emitter_id, x, y):
+        if emitter_id not in self._emitters:
+            return False
+        _, _, rate, radius = self._emitters[emitter_id]
+        self._emitters[emitter_id] = (x, y, rate, radius)
+        self._rebuild_source_term()
+        return True
+
+    def remove_heat_emitter(self, emitter_id):
+        if self._emitters.pop(emitter_id, None) is None:
+            return False
+        self._rebuild_source_term()
+        return True
+
+    def clear_heat_emitters(self):
+        self._emitters.clear()
+        self._source = None
+
+    def get_heat_emitter_count(self):
+        return len(self._emitters)
+
+    def _rebuild_source_term(self):
+        if not self._emitters:
+            self._source = None
+            return
+        self._source = np.zeros((self._height, self._width), dtype=self._real)
+        for x, y, rate, radius in self._emitters.values():
+            _add_gaussian(self._source, x, y, rate, radius)
+
+    def get_source_term(self):
+        return None if self._source is None else self._source.ravel().copy()
+
+    def set_source_term(self, source):
+        if source is None:
+            self._source = None
+            return
+        source = np.asarray(source, dtype=self._real)
+        if source.size and source.size != self._width * self._height:
+            raise ValueError("Solver::setSourceTerm - Kích thước số hạng nguồn không khớp lưới")
+        self._source = source.reshape(self._height, self._width).copy() if source.size else None
+
+    def compute_cfl_time_step(self, wind_x, wind_y):
+        real = self._real
+        wind_x = np.asarray(wind_x, dtype=real)
+        wind_y = np.asarray(wind_y, dtype=real)
+        max_velocity = np.sqrt(wind_x * wind_x + wind_y * wind_y).max(initial=real(0.0))
+        max_velocity = max(max_velocity, real(1e-10))
+        # Điều kiện CFL với hệ số an toàn 0.8: đối lưu dt <= dx/|u|, khuếch tán dt <= dx²/(2*kappa)
+        dt_advection = real(0.8) * self._dx / max_velocity
+        dt_diffusion = real(0.8) * self._dx * self._dx / (real(2.0) * self._kappa)
+        return float(min(dt_advection, dt_diffusion))
+
+    def _workspace(self, shape, strip=False):
+        """Bộ đệm của luồng hiện tại cho lưới kích thước shape (tạo lần đầu dùng)."""
+        workspaces = getattr(self._local, 'workspaces', None)
+        if workspaces is None:
+            workspaces = self._local.workspaces = {}
+        workspace = workspaces.get((shape, strip))
+        if workspace is None:
+            workspace = workspaces[(shape, strip)] = _Workspace(shape, self._real, strip)
+        return workspace
+
+    def _time_derivative(self, temperature, negative_wind_x, wind_y, source, out, workspace):
+        """
+        out = dT/dt = -u*dT/dx - v*dT/dy + kappa*∇²T + S, sai phân trung tâm tuần hoàn.
+        Thứ tự phép toán giống SolverT::computeTimeDerivative để trùng từng bit.
+        """
+        real = self._real
+        two_dx = real(2.0) * self._dx
+        grad_x = _neighbour_op(np.subtract, temperature, workspace.grad_x, axis=1)
+        grad_x /= two_dx
+        grad_y = _neighbour_op(np.subtract, temperature, workspace.grad_y, axis=0)
+        grad_y /= two_dx
+        # ((T[x+1] + T[x-1]) + T[y+1]) + T[y-1] - 4*T
+        laplacian = _neighbour_op(np.add, temperature, workspace.laplacian, axis=1)
+        _add_row_shifted(laplacian, temperature, 1)
+        _add_row_shifted(laplacian, temperature, -1)
+        laplacian -= np.multiply(temperature, real(4.0), out=workspace.scratch)
+        laplacian /= self._dx * self._dx
+
+        np.multiply(negative_wind_x, grad_x, out=out)
+        out -= np.multiply(wind_y, grad_y, out=workspace.scratch)
+        out += np.multiply(laplacian, self._kappa, out=workspace.scratch)
+        if source is not None:
+            out += source
+        return out
+
+    def _rk4_increment(self, temperature, wind_x, wind_y, dt, source, workspace):
+        """
+        Returns:
+            numpy.ndarray: dt/6*(k1 + 2*k2 + 2*k3 + k4), nằm trong bộ đệm workspace.stage
+        """
+        real = self._real
+        half_dt = dt * real(0.5)
+        negative_wind_x = np.negative(wind_x, out=workspace.negative_wind_x)
+        self._time_derivative(temperature, negative_wind_x, wind_y, source, workspace.k1, workspace)
+        stage = workspace.stage
+        for previous, current, factor in ((workspace.k1, workspace.k2, half_dt),
+                                          (workspace.k2, workspace.k3, half_dt),
+                                          (workspace.k3, workspace.k4, dt)):
+            np.multiply(previous, factor, out=stage)
+            stage += temperature
+            self._time_derivative(stage, negative_wind_x, wind_y, source, current, workspace)
+
+        increment = np.multiply(workspace.k2, real(2.0), out=stage)
+        increment += workspace.k1
+        increment += np.multiply(workspace.k3, real(2.0), out=workspace.scratch)
+        increment += workspace.k4
+        increment *= dt / real(6.0)
+        return increment
+
+    def _fields(self, temperature, wind_x, wind_y):
+        shape = (self._height, self._width)
+        return (np.asarray(temperature, dtype=self._real).reshape(shape),
+                np.asarray(wind_x, dtype=self._real).reshape(shape),
+                np.asarray(wind_y, dtype=self._real).reshape(shape))
+
+    def _store_stats(self, temperature):
+        values = temperature.astype(np.float64, copy=False)
+        self._stats = (float(values.min()), float(values.max()), float(values.sum()),
+                       float(np.dot(values.ravel(), values.ravel())), values.size)
+
+    def solve_rk4_step(self, temp, wind_x, wind_y, dt):
+        temperature, wind_x, wind_y = self._fields(temp, wind_x, wind_y)
+        workspace = self._workspace(temperature.shape)
+        result = temperature + self._rk4_increment(temperature, wind_x, wind_y, self._real(dt), self._source,
+                                                   workspace)
+        self._store_stats(result)
+        return result
+
+    def solve_step(self, temp, wind_x, wind_y, dt):
+        return self.solve_rk4_step(temp, wind_x, wind_y, dt)
+
+    def solve_imex_step(self, temp, wind_x, wind_y, dt):
+        _reject_scheme(Scheme.IMEX)
+
+    def solve_semi_lagrangian_step(self, temp, wind_x, wind_y, dt):
+        _reject_scheme(Scheme.SEMI_LAGRANGIAN)
+
+    def _solve_rows(self, temperature, wind_x, wind_y, start_row, end_row, dt, out):
+        """Giải dải [start_row, end_row] kèm halo tuần hoàn, ghi các hàng bên trong vào out."""
+        if start_row < 0 or end_row >= self._height or start_row > end_row:
+            raise ValueError(f"Phạm vi hàng không hợp lệ: [{start_row}, {end_row}]")
+        halo = SUBDOMAIN_HALO_ROWS
+        rows = np.arange(start_row - halo, end_row + halo + 1)
+        workspace = self._workspace((len(rows), self._width), strip=True)
+        for field, buffer in ((temperature, workspace.temperature), (wind_x, workspace.wind_x),
+                              (wind_y, workspace.wind_y), (self._source, workspace.source)):
+            if field is not None:
+                np.take(field, rows, axis=0, mode='wrap', out=buffer)
+        source = None if self._source is None else workspace.source
+        increment = self._rk4_increment(workspace.temperature, workspace.wind_x, workspace.wind_y,
+                                        self._real(dt), source, workspace)
+        np.add(workspace.temperature[halo:-halo], increment[halo:-halo], out=out)
+
+    def solve_subdomain(self, temp, wind_x, wind_y, start_row, end_row, dt):
+        temperature, wind_x, wind_y = self._fields(temp, wind_x, wind_y)
+        result = temperature.copy()
+        self._solve_rows(temperature, wind_x, wind_y, start_row, end_row, dt, result[start_row:end_row + 1])
+        return result
+
+    def solve_subdomain_into(self, temp, wind_x, wind_y, out, start_row, end_row, dt):
+        size = self._width * self._height
+        if any(np.size(array) != size for array in (temp, wind_x, wind_y, out)):
+            raise ValueError("solve_subdomain_into: temp, wind_x, wind_y, out phải có width*height phần tử")
+        if out.dtype != self._real or not out.flags.c_contiguous:
+            raise TypeError("solve_subdomain_into: out phải là mảng C liên tục cùng kiểu số thực với solver")
+        temperature, wind_x, wind_y = self._fields(temp, wind_x, wind_y)
+        rows = out.reshape(self._height, self._width)[start_row:end_row + 1]
+        self._solve_rows(temperature, wind_x, wind_y, start_row, end_row, dt, rows)
+
+    def last_stats(self):
+        if self._stats is None:
+            return None
+        minimum, maximum, total, total_squares, count = self._stats
+        mean = total / count
+        variance = max(0.0, total_squares / count - mean * mean)
+        return {"min": minimum, "max": maximum, "mean": mean, "std": math.sqrt(variance),
+                "sum": total, "sum_sq": total_squares, "count": count}
+
+
+class Solver(_Solver):
+    _real = np.float64
+
+
+class Solver32(_Solver):
+    _real = np.float32
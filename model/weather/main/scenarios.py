@@ -0,0 +1,177 @@
+"""
+Các kịch bản nhiệt độ ban đầu, đăng ký theo tên, kèm cache trên đĩa.
+
+Mỗi kịch bản là một hàm builder(field, rng) dựng trạng thái ban đầu lên một
+TemperatureField C++ bằng các phép NumPy vector hóa (set_temperature) hoặc
+kernel C++ (set_uniform, add_heat_sources); rng là numpy.random.Generator nếu
+kịch bản đăng ký seeded=True, ngược lại None.
+
+build_scenario lưu kết quả vào cache_dir theo khóa (tên, phiên bản, kích
+thước lưới, kiểu số thực, seed), nên với lưới lớn lần khởi động sau chỉ còn
+là đọc một file .npy. Lưới nhỏ hơn min_cells ô dựng lại luôn vì nhanh hơn
+đọc đĩa. Sửa builder thì tăng version khi đăng ký để bỏ các bản cache cũ.
+
+HƯỚNG DẪN SỬ DỤNG:
+    @register_scenario('hot_spot', seeded=True)
+    def build_hot_spot(field, rng):
+        field.set_uniform(INITIAL_TEMPERATURE)
+        ...
+    build_scenario(weather.temp_field, 'hot_spot', seed=seed_for('scenario'))
+"""
+
+import os
+from collections import namedtuple
+
+import numpy as np
+
+from utils.config import INITIAL_TEMPERATURE, SCENARIO_CACHE_DIR, SCENARIO_CACHE_MIN_CELLS
+from utils.log import get_logger
+
+logger = get_logger("weather.scenarios")
+
+Scenario = namedtuple("Scenario", ["name", "builder", "version", "seeded"])
+
+_SCENARIOS = {}
+
+
+def register_scenario(name, version=1, seeded=False):
+    """
+    Decorator đăng ký builder(field, rng) dưới tên name.
+
+    Args:
+        name (str): Tên kịch bản (--heat_scenario)
+        version (int): Phiên bản builder, là một phần của khóa cache
+        seeded (bool): Builder có dùng rng; khi đó seed là một phần của khóa cache
+
+    Raises:
+        ValueError: Nếu tên đã được đăng ký
+    """
+    def decorator(builder):
+        if name in _SCENARIOS:
+            raise ValueError(f"Kịch bản '{name}' đã được đăng ký")
+        _SCENARIOS[name] = Scenario(name, builder, version, seeded)
+        return builder
+    return decorator
+
+
+def scenario_names():
+    """
+    Returns:
+        list: Tên các kịch bản đã đăng ký, theo thứ tự đăng ký
+    """
+    return list(_SCENARIOS)
+
+
+def get_scenario(name):
+    """
+    Returns:
+        Scenario: Kịch bản đã đăng ký
+
+    Raises:
+        ValueError: Nếu tên chưa được đăng ký
+    """
+    try:
+        return _SCENARIOS[name]
+    except KeyError:
+        raise ValueError(f"Kịch bản nhiệt không hợp lệ: {name}. Chọn một trong: {scenario_names()}") from None
+
+
+def scenario_cache_path(cache_dir, scenario, width, height, dtype, seed=None):
+    """Đường dẫn file cache của một kịch bản ứng với khóa của nó."""
+    seed_part = f"-seed{seed}" if scenario.seeded else ""
+    name = f"{scenario.name}-v{scenario.version}-{width}x{height}-{np.dtype(dtype).name}{seed_part}.npy"
+    return os.path.join(os.path.expanduser(cache_dir), name)
+
+
+def build_scenario(field, name, seed=None, cache_dir=SCENARIO_CACHE_DIR, min_cells=SCENARIO_CACHE_MIN_CELLS):
+    """
+    Dựng kịch bản name lên field, đọc từ cache nếu đã có.
+
+    Args:
+        field: TemperatureField hoặc TemperatureField32 của module C++
+        name (str): Tên kịch bản
+        seed (int, optional): Seed cho kịch bản seeded; None thì không dùng cache cho kịch bản đó
+        cache_dir (str, optional): Thư mục cache; None để tắt cache
+        min_cells (int): Chỉ dùng cache khi lưới có ít nhất ngần này ô
+
+    Returns:
+        bool: True nếu trạng thái được đọc từ cache
+
+    Raises:
+        ValueError: Nếu tên chưa được đăng ký
+    """
+    scenario = get_scenario(name)
+    width, height = field.get_width(), field.get_height()
+    path = None
+    if cache_dir and width * height >= min_cells and (seed is not None or not scenario.seeded):
+        path = scenario_cache_path(cache_dir, scenario, width, height,
+                                   field.get_temperature_view().dtype, seed)
+        try:
+            cached = np.load(path, allow_pickle=False)
+            if cached.shape == (height, width):
+                field.set_temperature(cached.ravel())
+                return True
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning("Bỏ qua cache kịch bản hỏng %s: %s", path, e)
+
+    rng = np.random.default_rng(seed) if scenario.seeded else None
+    scenario.builder(field, rng)
+
+    if path is not None:
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temporary = f"{path}.{os.getpid()}.tmp"
+            with open(temporary, "wb") as stream:
+                np.save(stream, field.get_temperature())
+            os.replace(temporary, path)
+        except OSError as e:
+            logger.warning("Không ghi được cache kịch bản %s: %s", path, e)
+    return False
+
+
+@register_scenario('default')
+def build_default(field, rng):
+    """Gradient Bắc (15°C) -> Nam (30°C) cùng năm nguồn nhiệt ở bốn góc và trung tâm."""
+    width, height = field.get_width(), field.get_height()
+    # Cùng công thức với set_gradient(15, 30, NORTH_SOUTH): y / (height - 1)
+    rows = 15.0 + 15.0 * np.arange(height) / max(height - 1, 1)
+    field.set_temperature(np.repeat(rows, width))
+    xs = np.array([int(width * 0.1), int(width * 0.1), int(width * 0.9), int(width * 0.9), width // 2],
+                  dtype=float)
+    ys = np.array([int(height * 0.1), int(height * 0.9), int(height * 0.1), int(height * 0.9), height // 2],
+                  dtype=float)
+    field.add_heat_sources(xs, ys, np.full(len(xs), 15.0), np.full(len(xs), float(width // 8)))
+
+
+@register_scenario('checkerboard')
+def build_checkerboard(field, rng):
+    """Mẫu bàn cờ 30°C / 15°C theo từng ô."""
+    rows, columns = np.indices((field.get_height(), field.get_width()))
+    field.set_temperature(np.where((rows + columns) % 2 == 0, 30.0, 15.0).ravel())
+
+
+@register_scenario('random_sources', seeded=True)
+def build_random_sources(field, rng):
+    """Mười nguồn nhiệt ở vị trí ngẫu nhiên trên nền INITIAL_TEMPERATURE."""
+    width, height = field.get_width(), field.get_height()
+    field.set_uniform(INITIAL_TEMPERATURE)
+    xs = rng.integers(0, width, 10).astype(float)
+    ys = rng.integers(0, height, 10).astype(float)
+    field.add_heat_sources(xs, ys, np.full(10, 15.0), np.full(10, float(width // 12)))
+
+
+@register_scenario('stripe')
+def build_stripe(field, rng):
+    """Một dải 35°C ở một phần ba giữa theo chiều ngang, trên nền INITIAL_TEMPERATURE."""
+    width, height = field.get_width(), field.get_height()
+    temperature = np.full((height, width), INITIAL_TEMPERATURE)
+    temperature[:, width // 3:width // 3 * 2] = 35.0
+    field.set_temperature(temperature.ravel())
+
+
+@register_scenario('uniform')
+def build_uniform(field, rng):
+    """Toàn bộ trường đồng nhất 25°C."""
+    field.set_uniform(25.0)
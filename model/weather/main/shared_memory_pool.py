@@ -0,0 +1,230 @@
+"""
+Pool tiến trình bền vững giải mô hình thời tiết theo phân rã miền (theo hàng),
+dữ liệu dùng chung qua multiprocessing.shared_memory.
+
+Mỗi worker gắn vào các khối bộ nhớ chung (hai bộ đệm nhiệt độ luân phiên,
+gió X, gió Y, số hạng nguồn) đúng một lần khi khởi động và giữ một cpp_weather.Solver riêng
+cho dải hàng của mình. Mỗi bước chỉ gửi thông điệp (dt, step) qua Pipe, worker
+đọc dải (kèm vùng halo, xem decomposition.py) từ bộ đệm nguồn và ghi kết quả
+vào bộ đệm đích, nên IPC mỗi bước chỉ vài chục byte thay vì vài lưới đầy đủ.
+
+HƯỚNG DẪN SỬ DỤNG:
+    with SharedMemoryWeatherPool(width, height, dx, kappa, num_workers=4) as pool:
+        pool.set_temperature(temperature)
+        pool.set_wind(wind_x, wind_y)
+        for _ in range(100):
+            pool.step(dt)
+        result = pool.get_temperature()
+
+Chỉ hỗ trợ sơ đồ RK4 tường minh: IMEX và bán Lagrange ghép toàn cột/toàn
+lưới nên không phân rã theo dải được.
+"""
+
+import os
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .decomposition import split_rows, strip_height, halo_rows, solve_strip
+from .native import load_cpp_weather
+
+
+def _pool_worker(conn, block_names, width, height, dtype_name, dx, kappa, start_row, end_row):
+    """
+    Vòng lặp của một worker: gắn vào bộ nhớ chung một lần, giữ Solver cho dải
+    [start_row, end_row] và giải mỗi khi nhận (dt, step); ('source', có_nguồn)
+    để nạp lại số hạng nguồn từ bộ nhớ chung; None để dừng.
+    """
+    # Mỗi tiến trình đã là một luồng song song, tránh OpenMP tạo thêm luồng
+    os.environ['OMP_NUM_THREADS'] = '1'
+    cpp_weather = load_cpp_weather()
+
+    dtype = np.dtype(dtype_name)
+    blocks = [shared_memory.SharedMemory(name=name) for name in block_names]
+    try:
+        temps = [np.ndarray((height, width), dtype=dtype, buffer=blocks[i].buf) for i in (0, 1)]
+        wind_x = np.ndarray((height, width), dtype=dtype, buffer=blocks[2].buf)
+        wind_y = np.ndarray((height, width), dtype=dtype, buffer=blocks[3].buf)
+        source_term = np.ndarray((height, width), dtype=dtype, buffer=blocks[4].buf)
+
+        # Chỉ số hàng của dải kèm halo, quấn tuần hoàn theo toàn lưới
+        rows = halo_rows(start_row, end_row, height)
+        solver_class = cpp_weather.Solver32 if dtype == np.float32 else cpp_weather.Solver
+        solver = solver_class(width, strip_height(start_row, end_row), dx, kappa, False)
+
+        conn.send(('ready', start_row))
+        while True:
+            message = conn.recv()
+            if message is None:
+                break
+            if message[0] == 'source':
+                solver.set_source_term(source_term[rows].ravel() if message[1] else None)
+                conn.send('source')
+                continue
+            dt, step = message
+            source = temps[step % 2]
+            target = temps[(step + 1) % 2]
+            target[start_row:end_row + 1] = solve_strip(
+                solver, source, wind_x, wind_y, start_row, end_row, dt, rows
+            )
+            conn.send(step)
+    finally:
+        del temps, wind_x, wind_y, source_term
+        for block in blocks:
+            block.close()
+
+
+class SharedMemoryWeatherPool:
+    """Pool worker bền vững giải mô hình thời tiết trên bộ nhớ chung."""
+
+    def __init__(self, width, height, dx, kappa, num_workers=None, dtype=np.float64):
+        """
+        Tạo bộ nhớ chung và khởi động các worker.
+
+        Args:
+            width (int): Chiều rộng lưới
+            height (int): Chiều cao lưới
+            dx (float): Khoảng cách lưới
+            kappa (float): Hệ số khuếch tán
+            num_workers (int, optional): Số worker. Mặc định là số CPU.
+            dtype: np.float64 (Solver) hoặc np.float32 (Solver32)
+        """
+        self.width = width
+        self.height = height
+        self.dx = dx
+        self.kappa = kappa
+        self.dtype = np.dtype(dtype)
+        self.steps = 0
+        self.num_workers = num_workers or mp.cpu_count()
+        self.subdomains = split_rows(height, self.num_workers)
+
+        # Hai bộ đệm nhiệt độ luân phiên theo chẵn lẻ của step, gió X, gió Y,
+        # số hạng nguồn của các nguồn nhiệt duy trì
+        nbytes = width * height * self.dtype.itemsize
+        self._blocks = [shared_memory.SharedMemory(create=True, size=nbytes) for _ in range(5)]
+        self._temps = [np.ndarray((height, width), dtype=self.dtype, buffer=self._blocks[i].buf)
+                       for i in (0, 1)]
+        self._wind_x = np.ndarray((height, width), dtype=self.dtype, buffer=self._blocks[2].buf)
+        self._wind_y = np.ndarray((height, width), dtype=self.dtype, buffer=self._blocks[3].buf)
+        self._source = np.ndarray((height, width), dtype=self.dtype, buffer=self._blocks[4].buf)
+        for array in self._temps + [self._wind_x, self._wind_y, self._source]:
+            array.fill(0)
+
+        # 'spawn' để worker khởi tạo OpenMP với OMP_NUM_THREADS=1
+        context = mp.get_context('spawn')
+        block_names = [block.name for block in self._blocks]
+        self._connections = []
+        self._workers = []
+        try:
+            for start_row, end_row in self.subdomains:
+                parent_conn, child_conn = context.Pipe()
+                worker = context.Process(
+                    target=_pool_worker,
+                    args=(child_conn, block_names, width, height, self.dtype.name,
+                          dx, kappa, start_row, end_row),
+                    daemon=True
+                )
+                worker.start()
+                child_conn.close()
+                self._connections.append(parent_conn)
+                self._workers.append(worker)
+            for conn in self._connections:
+                conn.recv()
+        except Exception:
+            self.close()
+            raise
+
+    def set_temperature(self, temperature):
+        """
+        Ghi trường nhiệt độ vào bộ đệm hiện tại.
+
+        Args:
+            temperature (numpy.ndarray): Mảng (height, width) hoặc phẳng
+        """
+        np.copyto(self._temps[self.steps % 2],
+                  np.asarray(temperature).reshape(self.height, self.width), casting='unsafe')
+
+    def set_wind(self, wind_x, wind_y):
+        """
+        Ghi trường gió vào bộ nhớ chung; worker đọc lại ở bước kế tiếp.
+
+        Args:
+            wind_x, wind_y (numpy.ndarray): Mảng (height, width) hoặc phẳng
+        """
+        np.copyto(self._wind_x, np.asarray(wind_x).reshape(self.height, self.width), casting='unsafe')
+        np.copyto(self._wind_y, np.asarray(wind_y).reshape(self.height, self.width), casting='unsafe')
+
+    def set_source_term(self, source):
+        """
+        Đặt số hạng nguồn (nguồn nhiệt duy trì) cho mọi worker.
+
+        Args:
+            source (numpy.ndarray): Mảng (height, width) hoặc phẳng, None để bỏ
+        """
+        if source is not None:
+            np.copyto(self._source, np.asarray(source).reshape(self.height, self.width), casting='unsafe')
+        self._broadcast(('source', source is not None))
+
+    def step(self, dt):
+        """
+        Giải một bước RK4 song song trên mọi dải.
+
+        Args:
+            dt (float): Bước thời gian
+        """
+        self._broadcast((float(dt), self.steps))
+        self.steps += 1
+
+    def _broadcast(self, message):
+        """Gửi thông điệp tới mọi worker và chờ tất cả trả lời."""
+        for conn in self._connections:
+            conn.send(message)
+        for conn in self._connections:
+            conn.recv()
+
+    def get_temperature(self, copy=True):
+        """
+        Lấy trường nhiệt độ hiện tại.
+
+        Args:
+            copy (bool): False để nhận view lên bộ nhớ chung (bị ghi đè ở bước sau)
+
+        Returns:
+            numpy.ndarray: Mảng (height, width)
+        """
+        current = self._temps[self.steps % 2]
+        return current.copy() if copy else current
+
+    def close(self):
+        """Dừng các worker và giải phóng bộ nhớ chung."""
+        for conn in getattr(self, '_connections', []):
+            try:
+                conn.send(None)
+                conn.close()
+            except (OSError, BrokenPipeError):
+                pass
+        for worker in getattr(self, '_workers', []):
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+        self._connections = []
+        self._workers = []
+
+        # Giải phóng view numpy trước khi đóng bộ nhớ chung
+        self._temps = []
+        self._wind_x = self._wind_y = self._source = None
+        for block in getattr(self, '_blocks', []):
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        """Destructor để đảm bảo worker và bộ nhớ chung được giải phóng."""
+        self.close()
@@ -0,0 +1,377 @@
+"""
+Động cơ thời tiết hợp nhất: một giao diện step / advance / get_temperature
+cho mọi backend song song của solver C++.
+
+Các backend:
+    - 'cpp-openmp':   một cpp_weather.Solver, song song bằng OpenMP
+    - 'cpp-seq':      một cpp_weather.Solver đơn luồng
+    - 'process-pool': SharedMemoryWeatherPool, mỗi tiến trình giải một dải hàng
+    - 'thread-pool':  ThreadPoolExecutor, mỗi luồng giải một dải hàng bằng
+                      Solver.solve_subdomain_into (không giữ GIL)
+
+Hai backend theo dải giải mỗi dải kèm 4 hàng halo tuần hoàn (decomposition.py
+và Solver::solveSubdomain) nên cho kết quả trùng khớp từng bit với 'cpp-seq',
+và chỉ hỗ trợ sơ đồ RK4.
+
+HƯỚNG DẪN SỬ DỤNG:
+    with WeatherEngine(width, height, dx, kappa, mode='process-pool') as engine:
+        engine.set_temperature(temperature)
+        engine.set_wind(wind_x, wind_y)
+        engine.advance(10.0, engine.compute_time_step(wind_x, wind_y))
+        result = engine.get_temperature()
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import multiprocessing as mp
+
+import numpy as np
+
+from utils.log import get_logger
+from .decomposition import split_rows
+from .native import load_cpp_weather, is_native
+
+logger = get_logger("weather.engine")
+
+# Các thành phần hợp lệ của tham số mode, ghép bằng '+' (vd: 'cpp-seq+imex')
+SOLVER_BACKENDS = ('cpp-openmp', 'cpp-seq', 'process-pool', 'thread-pool')
+SOLVER_SCHEMES = ('rk4', 'imex', 'semi_lagrangian', 'maccormack')
+SOLVER_PRECISIONS = ('float64', 'float32')
+# Tên cũ của backend, giữ để các tham số --weather_mode cũ vẫn chạy
+BACKEND_ALIASES = {'parallel': 'cpp-openmp', 'seq': 'cpp-seq'}
+# Backend phân rã theo dải hàng, chỉ giải được RK4 tường minh
+STRIP_BACKENDS = ('process-pool', 'thread-pool')
+
+
+def parse_solver_mode(mode):
+    """
+    Tách chuỗi mode thành (backend, scheme, precision).
+
+    Args:
+        mode (str): Tên backend, tên sơ đồ, độ chính xác, hoặc ghép chúng
+            bằng '+', ví dụ 'cpp-openmp', 'imex', 'cpp-seq+imex',
+            'thread-pool+float32'. 'parallel' và 'seq' là tên cũ của
+            'cpp-openmp' và 'cpp-seq'
+
+    Returns:
+        tuple: (backend, scheme, precision), mặc định ('cpp-openmp', 'rk4', 'float64')
+
+    Raises:
+        ValueError: Nếu mode chứa thành phần không hợp lệ
+    """
+    backend, scheme, precision = 'cpp-openmp', 'rk4', 'float64'
+    for token in str(mode).lower().split('+'):
+        token = token.strip()
+        token = BACKEND_ALIASES.get(token, token)
+        if token in SOLVER_BACKENDS:
+            backend = token
+        elif token in SOLVER_SCHEMES:
+            scheme = token
+        elif token in SOLVER_PRECISIONS:
+            precision = token
+        else:
+            raise ValueError(
+                f"Chế độ solver không hợp lệ: '{token}'. "
+                f"Chọn backend {SOLVER_BACKENDS}, sơ đồ {SOLVER_SCHEMES} "
+                f"và/hoặc độ chính xác {SOLVER_PRECISIONS}"
+            )
+    return backend, scheme, precision
+
+
+class SolverBackend:
+    """Backend một Solver toàn lưới ('cpp-openmp' hoặc 'cpp-seq')."""
+
+    def __init__(self, solver, width, height, dtype):
+        """
+        Args:
+            solver: cpp_weather.Solver hoặc Solver32 đã chọn sơ đồ
+            width (int): Chiều rộng lưới
+            height (int): Chiều cao lưới
+            dtype: Kiểu số thực của solver
+        """
+        self.solver = solver
+        self.width = width
+        self.height = height
+        self.temperature = np.zeros((height, width), dtype=dtype)
+        self.wind_x = np.zeros(width * height, dtype=dtype)
+        self.wind_y = np.zeros(width * height, dtype=dtype)
+
+    def set_temperature(self, temperature):
+        np.copyto(self.temperature, np.asarray(temperature).reshape(self.height, self.width), casting='unsafe')
+
+    def set_wind(self, wind_x, wind_y):
+        np.copyto(self.wind_x, np.asarray(wind_x).ravel(), casting='unsafe')
+        np.copyto(self.wind_y, np.asarray(wind_y).ravel(), casting='unsafe')
+
+    def set_source_term(self, source):
+        # Solver toàn lưới tự giữ số hạng nguồn của các emitter
+        pass
+
+    def step(self, dt):
+        self.temperature = self.solver.solve_step(self.temperature, self.wind_x, self.wind_y, dt)
+
+    def get_temperature(self, copy=True):
+        return self.temperature.copy() if copy else self.temperature
+
+    def close(self):
+        pass
+
+
+class ThreadPoolBackend:
+    """
+    Backend 'thread-pool': các luồng giải các dải hàng bằng
+    Solver.solve_subdomain_into trên bộ đệm NumPy dùng chung. Binding không
+    giữ GIL khi giải nên các dải chạy song song thật sự, không tốn chi phí
+    tạo tiến trình hay pickle, và vẫn đa lõi khi bản build không có OpenMP.
+    """
+
+    def __init__(self, solver, width, height, num_workers, dtype):
+        """
+        Args:
+            solver: cpp_weather.Solver hoặc Solver32 toàn lưới (giữ cả số hạng
+                nguồn của các emitter, được cắt theo dải bên trong C++)
+            width (int): Chiều rộng lưới
+            height (int): Chiều cao lưới
+            num_workers (int): Số luồng (số dải)
+            dtype: Kiểu số thực của solver
+        """
+        self.solver = solver
+        self.width = width
+        self.height = height
+        self.subdomains = split_rows(height, num_workers)
+        self._executor = ThreadPoolExecutor(max_workers=len(self.subdomains))
+        # Hai bộ đệm luân phiên: các luồng đọc bộ hiện tại, ghi bộ kế tiếp
+        self.temperature = np.zeros((height, width), dtype=dtype)
+        self._next = np.zeros_like(self.temperature)
+        self.wind_x = np.zeros((height, width), dtype=dtype)
+        self.wind_y = np.zeros((height, width), dtype=dtype)
+
+    def set_temperature(self, temperature):
+        np.copyto(self.temperature, np.asarray(temperature).reshape(self.height, self.width), casting='unsafe')
+
+    def set_wind(self, wind_x, wind_y):
+        np.copyto(self.wind_x, np.asarray(wind_x).reshape(self.height, self.width), casting='unsafe')
+        np.copyto(self.wind_y, np.asarray(wind_y).reshape(self.height, self.width), casting='unsafe')
+
+    def set_source_term(self, source):
+        # solve_subdomain_into đọc thẳng số hạng nguồn của solver toàn lưới
+        pass
+
+    def _solve(self, subdomain, dt):
+        start_row, end_row = subdomain
+        self.solver.solve_subdomain_into(
+            self.temperature, self.wind_x, self.wind_y, self._next, start_row, end_row, dt
+        )
+
+    def step(self, dt):
+        list(self._executor.map(lambda subdomain: self._solve(subdomain, dt), self.subdomains))
+        self.temperature, self._next = self._next, self.temperature
+
+    def get_temperature(self, copy=True):
+        return self.temperature.copy() if copy else self.temperature
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+
+class WeatherEngine:
+    """
+    Động cơ thời tiết với backend có thể thay thế. Ngoài backend giải, động
+    cơ giữ một Solver toàn lưới để tính bước CFL, quản lý nguồn nhiệt duy trì
+    và (với backend cpp-*) cung cấp thống kê của bước giải gần nhất.
+    """
+
+    def __init__(self, width, height, dx, kappa, mode='cpp-openmp', num_workers=None):
+        """
+        Khởi tạo động cơ thời tiết.
+
+        Args:
+            width (int): Chiều rộng lưới
+            height (int): Chiều cao lưới
+            dx (float): Khoảng cách lưới
+            kappa (float): Hệ số khuếch tán
+            mode (str): Chế độ solver, xem parse_solver_mode. Trên solver NumPy
+                (chưa build module C++) sơ đồ khác rk4 lùi về rk4 kèm cảnh báo
+            num_workers (int, optional): Số tiến trình/luồng cho backend theo
+                dải. Mặc định là số CPU.
+
+        Raises:
+            ImportError: Nếu module C++ chưa được biên dịch và CPP_WEATHER_FALLBACK tắt
+            ValueError: Nếu mode không hợp lệ, hoặc backend theo dải được ghép
+                với sơ đồ khác RK4
+        """
+        self.backend_name, self.scheme_name, self.precision = parse_solver_mode(mode)
+        if self.backend_name in STRIP_BACKENDS and self.scheme_name != 'rk4':
+            raise ValueError(
+                f"Backend '{self.backend_name}' chỉ hỗ trợ sơ đồ rk4, không hỗ trợ '{self.scheme_name}'"
+            )
+
+        # Module C++ hoặc solver NumPy thay thế, xem native.py
+        cpp_weather = load_cpp_weather()
+        if not is_native(cpp_weather) and self.scheme_name != 'rk4':
+            # Solver NumPy chỉ có RK4: chạy RK4 (bước nhỏ hơn) thay vì tắt cả lớp thời tiết
+            logger.warning("Solver NumPy không hỗ trợ sơ đồ '%s', dùng rk4. Build module C++ để dùng sơ đồ này: "
+                           "python -m model.weather.python.utils.build_cpp_module", self.scheme_name)
+            self.scheme_name = 'rk4'
+        self.cpp_weather = cpp_weather
+        self.width = width
+        self.height = height
+        self.dx = dx
+        self.kappa = kappa
+        self.time = 0.0
+        self.steps = 0
+        self.dtype = np.float32 if self.precision == 'float32' else np.float64
+
+        # Hậu tố lớp theo độ chính xác: Solver/Solver32
+        solver_class = getattr(cpp_weather, 'Solver' + ('32' if self.precision == 'float32' else ''))
+        self.solver = solver_class(width, height, dx, kappa, self.backend_name == 'cpp-openmp')
+        if self.scheme_name == 'imex':
+            self.solver.set_scheme(cpp_weather.Solver.Scheme.IMEX)
+        elif self.scheme_name in ('semi_lagrangian', 'maccormack'):
+            self.solver.set_scheme(cpp_weather.Solver.Scheme.SEMI_LAGRANGIAN)
+            self.solver.set_maccormack(self.scheme_name == 'maccormack')
+
+        num_workers = num_workers or mp.cpu_count()
+        if self.backend_name == 'process-pool':
+            from .shared_memory_pool import SharedMemoryWeatherPool
+            self.backend = SharedMemoryWeatherPool(width, height, dx, kappa, num_workers, self.dtype)
+        elif self.backend_name == 'thread-pool':
+            self.backend = ThreadPoolBackend(self.solver, width, height, num_workers, self.dtype)
+        else:
+            self.backend = SolverBackend(self.solver, width, height, self.dtype)
+        # Số hạng nguồn cần chép sang backend trước bước giải kế tiếp
+        self._source_dirty = False
+
+    def compute_time_step(self, wind_x, wind_y):
+        """
+        Tính bước thời gian CFL của sơ đồ đang dùng.
+
+        Args:
+            wind_x, wind_y (numpy.ndarray): Trường gió phẳng
+
+        Returns:
+            float: Bước thời gian ổn định
+        """
+        return self.solver.compute_cfl_time_step(wind_x, wind_y)
+
+    def set_temperature(self, temperature):
+        """
+        Đặt trường nhiệt độ hiện tại.
+
+        Args:
+            temperature (numpy.ndarray): Mảng (height, width) hoặc phẳng
+        """
+        self.backend.set_temperature(temperature)
+
+    def set_wind(self, wind_x, wind_y):
+        """
+        Đặt trường gió dùng cho các bước giải kế tiếp.
+
+        Args:
+            wind_x, wind_y (numpy.ndarray): Mảng (height, width) hoặc phẳng
+        """
+        self.backend.set_wind(wind_x, wind_y)
+
+    def step(self, dt):
+        """
+        Giải một bước thời gian.
+
+        Args:
+            dt (float): Bước thời gian
+        """
+        if self._source_dirty:
+            self.backend.set_source_term(self.solver.get_source_term())
+            self._source_dirty = False
+        self.backend.step(dt)
+        self.time += dt
+        self.steps += 1
+
+    def advance(self, duration, max_dt):
+        """
+        Tiến một khoảng thời gian mô phỏng, mỗi bước không vượt max_dt.
+
+        Args:
+            duration (float): Thời gian mô phỏng cần tiến
+            max_dt (float): Bước thời gian lớn nhất (thường là bước CFL)
+
+        Returns:
+            int: Số bước đã thực hiện
+        """
+        elapsed = 0.0
+        steps = 0
+        while elapsed < duration:
+            dt = min(max_dt, duration - elapsed)
+            self.step(dt)
+            elapsed += dt
+            steps += 1
+        return steps
+
+    def get_temperature(self, copy=True):
+        """
+        Lấy trường nhiệt độ hiện tại.
+
+        Args:
+            copy (bool): False để nhận mảng nội bộ (bị ghi đè ở bước sau)
+
+        Returns:
+            numpy.ndarray: Mảng (height, width)
+        """
+        return self.backend.get_temperature(copy)
+
+    def last_stats(self):
+        """
+        Thống kê của bước giải gần nhất, tính sẵn trong solver.
+
+        Returns:
+            dict: Như Solver.last_stats(), hoặc None với backend theo dải
+                (thống kê phải tính lại bằng NumPy)
+        """
+        if self.backend_name in STRIP_BACKENDS:
+            return None
+        return self.solver.last_stats()
+
+    def add_heat_emitter(self, x, y, rate, radius):
+        """
+        Thêm nguồn nhiệt duy trì, xem Solver.add_heat_emitter.
+
+        Returns:
+            int: Mã định danh của nguồn
+        """
+        self._source_dirty = True
+        return self.solver.add_heat_emitter(x, y, rate, radius)
+
+    def move_heat_emitter(self, emitter_id, x, y):
+        """
+        Di chuyển nguồn nhiệt duy trì.
+
+        Returns:
+            bool: False nếu không tìm thấy nguồn
+        """
+        self._source_dirty = True
+        return self.solver.move_heat_emitter(emitter_id, x, y)
+
+    def remove_heat_emitter(self, emitter_id):
+        """
+        Xóa nguồn nhiệt duy trì.
+
+        Returns:
+            bool: True nếu đã xóa
+        """
+        self._source_dirty = True
+        return self.solver.remove_heat_emitter(emitter_id)
+
+    def close(self):
+        """Giải phóng worker của backend (nếu có)."""
+        backend = getattr(self, 'backend', None)
+        if backend is not None:
+            backend.close()
+            self.backend = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        """Destructor để đảm bảo worker được giải phóng."""
+        self.close()
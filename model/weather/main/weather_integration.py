@@ -1,37 +1,63 @@
+import logging
 import numpy as np
 import time
-import os
-import sys
 from utils.vector import Vector2D
 from utils.config import *
-from model.weather.visualization import HeatmapRenderer, WindFieldRenderer
+from utils.log import get_logger
+from utils.rng import seed_for
 from .utils import print_safe
+from .weather_engine import WeatherEngine, parse_solver_mode
+from .native import load_cpp_weather, is_native
+from .multires import WeatherGrid, NestedPatch, sample_field
+from .scenarios import build_scenario, get_scenario
+
+logger = get_logger("weather")
 
-# Thêm thư mục chứa module C++ vào path
-current_dir = os.path.dirname(os.path.abspath(__file__))
-python_dir = os.path.abspath(os.path.join(current_dir, '..', 'python'))
-if python_dir not in sys.path:
-    sys.path.insert(0, python_dir)
 
 class WeatherIntegration:
     """
     Lớp tích hợp module thời tiết C++ vào mô phỏng đàn chim.
     """
     
-    def __init__(self, width, height, mode='parallel'):
+    def __init__(self, width, height, mode='cpp-openmp', grid_size=None, scenario='default'):
         """
         Khởi tạo lớp tích hợp thời tiết.
         
         Args:
-            width (int): Chiều rộng cửa sổ hiển thị
-            height (int): Chiều cao cửa sổ hiển thị
-        """
+            width (int): Chiều rộng vùng mô phỏng (pixel)
+            height (int): Chiều cao vùng mô phỏng (pixel)
+            mode (str): Chế độ solver, xem parse_solver_mode. Backend
+                'cpp-openmp', 'cpp-seq', 'process-pool' hoặc 'thread-pool'
+                chọn cách chia tải của bước giải (xem WeatherEngine); 'imex' giải
+                khuếch tán ẩn nên cho phép bước thời gian lớn hơn nhiều;
+                'semi_lagrangian' (hoặc 'maccormack' để bật hiệu chỉnh
+                MacCormack) đối lưu bán Lagrange nên gió mạnh không còn làm
+                bước thời gian co lại; 'float32' dùng Solver32 và các trường
+                float32 (nửa băng thông bộ nhớ, đủ cho bản đồ màu)
+            grid_size (tuple, optional): (cột, hàng) của lưới thời tiết thô,
+                mặc định (GRID_SIZE_X, GRID_SIZE_Y); không phụ thuộc kích
+                thước cửa sổ vì mọi truy vấn đi qua nội suy của WeatherGrid
+            scenario (str): Kịch bản nhiệt ban đầu đã đăng ký trong scenarios.py
+            
+        Raises:
+            ValueError: Nếu kịch bản chưa được đăng ký
+        """
+        self.backend, self.scheme_name, self.precision = parse_solver_mode(mode)
+        get_scenario(scenario)
+        
         self.window_width = width
         self.window_height = height
         
         # Cài đặt kích thước lưới (số điểm lưới)
-        self.grid_width = GRID_SIZE_X
-        self.grid_height = GRID_SIZE_Y
+        self.grid_width, self.grid_height = grid_size or (GRID_SIZE_X, GRID_SIZE_Y)
+        # Ánh xạ tọa độ màn hình <-> lưới thô và lấy mẫu nội suy
+        self.grid = WeatherGrid(width, height, self.grid_width, self.grid_height)
+        self.sampling_mode = WEATHER_SAMPLING_MODE
+        # Vùng lưới mịn lồng (None nếu tắt), xem enable_patch
+        self.patch = None
+        self.patch_focus_step = None
+        # View không sao chép lên trường C++ cho các truy vấn lấy mẫu, xem _field_views
+        self._views = None
         
         # Tham số vật lý
         self.dx = GRID_SPACING_K
@@ -42,39 +68,53 @@ class WeatherIntegration:
         self.mouse_pressed = False
         self.cursor_size = 10
         self.cursor_strength = 30.0
+        # Nguồn nhiệt duy trì theo con trỏ khi đang giữ chuột (id trong solver)
+        self.cursor_emitter = None
         
         # Trạng thái hiện tại
         self.time = 0.0
         self.steps = 0
         self.statistics = {"min_temp": 15, "max_temp": 30, "mean_temp": 22}
+        # True khi trường nhiệt độ chưa bị sửa kể từ bước giải gần nhất,
+        # lúc đó thống kê lấy thẳng từ solver.last_stats()
+        self.stats_from_solver = False
         
         # Flag để kiểm tra xem module C++ đã được khởi tạo chưa
         self.initialized = False
         
-        self.scenario = None
+        self.scenario = scenario
         # Thử tải module C++
         try:
-            # Import module C++
-            import cpp_weather
-            self.cpp_weather = cpp_weather
+            # Module C++, hoặc solver NumPy khi chưa build (native.py)
+            self.cpp_weather = load_cpp_weather()
             
             # Khởi tạo các đối tượng C++
-            # Chọn chế độ song song hoặc đơn luồng
-            parallel = True if mode == 'parallel' else False
-            self.solver = self.cpp_weather.Solver(
-                self.grid_width, self.grid_height, self.dx, self.kappa, parallel
+            # Động cơ giải theo backend đã chọn; self.solver là Solver toàn
+            # lưới của động cơ (bước CFL, nguồn nhiệt duy trì, thống kê)
+            self.engine = WeatherEngine(
+                self.grid_width, self.grid_height, self.dx, self.kappa, mode
             )
-            self.temp_field = self.cpp_weather.TemperatureField(
+            self.solver = self.engine.solver
+            # Động cơ có thể đã lùi về rk4 (solver NumPy chỉ hỗ trợ RK4)
+            self.scheme_name = self.engine.scheme_name
+            # Hậu tố lớp theo độ chính xác: TemperatureField/TemperatureField32, ...
+            suffix = '32' if self.precision == 'float32' else ''
+            self.temp_field = getattr(self.cpp_weather, 'TemperatureField' + suffix)(
                 self.grid_width, self.grid_height
             )
-            self.wind_field = self.cpp_weather.WindField(
-                self.grid_width, self.grid_height
+            # Seed từ luồng 'wind' để các xoáy tái lập được theo --seed
+            self.wind_field = getattr(self.cpp_weather, 'WindField' + suffix)(
+                self.grid_width, self.grid_height, seed_for('wind')
             )
+            self.wind_field.set_evolution(WIND_VORTEX_DRIFT_SPEED, WIND_VORTEX_LIFETIME)
             
             # Đặt nhiệt độ ban đầu và tạo gió
-            self.initialize_weather(self.scenario)
+            self._build_initial_state()
+            if WEATHER_PATCH_ENABLED:
+                self.enable_patch(WEATHER_PATCH_SIZE, WEATHER_PATCH_REFINEMENT)
             
-            # Khởi tạo các lớp renderer
+            # Khởi tạo các lớp renderer (import ở đây để chỉ nạp pyglet khi thời tiết thực sự chạy)
+            from model.weather.visualization import HeatmapRenderer, WindFieldRenderer
             self.heatmap_renderer = HeatmapRenderer(
                 self.temp_field, self.window_width, self.window_height
             )
@@ -85,7 +125,11 @@ class WeatherIntegration:
             # Đánh dấu đã khởi tạo thành công
             self.initialized = True
             
-            print_safe("Khởi tạo module thời tiết C++ thành công", "Weather C++ module initialized successfully")
+            if is_native(self.cpp_weather):
+                print_safe("Khởi tạo module thời tiết C++ thành công", "Weather C++ module initialized successfully")
+            else:
+                print_safe("Khởi tạo module thời tiết (solver NumPy) thành công",
+                           "Weather module initialized successfully (NumPy solver)")
         except ImportError as e:
             # Fix encoding for Windows console
             print_safe(f"Không thể tải module C++ 'cpp_weather': {e}", f"Could not load C++ module 'cpp_weather': {e}")
@@ -95,78 +139,34 @@ class WeatherIntegration:
             print_safe(f"Lỗi khi khởi tạo module thời tiết: {e}", f"Error initializing weather module: {e}")
             self.initialized = False
     
-    def initialize_weather(self, scenario='default'):
+    def initialize_weather(self, scenario=None):
         """
-        Khởi tạo điều kiện thời tiết ban đầu với nhiều kịch bản.
-        scenario: 'default', 'checkerboard', 'random_sources', 'stripe', 'uniform'
+        Đặt lại trường nhiệt độ theo một kịch bản đã đăng ký (xem scenarios.py)
+        và tạo lại trường gió. Hàm khởi tạo đã dựng kịch bản truyền vào, nên chỉ
+        cần gọi hàm này để đặt lại hoặc đổi kịch bản.
+        
+        Args:
+            scenario (str, optional): Tên kịch bản; mặc định giữ kịch bản hiện tại
+            
+        Raises:
+            ValueError: Nếu kịch bản chưa được đăng ký
         """
-        print("Current heat scenario before:", scenario, self.scenario)
-        if self.scenario is None:
+        if scenario is not None:
+            get_scenario(scenario)
             self.scenario = scenario
         if not self.initialized:
             return
-        print("Current heat scenario after:", self.scenario)
-        import numpy as np
-        if self.scenario == 'default':
-            # Gradient Bắc-Nam + nhiều nguồn nhiệt (như hiện tại)
-            self.temp_field.set_uniform(INITIAL_TEMPERATURE)
-            try:
-                self.temp_field.set_gradient(
-                    15.0, 30.0, self.cpp_weather.GradientDirection.NORTH_SOUTH
-                )
-            except Exception:
-                temps = self.temp_field.get_temperature().reshape(self.grid_height, self.grid_width)
-                for i in range(self.grid_height):
-                    t = i / self.grid_height
-                    row_temp = 15 + 15 * t
-                    temps[i, :] = row_temp
-                self.temp_field.set_temperature(temps.flatten())
-            heat_sources = [
-                (int(self.grid_width * 0.1), int(self.grid_height * 0.1)),
-                (int(self.grid_width * 0.1), int(self.grid_height * 0.9)),
-                (int(self.grid_width * 0.9), int(self.grid_height * 0.1)),
-                (int(self.grid_width * 0.9), int(self.grid_height * 0.9)),
-                (self.grid_width // 2, self.grid_height // 2)
-            ]
-            for x, y in heat_sources:
-                self.temp_field.add_heat_source(x, y, 15.0, self.grid_width // 8)
-
-        elif self.scenario == 'checkerboard':
-            # Mẫu bàn cờ
-            temps = self.temp_field.get_temperature().reshape(self.grid_height, self.grid_width)
-            for i in range(self.grid_height):
-                for j in range(self.grid_width):
-                    temps[i, j] = 30.0 if (i + j) % 2 == 0 else 15.0
-            self.temp_field.set_temperature(temps.flatten())
-
-        elif self.scenario == 'random_sources':
-            # Nhiều nguồn nhiệt ngẫu nhiên
-            self.temp_field.set_uniform(INITIAL_TEMPERATURE)
-            import random
-            for _ in range(10):
-                x = random.randint(0, self.grid_width-1)
-                y = random.randint(0, self.grid_height-1)
-                self.temp_field.add_heat_source(x, y, 15.0, self.grid_width // 12)
-
-        elif self.scenario == 'stripe':
-            # Một dải nhiệt độ cao ở giữa
-            temps = self.temp_field.get_temperature().reshape(self.grid_height, self.grid_width)
-            stripe_start = self.grid_width // 3
-            stripe_end = self.grid_width // 3 * 2
-            temps[:, stripe_start:stripe_end] = 35.0
-            self.temp_field.set_temperature(temps.flatten())
-
-        elif self.scenario == 'uniform':
-            # Toàn bộ trường nhiệt độ đồng nhất
-            self.temp_field.set_uniform(25.0)
-
-        else:
-            # fallback về mặc định
-            self.temp_field.set_uniform(INITIAL_TEMPERATURE)
-
+        self._build_initial_state()
+    
+    def _build_initial_state(self):
+        """Dựng kịch bản self.scenario (từ cache nếu có) và tạo trường gió."""
+        cached = build_scenario(self.temp_field, self.scenario, seed=seed_for('scenario'))
+        logger.debug("Kịch bản nhiệt %s: %s", self.scenario, "đọc từ cache" if cached else "dựng mới")
         # Tạo trường gió
         self.wind_field.generate_gaussian_field(5, WIND_STRENGTH, self.grid_width // 8)
+        self._reset_patch()
         # Cập nhật thống kê nhiệt độ
+        self.stats_from_solver = False
         self.update_statistics()
     
     def set_checkerboard_pattern(self):
@@ -176,19 +176,9 @@ class WeatherIntegration:
         if not self.initialized:
             return
         
-        # Lấy mảng nhiệt độ hiện tại
-        temps = self.temp_field.get_temperature().reshape(self.grid_height, self.grid_width)
-        
-        # Tạo mẫu bàn cờ
-        for i in range(self.grid_height):
-            for j in range(self.grid_width):
-                if (i + j) % 2 == 0:
-                    temps[i, j] = 30.0
-                else:
-                    temps[i, j] = 15.0
-        
-        # Đặt lại nhiệt độ
-        self.temp_field.set_temperature(temps.flatten())
+        build_scenario(self.temp_field, 'checkerboard')
+        self._reset_patch()
+        self.stats_from_solver = False
         self.update_statistics()
     
     def update(self, dt):
@@ -202,41 +192,51 @@ class WeatherIntegration:
             return
             
         # Lấy dữ liệu hiện tại
-        temp_data = self.temp_field.get_temperature()
         wind_x = self.wind_field.get_wind_x()
         wind_y = self.wind_field.get_wind_y()
             
         # Tính bước thời gian phù hợp với CFL
-        sim_dt = self.solver.compute_cfl_time_step(wind_x, wind_y)
+        sim_dt = self.engine.compute_time_step(wind_x, wind_y)
         sim_dt = min(0.1, sim_dt)  # Giới hạn dt để tránh không ổn định
             
         # Điều chỉnh dt với hệ số mô phỏng
         sim_dt *= SIMULATION_SPEED
+        self._step(sim_dt, wind_x, wind_y)
+    
+    def _step(self, sim_dt, wind_x, wind_y):
+        """
+        Một bước giải nhiệt độ (kèm lưới mịn nếu bật), rồi tiến hóa gió và cập
+        nhật thống kê; dùng chung cho update và fast_forward.
+        
+        Args:
+            sim_dt (float): Bước thời gian mô phỏng
+            wind_x (np.ndarray): Gió theo x ở đầu bước
+            wind_y (np.ndarray): Gió theo y ở đầu bước
+        """
+        temp_data = self.temp_field.get_temperature()
             
-        # Cập nhật trường nhiệt độ
-        new_temp = self.solver.solve_rk4_step(
-            temp_data, wind_x, wind_y, sim_dt
-        )
-        print("diff New temperature:", np.sum(new_temp - temp_data))
+        # Cập nhật trường nhiệt độ theo sơ đồ và backend đã chọn
+        self.engine.set_temperature(temp_data)
+        self.engine.set_wind(wind_x, wind_y)
+        self.engine.step(sim_dt)
+        new_temp = self.engine.get_temperature(copy=False)
+        # Phép rút gọn chẩn đoán trên cả trường chỉ tính khi bật mức DEBUG
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("diff New temperature: %s", np.sum(new_temp - temp_data), extra={"key": "weather.diff"})
+        if self.patch is not None:
+            # Lưới mịn lấy biên theo thời gian từ nhiệt độ thô đầu và cuối bước
+            self.patch.step(temp_data, new_temp, wind_x, wind_y, sim_dt,
+                            self.solver.get_source_term())
         self.temp_field.set_temperature(new_temp)
-            
-        # Thêm nguồn nhiệt nếu đang nhấn chuột
-        if self.mouse_pressed:
-            # Chuyển đổi vị trí chuột thành chỉ số lưới
-            grid_x = int(self.mouse_pos[0] / self.window_width * self.grid_width)
-            grid_y = int(self.mouse_pos[1] / self.window_height * self.grid_height)
-            
-            # Đảm bảo chỉ số lưới hợp lệ
-            grid_x = max(0, min(grid_x, self.grid_width - 1))
-            grid_y = max(0, min(grid_y, self.grid_height - 1))
-            
-            # Thêm nguồn nhiệt
-            self.temp_field.add_heat_source(
-                grid_x, grid_y, self.cursor_strength, self.cursor_size
-            )
-            
-        # Đôi khi cập nhật trường gió để tạo sự thay đổi
-        if self.steps % 20 == 0 and self.steps > 0:
+        self.stats_from_solver = True
+        # Nhiệt từ chuột đang giữ đã được cộng như số hạng nguồn trong
+        # bước giải (cursor_emitter), không cần cộng thêm ở đây
+            
+        # Cập nhật trường gió: tiến hóa mượt từng bước, hoặc tạo lại
+        # toàn bộ sau mỗi 20 bước ở chế độ cũ
+        if WIND_MODE == 'evolving':
+            self.wind_field.evolve(sim_dt)
+        elif self.steps % 20 == 0 and self.steps > 0:
             self.wind_field.generate_gaussian_field(
                 5, WIND_STRENGTH, self.grid_width // 8
             )
@@ -247,10 +247,52 @@ class WeatherIntegration:
         # Cập nhật thời gian mô phỏng
         self.time += sim_dt
         self.steps += 1
-        print("Updated statistics:", self.statistics)
+        logger.debug("Updated statistics: %s", self.statistics, extra={"key": "weather.statistics"})
+    
+    def fast_forward(self, duration, max_dt=None):
+        """
+        Tua nhanh mô hình thời tiết một khoảng thời gian mô phỏng bằng các bước
+        đều nhau, mặc định không vượt bước CFL của solver (không giới hạn 0.1
+        như update). Với mode 'imex' bước chỉ bị giới hạn bởi đối lưu; với mode
+        bán Lagrange bước được phép vượt CFL đối lưu nhiều lần. Gió tiến hóa
+        sau mỗi bước như trong update.
+        
+        Args:
+            duration (float): Thời gian mô phỏng cần tua
+            max_dt (float, optional): Bước lớn nhất; mặc định bước CFL theo gió hiện tại
+            
+        Returns:
+            int: Số bước đã thực hiện
+        """
+        if not self.initialized or duration <= 0:
+            return 0
+        
+        if max_dt is None:
+            max_dt = self.engine.compute_time_step(self.wind_field.get_wind_x(), self.wind_field.get_wind_y())
+        # Số bước tính một lần: cộng dồn dt bằng số thực có thể sinh thêm một bước thừa
+        steps = max(1, round(duration / max_dt))
+        if duration / steps > max_dt:
+            steps += 1
+        sim_dt = duration / steps
+        for _ in range(steps):
+            self._step(sim_dt, self.wind_field.get_wind_x(), self.wind_field.get_wind_y())
+        return steps
+    
     def update_statistics(self):
-        """Cập nhật thống kê nhiệt độ."""
+        """
+        Cập nhật thống kê nhiệt độ. Ngay sau một bước giải, thống kê lấy từ
+        solver.last_stats() (tính sẵn trong vòng lặp cuối của bước giải);
+        chỉ duyệt lại trường bằng NumPy khi trường bị sửa ngoài solver.
+        """
         try:
+            stats = self.engine.last_stats() if self.stats_from_solver else None
+            if stats is not None:
+                self.statistics = {
+                    "min_temp": stats["min"],
+                    "max_temp": stats["max"],
+                    "mean_temp": stats["mean"]
+                }
+                return
             # Lấy dữ liệu nhiệt độ
             temp_data = self.temp_field.get_temperature()
             # Tính toán thống kê
@@ -260,7 +302,7 @@ class WeatherIntegration:
                 "mean_temp": np.mean(temp_data)
             }
         except Exception as e:
-            print(f"Lỗi khi cập nhật thống kê: {e}")
+            logger.warning("Lỗi khi cập nhật thống kê: %s", e, extra={"key": "weather.statistics_error"})
     
     def draw(self):
         """
@@ -294,6 +336,11 @@ class WeatherIntegration:
         """
         # Cập nhật vị trí chuột
         self.mouse_pos = (x, y)
+        
+        # Di chuyển nguồn nhiệt duy trì theo con trỏ
+        if self.initialized and self.cursor_emitter is not None:
+            grid_x, grid_y = self.grid.cell_index(x, y)
+            self.engine.move_heat_emitter(self.cursor_emitter, grid_x, grid_y)
         return False
     
     def on_mouse_press(self, x, y, button, modifiers):
@@ -318,17 +365,18 @@ class WeatherIntegration:
         # Kiểm tra xem vị trí click có nằm trong khu vực hiển thị thời tiết không
         # (trừ đi thanh thông tin ở bên phải)
         if x < self.window_width - INFO_PANEL_WIDTH:
-            # Chuyển đổi vị trí chuột thành chỉ số lưới
-            grid_x = int(x / self.window_width * self.grid_width)
-            grid_y = int(y / self.window_height * self.grid_height)
-            
-            # Đảm bảo chỉ số lưới hợp lệ
-            grid_x = max(0, min(grid_x, self.grid_width - 1))
-            grid_y = max(0, min(grid_y, self.grid_height - 1))
+            # Chuyển đổi vị trí chuột thành chỉ số lưới (đã kẹp trong lưới)
+            grid_x, grid_y = self.grid.cell_index(x, y)
             
             # Thêm nguồn nhiệt
             self.add_heat_source(grid_x, grid_y, self.cursor_strength, self.cursor_size)
             
+            # Giữ chuột: cấp nhiệt liên tục qua số hạng nguồn của solver, tốc độ
+            # tương đương cursor_strength cho mỗi bước cập nhật mặc định
+            if self.cursor_emitter is None:
+                rate = self.cursor_strength / (DELTA_T * SIMULATION_SPEED)
+                self.cursor_emitter = self.add_heat_emitter(grid_x, grid_y, rate, self.cursor_size)
+            
             # Đã xử lý sự kiện
             return True
             
@@ -339,6 +387,9 @@ class WeatherIntegration:
         Xử lý sự kiện thả chuột.
         """
         self.mouse_pressed = False
+        if self.cursor_emitter is not None:
+            self.remove_heat_emitter(self.cursor_emitter)
+            self.cursor_emitter = None
         return False
     
     def on_key_press(self, symbol, modifiers):
@@ -410,41 +461,150 @@ class WeatherIntegration:
             
         try:
             self.temp_field.add_heat_source(x, y, strength, radius)
+            self._reset_patch()
+            self.stats_from_solver = False
         except Exception as e:
-            print(f"Lỗi khi thêm nguồn nhiệt: {e}")
+            logger.warning("Lỗi khi thêm nguồn nhiệt: %s", e, extra={"key": "weather.heat_source_error"})
     
-    def get_temperature_at(self, x, y):
+    def add_heat_sources(self, xs, ys, strengths, radii):
         """
-        Lấy giá trị nhiệt độ tại một điểm trên màn hình.
+        Thêm nhiều nguồn nhiệt trong một lần gọi, mỗi nguồn chỉ cập nhật
+        vùng bao quanh nó.
         
         Args:
-            x, y: Tọa độ điểm trên màn hình
+            xs, ys: Mảng vị trí các nguồn nhiệt (chỉ số lưới)
+            strengths: Mảng cường độ
+            radii: Mảng bán kính ảnh hưởng
+        """
+        if not self.initialized:
+            return
+            
+        try:
+            self.temp_field.add_heat_sources(
+                np.asarray(xs, dtype=float), np.asarray(ys, dtype=float),
+                np.asarray(strengths, dtype=float), np.asarray(radii, dtype=float)
+            )
+            self._reset_patch()
+            self.stats_from_solver = False
+        except Exception as e:
+            logger.warning("Lỗi khi thêm nguồn nhiệt: %s", e, extra={"key": "weather.heat_source_error"})
+    
+    def add_heat_emitter(self, x, y, rate, radius):
+        """
+        Thêm nguồn nhiệt duy trì, được cộng như số hạng nguồn trong mỗi bước
+        giải thay vì cộng dồn giữa các bước.
+        
+        Args:
+            x, y: Vị trí nguồn nhiệt (chỉ số lưới)
+            rate: Tốc độ cấp nhiệt tại tâm (độ / đơn vị thời gian)
+            radius: Bán kính ảnh hưởng
             
         Returns:
-            float: Giá trị nhiệt độ
+            int: Mã định danh của nguồn, hoặc None nếu không thành công
         """
         if not self.initialized:
-            return 0.0
+            return None
             
         try:
-            # Chuyển đổi tọa độ màn hình thành chỉ số lưới
-            grid_x = int(x / self.window_width * self.grid_width)
-            grid_y = int(y / self.window_height * self.grid_height)
+            return self.engine.add_heat_emitter(x, y, rate, radius)
+        except Exception as e:
+            logger.warning("Lỗi khi thêm nguồn nhiệt duy trì: %s", e, extra={"key": "weather.heat_emitter_error"})
+            return None
+    
+    def remove_heat_emitter(self, emitter_id):
+        """
+        Xóa nguồn nhiệt duy trì.
+        
+        Args:
+            emitter_id: Mã định danh trả về từ add_heat_emitter
             
-            # Đảm bảo chỉ số lưới hợp lệ
-            grid_x = max(0, min(grid_x, self.grid_width - 1))
-            grid_y = max(0, min(grid_y, self.grid_height - 1))
+        Returns:
+            bool: True nếu đã xóa
+        """
+        if not self.initialized or emitter_id is None:
+            return False
+        return self.engine.remove_heat_emitter(emitter_id)
+    
+    def _field_views(self):
+        """
+        View chỉ đọc (không sao chép) lên trường nhiệt độ và gió trong C++,
+        tạo một lần và dùng lại: bộ nhớ của các std::vector không đổi khi
+        set_temperature/evolve ghi đè cùng kích thước nên view luôn phản ánh
+        giá trị mới nhất.
+        
+        Returns:
+            tuple: (temperature, wind_x, wind_y), mỗi mảng (grid_height, grid_width)
+        """
+        if self._views is None:
+            shape = (self.grid_height, self.grid_width)
+            self._views = (
+                self.temp_field.get_temperature_view().reshape(shape),
+                self.wind_field.get_wind_x_view().reshape(shape),
+                self.wind_field.get_wind_y_view().reshape(shape),
+            )
+        return self._views
+    
+    def sample_temperature(self, xs, ys, mode=None):
+        """
+        Lấy nhiệt độ tại nhiều điểm trên màn hình trong một lần gọi (ví dụ mọi
+        chim hoặc mọi quả), trên view không sao chép của trường; điểm nằm
+        trong vùng lưới mịn lấy từ lưới mịn.
+        
+        Args:
+            xs, ys: Tọa độ màn hình (vô hướng hoặc mảng cùng hình dạng)
+            mode (str, optional): 'bilinear' hoặc 'nearest', mặc định self.sampling_mode
             
-            # Lấy nhiệt độ
-            temps = self.temp_field.get_temperature().reshape(self.grid_height, self.grid_width)
-            return temps[grid_y, grid_x]
+        Returns:
+            numpy.ndarray: Nhiệt độ tại các điểm, cùng hình dạng với xs
+                (toàn 0 nếu chưa khởi tạo)
+        """
+        if not self.initialized:
+            return np.zeros(np.shape(xs))
+        mode = mode or self.sampling_mode
+        temperature = self.grid.sample(self._field_views()[0], xs, ys, mode)
+        if self.patch is not None:
+            temperature = self.patch.sample(xs, ys, temperature, mode)
+        return temperature
+    
+    def sample_wind(self, xs, ys, mode=None):
+        """
+        Lấy vector gió tại nhiều điểm trên màn hình trong một lần gọi. Gió chỉ
+        có trên lưới thô (lưới mịn cũng nội suy gió từ lưới thô).
+        
+        Args:
+            xs, ys: Tọa độ màn hình (vô hướng hoặc mảng cùng hình dạng)
+            mode (str, optional): 'bilinear' hoặc 'nearest', mặc định self.sampling_mode
+            
+        Returns:
+            tuple: (wind_x, wind_y) hai mảng cùng hình dạng với xs
+                (toàn 0 nếu chưa khởi tạo)
+        """
+        if not self.initialized:
+            return np.zeros(np.shape(xs)), np.zeros(np.shape(xs))
+        mode = mode or self.sampling_mode
+        _, wind_x, wind_y = self._field_views()
+        gx, gy = self.grid.to_grid(xs, ys)
+        return sample_field(wind_x, gx, gy, mode), sample_field(wind_y, gx, gy, mode)
+    
+    def get_temperature_at(self, x, y):
+        """
+        Lấy giá trị nhiệt độ tại một điểm trên màn hình (xem sample_temperature).
+        
+        Args:
+            x, y: Tọa độ điểm trên màn hình
+            
+        Returns:
+            float: Giá trị nhiệt độ
+        """
+        try:
+            return float(self.sample_temperature(x, y))
         except Exception as e:
-            print(f"Lỗi khi lấy nhiệt độ: {e}")
+            logger.warning("Lỗi khi lấy nhiệt độ: %s", e, extra={"key": "weather.temperature_error"})
             return 0.0
     
     def get_wind_at(self, x, y):
         """
-        Lấy vector gió tại một điểm trên màn hình.
+        Lấy vector gió tại một điểm trên màn hình (xem sample_wind).
         
         Args:
             x, y: Tọa độ điểm trên màn hình
@@ -452,30 +612,17 @@ class WeatherIntegration:
         Returns:
             Vector2D: Vector gió
         """
-        if not self.initialized:
-            return Vector2D(0, 0)
-            
         try:
-            # Chuyển đổi tọa độ màn hình thành chỉ số lưới
-            grid_x = int(x / self.window_width * self.grid_width)
-            grid_y = int(y / self.window_height * self.grid_height)
-            
-            # Đảm bảo chỉ số lưới hợp lệ
-            grid_x = max(0, min(grid_x, self.grid_width - 1))
-            grid_y = max(0, min(grid_y, self.grid_height - 1))
-            
-            # Lấy vector gió
-            wind_x = self.wind_field.get_wind_x().reshape(self.grid_height, self.grid_width)
-            wind_y = self.wind_field.get_wind_y().reshape(self.grid_height, self.grid_width)
-            
-            return Vector2D(wind_x[grid_y, grid_x], wind_y[grid_y, grid_x])
+            wind_x, wind_y = self.sample_wind(x, y)
+            return Vector2D(float(wind_x), float(wind_y))
         except Exception as e:
-            print_safe(f"Lỗi khi lấy gió: {e}", f"Error getting wind: {e}")
+            logger.warning("Lỗi khi lấy gió: %s", e, extra={"key": "weather.wind_error"})
             return Vector2D(0, 0)
     
     def get_weather_for_birds(self, x, y):
         """
-        Lấy thông tin thời tiết tại vị trí của chim.
+        Lấy thông tin thời tiết tại vị trí của chim. Với cả đàn, dùng
+        sample_temperature/sample_wind trên mảng tọa độ thay vì gọi từng con.
         
         Args:
             x, y: Vị trí của chim
@@ -486,17 +633,40 @@ class WeatherIntegration:
         if not self.initialized:
             return {"temperature": 20.0, "wind": None}
             
-        temperature = self.get_temperature_at(x, y)
-        wind = self.get_wind_at(x, y)
-            
         return {
-            "temperature": temperature,
-            "wind": wind
+            "temperature": self.get_temperature_at(x, y),
+            "wind": self.get_wind_at(x, y)
         }
     
+    def get_ripening_factors(self, xs, ys):
+        """
+        Hệ số ảnh hưởng của nhiệt độ đến tốc độ chín cho nhiều quả cùng lúc.
+        - Nhiệt độ <10°C: chín chậm (0.5)
+        - Nhiệt độ 10-20°C: 0.8
+        - Nhiệt độ 20-25°C: bình thường (1.0)
+        - Nhiệt độ 25-30°C: 1.2
+        - Nhiệt độ >30°C: chín nhanh (1.5)
+        
+        Args:
+            xs, ys: Tọa độ màn hình của các quả
+            
+        Returns:
+            numpy.ndarray: Hệ số (>1: chín nhanh hơn, <1: chín chậm hơn),
+                toàn 1 nếu chưa khởi tạo
+        """
+        if not self.initialized:
+            return np.ones(np.shape(xs))
+        temperature = self.sample_temperature(xs, ys)
+        return np.select(
+            [temperature < 10, temperature < 20, temperature <= 25, temperature <= 30],
+            [0.5, 0.8, 1.0, 1.2],
+            default=1.5
+        )
+    
     def get_weather_influence_on_fruit(self, x, y):
         """
-        Tính toán hệ số ảnh hưởng của thời tiết đến tốc độ chín của quả.
+        Tính toán hệ số ảnh hưởng của thời tiết đến tốc độ chín của quả
+        (xem get_ripening_factors).
         
         Args:
             x, y: Vị trí của quả
@@ -504,27 +674,7 @@ class WeatherIntegration:
         Returns:
             float: Hệ số ảnh hưởng (>1: chín nhanh hơn, <1: chín chậm hơn)
         """
-        if not self.initialized:
-            return 1.0
-            
-        temperature = self.get_temperature_at(x, y)
-        
-        # Điều chỉnh hệ số tốc độ chín dựa trên nhiệt độ
-        # - Nhiệt độ <10°C: chín chậm
-        # - Nhiệt độ 20-25°C: bình thường
-        # - Nhiệt độ >30°C: chín nhanh
-        if temperature < 10:
-            ripening_factor = 0.5
-        elif temperature < 20:
-            ripening_factor = 0.8
-        elif temperature <= 25:
-            ripening_factor = 1.0
-        elif temperature <= 30:
-            ripening_factor = 1.2
-        else:
-            ripening_factor = 1.5
-            
-        return ripening_factor
+        return float(self.get_ripening_factors(x, y))
     
     def toggle_auto_iteration(self):
         """
@@ -558,13 +708,100 @@ class WeatherIntegration:
         raw_temp = self.temp_field.get_temperature()
         temp_array = raw_temp.reshape(self.grid_height, self.grid_width)
         
-        # Cập nhật min/max nhiệt độ
-        import numpy as np
-        self.min_temp = max(0, np.min(temp_array) - 5)
-        self.max_temp = min(45, np.max(temp_array) + 5)
+        # Cập nhật min/max nhiệt độ từ thống kê đã có, không duyệt lại mảng
+        if not self.stats_from_solver:
+            self.update_statistics()
+        self.min_temp = max(0, self.statistics["min_temp"] - 5)
+        self.max_temp = min(45, self.statistics["max_temp"] + 5)
         
         return temp_array
         
+    def get_display_field(self, columns=None, rows=None):
+        """
+        Lấy trường nhiệt độ lấy mẫu lên lưới hiển thị columns x rows, độc lập
+        với độ phân giải của lưới thời tiết; vùng lưới mịn (nếu bật) được phủ
+        lên với độ chi tiết của nó.
+        
+        Args:
+            columns, rows (int, optional): Độ phân giải hiển thị, mặc định
+                WEATHER_DISPLAY_RESOLUTION (None = đúng lưới thời tiết)
+            
+        Returns:
+            numpy.ndarray: Mảng (rows, columns), hoặc None nếu không khởi tạo
+        """
+        if columns is None:
+            columns, rows = WEATHER_DISPLAY_RESOLUTION or (self.grid_width, self.grid_height)
+        temp_array = self.get_temperature_field()
+        if temp_array is None or (self.patch is None and (columns, rows) == temp_array.shape[::-1]):
+            return temp_array
+        display = self.grid.resample(temp_array, columns, rows, self.sampling_mode)
+        if self.patch is not None:
+            xs = (np.arange(columns) + 0.5) * (self.grid.world_width / columns)
+            ys = (np.arange(rows) + 0.5) * (self.grid.world_height / rows)
+            xs, ys = np.meshgrid(xs, ys)
+            display = self.patch.sample(xs, ys, display, self.sampling_mode)
+        return display
+    
+    def enable_patch(self, size=WEATHER_PATCH_SIZE, refinement=WEATHER_PATCH_REFINEMENT):
+        """
+        Bật vùng lưới mịn lồng vào lưới thô (xem multires.NestedPatch). Lưới
+        mịn luôn giải bằng RK4 tường minh với bước con theo CFL của nó.
+        
+        Args:
+            size (tuple): (cột, hàng) của vùng mịn tính theo ô thô
+            refinement (int): Số ô mịn trên mỗi ô thô theo mỗi chiều
+            
+        Returns:
+            bool: True nếu đã bật
+        """
+        if not hasattr(self, 'temp_field'):
+            return False
+        try:
+            suffix = '32' if self.precision == 'float32' else ''
+            self.patch = NestedPatch(
+                self.grid, getattr(self.cpp_weather, 'Solver' + suffix), self.dx, self.kappa,
+                size, refinement, np.float32 if suffix else np.float64
+            )
+            # Bắt đầu ở giữa lưới cho tới lần focus_patch đầu tiên
+            self.patch.move_to(((self.grid_width - self.patch.columns) // 2,
+                                (self.grid_height - self.patch.rows) // 2),
+                               self._field_views()[0])
+            self._reset_patch()
+            return True
+        except Exception as e:
+            print_safe(f"Không thể bật lưới mịn: {e}", f"Could not enable nested patch: {e}")
+            self.patch = None
+            return False
+    
+    def disable_patch(self):
+        """Tắt vùng lưới mịn lồng."""
+        self.patch = None
+        self.patch_focus_step = None
+    
+    def focus_patch(self, xs, ys, interval=WEATHER_PATCH_FOCUS_INTERVAL):
+        """
+        Dời vùng lưới mịn tới nơi chim/quả dày đặc nhất, tối đa một lần mỗi
+        interval bước thời tiết.
+        
+        Args:
+            xs, ys: Tọa độ màn hình của chim/quả
+            interval (int): Số bước tối thiểu giữa hai lần dời
+            
+        Returns:
+            bool: True nếu vùng mịn đã dời
+        """
+        if self.patch is None:
+            return False
+        if self.patch_focus_step is not None and self.steps - self.patch_focus_step < interval:
+            return False
+        self.patch_focus_step = self.steps
+        return self.patch.focus(xs, ys, self._field_views()[0])
+    
+    def _reset_patch(self):
+        """Khởi tạo lại lưới mịn từ lưới thô sau khi trường bị sửa ngoài solver."""
+        if self.patch is not None:
+            self.patch.reset_from(self._field_views()[0])
+    
     def get_wind_field(self):
         """
         Lấy hai mảng 2D chứa dữ liệu gió (x, y) để hiển thị
@@ -583,3 +820,50 @@ class WeatherIntegration:
         wind_y = raw_wind_y.reshape(self.grid_height, self.grid_width)
         
         return wind_x, wind_y
+    
+    def get_state(self):
+        """
+        Trạng thái đầy đủ của mô hình để ghi checkpoint: trường nhiệt độ,
+        trạng thái trường gió (gió, xoáy, tham số tiến hóa, bộ sinh số ngẫu
+        nhiên), thời gian và số bước. Nguồn nhiệt duy trì theo con trỏ không
+        được lưu.
+        
+        Returns:
+            dict: Trạng thái, hoặc None nếu mô hình chưa khởi tạo
+        """
+        if not self.initialized:
+            return None
+        return {
+            "grid_size": (self.grid_width, self.grid_height),
+            "temperature": self.temp_field.get_temperature(),
+            "wind": self.wind_field.get_state(),
+            "time": float(self.time),
+            "steps": int(self.steps),
+            "scenario": self.scenario,
+        }
+    
+    def set_state(self, state):
+        """
+        Khôi phục trạng thái từ get_state.
+        
+        Args:
+            state (dict): Trạng thái đã lưu
+            
+        Raises:
+            ValueError: Nếu kích thước lưới khác với mô hình hiện tại
+        """
+        if not self.initialized:
+            return
+        grid_size = tuple(int(value) for value in state["grid_size"])
+        if grid_size != (self.grid_width, self.grid_height):
+            raise ValueError(f"Checkpoint có lưới {grid_size}, mô hình hiện tại "
+                             f"{(self.grid_width, self.grid_height)}")
+        self.temp_field.set_temperature(np.ascontiguousarray(state["temperature"]))
+        self.wind_field.set_state(state["wind"])
+        self.time = float(state["time"])
+        self.steps = int(state["steps"])
+        self.scenario = state.get("scenario", self.scenario)
+        self.patch_focus_step = None
+        self._reset_patch()
+        self.stats_from_solver = False
+        self.update_statistics()
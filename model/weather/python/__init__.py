@@ -11,9 +11,23 @@ The module is organized into the following subpackages:
 - utils: Build and utility tools
 """
 
-# Import main classes for backwards compatibility
-from model.weather.python.core.cpp_weather_interface import WeatherModelCpp
-from model.weather.python.visualization.realtime_simulation import RealtimeWeatherSimulation
+# Import main classes for backwards compatibility, lazily: RealtimeWeatherSimulation
+# pulls in matplotlib, which only the standalone visualization tools need
+_LAZY_ATTRIBUTES = {
+    'WeatherModelCpp': 'model.weather.python.core.cpp_weather_interface',
+    'RealtimeWeatherSimulation': 'model.weather.python.visualization.realtime_simulation',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
 
 # Make key classes available at the top level
 __all__ = ['WeatherModelCpp', 'RealtimeWeatherSimulation']
@@ -1,95 +1,19 @@
 """
 Tối ưu hóa multiprocessing cho mô phỏng thời tiết C++/Python
-- Sử dụng persistent worker pool
+- Sử dụng persistent worker pool trên bộ nhớ chung (WeatherEngine, backend 'process-pool')
 - Tối thiểu hóa chi phí khởi tạo
-- Cân bằng tải động giữa các workers
+- So sánh hiệu năng tuần tự và song song trên lưới lớn
+
+Chạy từ thư mục gốc của project:
+    python -m model.weather.python.optimized_mp
 """
 
-import os
-import sys
 import numpy as np
 import time
-from multiprocessing import Pool, cpu_count, freeze_support, current_process, Array, shared_memory
-import ctypes
-
-# Điều chỉnh Python path
-current_dir = os.path.dirname(os.path.abspath(__file__))
-project_root = os.path.abspath(os.path.join(current_dir, '..', '..', '..'))
-if project_root not in sys.path:
-    sys.path.insert(0, project_root)
-if current_dir not in sys.path:
-    sys.path.insert(0, current_dir)
+from multiprocessing import cpu_count, freeze_support
 
-# Biến toàn cục để lưu trữ module C++ sau khi import
-global_cpp_weather = None
-
-def init_worker():
-    """
-    Hàm khởi tạo cho worker processes.
-    """
-    global global_cpp_weather
-    
-    # Import module C++ một lần duy nhất trong worker
-    import cpp_weather
-    global_cpp_weather = cpp_weather
-    
-    proc_name = current_process().name
-    proc_id = int(proc_name.split('-')[-1]) if '-' in proc_name else 0
-    
-    # Chỉ in thông báo khi worker được tạo
-    print(f"Worker {proc_name} (ID: {proc_id}) initialized with C++ module")
-
-def process_subdomain(args):
-    """
-    Worker function tối ưu hóa.
-    """
-    global global_cpp_weather
-    
-    start_row, end_row, width, height, kappa, dx, temp_shape, temp_data, wind_x_data, wind_y_data, dt = args
-    
-    # Đảm bảo C++ module đã được import
-    if global_cpp_weather is None:
-        import cpp_weather
-        global_cpp_weather = cpp_weather
-        print(f"Late import of C++ module in process {current_process().name}")
-    
-    # Chuyển đổi dữ liệu shared memory thành numpy arrays
-    temp_array = np.frombuffer(temp_data, dtype=np.float64).reshape(temp_shape)
-    wind_x_array = np.frombuffer(wind_x_data, dtype=np.float64)
-    wind_y_array = np.frombuffer(wind_y_data, dtype=np.float64)
-    
-    # Tạo subdomain với ghost cells
-    # Ghost cells là các ô bổ sung ở biên để xử lý các điều kiện biên chính xác
-    ghost_start = max(0, start_row - 1)
-    ghost_end = min(height - 1, end_row + 1)
-    
-    # Trích xuất subdomain với ghost cells
-    sub_temp = temp_array[ghost_start:ghost_end+1, :].copy()
-    wind_x_2d = wind_x_array.reshape(height, width)
-    wind_y_2d = wind_y_array.reshape(height, width)
-    sub_wind_x = wind_x_2d[ghost_start:ghost_end+1, :].flatten()
-    sub_wind_y = wind_y_2d[ghost_start:ghost_end+1, :].flatten()
-    
-    # Tạo solver cho subdomain
-    sub_width = width
-    sub_height = sub_temp.shape[0]
-    sub_solver = global_cpp_weather.Solver(sub_width, sub_height, dx, kappa)
-    
-    # Giải subdomain
-    sub_result = sub_solver.solve_rk4_step(sub_temp, sub_wind_x, sub_wind_y, dt)
-    
-    # Xác định phần kết quả cần trả về
-    local_start = 1 if start_row > 0 else 0
-    local_end = sub_height - 1 if end_row < height - 1 else sub_height
-    
-    # Trả về chỉ phần kết quả thực tế (không có ghost cells)
-    # Giả sử subdomain là một phần của mảng lớn
-    result_2d = sub_result[local_start:local_end, :]
-    
-    # Chỉ in thông báo khi cần thiết
-    # print(f"Process {current_process().name} completed subdomain [{start_row}:{end_row+1}]")
-    
-    return (start_row, end_row, result_2d)
+from model.weather.main.native import load_cpp_weather
+from model.weather.main.weather_engine import WeatherEngine
 
 class OptimizedWeatherSimulation:
     """Mô phỏng thời tiết tối ưu hóa sử dụng module C++ và worker pool cố định"""
@@ -104,19 +28,24 @@ class OptimizedWeatherSimulation:
         self.num_processes = num_processes or min(4, cpu_count())
         self.dx = dx
         self.kappa = kappa
-        self.worker_pool = None
         
         print(f"Initializing optimized weather simulation ({width}x{height})")
         print(f"Multiprocessing: {'Enabled' if multiprocessing else 'Disabled'}")
         if multiprocessing:
             print(f"Number of processes: {self.num_processes}")
         
-        # Import module C++
-        import cpp_weather
+        # Module C++ (bản build trong cache) hoặc solver NumPy thay thế
+        cpp_weather = load_cpp_weather()
         self.cpp_weather = cpp_weather
         
-        # Khởi tạo đối tượng C++
-        self.solver = cpp_weather.Solver(width, height, dx, kappa)
+        # Khởi tạo đối tượng C++; bước giải do WeatherEngine đảm nhận, pool
+        # tiến trình cố định trên bộ nhớ chung khi bật multiprocessing
+        self.engine = WeatherEngine(
+            width, height, dx, kappa,
+            mode='process-pool' if multiprocessing else 'cpp-openmp',
+            num_workers=self.num_processes
+        )
+        self.solver = self.engine.solver
         self.wind_field = cpp_weather.WindField(width, height)
         self.temp_field = cpp_weather.TemperatureField(width, height)
         
@@ -128,35 +57,6 @@ class OptimizedWeatherSimulation:
         self.min_temp = []
         self.max_temp = []
         self.mean_temp = []
-        
-        # Chuẩn bị các subdomain nếu sử dụng multiprocessing
-        if self.use_mp:
-            self._prepare_subdomains()
-            # Tạo worker pool cố định
-            self._create_worker_pool()
-    
-    def _prepare_subdomains(self):
-        """Phân chia lưới thành các subdomain"""
-        rows_per_process = self.height // self.num_processes
-        self.subdomains = []
-        
-        for i in range(self.num_processes):
-            start_row = i * rows_per_process
-            end_row = (i + 1) * rows_per_process - 1 if i < self.num_processes - 1 else self.height - 1
-            self.subdomains.append((start_row, end_row))
-            
-        print(f"Created {len(self.subdomains)} subdomains")
-    
-    def _create_worker_pool(self):
-        """Tạo worker pool cố định để tái sử dụng"""
-        if self.worker_pool is None:
-            print("Creating worker pool...")
-            self.worker_pool = Pool(
-                processes=self.num_processes,
-                initializer=init_worker
-            )
-            # Chờ tất cả worker khởi tạo
-            time.sleep(0.5)
     
     def set_initial_conditions(self):
         """Tạo điều kiện ban đầu thực tế"""
@@ -196,10 +96,7 @@ class OptimizedWeatherSimulation:
         """
         start_time = time.time()
         
-        if self.use_mp:
-            dt = self._step_multiprocessing(dt)
-        else:
-            dt = self._step_sequential(dt)
+        dt = self._step_engine(dt)
         
         end_time = time.time()
         step_time = end_time - start_time
@@ -221,58 +118,21 @@ class OptimizedWeatherSimulation:
         
         return dt
     
-    def _step_sequential(self, dt=None):
-        """Xử lý tuần tự"""
+    def _step_engine(self, dt=None):
+        """Giải một bước bằng WeatherEngine (tuần tự hoặc pool tiến trình)"""
         # Lấy dữ liệu
-        temp = self.temp_field.get_temperature()
         wind_x = self.wind_field.get_wind_x()
         wind_y = self.wind_field.get_wind_y()
         
         # Tính bước thời gian nếu cần
         if dt is None:
-            dt = self.solver.compute_cfl_time_step(wind_x, wind_y)
+            dt = self.engine.compute_time_step(wind_x, wind_y)
         
         # Cập nhật nhiệt độ
-        new_temp = self.solver.solve_rk4_step(temp, wind_x, wind_y, dt)
-        self.temp_field.set_temperature(new_temp.flatten())
-        
-        return dt
-    
-    def _step_multiprocessing(self, dt=None):
-        """Xử lý song song tối ưu hóa"""
-        # Đảm bảo worker pool tồn tại
-        if self.worker_pool is None:
-            self._create_worker_pool()
-        
-        # Lấy dữ liệu
-        temp = self.temp_field.get_temperature().reshape(self.height, self.width)
-        wind_x = self.wind_field.get_wind_x()
-        wind_y = self.wind_field.get_wind_y()
-        
-        # Tính bước thời gian nếu cần
-        if dt is None:
-            dt = self.solver.compute_cfl_time_step(wind_x, wind_y)
-        
-        # Chuẩn bị tham số cho mỗi worker - truyền dữ liệu thay vì đối tượng
-        args_list = []
-        for start_row, end_row in self.subdomains:
-            args_list.append(
-                (start_row, end_row, self.width, self.height, 
-                 self.kappa, self.dx, temp.shape, temp.tobytes(), 
-                 wind_x.tobytes(), wind_y.tobytes(), dt)
-            )
-        
-        # Xử lý song song với worker pool cố định
-        results = self.worker_pool.map(process_subdomain, args_list)
-        
-        # Kết hợp kết quả vào một mảng 2D
-        temp_result = np.zeros((self.height, self.width), dtype=np.float64)
-        for start_row, end_row, sub_result in results:
-            # Cập nhật phần kết quả tương ứng
-            temp_result[start_row:end_row+1, :] = sub_result
-        
-        # Cập nhật trường nhiệt độ chính
-        self.temp_field.set_temperature(temp_result.flatten())
+        self.engine.set_temperature(self.temp_field.get_temperature())
+        self.engine.set_wind(wind_x, wind_y)
+        self.engine.step(dt)
+        self.temp_field.set_temperature(self.engine.get_temperature(copy=False).ravel())
         
         return dt
     
@@ -311,11 +171,10 @@ class OptimizedWeatherSimulation:
     
     def cleanup(self):
         """Dọn dẹp tài nguyên"""
-        if self.worker_pool:
+        if self.engine is not None:
             print("Closing worker pool...")
-            self.worker_pool.close()
-            self.worker_pool.join()
-            self.worker_pool = None
+            self.engine.close()
+            self.engine = None
 
 def run_large_grid_test(use_multiprocessing=False, grid_size=500, num_steps=10):
     """
@@ -347,7 +206,6 @@ def run_large_grid_test(use_multiprocessing=False, grid_size=500, num_steps=10):
 def main():
     """Hàm chính"""
     print("Weather Simulation Optimized MultiProcessing Test")
-    print(f"Current directory: {current_dir}")
     print(f"Available CPUs: {cpu_count()}")
     
     try:
@@ -7,66 +7,18 @@ import os
 import sys
 import numpy as np
 import time
-from multiprocessing import Pool, cpu_count, freeze_support, current_process
+from multiprocessing import cpu_count, freeze_support
 
 # Điều chỉnh Python path
 current_dir = os.path.dirname(os.path.abspath(__file__))
-project_root = os.path.abspath(os.path.join(current_dir, '..', '..', '..'))
+project_root = os.path.abspath(os.path.join(current_dir, '..', '..', '..', '..'))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 if current_dir not in sys.path:
     sys.path.insert(0, current_dir)
 
-# Hàm xử lý subdomain ở cấp độ module
-def process_subdomain(args):
-    """
-    Worker function cho multiprocessing
-    """
-    process_id = current_process().name
-    
-    start_row, end_row, width, height, kappa, dx, temp_array, wind_x_array, wind_y_array, dt = args
-    
-    # Import module C++ trong worker
-    try:
-        from model.weather.python.core import cpp_weather
-    except ImportError as e:
-        print(f"Process {process_id} failed to import C++ module: {e}")
-        return start_row, end_row, temp_array
-    
-    # Tạo subdomain với ghost cells
-    sub_height = end_row - start_row + 3  # +3 cho ghost cells
-    
-    # Xác định vùng dữ liệu với ghost cells
-    ghost_start = max(0, start_row - 1)
-    ghost_end = min(height - 1, end_row + 1)
-    
-    # Chuyển đổi mảng 1D thành 2D để dễ trích xuất subdomain
-    temp_2d = temp_array.reshape(height, width)
-    wind_x_2d = wind_x_array.reshape(height, width)
-    wind_y_2d = wind_y_array.reshape(height, width)
-    
-    # Trích xuất subdomain với ghost cells
-    sub_temp = temp_2d[ghost_start:ghost_end+1, :].copy()
-    sub_wind_x = wind_x_2d[ghost_start:ghost_end+1, :].flatten()
-    sub_wind_y = wind_y_2d[ghost_start:ghost_end+1, :].flatten()
-    
-    # Tạo solver cho subdomain
-    sub_width = width
-    sub_height = sub_temp.shape[0]
-    sub_solver = cpp_weather.Solver(sub_width, sub_height, dx, kappa)
-    
-    # Giải subdomain
-    sub_result = sub_solver.solve_rk4_step(sub_temp, sub_wind_x, sub_wind_y, dt)
-    
-    # Xác định phần kết quả cần trả về
-    local_start = 1 if start_row > 0 else 0
-    local_end = sub_height - 1 if end_row < height - 1 else sub_height
-    
-    # Chỉ trả về phần kết quả cho subdomain thực tế
-    result_2d = sub_result[local_start:local_end, :]
-    
-    print(f"Process {process_id} completed subdomain [{start_row}:{end_row+1}]")
-    return start_row, end_row, result_2d
+from model.weather.main.native import load_cpp_weather
+from model.weather.main.weather_engine import WeatherEngine
 
 class WeatherSimulation:
     """Mô phỏng thời tiết sử dụng module C++"""
@@ -87,12 +39,18 @@ class WeatherSimulation:
         if multiprocessing:
             print(f"Number of processes: {self.num_processes}")
         
-        # Import module C++
-        from model.weather.python.core import cpp_weather
+        # Module C++ (bản build trong cache) hoặc solver NumPy thay thế
+        cpp_weather = load_cpp_weather()
         self.cpp_weather = cpp_weather
         
-        # Khởi tạo đối tượng C++
-        self.solver = cpp_weather.Solver(width, height, dx, kappa)
+        # Khởi tạo đối tượng C++; bước giải do WeatherEngine đảm nhận, pool
+        # tiến trình trên bộ nhớ chung khi bật multiprocessing
+        self.engine = WeatherEngine(
+            width, height, dx, kappa,
+            mode='process-pool' if multiprocessing else 'cpp-openmp',
+            num_workers=self.num_processes
+        )
+        self.solver = self.engine.solver
         self.wind_field = cpp_weather.WindField(width, height)
         self.temp_field = cpp_weather.TemperatureField(width, height)
         
@@ -103,22 +61,6 @@ class WeatherSimulation:
         self.min_temp = []
         self.max_temp = []
         self.mean_temp = []
-        
-        # Chuẩn bị các subdomain nếu sử dụng multiprocessing
-        if self.use_mp:
-            self._prepare_subdomains()
-    
-    def _prepare_subdomains(self):
-        """Phân chia lưới thành các subdomain"""
-        rows_per_process = self.height // self.num_processes
-        self.subdomains = []
-        
-        for i in range(self.num_processes):
-            start_row = i * rows_per_process
-            end_row = (i + 1) * rows_per_process - 1 if i < self.num_processes - 1 else self.height - 1
-            self.subdomains.append((start_row, end_row))
-            
-        print(f"Created {len(self.subdomains)} subdomains")
     
     def set_initial_conditions(self):
         """Tạo điều kiện ban đầu thực tế"""
@@ -158,10 +100,7 @@ class WeatherSimulation:
         """
         start_time = time.time()
         
-        if self.use_mp:
-            dt = self._step_multiprocessing(dt)
-        else:
-            dt = self._step_sequential(dt)
+        dt = self._step_engine(dt)
         
         end_time = time.time()
         step_time = end_time - start_time
@@ -182,54 +121,21 @@ class WeatherSimulation:
         
         return dt
     
-    def _step_sequential(self, dt=None):
-        """Xử lý tuần tự"""
+    def _step_engine(self, dt=None):
+        """Giải một bước bằng WeatherEngine (tuần tự hoặc pool tiến trình)"""
         # Lấy dữ liệu
-        temp = self.temp_field.get_temperature()
         wind_x = self.wind_field.get_wind_x()
         wind_y = self.wind_field.get_wind_y()
         
         # Tính bước thời gian nếu cần
         if dt is None:
-            dt = self.solver.compute_cfl_time_step(wind_x, wind_y)
+            dt = self.engine.compute_time_step(wind_x, wind_y)
         
         # Cập nhật nhiệt độ
-        new_temp = self.solver.solve_rk4_step(temp, wind_x, wind_y, dt)
-        self.temp_field.set_temperature(new_temp.flatten())
-        
-        return dt
-    
-    def _step_multiprocessing(self, dt=None):
-        """Xử lý song song"""
-        # Lấy dữ liệu
-        temp = self.temp_field.get_temperature()
-        wind_x = self.wind_field.get_wind_x()
-        wind_y = self.wind_field.get_wind_y()
-        
-        # Tính bước thời gian nếu cần
-        if dt is None:
-            dt = self.solver.compute_cfl_time_step(wind_x, wind_y)
-        
-        # Chuẩn bị tham số cho mỗi worker
-        args_list = []
-        for start_row, end_row in self.subdomains:
-            args_list.append(
-                (start_row, end_row, self.width, self.height, 
-                 self.kappa, self.dx, temp, wind_x, wind_y, dt)
-            )
-        
-        # Xử lý song song
-        with Pool(processes=self.num_processes) as pool:
-            results = pool.map(process_subdomain, args_list)
-        
-        # Kết hợp kết quả vào một mảng 2D
-        temp_result = np.zeros((self.height, self.width), dtype=np.float64)
-        for start_row, end_row, sub_result in results:
-            # Cập nhật phần kết quả tương ứng
-            temp_result[start_row:end_row+1, :] = sub_result
-        
-        # Cập nhật trường nhiệt độ chính
-        self.temp_field.set_temperature(temp_result.flatten())
+        self.engine.set_temperature(self.temp_field.get_temperature())
+        self.engine.set_wind(wind_x, wind_y)
+        self.engine.step(dt)
+        self.temp_field.set_temperature(self.engine.get_temperature(copy=False).ravel())
         
         return dt
     
@@ -28,71 +28,23 @@ HƯỚNG DẪN SỬ DỤNG:
    ```
 """
 
-import numpy as np
 import time
-from multiprocessing import Pool, cpu_count
+from multiprocessing import cpu_count
 import logging
 
+from model.weather.main.weather_engine import WeatherEngine
+
 # Cài đặt logging
 logger = logging.getLogger(__name__)
 
 # Import lớp interface C++
 try:
-    from model.weather.python.cpp_weather_interface import WeatherModelCpp
+    from model.weather.python.core.cpp_weather_interface import WeatherModelCpp
     CPP_MODULE_AVAILABLE = True
 except ImportError:
     logger.warning("Không thể import module C++. Đảm bảo module đã được biên dịch.")
     CPP_MODULE_AVAILABLE = False
 
-def solve_subdomain(args):
-    """
-    Hàm worker để xử lý một subdomain (được gọi bởi pool.map)
-    
-    Args:
-        args (tuple): (start_row, end_row, temperature, wind_x, wind_y, dt, width, height, dx, kappa)
-        
-    Returns:
-        tuple: (start_row, end_row, temperature_result)
-    """
-    start_row, end_row, temperature, wind_x, wind_y, dt, width, height, dx, kappa = args
-    
-    # Phân tích subdomain từ mảng đầu vào
-    rows = end_row - start_row + 1
-    subdomain_height = rows + 2  # Thêm ghost cells
-    subdomain_temp = np.zeros((subdomain_height, width))
-    
-    # Sao chép dữ liệu vào subdomain (bao gồm ghost cells)
-    if start_row > 0:
-        subdomain_temp[0, :] = temperature[start_row - 1, :]
-    else:
-        subdomain_temp[0, :] = temperature[0, :]
-        
-    subdomain_temp[1:rows+1, :] = temperature[start_row:end_row+1, :]
-    
-    if end_row < height - 1:
-        subdomain_temp[rows+1, :] = temperature[end_row + 1, :]
-    else:
-        subdomain_temp[rows+1, :] = temperature[end_row, :]
-        
-    # Cắt trường gió tương ứng
-    subdomain_wind_x = wind_x[max(0, start_row-1):min(height, end_row+2), :]
-    subdomain_wind_y = wind_y[max(0, start_row-1):min(height, end_row+2), :]
-    
-    # Tạo đối tượng trình giải
-    solver = WeatherModelCpp(width, subdomain_height, dx, kappa)
-    
-    # Đặt dữ liệu nhiệt độ và gió
-    solver.set_temperature_data(subdomain_temp)
-    
-    # Chạy một bước mô phỏng
-    solver.step_simulation(dt)
-    
-    # Lấy kết quả (chỉ phần không có ghost cells)
-    result = solver.get_temperature()[1:rows+1, :]
-    
-    return (start_row, end_row, result)
-
-
 class WeatherMultiprocessingManager:
     """Quản lý tính toán song song cho mô hình thời tiết."""
 
@@ -125,31 +77,10 @@ class WeatherMultiprocessingManager:
         # Khởi tạo mô hình tuần tự để quản lý dữ liệu và tạo trường gió
         self.model = WeatherModelCpp(width, height, dx, kappa)
         
-        # Khởi tạo Pool để tính toán song song
-        self.pool = Pool(processes=self.num_processes)
-        
-        # Xác định phân chia subdomain
-        self._calculate_subdomains()
-
-    def _calculate_subdomains(self):
-        """Tính toán phân chia subdomain dựa trên số processes."""
-        # Tối ưu: chia đều số hàng cho mỗi process
-        rows_per_process = self.height // self.num_processes
-        remainder = self.height % self.num_processes
-        
-        self.subdomains = []
-        start_row = 0
-        
-        for i in range(self.num_processes):
-            # Điều chỉnh để phân phối dư số hàng
-            extra = 1 if i < remainder else 0
-            rows = rows_per_process + extra
-            end_row = start_row + rows - 1
-            
-            self.subdomains.append((start_row, end_row))
-            start_row = end_row + 1
-            
-        logger.debug(f"Đã tạo {len(self.subdomains)} subdomain: {self.subdomains}")
+        # Pool tiến trình bền vững trên bộ nhớ chung, mỗi tiến trình một dải hàng
+        self.engine = WeatherEngine(width, height, dx, kappa, mode='process-pool',
+                                    num_workers=self.num_processes)
+        logger.debug(f"Đã tạo {len(self.engine.backend.subdomains)} subdomain: {self.engine.backend.subdomains}")
 
     def set_uniform_temperature(self, temp_value):
         """
@@ -211,26 +142,16 @@ class WeatherMultiprocessingManager:
         
         # Tính bước thời gian nếu cần
         if dt is None:
-            dt = self.model.solver.compute_cfl_time_step(wind_x.flatten(), wind_y.flatten())
+            dt = self.engine.compute_time_step(wind_x.flatten(), wind_y.flatten())
             logger.debug(f"Bước thời gian CFL được tính: {dt}")
         
-        # Chuẩn bị tham số cho mỗi subdomain
-        worker_args = []
-        for start_row, end_row in self.subdomains:
-            worker_args.append((
-                start_row, end_row, temperature, wind_x, wind_y, dt,
-                self.width, self.height, self.dx, self.kappa
-            ))
-        
         # Xử lý song song
-        results = self.pool.map(solve_subdomain, worker_args)
-        
-        # Kết hợp kết quả từ các subdomain
-        for start_row, end_row, result in results:
-            temperature[start_row:end_row+1, :] = result
+        self.engine.set_temperature(temperature)
+        self.engine.set_wind(wind_x, wind_y)
+        self.engine.step(dt)
         
         # Cập nhật mô hình chính
-        self.model.set_temperature_data(temperature)
+        self.model.set_temperature_data(self.engine.get_temperature())
         
         end_time = time.time()
         logger.debug(f"Bước mô phỏng song song hoàn thành trong {end_time - start_time:.3f} giây")
@@ -275,9 +196,9 @@ class WeatherMultiprocessingManager:
     
     def close(self):
         """Đóng pool tiến trình khi kết thúc."""
-        if hasattr(self, 'pool'):
-            self.pool.close()
-            self.pool.join()
+        if getattr(self, 'engine', None) is not None:
+            self.engine.close()
+            self.engine = None
             logger.info("Đã đóng pool tiến trình")
     
     def __del__(self):
@@ -1,71 +1,39 @@
 """
 Script biên dịch module C++ cho mô hình thời tiết
 
+Module được build bằng setuptools + pybind11 (model/weather/cpp/setup.py, bật
+-O3, -march=native và OpenMP nếu trình biên dịch hỗ trợ) rồi đặt vào
+CPP_WEATHER_CACHE_DIR/<mã băm mã nguồn>/. model/weather/main/native.py nạp
+đúng bản ứng với mã nguồn hiện tại; nếu chưa build, mô phỏng dùng solver NumPy.
+Mã nguồn không đổi thì lần chạy sau không build lại.
+
 HƯỚNG DẪN SỬ DỤNG:
-1. Đảm bảo đã cài đặt pybind11:
+1. Đảm bảo đã cài đặt pybind11 và một trình biên dịch C++ (g++, clang++ hoặc MSVC):
    `pip install pybind11`
 2. Chạy script này từ thư mục gốc của project:
-   `python -m model.weather.python.build_cpp_module`
-3. Sau khi biên dịch thành công, bạn có thể sử dụng các lớp trong cpp_weather_interface.py
+   `python -m model.weather.python.utils.build_cpp_module`
+   Thêm --force để build lại dù đã có trong cache.
 """
 
+import argparse
+import glob
 import os
 import sys
 import subprocess
 import shutil
 import logging
-import platform
+import tempfile
+
+from model.weather.main.native import CPP_DIR, cached_build_path, extension_filename
+from utils.config import CPP_WEATHER_CACHE_DIR
 
 # Cài đặt logging
-logging.basicConfig(level=logging.INFO, 
+logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def get_project_root():
-    """Lấy đường dẫn thư mục gốc của project."""
-    # Giả sử script này đặt trong model/weather/python/
-    return os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
-
 def check_dependencies():
     """Kiểm tra các phụ thuộc cần thiết."""
-    # Kiểm tra CMake
-    try:
-        subprocess.run(['cmake', '--version'], check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        logger.info("CMake đã được cài đặt.")
-    except (subprocess.SubprocessError, FileNotFoundError):
-        logger.error("CMake không được tìm thấy. Vui lòng cài đặt CMake.")
-        return False
-
-    # Kiểm tra trình biên dịch C++
-    compiler_found = False
-    if platform.system() == 'Windows':
-        try:
-            subprocess.run(['cl'], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            logger.info("MSVC compiler đã được tìm thấy.")
-            compiler_found = True
-        except (subprocess.SubprocessError, FileNotFoundError):
-            pass
-            
-        if not compiler_found:
-            try:
-                subprocess.run(['g++', '--version'], check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-                logger.info("GCC compiler đã được tìm thấy.")
-                compiler_found = True
-            except (subprocess.SubprocessError, FileNotFoundError):
-                pass
-    else:
-        try:
-            subprocess.run(['g++', '--version'], check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            logger.info("GCC compiler đã được tìm thấy.")
-            compiler_found = True
-        except (subprocess.SubprocessError, FileNotFoundError):
-            pass
-            
-    if not compiler_found:
-        logger.error("Không tìm thấy trình biên dịch C++. Cài đặt MSVC, GCC, hoặc Clang.")
-        return False
-
-    # Kiểm tra pybind11
     try:
         import pybind11
         logger.info(f"pybind11 đã được cài đặt, phiên bản {pybind11.__version__}")
@@ -73,80 +41,70 @@ def check_dependencies():
         logger.error("pybind11 chưa được cài đặt. Chạy 'pip install pybind11'")
         return False
 
-    return True
-
-def build_module():
-    """Biên dịch module C++ sử dụng CMake."""
-    project_root = get_project_root()
-    module_dir = os.path.join(project_root, 'model', 'weather')
-    build_dir = os.path.join(module_dir, 'cpp', 'build')
-    
-    # Tạo thư mục build nếu chưa tồn tại
-    os.makedirs(build_dir, exist_ok=True)
-    
-    # Chạy CMake để tạo build files
-    logger.info("Đang tạo build files với CMake...")
-    
-    # Thay đổi thư mục làm việc
-    os.chdir(build_dir)
-    
-    # Chạy CMake
-    try:
-        cmake_cmd = ['cmake', '..']
-        subprocess.run(cmake_cmd, check=True)
-    except subprocess.CalledProcessError as e:
-        logger.error(f"Lỗi khi chạy CMake: {e}")
-        return False
-    
-    # Build module
-    logger.info("Đang biên dịch module C++...")
     try:
-        build_cmd = ['cmake', '--build', '.', '--config', 'Release']
-        subprocess.run(build_cmd, check=True)
-    except subprocess.CalledProcessError as e:
-        logger.error(f"Lỗi khi biên dịch module: {e}")
-        return False
-    
-    logger.info("Module C++ đã được biên dịch thành công.")
-    
-    # Kiểm tra file đầu ra
-    module_name = None
-    if platform.system() == 'Windows':
-        module_name = 'cpp_weather.pyd'
-    else:
-        module_name = 'cpp_weather.so'
-    
-    output_path = os.path.join(module_dir, 'python', module_name)
-    if not os.path.exists(output_path):
-        logger.warning(f"Không tìm thấy file kết quả tại {output_path}")
-        # Tìm kiếm file đầu ra trong các thư mục
-        for root, dirs, files in os.walk(build_dir):
-            for file in files:
-                if file.startswith('cpp_weather') and (file.endswith('.so') or file.endswith('.pyd')):
-                    found_path = os.path.join(root, file)
-                    logger.info(f"Tìm thấy module tại {found_path}")
-                    # Di chuyển sang thư mục đích
-                    shutil.copy2(found_path, output_path)
-                    logger.info(f"Đã sao chép module vào {output_path}")
-                    return True
-        
-        logger.error("Không tìm thấy module đã biên dịch.")
+        import setuptools  # noqa: F401
+    except ImportError:
+        logger.error("setuptools chưa được cài đặt. Chạy 'pip install setuptools'")
         return False
-    
+
     return True
 
+def build_module(cache_dir=CPP_WEATHER_CACHE_DIR, force=False):
+    """
+    Biên dịch module C++ vào cache.
+
+    Args:
+        cache_dir (str): Thư mục cache bản build
+        force (bool): Build lại dù đã có bản ứng với mã nguồn hiện tại
+
+    Returns:
+        str: Đường dẫn module trong cache, None nếu biên dịch thất bại
+    """
+    output_path = cached_build_path(cache_dir)
+    if os.path.exists(output_path) and not force:
+        logger.info(f"Module ứng với mã nguồn hiện tại đã có tại {output_path}")
+        return output_path
+
+    output_dir = os.path.dirname(output_path)
+    os.makedirs(output_dir, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=output_dir) as work_dir:
+        logger.info("Đang biên dịch module C++...")
+        build_cmd = [sys.executable, 'setup.py', '-q', 'build_ext',
+                     '--build-lib', work_dir, '--build-temp', os.path.join(work_dir, 'obj')]
+        try:
+            subprocess.run(build_cmd, cwd=CPP_DIR, check=True)
+        except (subprocess.CalledProcessError, OSError) as e:
+            logger.error(f"Lỗi khi biên dịch module: {e}")
+            return None
+
+        built = glob.glob(os.path.join(work_dir, extension_filename()))
+        if not built:
+            logger.error("Không tìm thấy module đã biên dịch.")
+            return None
+        # Đổi tên nguyên tử: tiến trình khác không bao giờ thấy file ghi dở
+        os.replace(built[0], output_path)
+    shutil.rmtree(os.path.join(CPP_DIR, 'build'), ignore_errors=True)
+
+    logger.info(f"Module C++ đã được biên dịch thành công: {output_path}")
+    return output_path
+
 def main():
     """Hàm chính để biên dịch module."""
+    parser = argparse.ArgumentParser(description="Biên dịch module C++ cpp_weather vào cache")
+    parser.add_argument('--force', action='store_true', help="Build lại dù đã có trong cache")
+    parser.add_argument('--cache-dir', default=CPP_WEATHER_CACHE_DIR, help="Thư mục cache bản build")
+    args = parser.parse_args()
+
     logger.info("Kiểm tra các phụ thuộc...")
     if not check_dependencies():
         logger.error("Kiểm tra phụ thuộc thất bại. Không thể tiếp tục.")
         return 1
-    
+
     logger.info("Bắt đầu biên dịch module C++...")
-    if not build_module():
+    if build_module(args.cache_dir, args.force) is None:
         logger.error("Biên dịch module C++ thất bại.")
         return 1
-    
+
     logger.info("Quá trình biên dịch đã hoàn tất thành công.")
     return 0
 
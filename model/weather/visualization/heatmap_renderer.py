@@ -6,7 +6,6 @@ Cung cấp các class để vẽ bản đồ nhiệt độ và trường gió.
 import numpy as np
 import pyglet
 import math
-from utils.config import GRID_SIZE_X, GRID_SIZE_Y
 
 class HeatmapRenderer:
     """Lớp vẽ bản đồ nhiệt độ sử dụng Pyglet"""
@@ -22,8 +21,8 @@ class HeatmapRenderer:
         self.temp_field = temp_field
         self.width = width
         self.height = height
-        # Khởi tạo mảng nhiệt độ rỗng
-        self.temperature_field = np.zeros((GRID_SIZE_Y, GRID_SIZE_X))
+        # Khởi tạo mảng nhiệt độ rỗng theo kích thước lưới của trường
+        self.temperature_field = np.zeros((temp_field.get_height(), temp_field.get_width()))
         # Giá trị nhiệt độ min và max
         self.min_temp = 0
         self.max_temp = 100
@@ -116,9 +115,10 @@ class WindFieldRenderer:
         self.wind_field = wind_field
         self.width = width
         self.height = height
-        # Khởi tạo mảng vectơ gió rỗng (u, v là các thành phần vận tốc)
-        self.wind_field_u = np.zeros((GRID_SIZE_Y, GRID_SIZE_X))  # thành phần gió theo hướng x
-        self.wind_field_v = np.zeros((GRID_SIZE_Y, GRID_SIZE_X))  # thành phần gió theo hướng y
+        # Mảng vectơ gió (u, v là các thành phần vận tốc), có sau lần update đầu tiên;
+        # kích thước lưới lấy từ mảng nên không phụ thuộc GRID_SIZE_X/GRID_SIZE_Y
+        self.wind_field_u = None  # thành phần gió theo hướng x
+        self.wind_field_v = None  # thành phần gió theo hướng y
     
     def update(self, wind_field_u=None, wind_field_v=None):
         """Cập nhật dữ liệu trường gió"""
@@ -0,0 +1,139 @@
+"""
+Giai đoạn ghép thời tiết vào chim và quả, chạy một lần mỗi tick.
+
+Thay vì mỗi con chim/mỗi quả tự truy vấn trường thời tiết, giai đoạn này gom
+vị trí của cả đàn thành mảng, lấy mẫu gió (và nhiệt độ tại các quả) bằng một
+lần gọi WeatherIntegration.sample_wind/sample_temperature, rồi tính lực lái và
+hệ số chín bằng các phép toán NumPy trên toàn mảng. Chi phí còn lại theo từng
+con chỉ là gom tọa độ và cộng lực, nên có thể bật thường trực với hàng chục
+nghìn con chim.
+
+HƯỚNG DẪN SỬ DỤNG:
+    coupling = WeatherCoupling(weather_integration)
+    # Mỗi tick, trước khi cập nhật chim (lực được cộng dồn vào bird.steering)
+    # và trước khi cập nhật quả
+    coupling.apply(renderer.birds, fruit_manager.store)
+"""
+
+import numpy as np
+
+from utils.vector import Vector2D
+from utils.config import (
+    WIND_STEERING_FACTOR, RIPENING_TEMPERATURE_FACTOR,
+    RIPENING_REFERENCE_TEMPERATURE, RIPENING_MULTIPLIER_MAX
+)
+
+
+def gather_positions(entities):
+    """
+    Gom thuộc tính position (Vector2D) của các đối tượng thành mảng.
+
+    Args:
+        entities (list): Chim (hoặc đối tượng bất kỳ) có thuộc tính position
+
+    Returns:
+        tuple: (xs, ys) hai mảng float độ dài len(entities)
+    """
+    count = len(entities)
+    coords = np.fromiter(
+        (value for entity in entities for value in (entity.position.x, entity.position.y)),
+        dtype=np.float64, count=2 * count
+    ).reshape(count, 2)
+    return coords[:, 0], coords[:, 1]
+
+
+def wind_steering_forces(wind_x, wind_y, max_force, factor=WIND_STEERING_FACTOR):
+    """
+    Lực lái do gió: factor * gió, giới hạn độ lớn theo max_force.
+
+    Args:
+        wind_x, wind_y (numpy.ndarray): Gió tại vị trí từng con chim
+        max_force (float hoặc numpy.ndarray): Lực lái tối đa của từng con
+        factor (float): Hệ số ảnh hưởng của gió
+
+    Returns:
+        tuple: (force_x, force_y) hai mảng cùng hình dạng với wind_x
+    """
+    force_x = factor * np.asarray(wind_x, dtype=np.float64)
+    force_y = factor * np.asarray(wind_y, dtype=np.float64)
+    magnitude = np.hypot(force_x, force_y)
+    scale = np.minimum(1.0, max_force / np.maximum(magnitude, 1e-12))
+    return force_x * scale, force_y * scale
+
+
+def ripening_multipliers(temperature, factor=RIPENING_TEMPERATURE_FACTOR,
+                         reference=RIPENING_REFERENCE_TEMPERATURE):
+    """
+    Hệ số tốc độ chín theo nhiệt độ: 1 tại nhiệt độ tham chiếu, tăng/giảm
+    tuyến tính factor mỗi độ, kẹp trong [0, RIPENING_MULTIPLIER_MAX].
+
+    Args:
+        temperature (numpy.ndarray): Nhiệt độ tại vị trí từng quả
+        factor (float): Độ thay đổi hệ số trên mỗi độ
+        reference (float): Nhiệt độ tham chiếu
+
+    Returns:
+        numpy.ndarray: Hệ số nhân với RIPENING_RATE
+    """
+    temperature = np.asarray(temperature, dtype=np.float64)
+    return np.clip(1.0 + factor * (temperature - reference), 0.0, RIPENING_MULTIPLIER_MAX)
+
+
+class WeatherCoupling:
+    """Ghép trường thời tiết vào hướng bay của chim và tốc độ chín của quả."""
+
+    def __init__(self, weather, wind_factor=WIND_STEERING_FACTOR,
+                 ripening_factor=RIPENING_TEMPERATURE_FACTOR):
+        """
+        Args:
+            weather: WeatherIntegration (cần sample_wind và sample_temperature)
+            wind_factor (float): Hệ số ảnh hưởng của gió đến hướng bay
+            ripening_factor (float): Độ thay đổi tốc độ chín trên mỗi độ
+        """
+        self.weather = weather
+        self.wind_factor = wind_factor
+        self.ripening_factor = ripening_factor
+
+    def apply_wind(self, birds):
+        """
+        Cộng lực lái do gió vào mọi con chim (qua bird.apply_force).
+
+        Args:
+            birds (list): Danh sách chim
+
+        Returns:
+            tuple: (force_x, force_y) đã áp dụng, hoặc None nếu không có chim
+        """
+        if not birds:
+            return None
+        xs, ys = gather_positions(birds)
+        wind_x, wind_y = self.weather.sample_wind(xs, ys)
+        max_force = np.fromiter((bird.max_force for bird in birds), dtype=np.float64, count=len(birds))
+        force_x, force_y = wind_steering_forces(wind_x, wind_y, max_force, self.wind_factor)
+        for bird, fx, fy in zip(birds, force_x.tolist(), force_y.tolist()):
+            bird.apply_force(Vector2D(fx, fy))
+        return force_x, force_y
+
+    def apply_ripening(self, store):
+        """
+        Đặt hệ số tốc độ chín theo nhiệt độ tại vị trí từng quả, ghi thẳng
+        vào mảng ripening_multiplier của kho quả (dùng trong FruitStore.update).
+
+        Args:
+            store (FruitStore): Kho quả
+
+        Returns:
+            numpy.ndarray: Hệ số đã đặt, hoặc None nếu không có quả
+        """
+        if store is None or len(store) == 0:
+            return None
+        positions = store.positions()
+        temperature = self.weather.sample_temperature(positions[:, 0], positions[:, 1])
+        multipliers = ripening_multipliers(temperature, self.ripening_factor)
+        store.set_ripening_multipliers(multipliers)
+        return multipliers
+
+    def apply(self, birds, store):
+        """Chạy cả hai phần ghép cho một tick."""
+        self.apply_wind(birds)
+        self.apply_ripening(store)
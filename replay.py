@@ -0,0 +1,255 @@
+#!/usr/bin/env python
+"""
+Xem lại một bản ghi quỹ đạo (main.py --record DIR) mà không chạy mô phỏng.
+
+Mỗi khung chỉ đọc dữ liệu đã ghi qua TrajectoryReader (memory-map, nạp chunk
+khi cần), nên tua tới tick bất kỳ của một bản ghi rất dài cũng tức thì.
+
+Điều khiển:
+    Space        Phát / tạm dừng
+    ←/→          Lùi / tiến một khung (Shift: một chunk)
+    Home/End     Về đầu / cuối bản ghi
+    ↑/↓          Tăng / giảm tốc độ phát
+    T, G         Bật/tắt bản đồ nhiệt độ, hướng gió
+    Chuột        Bấm hoặc kéo trên thanh tiến trình để tua
+    Q            Thoát
+
+HƯỚNG DẪN SỬ DỤNG:
+    python main.py --record runs/exp1
+    python replay.py runs/exp1 --start_tick 5000
+"""
+
+import os
+import sys
+import pyglet
+from pyglet.window import key
+
+# Đảm bảo import các module dự án
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
+
+from utils.config import WINDOW_WIDTH, WINDOW_HEIGHT, INFO_PANEL_WIDTH, LOG_LEVEL, REPLAY_SPEEDS
+from utils.log import get_logger, configure_logging
+from model.recorder import TrajectoryReader
+from view.renderer import ReplayRenderer
+from temperature_visualization import TemperatureRenderer
+from model.weather.visualization import WindFieldRenderer
+
+logger = get_logger("replay")
+
+# Chiều cao thanh tiến trình ở đáy vùng mô phỏng
+SCRUB_BAR_HEIGHT = 12
+
+
+class RecordedWeather:
+    """Thay WeatherIntegration cho TemperatureRenderer: chỉ trả về khung nhiệt độ đã ghi"""
+
+    def __init__(self):
+        self.temperature = None
+
+    def initialize_weather(self):
+        """Không có mô hình để khởi tạo khi xem lại"""
+
+    def get_temperature_field(self):
+        return self.temperature
+
+
+class ReplayViewer:
+    """Cửa sổ xem lại bản ghi quỹ đạo"""
+
+    def __init__(self, reader, start_frame=0, speed_index=None):
+        """
+        Args:
+            reader (TrajectoryReader): Bản ghi đã mở
+            start_frame (int): Khung bắt đầu
+            speed_index (int, optional): Chỉ số trong REPLAY_SPEEDS, mặc định tốc độ 1
+        """
+        self.reader = reader
+        self.area_width = WINDOW_WIDTH - INFO_PANEL_WIDTH
+        self.window = pyglet.window.Window(
+            width=WINDOW_WIDTH,
+            height=WINDOW_HEIGHT,
+            caption=f"Xem lại: {reader.directory}"
+        )
+        self.renderer = ReplayRenderer()
+        self.weather = RecordedWeather()
+        self.temperature_renderer = TemperatureRenderer(WINDOW_WIDTH, WINDOW_HEIGHT, INFO_PANEL_WIDTH)
+        self.wind_renderer = WindFieldRenderer(None, self.area_width, WINDOW_HEIGHT)
+
+        self.playing = True
+        self.speed_index = REPLAY_SPEEDS.index(1) if speed_index is None else speed_index
+        self.position = float(start_frame)
+        self.frame_index = None
+        self.frame = None
+        self.show_temperature_map = False
+        self.show_wind_field = False
+        self.show_frame(start_frame)
+
+        self.window.on_draw = self.on_draw
+        self.window.on_key_press = self.on_key_press
+        self.window.on_mouse_press = self.on_mouse_press
+        self.window.on_mouse_drag = self.on_mouse_drag
+
+    @property
+    def speed(self):
+        return REPLAY_SPEEDS[self.speed_index]
+
+    def show_frame(self, index):
+        """Đọc và hiển thị khung index (giới hạn trong bản ghi)"""
+        index = min(max(int(index), 0), len(self.reader) - 1)
+        if index == self.frame_index:
+            return
+        self.frame_index = index
+        self.frame = self.reader.frame(index)
+        self.renderer.set_frame(self.frame)
+        if self.frame['temperature'] is not None:
+            self.weather.temperature = self.frame['temperature']
+        if self.frame['wind'] is not None:
+            self.wind_renderer.update(self.frame['wind'][0], self.frame['wind'][1])
+
+    def seek(self, index):
+        """Tua tới khung index"""
+        self.position = float(min(max(index, 0), len(self.reader) - 1))
+        self.show_frame(self.position)
+
+    def update(self, dt):
+        """Tiến speed khung mỗi lần vẽ khi đang phát; dừng ở cuối bản ghi"""
+        if not self.playing:
+            return
+        self.position = min(self.position + self.speed, len(self.reader) - 1)
+        if self.position >= len(self.reader) - 1:
+            self.playing = False
+        self.show_frame(self.position)
+
+    def on_draw(self):
+        """Vẽ khung hiện tại cùng bản đồ nhiệt, gió và thanh thông tin"""
+        self.window.clear()
+        if self.show_temperature_map and self.weather.temperature is not None:
+            self.temperature_renderer.draw(self.weather, True)
+        if self.show_wind_field:
+            self.wind_renderer.draw(self.area_width, WINDOW_HEIGHT, scale=3.0, arrow_color=(0, 150, 255), opacity=200)
+        self.renderer.draw()
+        self.draw_scrub_bar()
+        self.draw_info_panel()
+
+    def draw_scrub_bar(self):
+        """Thanh tiến trình ở đáy vùng mô phỏng, kèm vạch ranh giới chunk khi đủ thưa"""
+        pyglet.shapes.Rectangle(0, 0, self.area_width, SCRUB_BAR_HEIGHT, color=(60, 60, 60)).draw()
+        progress = self.frame_index / max(len(self.reader) - 1, 1)
+        pyglet.shapes.Rectangle(0, 0, self.area_width * progress, SCRUB_BAR_HEIGHT, color=(0, 170, 255)).draw()
+        chunks = len(self.reader.chunk_names)
+        if 1 < chunks <= self.area_width // 4:
+            for index in range(1, chunks):
+                x = self.area_width * index * self.reader.chunk_ticks / max(len(self.reader) - 1, 1)
+                pyglet.shapes.Line(x, 0, x, SCRUB_BAR_HEIGHT, color=(20, 20, 20)).draw()
+
+    def draw_info_panel(self):
+        """Thanh thông tin bên phải"""
+        panel = pyglet.shapes.Rectangle(
+            x=self.area_width, y=0, width=INFO_PANEL_WIDTH, height=WINDOW_HEIGHT, color=(30, 30, 30)
+        )
+        panel.opacity = 200
+        panel.draw()
+        lines = [
+            "XEM LẠI BẢN GHI",
+            "------------------------",
+            f"Tick: {self.frame['tick']} / {self.reader.tick_of(len(self.reader) - 1)}",
+            f"Khung: {self.frame_index + 1} / {len(self.reader)}",
+            f"Chunk: {self.reader.chunk_of(self.frame_index) + 1} / {len(self.reader.chunk_names)}",
+            f"Tốc độ: x{self.speed:g} ({'đang phát' if self.playing else 'tạm dừng'})",
+            f"Số chim: {len(self.frame['bird_id'])}",
+            f"Số quả: {len(self.frame['fruit_xy'])}",
+            "",
+            "Space: Phát / tạm dừng",
+            "←/→: Một khung (Shift: một chunk)",
+            "↑/↓: Tốc độ, Home/End: Đầu/cuối",
+            f"T: Nhiệt độ ({'hiện' if self.show_temperature_map else 'ẩn'})",
+            f"G: Gió ({'hiện' if self.show_wind_field else 'ẩn'})",
+            "Q: Thoát",
+        ]
+        pyglet.text.Label(
+            "\n".join(lines),
+            font_name='Arial',
+            font_size=12,
+            x=self.area_width + 10,
+            y=WINDOW_HEIGHT - 20,
+            width=INFO_PANEL_WIDTH - 20,
+            multiline=True,
+            color=(255, 255, 255, 255)
+        ).draw()
+
+    def on_key_press(self, symbol, modifiers):
+        """Xử lý phím điều khiển"""
+        step = self.reader.chunk_ticks if modifiers & key.MOD_SHIFT else 1
+        if symbol == key.Q:
+            pyglet.app.exit()
+        elif symbol == key.SPACE:
+            if self.frame_index >= len(self.reader) - 1:
+                self.seek(0)
+            self.playing = not self.playing
+        elif symbol == key.RIGHT:
+            self.playing = False
+            self.seek(self.frame_index + step)
+        elif symbol == key.LEFT:
+            self.playing = False
+            self.seek(self.frame_index - step)
+        elif symbol == key.HOME:
+            self.seek(0)
+        elif symbol == key.END:
+            self.seek(len(self.reader) - 1)
+        elif symbol == key.UP:
+            self.speed_index = min(self.speed_index + 1, len(REPLAY_SPEEDS) - 1)
+        elif symbol == key.DOWN:
+            self.speed_index = max(self.speed_index - 1, 0)
+        elif symbol == key.T:
+            self.show_temperature_map = not self.show_temperature_map
+        elif symbol == key.G:
+            self.show_wind_field = not self.show_wind_field
+
+    def on_mouse_press(self, x, y, button, modifiers):
+        """Bấm trên thanh tiến trình để tua"""
+        if y <= SCRUB_BAR_HEIGHT and x < self.area_width:
+            self.seek(round(x / self.area_width * (len(self.reader) - 1)))
+
+    def on_mouse_drag(self, x, y, dx, dy, buttons, modifiers):
+        """Kéo trên thanh tiến trình để tua liên tục"""
+        self.on_mouse_press(x, y, buttons, modifiers)
+
+    def run(self):
+        """Chạy vòng vẽ"""
+        pyglet.clock.schedule_interval(self.update, 1 / 60.0)
+        pyglet.app.run()
+
+
+def main():
+    """Hàm chính"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Xem lại bản ghi quỹ đạo Bird Simulation')
+    parser.add_argument('directory', type=str, help="Thư mục bản ghi (main.py --record DIR)")
+    parser.add_argument('--start_tick', type=int, default=0, help="Tick bắt đầu xem")
+    parser.add_argument('--cache', type=str, default=None,
+                        help="Thư mục chứa các mảng đã giải nén (mặc định DIR/replay_cache)")
+    parser.add_argument('--log_level', type=str, default=LOG_LEVEL,
+                        help="Mức log: DEBUG, INFO, WARNING, ERROR")
+    args = parser.parse_args()
+    configure_logging(args.log_level)
+
+    try:
+        reader = TrajectoryReader(args.directory, cache_directory=args.cache)
+    except (OSError, ValueError) as e:
+        logger.error("Không mở được bản ghi %s: %s", args.directory, e)
+        sys.exit(1)
+    if len(reader) == 0:
+        logger.error("Bản ghi %s chưa có chunk nào", args.directory)
+        sys.exit(1)
+    logger.info("Đã mở bản ghi %s: %d khung, %d chunk, decimation %d",
+                args.directory, len(reader), len(reader.chunk_names), reader.decimation)
+
+    with reader:
+        ReplayViewer(reader, reader.frame_at_tick(args.start_tick)).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,7 @@ Module cập nhật dữ liệu nhiệt độ từ mô hình.
 """
 
 import numpy as np
-import random
+from utils.rng import get_rng
 from .utils import print_safe
 
 class TemperatureUpdater:
@@ -29,15 +29,8 @@ class TemperatureUpdater:
             return False
             
         try:
-            # Khởi tạo mô hình một lần (không reset khi force_update)
-            if self.steps == 0:
-                try:
-                    weather_integration.initialize_weather()
-                except Exception as e:
-                    print_safe(f"Khởi tạo mô hình thời tiết không thành công: {e}",
-                              f"Failed to initialize weather model: {e}")
-            
-            # Cập nhật mô hình
+            # Cập nhật mô hình (không gọi initialize_weather: mô hình đã dựng kịch bản
+            # khi khởi tạo, gọi lại sẽ xóa mọi thay đổi của trường trước lúc bật bản đồ)
             if hasattr(weather_integration, 'update') and callable(getattr(weather_integration, 'update')):
                 weather_integration.update(dt)
                 self.steps += 1
@@ -67,23 +60,23 @@ class TemperatureUpdater:
             return None, None, None
             
         try:
-            # Lấy dữ liệu nhiệt độ
+            # Lấy dữ liệu nhiệt độ, theo độ phân giải hiển thị nếu mô hình hỗ trợ
             if hasattr(weather_integration, 'get_temperature_field'):
-                temp_array = weather_integration.get_temperature_field()
+                temp_array = self._get_field(weather_integration)
                 
                 if temp_array is not None:
-                    # Kiểm tra dữ liệu nhiệt độ
-                    if np.all(temp_array == 0):
+                    # Dùng min/max đã được mô hình tính sẵn nếu có
+                    min_temp, max_temp = self._get_min_max(weather_integration, temp_array)
+                    
+                    # Kiểm tra dữ liệu nhiệt độ (toàn 0 <=> min == max == 0)
+                    if min_temp == 0 and max_temp == 0:
                         print_safe("Phát hiện trường nhiệt độ toàn 0, tạo lại gradient nhiệt độ...",
                                   "Detected all-zero temperature, recreating temperature gradient...")
                         
                         # Tái tạo dữ liệu nhiệt độ
                         weather_integration.initialize_weather()
-                        temp_array = weather_integration.get_temperature_field()
-                
-                    # Tính min/max
-                    min_temp = float(np.min(temp_array))
-                    max_temp = float(np.max(temp_array))
+                        temp_array = self._get_field(weather_integration)
+                        min_temp, max_temp = self._get_min_max(weather_integration, temp_array)
                     
                     return temp_array, min_temp, max_temp
                     
@@ -93,6 +86,37 @@ class TemperatureUpdater:
             
         return None, None, None
         
+    def _get_field(self, weather_integration):
+        """
+        Lấy mảng nhiệt độ để vẽ: get_display_field (lấy mẫu lên lưới hiển thị,
+        kèm vùng lưới mịn) nếu có, ngược lại đúng lưới thời tiết.
+        
+        Args:
+            weather_integration: Đối tượng tích hợp thời tiết
+            
+        Returns:
+            numpy.ndarray: Mảng 2D nhiệt độ hoặc None
+        """
+        if hasattr(weather_integration, 'get_display_field'):
+            return weather_integration.get_display_field()
+        return weather_integration.get_temperature_field()
+        
+    def _get_min_max(self, weather_integration, temp_array):
+        """
+        Lấy min/max nhiệt độ, ưu tiên thống kê mô hình đã tính sẵn.
+        
+        Args:
+            weather_integration: Đối tượng tích hợp thời tiết
+            temp_array (numpy.ndarray): Mảng nhiệt độ, chỉ duyệt khi không có thống kê
+            
+        Returns:
+            tuple: (min_temp, max_temp)
+        """
+        statistics = getattr(weather_integration, 'statistics', None)
+        if statistics and "min_temp" in statistics and "max_temp" in statistics:
+            return float(statistics["min_temp"]), float(statistics["max_temp"])
+        return float(np.min(temp_array)), float(np.max(temp_array))
+        
     def _add_random_heat_source(self, weather_integration):
         """
         Thêm một nguồn nhiệt ngẫu nhiên vào mô hình.
@@ -115,7 +139,7 @@ class TemperatureUpdater:
             ]
             
             # Lấy một vị trí ngẫu nhiên
-            x, y = random.choice(heat_positions)
+            x, y = heat_positions[get_rng('scenario').integers(len(heat_positions))]
             strength = 15.0  # Cường độ nguồn nhiệt
             radius = 8  # Bán kính
             
@@ -0,0 +1,35 @@
+import sys
+import types
+
+import pytest
+
+from model.weather.main import native, numpy_weather
+from model.weather.main.native import find_cpp_weather
+
+
+@pytest.fixture(scope="session")
+def cpp_weather():
+    """Module C++ đã build (cache theo mã băm hoặc trên sys.path); bỏ qua test nếu chưa build"""
+    try:
+        return find_cpp_weather(fallback=False)
+    except ImportError:
+        pytest.skip("chưa build module C++ cpp_weather")
+
+
+@pytest.fixture(params=["native", "numpy"])
+def weather_module(request, monkeypatch):
+    """
+    Lần lượt module C++ và solver NumPy thay thế (trùng từng bit với RK4), đặt
+    làm kết quả của load_cpp_weather cho WeatherEngine và WeatherIntegration.
+    Worker của process-pool khởi động bằng 'spawn' nên tự tìm lại module.
+    """
+    module = numpy_weather if request.param == "numpy" else request.getfixturevalue("cpp_weather")
+    monkeypatch.setattr(native, "_module", module)
+    return module
+
+
+@pytest.fixture
+def headless_weather(monkeypatch):
+    """Thay renderer heatmap/gió (cần pyglet) bằng lớp rỗng để dựng WeatherIntegration mà không vẽ"""
+    renderers = types.SimpleNamespace(HeatmapRenderer=lambda *args: None, WindFieldRenderer=lambda *args: None)
+    monkeypatch.setitem(sys.modules, "model.weather.visualization", renderers)
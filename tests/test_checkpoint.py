@@ -0,0 +1,79 @@
+import random
+
+import numpy as np
+import pytest
+
+from utils.vector import Vector2D
+from utils.rng import get_rng
+from model.fruit import FruitManager
+from model.checkpoint import save_checkpoint, read_checkpoint, apply_checkpoint
+
+
+class FakeBird:
+    """Chim tối giản có cùng thuộc tính và hàm khởi tạo với Bird (không cần pyglet)"""
+
+    def __init__(self, x, y, velocity):
+        self.position = Vector2D(x, y)
+        self.velocity = velocity
+        self.steering = Vector2D(0, 0)
+        self.speed = velocity.magnitude()
+        self.max_speed = self.max_force = self.size = 1.0
+        self.health = self.energy = self.hunger = 1.0
+        self.lifetime = 0.0
+        self.max_lifespan = self.lifespan = 100
+        self.is_dead = False
+        self.color = (1, 2, 3, 4)
+
+
+class TestCheckpoint:
+    def test_round_trip_flock_fruit_and_rng(self, tmp_path):
+        """Kiểm tra nạp lại cho đúng đàn chim, kho quả, bộ đếm spawn và chuỗi số ngẫu nhiên"""
+        rng = np.random.default_rng(0)
+        birds = [FakeBird(x, y, Vector2D(1.0, -2.0)) for x, y in rng.uniform(0, 500, (20, 2))]
+        birds[3].hunger = 0.25
+        birds[4].original_color, birds[4].color = (9, 9, 9, 9), (0, 255, 0, 0)
+        manager = FruitManager()
+        manager.add_random_fruits(12)
+        manager.store.remove([2, 5])
+        manager.store.ripeness[:] = np.linspace(0, 1.5, manager.store.capacity)
+        manager.spawn_stepper.counter = 3
+        random.seed(7)
+        np.random.seed(7)
+        path = tmp_path / "run.npz"
+        save_checkpoint(str(path), birds, manager, None)
+        expected = (random.random(), np.random.random(3), get_rng('fruit').random())
+
+        restored_manager = FruitManager()
+        restored = apply_checkpoint(read_checkpoint(str(path)), restored_manager, bird_class=FakeBird)
+
+        assert (random.random(), *np.random.random(3)) == (expected[0], *expected[1])
+        assert get_rng('fruit').random() == expected[2]
+        assert [(bird.position.x, bird.position.y) for bird in restored] == \
+               [(bird.position.x, bird.position.y) for bird in birds]
+        assert restored[3].hunger == 0.25 and restored[4].color == (9, 9, 9, 9)
+        assert np.array_equal(restored_manager.positions, manager.positions)
+        assert np.array_equal(restored_manager.ripeness, manager.ripeness)
+        assert restored_manager.spawn_stepper.counter == 3
+        # Ô trống được dựng lại từ các quả đã xóa
+        assert restored_manager.store.add(0.0, 0.0, 0.0) == 2
+
+    def test_rejects_foreign_file(self, tmp_path):
+        """Kiểm tra từ chối file .npz không phải checkpoint"""
+        path = tmp_path / "other.npz"
+        np.savez(path, header=np.array('{"format": "other"}'))
+        with pytest.raises(ValueError):
+            read_checkpoint(str(path))
+
+
+def test_wind_field_state_round_trip(weather_module):
+    """Kiểm tra trường gió khôi phục từ get_state tiến hóa giống hệt bản gốc"""
+    original = weather_module.WindField(30, 20)
+    original.set_evolution(0.2, 20.0)
+    original.generate_gaussian_field(5, 5.0, 4.0)
+    copy = weather_module.WindField(30, 20)
+    copy.set_state(original.get_state())
+    for _ in range(100):
+        original.evolve(0.5)
+        copy.evolve(0.5)
+    assert np.array_equal(original.get_wind_x(), copy.get_wind_x())
+    assert np.array_equal(original.get_wind_y(), copy.get_wind_y())
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from model.weather.main.decomposition import HALO_ROWS, split_rows, strip_height, halo_rows, solve_strip
+
+
+class TestRowSplitting:
+    def test_split_rows_covers_grid(self):
+        """Kiểm tra các dải phủ kín lưới, liên tiếp và lệch nhau tối đa một hàng"""
+        for height in (1, 7, 64, 101):
+            for num_parts in (1, 2, 3, 4, 8):
+                subdomains = split_rows(height, num_parts)
+                assert subdomains[0][0] == 0
+                assert subdomains[-1][1] == height - 1
+                for (_, end_row), (next_start, _) in zip(subdomains, subdomains[1:]):
+                    assert next_start == end_row + 1
+                sizes = [end_row - start_row + 1 for start_row, end_row in subdomains]
+                assert min(sizes) >= 1
+                assert max(sizes) - min(sizes) <= 1
+
+    def test_halo_rows_wrap_periodically(self):
+        """Kiểm tra halo quấn tuần hoàn ở biên trên và dưới"""
+        rows = halo_rows(0, 2, 10)
+        assert len(rows) == strip_height(0, 2)
+        assert list(rows[:HALO_ROWS]) == [6, 7, 8, 9]
+        assert list(rows[HALO_ROWS:HALO_ROWS + 3]) == [0, 1, 2]
+        assert list(rows[-HALO_ROWS:]) == [3, 4, 5, 6]
+
+
+class TestStripSolve:
+    @pytest.fixture
+    def fields(self, weather_module):
+        width, height = 40, 30
+        rng = np.random.default_rng(0)
+        temperature = rng.uniform(10.0, 30.0, (height, width))
+        wind_x = rng.uniform(-2.0, 2.0, (height, width))
+        wind_y = rng.uniform(-2.0, 2.0, (height, width))
+        return weather_module, temperature, wind_x, wind_y
+
+    @pytest.mark.parametrize("num_parts", [1, 2, 3, 4, 7, 30])
+    def test_matches_single_solver_bitwise(self, fields, num_parts):
+        """Kiểm tra giải theo dải trùng khớp từng bit với Solver một tiến trình"""
+        cpp_weather, temperature, wind_x, wind_y = fields
+        height, width = temperature.shape
+        dx, kappa, dt = 1.0, 0.1, 0.05
+
+        expected = temperature
+        result = temperature
+        single = cpp_weather.Solver(width, height, dx, kappa)
+        for _ in range(3):
+            expected = single.solve_rk4_step(expected, wind_x.ravel(), wind_y.ravel(), dt)
+            stepped = np.empty_like(result)
+            for start_row, end_row in split_rows(height, num_parts):
+                solver = cpp_weather.Solver(width, strip_height(start_row, end_row), dx, kappa)
+                stepped[start_row:end_row + 1] = solve_strip(
+                    solver, result, wind_x, wind_y, start_row, end_row, dt
+                )
+            result = stepped
+
+        assert np.array_equal(result, np.asarray(expected).reshape(height, width))
+
+    @pytest.mark.parametrize("num_parts", [1, 3, 30])
+    def test_cpp_subdomain_matches_single_solver_bitwise(self, fields, num_parts):
+        """Kiểm tra Solver.solve_subdomain_into (halo trong C++) trùng khớp với solve_rk4_step"""
+        cpp_weather, temperature, wind_x, wind_y = fields
+        height, width = temperature.shape
+        solver = cpp_weather.Solver(width, height, 1.0, 0.1, False)
+        solver.add_heat_emitter(3.0, 1.0, 2.0, 2.0)
+        expected = solver.solve_rk4_step(temperature, wind_x.ravel(), wind_y.ravel(), 0.05)
+
+        result = np.empty_like(temperature)
+        for start_row, end_row in split_rows(height, num_parts):
+            solver.solve_subdomain_into(temperature, wind_x, wind_y, result, start_row, end_row, 0.05)
+
+        assert np.array_equal(result, expected)
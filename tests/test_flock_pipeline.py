@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+
+from utils.config import SEPARATION_RADIUS, ALIGNMENT_RADIUS, COHESION_RADIUS
+from utils.spatial import neighbor_indices
+from utils.vector import Vector2D
+from model.flock_pipeline import FlockPipeline, default_flock_pipeline
+from model.steering import calculate_steering
+
+
+class StubBird:
+    """Chim tối giản có các hàm pipeline gọi tới, cập nhật như Bird (dùng khi không có pyglet)"""
+
+    def __init__(self, x, y, velocity):
+        self.position = Vector2D(x, y)
+        self.velocity = velocity
+        self.speed = velocity.magnitude()
+        self.steering = Vector2D(0, 0)
+        self.max_speed = 5.0
+        self.max_force = 0.3
+        self.hunger = self.energy = 1.0
+        self.is_dead = False
+
+    def apply_force(self, force):
+        self.steering = self.steering + force
+
+    def update(self, dt):
+        self.steering = self.steering.limit(self.max_force)
+        if self.steering.magnitude() > 0:
+            self.velocity = (self.velocity + self.steering).normalize() * self.speed
+        self.steering = Vector2D(0, 0)
+        self.position = self.position + self.velocity * dt
+
+    def edges(self):
+        # Đàn trong test nằm xa biên, không cần bọc
+        pass
+
+    def consume_food(self, food_positions, ripeness):
+        return -1
+
+    def eat(self, amount):
+        self.hunger = min(1.0, self.hunger + amount)
+
+    def is_alive(self):
+        return True
+
+
+try:
+    from model.bird import Bird
+except ImportError:
+    Bird = StubBird
+
+
+def make_flock(seed, count=150):
+    """Đàn dày đặc ở giữa màn hình để mỗi con có nhiều láng giềng"""
+    rng = np.random.default_rng(seed)
+    xs, ys = rng.uniform(200, 500, (2, count)).tolist()
+    velocities = rng.uniform(-3, 3, (count, 2)).tolist()
+    return [Bird(x, y, Vector2D(vx, vy)) for x, y, (vx, vy) in zip(xs, ys, velocities)]
+
+
+class TestNeighborIndices:
+    def test_matches_brute_force(self):
+        """Kiểm tra lưới ô cho cùng láng giềng (và cùng thứ tự) như so từng cặp"""
+        rng = np.random.default_rng(0)
+        xs, ys = rng.uniform(-50, 400, (2, 300))
+        neighbors = neighbor_indices(xs, ys, 30.0)
+        for index in range(300):
+            expected = np.flatnonzero(np.hypot(xs - xs[index], ys - ys[index]) <= 30.0)
+            assert neighbors[index].tolist() == expected.tolist()
+        assert neighbor_indices([], [], 30.0) == []
+
+
+class TestFlockPipeline:
+    def test_stages_read_context_by_parameter_name(self):
+        """Kiểm tra tham số lấy từ ngữ cảnh theo tên, kết quả ghi vào output"""
+        calls = []
+        pipeline = FlockPipeline()
+        pipeline.register("double", lambda birds: [2 * bird for bird in birds], output="birds")
+        pipeline.register("record", lambda birds, dt, scale=10: calls.append((birds, dt, scale)))
+        context = pipeline.run(birds=[1, 2], dt=0.5)
+        assert context["birds"] == [2, 4]
+        assert calls == [([2, 4], 0.5, 10)]
+        assert set(pipeline.timings) == {"double", "record"} and pipeline.ticks == 1
+
+    def test_replace_keeps_order(self):
+        """Kiểm tra thay một giai đoạn giữ nguyên vị trí và chèn được giai đoạn mới"""
+        pipeline = default_flock_pipeline()
+        assert pipeline.names() == ["neighbors", "steering", "food", "integrate", "wrap", "eat", "cull"]
+        pipeline.replace("neighbors", lambda birds: [birds] * len(birds), output="neighbors")
+        pipeline.register("weather", lambda birds: None, before="integrate")
+        assert pipeline.names() == ["neighbors", "steering", "food", "weather", "integrate", "wrap", "eat", "cull"]
+        with pytest.raises(ValueError):
+            pipeline.register("cull", lambda birds: birds)
+        with pytest.raises(TypeError):
+            pipeline.register("varargs", lambda *args: None)
+
+    def test_default_pipeline_matches_brute_force_steering(self):
+        """Kiểm tra pipeline mặc định (chỉ duyệt láng giềng) cho cùng đàn như calculate_steering trên cả đàn"""
+        food_positions = np.array([[250.0, 260.0], [420.0, 380.0], [330.0, 450.0]])
+        food_ripeness = np.array([0.4, 1.0, 0.8])
+        pipeline = default_flock_pipeline()
+        birds = make_flock(1)
+        expected = make_flock(1)
+        for _ in range(3):
+            birds = pipeline.run(birds=birds, dt=0.5, food_positions=food_positions,
+                                 food_ripeness=food_ripeness)["birds"]
+            for bird in expected:
+                calculate_steering(bird, expected, SEPARATION_RADIUS, ALIGNMENT_RADIUS, COHESION_RADIUS,
+                                   food_positions, food_ripeness)
+            for bird in expected:
+                bird.update(0.5)
+                bird.edges()
+                if bird.consume_food(food_positions, food_ripeness) >= 0:
+                    bird.eat(0.5)
+            expected = [bird for bird in expected if not bird.is_dead and bird.is_alive()]
+
+        def state(flock):
+            return [(bird.position.x, bird.position.y, bird.velocity.x, bird.velocity.y) for bird in flock]
+
+        assert len(birds) == len(expected) == 150
+        assert state(birds) == state(expected)
+        # Lực lái thật sự đổi hướng bay, không phải hai đàn cùng đứng yên
+        assert state(birds) != state(make_flock(1))
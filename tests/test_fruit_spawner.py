@@ -0,0 +1,46 @@
+import numpy as np
+
+from model.fruit import FruitManager
+from model.fruit_functions import FruitSpawner, generate_fruit_positions, sample_temperature_field
+from utils.config import FRUIT_SPAWN_STEP_INTERVAL, WINDOW_WIDTH, WINDOW_HEIGHT, INFO_PANEL_WIDTH
+
+
+def hot_right_field():
+    """Trường nhiệt độ tăng dần theo cột"""
+    return np.tile(np.linspace(0.0, 40.0, 50), (40, 1))
+
+
+class TestFruitSpawner:
+    def test_batch_keeps_hottest_candidate(self):
+        """Kiểm tra mỗi quả giữ đúng ứng viên nóng nhất trong lô"""
+        field = hot_right_field()
+        xs, ys, temps = generate_fruit_positions(200, temperature_field=field, num_samples=10,
+                                                 rng=np.random.default_rng(0))
+        assert xs.shape == ys.shape == temps.shape == (200,)
+        assert np.allclose(temps, sample_temperature_field(field, xs, ys))
+
+        # Cùng dãy số ngẫu nhiên, nhiệt độ từng ứng viên tính riêng
+        rng = np.random.default_rng(0)
+        candidates_x = rng.uniform(0, WINDOW_WIDTH - INFO_PANEL_WIDTH, (200, 10))
+        candidates_y = rng.uniform(0, WINDOW_HEIGHT, (200, 10))
+        candidate_temps = np.array([[sample_temperature_field(field, x, y) for x, y in zip(row_x, row_y)]
+                                    for row_x, row_y in zip(candidates_x, candidates_y)])
+        assert np.allclose(temps, candidate_temps.max(axis=1))
+        assert np.all(np.isin(xs, candidates_x))
+
+    def test_spawns_many_per_step_with_cached_range(self):
+        """Kiểm tra một lượt có thể mọc nhiều quả và dùng min/max truyền vào"""
+        spawner = FruitSpawner(attempts=500, rng=np.random.default_rng(1))
+        xs, ys = spawner.spawn(hot_right_field(), temp_range=(0.0, 40.0), weather=1.0, season=1)
+        assert 300 < len(xs) <= 500
+        # Khoảng nhiệt độ quá rộng làm xác suất nhỏ đi
+        xs, _ = spawner.spawn(hot_right_field(), temp_range=(0.0, 4000.0), weather=1.0, season=1)
+        assert len(xs) < 50
+
+    def test_stepper_advances_once_per_tick(self):
+        """Kiểm tra bộ đếm chỉ tiến một bước mỗi lần update"""
+        manager = FruitManager()
+        manager.spawner = FruitSpawner(attempts=1, rng=np.random.default_rng(2))
+        for tick in range(1, 3 * FRUIT_SPAWN_STEP_INTERVAL + 1):
+            manager.update(0.0, 1 / 60, weather=1.0, season=1)
+            assert manager.count() == tick // FRUIT_SPAWN_STEP_INTERVAL
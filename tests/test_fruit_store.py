@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from model.fruit_store import FruitStore, fruit_colors, MAX_RIPENESS
+from utils.config import RIPENING_RATE
+
+
+class TestFruitStore:
+    def test_add_and_remove_reuse_lowest_free_slot(self):
+        """Kiểm tra ô trống được dùng lại, ô nhỏ nhất trước"""
+        store = FruitStore(capacity=4)
+        slots = store.add_many(np.arange(6.0), np.zeros(6), 0.0)
+        assert slots.tolist() == list(range(6))
+        assert store.capacity >= 6
+        store.remove([4, 1])
+        assert len(store) == 4
+        assert store.add(10.0, 0.0, 0.0) == 1
+        assert store.add(11.0, 0.0, 0.0) == 4
+        assert store.add(12.0, 0.0, 0.0) == 6
+        assert store.positions()[:, 0].tolist() == [0.0, 10.0, 2.0, 3.0, 11.0, 5.0, 12.0]
+
+    def test_update_ripens_with_multiplier_and_expires(self):
+        """Kiểm tra độ chín tăng theo RIPENING_RATE * hệ số và quả quá chín bị loại"""
+        store = FruitStore()
+        store.add_many([0.0, 1.0, 2.0], [0.0, 0.0, 0.0], 0.0)
+        store.set_ripening_multipliers(np.array([1.0, 2.0, 0.0]))
+        elapsed = 0.5 / RIPENING_RATE
+        assert store.update(elapsed) == 0
+        assert store.ripeness_values() == pytest.approx([0.5, 1.0, 0.0])
+        assert store.update(3 * elapsed) == 1
+        assert store.ripeness_values() == pytest.approx([1.5, 0.0])
+        assert store.positions()[:, 0].tolist() == [0.0, 2.0]
+
+    def test_find_ripe_near_returns_nearest_ripe(self):
+        """Kiểm tra chỉ quả chín trong bán kính được chọn, gần nhất trước"""
+        store = FruitStore()
+        store.add_many([0.0, 3.0, 5.0], [0.0, 0.0, 0.0], 0.0)
+        store.ripeness[:3] = [0.5, 1.2, 1.0]
+        assert store.find_ripe_near(0.0, 0.0, 4.0) == 1
+        assert store.find_ripe_near(5.5, 0.0, 4.0) == 2
+        assert store.find_ripe_near(0.0, 0.0, 2.0) == -1
+
+    def test_compaction_keeps_order(self):
+        """Kiểm tra dồn mảng giữ nguyên thứ tự và dữ liệu các quả sống"""
+        store = FruitStore()
+        store.add_many(np.arange(200.0), np.arange(200.0), 0.0)
+        store.remove(np.arange(0, 200, 3))
+        expected = store.positions()
+        store.ripeness[store.active_slots()] = 0.25
+        store.compact()
+        assert store.size == len(store) == len(expected)
+        assert np.array_equal(store.positions(), expected)
+        assert np.all(store.ripeness_values() == 0.25)
+
+    def test_colors_follow_ripeness(self):
+        """Kiểm tra màu: xanh lá khi chưa chín, đỏ khi chín, mờ dần khi quá chín"""
+        colors = fruit_colors(np.array([0.0, 0.5, 1.0, 1.5, MAX_RIPENESS]))
+        assert colors.tolist() == [[0, 255, 0, 255], [127, 127, 0, 255], [255, 0, 0, 255],
+                                   [255, 0, 0, 127], [255, 0, 0, 0]]
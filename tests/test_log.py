@@ -0,0 +1,60 @@
+import io
+import logging
+
+from utils.log import RateLimitFilter, RingBufferHandler, SafeStreamHandler, StructuredFormatter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_logger(name, *handlers):
+    logger = logging.getLogger(f"birdsim.test.{name}")
+    logger.handlers = list(handlers)
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    return logger
+
+
+class TestRateLimitedLogging:
+    def test_rate_limit_per_key_and_suppressed_count(self):
+        """Kiểm tra mỗi khóa in tối đa một lần mỗi khoảng và đếm số bản bị bỏ qua"""
+        clock = FakeClock()
+        stream = io.StringIO()
+        handler = SafeStreamHandler(stream)
+        handler.setFormatter(StructuredFormatter())
+        handler.addFilter(RateLimitFilter(1.0, clock))
+        logger = make_logger("rate", handler)
+
+        for hunger in (0.1, 0.2, 0.3):
+            logger.info("Chim đã ăn quả %.1f", hunger, extra={"key": "bird.ate"})
+        logger.info("Khóa khác", extra={"key": "other"})
+        clock.now = 1.5
+        logger.info("Chim đã ăn quả %.1f", 0.4, extra={"key": "bird.ate"})
+
+        lines = stream.getvalue().splitlines()
+        assert len(lines) == 3
+        assert lines[0].endswith("Chim đã ăn quả 0.1")
+        assert lines[2].endswith("Chim đã ăn quả 0.4 (+2 bản bị bỏ qua)")
+
+    def test_ring_buffer_and_ascii_fallback(self):
+        """Kiểm tra bộ đệm vòng giữ bản ghi mới nhất và console ASCII nhận bản không dấu"""
+        ring = RingBufferHandler(capacity=3)
+        raw = io.BytesIO()
+        stream = io.TextIOWrapper(raw, encoding="ascii")
+        console = SafeStreamHandler(stream)
+        console.setFormatter(logging.Formatter("%(message)s"))
+        logger = make_logger("ring", ring, console)
+
+        for index in range(5):
+            logger.warning("Lỗi khi lấy nhiệt độ %d", index)
+        assert [record.getMessage() for record in ring.recent()] == [
+            "Lỗi khi lấy nhiệt độ 2", "Lỗi khi lấy nhiệt độ 3", "Lỗi khi lấy nhiệt độ 4"
+        ]
+        assert len(ring.recent(1)) == 1
+        stream.flush()
+        assert raw.getvalue().decode("ascii").splitlines()[-1] == "Loi khi lay nhiet do 4"
@@ -0,0 +1,87 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Thư mục chứa module C++ đã biên dịch (đặt cuối để không che gói utils của dự án)
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'model', 'weather', 'python'))
+
+from model.weather.main.multires import WeatherGrid, NestedPatch, sample_bilinear
+
+
+class TestWeatherGrid:
+    def test_bilinear_is_exact_on_linear_field(self):
+        """Kiểm tra nội suy song tuyến tính tái tạo đúng trường tuyến tính bên trong lưới"""
+        grid = WeatherGrid(950, 600, 100, 80)
+        rows, columns = np.mgrid[0:80, 0:100].astype(float)
+        field = 2.0 * columns - 3.0 * rows
+        rng = np.random.default_rng(0)
+        xs = rng.uniform(grid.cell_width, 950 - grid.cell_width, 200)
+        ys = rng.uniform(grid.cell_height, 600 - grid.cell_height, 200)
+        gx, gy = grid.to_grid(xs, ys)
+        assert np.allclose(grid.sample(field, xs, ys), 2.0 * gx - 3.0 * gy)
+
+    def test_nearest_matches_cell_index(self):
+        """Kiểm tra chế độ nearest lấy đúng ô chứa điểm như ánh xạ chỉ số cũ"""
+        grid = WeatherGrid(950, 600, 100, 80)
+        field = np.arange(100 * 80, dtype=float).reshape(80, 100)
+        rng = np.random.default_rng(1)
+        xs = rng.uniform(0, 950, 200)
+        ys = rng.uniform(0, 600, 200)
+        ix, iy = grid.cell_index(xs, ys)
+        assert np.array_equal(grid.sample(field, xs, ys, 'nearest'), field[iy, ix])
+        assert grid.cell_index(-5.0, 700.0) == (0, 79)
+
+    def test_bilinear_wraps_periodically(self):
+        """Kiểm tra nội suy giữa cột cuối và cột đầu quấn tuần hoàn như Solver"""
+        field = np.zeros((4, 4))
+        field[:, 0] = 1.0
+        assert sample_bilinear(field, np.array([3.5]), np.array([1.0]))[0] == pytest.approx(0.5)
+        assert sample_bilinear(field, np.array([3.5]), np.array([1.0]), periodic=False)[0] == 0.0
+
+    def test_resample_shape(self):
+        """Kiểm tra lấy mẫu lên lưới hiển thị độc lập với lưới thời tiết"""
+        grid = WeatherGrid(950, 600, 100, 80)
+        assert grid.resample(np.ones((80, 100)), 37, 11).shape == (11, 37)
+
+
+class TestNestedPatch:
+    @pytest.fixture
+    def setup(self):
+        cpp_weather = pytest.importorskip("cpp_weather")
+        grid = WeatherGrid(1000, 800, 50, 40)
+        rows, columns = np.mgrid[0:40, 0:50].astype(float)
+        temperature = 20.0 + 5.0 * np.sin(2 * np.pi * columns / 50) * np.cos(2 * np.pi * rows / 40)
+        patch = NestedPatch(grid, cpp_weather.Solver, 10.0, 0.92, (12, 10), refinement=3)
+        return cpp_weather, grid, patch, temperature
+
+    def test_tracks_coarse_solution_on_smooth_field(self, setup):
+        """Kiểm tra lưới mịn bám nghiệm lưới thô khi trường trơn"""
+        cpp_weather, grid, patch, temperature = setup
+        wind_x = np.full_like(temperature, 1.5)
+        wind_y = np.full_like(temperature, -0.7)
+        solver = cpp_weather.Solver(50, 40, 10.0, 0.92, False)
+        patch.move_to((20, 15), temperature)
+        current = temperature
+        for _ in range(10):
+            stepped = np.asarray(solver.solve_rk4_step(current, wind_x.ravel(), wind_y.ravel(), 0.5))
+            stepped = stepped.reshape(current.shape)
+            patch.step(current, stepped, wind_x, wind_y, 0.5)
+            current = stepped
+
+        x_min, y_min, x_max, y_max = patch.bounds()
+        xs, ys = np.meshgrid(np.linspace(x_min, x_max - 1, 20), np.linspace(y_min, y_max - 1, 20))
+        coarse = grid.sample(current, xs, ys)
+        assert np.abs(patch.sample(xs, ys, coarse) - coarse).max() < 0.05
+
+    def test_focus_moves_to_densest_region(self, setup):
+        """Kiểm tra vùng mịn dời tới nơi tập trung nhiều điểm nhất"""
+        _, grid, patch, temperature = setup
+        rng = np.random.default_rng(2)
+        xs = rng.normal(850.0, 10.0, 100)
+        ys = rng.normal(120.0, 10.0, 100)
+        assert patch.focus(xs, ys, temperature)
+        assert patch.contains(xs, ys).all()
+        # Vùng đã phủ mọi điểm thì không dời nữa
+        assert not patch.focus(xs, ys, temperature)
@@ -0,0 +1,77 @@
+import sys
+
+import numpy as np
+import pytest
+
+from model.weather.main import native, numpy_weather
+from model.weather.main.native import find_cpp_weather
+from model.weather.main.weather_engine import WeatherEngine
+from model.weather.main.weather_integration import WeatherIntegration
+
+
+def test_falls_back_to_numpy_when_native_missing(monkeypatch, tmp_path):
+    """Kiểm tra không có module C++ thì dùng solver NumPy, hoặc báo lỗi khi tắt fallback"""
+    monkeypatch.setitem(sys.modules, 'cpp_weather', None)
+    assert find_cpp_weather(cache_dir=str(tmp_path)) is numpy_weather
+    assert not native.is_native(numpy_weather)
+    with pytest.raises(ImportError):
+        find_cpp_weather(cache_dir=str(tmp_path), fallback=False)
+
+
+@pytest.mark.parametrize("solver_name", ["Solver", "Solver32"])
+def test_numpy_rk4_matches_native_bit_for_bit(solver_name):
+    """Kiểm tra bước RK4 của solver NumPy trùng từng bit với bản C++"""
+    try:
+        cpp_weather = find_cpp_weather(fallback=False)
+    except ImportError:
+        pytest.skip("chưa build module C++ cpp_weather")
+    rng = np.random.default_rng(3)
+    height, width = 30, 41
+    dtype = np.float32 if solver_name == "Solver32" else np.float64
+    temperature = rng.uniform(10.0, 30.0, (height, width)).astype(dtype)
+    wind_x, wind_y, source = (rng.normal(0.0, 2.0, height * width).astype(dtype) for _ in range(3))
+    solvers = [getattr(module, solver_name)(width, height, 1.0, 0.3) for module in (cpp_weather, numpy_weather)]
+    results = []
+    for solver in solvers:
+        # Số hạng nguồn đưa thẳng vào: nguồn Gaussian dùng exp, có thể lệch vài ulp giữa NumPy và libm
+        solver.set_source_term(source)
+        dt = solver.compute_cfl_time_step(wind_x, wind_y)
+        state = temperature
+        for _ in range(3):
+            state = solver.solve_rk4_step(state, wind_x, wind_y, dt)
+        out = np.zeros_like(temperature)
+        solver.solve_subdomain_into(temperature, wind_x, wind_y, out, 4, 17, dt)
+        results.append((dt, state, out))
+    (dt_native, state_native, out_native), (dt_numpy, state_numpy, out_numpy) = results
+    assert dt_native == dt_numpy
+    assert state_numpy.dtype == dtype and np.array_equal(state_native, state_numpy)
+    assert np.array_equal(out_native, out_numpy)
+
+
+def test_engine_runs_on_numpy_fallback(monkeypatch):
+    """Kiểm tra động cơ thời tiết chạy được trên solver NumPy, backend theo dải trùng khớp toàn lưới"""
+    monkeypatch.setattr(native, '_module', numpy_weather)
+    rng = np.random.default_rng(5)
+    temperature = rng.uniform(10.0, 30.0, (24, 32))
+    wind_x, wind_y = rng.uniform(-2.0, 2.0, (2, 24, 32))
+    results = []
+    for mode in ('cpp-seq', 'thread-pool'):
+        with WeatherEngine(32, 24, 1.0, 0.1, mode, num_workers=3) as engine:
+            engine.set_temperature(temperature)
+            engine.set_wind(wind_x, wind_y)
+            engine.add_heat_emitter(5.0, 1.0, 3.0, 2.0)
+            engine.advance(1.0, engine.compute_time_step(wind_x, wind_y))
+            results.append(engine.get_temperature())
+    assert np.array_equal(results[0], results[1])
+
+
+@pytest.mark.parametrize("mode", ['imex', 'semi_lagrangian', 'cpp-seq+maccormack'])
+def test_integration_falls_back_to_rk4_on_numpy(monkeypatch, headless_weather, mode):
+    """Kiểm tra sơ đồ chỉ có ở bản C++ lùi về rk4 trên solver NumPy thay vì tắt lớp thời tiết"""
+    monkeypatch.setattr(native, '_module', numpy_weather)
+    weather = WeatherIntegration(320, 240, mode=mode, grid_size=(32, 24))
+    assert weather.initialized
+    assert weather.scheme_name == weather.engine.scheme_name == 'rk4'
+    before = weather.get_temperature_field().copy()
+    weather.update(0.05)
+    assert weather.steps == 1 and not np.array_equal(weather.get_temperature_field(), before)
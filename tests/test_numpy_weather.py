@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from model.weather.main import native, numpy_weather
+from model.weather.main.native import find_cpp_weather
+from model.weather.main.weather_engine import WeatherEngine
+
+
+def reference_rk4_step(temperature, wind_x, wind_y, dt, dx, kappa, source):
+    """RK4 viết thẳng theo công thức bằng np.roll, cùng thứ tự phép toán với solver.cpp"""
+    real = temperature.dtype.type
+    dt, dx, kappa = real(dt), real(dx), real(kappa)
+
+    def derivative(field):
+        east, west = np.roll(field, -1, axis=1), np.roll(field, 1, axis=1)
+        north, south = np.roll(field, -1, axis=0), np.roll(field, 1, axis=0)
+        grad_x = (east - west) / (real(2.0) * dx)
+        grad_y = (north - south) / (real(2.0) * dx)
+        laplacian = (east + west + north + south - real(4.0) * field) / (dx * dx)
+        return -wind_x * grad_x - wind_y * grad_y + kappa * laplacian + source
+
+    k1 = derivative(temperature)
+    k2 = derivative(temperature + dt * real(0.5) * k1)
+    k3 = derivative(temperature + dt * real(0.5) * k2)
+    k4 = derivative(temperature + dt * k3)
+    return temperature + dt / real(6.0) * (k1 + real(2.0) * k2 + real(2.0) * k3 + k4)
+
+
+@pytest.mark.parametrize("shape", [(1, 1), (2, 3), (9, 2), (12, 17)])
+@pytest.mark.parametrize("solver_name", ["Solver", "Solver32"])
+def test_sliced_stencil_matches_reference(shape, solver_name):
+    """Kiểm tra stencil cắt lát với bộ đệm dựng sẵn trùng từng bit với công thức np.roll, kể cả lưới rất nhỏ"""
+    dtype = np.float32 if solver_name == "Solver32" else np.float64
+    rng = np.random.default_rng(7)
+    height, width = shape
+    temperature, wind_x, wind_y, source = (rng.normal(20.0, 5.0, shape).astype(dtype) for _ in range(4))
+    solver = getattr(numpy_weather, solver_name)(width, height, 0.8, 0.2)
+    solver.set_source_term(source)
+    expected = temperature
+    result = temperature
+    # Hai bước liên tiếp để chắc bộ đệm dùng lại không giữ dữ liệu cũ
+    for _ in range(2):
+        expected = reference_rk4_step(expected, wind_x, wind_y, 0.01, 0.8, 0.2, source)
+        result = solver.solve_rk4_step(result, wind_x.ravel(), wind_y.ravel(), 0.01)
+    assert result.dtype == dtype and np.array_equal(result, expected)
+
+
+@pytest.mark.parametrize("mode", ['cpp-seq', 'cpp-openmp', 'thread-pool', 'process-pool', 'thread-pool+float32'])
+def test_backends_match_numpy_oracle(monkeypatch, mode):
+    """Kiểm tra mọi backend của bản C++ (kể cả nguồn nhiệt duy trì) trùng từng bit với solver NumPy"""
+    try:
+        cpp_weather = find_cpp_weather(fallback=False)
+    except ImportError:
+        pytest.skip("chưa build module C++ cpp_weather")
+    monkeypatch.setattr(native, '_module', cpp_weather)
+    rng = np.random.default_rng(11)
+    height, width = 36, 48
+    temperature = rng.uniform(10.0, 30.0, (height, width))
+    wind_x, wind_y = rng.uniform(-2.0, 2.0, (2, height, width))
+
+    with WeatherEngine(width, height, 1.0, 0.1, mode, num_workers=3) as engine:
+        engine.set_temperature(temperature)
+        engine.set_wind(wind_x, wind_y)
+        engine.add_heat_emitter(5.0, 1.0, 3.0, 2.0)
+        dt = engine.compute_time_step(wind_x.ravel(), wind_y.ravel())
+        for _ in range(4):
+            engine.step(dt)
+        result = engine.get_temperature()
+        # Lấy số hạng nguồn từ bản C++: nguồn Gaussian dùng exp, có thể lệch vài ulp giữa NumPy và libm
+        oracle = getattr(numpy_weather, type(engine.solver).__name__)(width, height, 1.0, 0.1)
+        oracle.set_source_term(engine.solver.get_source_term())
+
+    expected = temperature.astype(engine.dtype)
+    for _ in range(4):
+        expected = oracle.solve_rk4_step(expected, wind_x, wind_y, dt)
+    assert np.array_equal(result, expected)
+
+
+def test_unsupported_schemes_raise_value_error():
+    """Kiểm tra sơ đồ IMEX và bán Lagrange bị từ chối bằng ValueError, qua set_scheme lẫn hàm giải trực tiếp"""
+    solver = numpy_weather.Solver(8, 6, 1.0, 0.1)
+    field, wind = np.zeros((6, 8)), np.zeros(48)
+    for scheme, solve in ((numpy_weather.Solver.Scheme.IMEX, solver.solve_imex_step),
+                          (numpy_weather.Solver.Scheme.SEMI_LAGRANGIAN, solver.solve_semi_lagrangian_step)):
+        with pytest.raises(ValueError, match=scheme.name):
+            solver.set_scheme(scheme)
+        with pytest.raises(ValueError, match=scheme.name):
+            solve(field, wind, wind, 0.1)
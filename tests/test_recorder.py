@@ -0,0 +1,123 @@
+import numpy as np
+import pytest
+
+from utils.vector import Vector2D
+from model.fruit_store import FruitStore
+from model.recorder import TrajectoryRecorder, TrajectoryReader, read_trajectory, read_manifest, FRUIT_EVENT_KINDS
+
+
+class Entity:
+    def __init__(self, x, y):
+        self.position = Vector2D(x, y)
+        self.velocity = Vector2D(1.0, -1.0)
+        self.hunger = 0.5
+
+
+class FakeTemperatureField:
+    def __init__(self, weather):
+        self.weather = weather
+
+    def get_temperature_view(self):
+        return np.full((4, 6), float(self.weather.tick))
+
+
+class FakeWeather:
+    """Thời tiết tối giản: nhiệt độ mọi ô bằng tick hiện tại"""
+
+    initialized = True
+
+    def __init__(self):
+        self.tick = 0
+        self.temp_field = FakeTemperatureField(self)
+
+    def get_wind_field(self):
+        return np.ones((4, 6)), np.zeros((4, 6))
+
+
+class TestTrajectoryRecorder:
+    def test_chunks_round_trip_with_decimation(self, tmp_path):
+        """Kiểm tra dữ liệu đọc lại khớp từng tick đã ghi, đúng decimation và chia chunk"""
+        birds = [Entity(float(index), 0.0) for index in range(3)]
+        with TrajectoryRecorder(str(tmp_path), decimation=2, chunk_ticks=4, temperature_every=0) as recorder:
+            for tick in range(20):
+                for bird in birds:
+                    bird.position = bird.position + Vector2D(0.0, 1.0)
+                if tick == 9:
+                    birds = birds[1:] + [Entity(100.0, 0.0)]
+                recorder.record(birds)
+
+        manifest = read_manifest(str(tmp_path))
+        assert manifest["decimation"] == 2 and len(manifest["chunks"]) == 3
+        chunks = list(read_trajectory(str(tmp_path)))
+        ticks = np.concatenate([chunk["tick"] for chunk in chunks])
+        assert ticks.tolist() == list(range(0, 20, 2))
+
+        last = chunks[-1]
+        start, end = last["bird_offsets"][-2:]
+        assert last["bird_id"][start:end].tolist() == [1, 2, 3]
+        assert last["bird_state"][start:end, 1].tolist() == [19.0, 19.0, 9.0]
+
+    def test_fruit_events_are_recorded(self, tmp_path):
+        """Kiểm tra sự kiện quả mọc/bị ăn được ghi kèm tick và vị trí"""
+        store = FruitStore()
+        recorder = TrajectoryRecorder(str(tmp_path), temperature_every=0)
+        recorder.attach(store)
+        store.add_many([1.0, 2.0], [3.0, 4.0], 0.0)
+        recorder.record([])
+        store.remove(1, 'eaten')
+        recorder.record([])
+        recorder.close()
+        assert store.event_log is None
+
+        chunk = next(read_trajectory(str(tmp_path)))
+        kinds = [FRUIT_EVENT_KINDS[kind] for kind in chunk["fruit_event_kind"]]
+        assert kinds == ['spawn', 'spawn', 'eaten']
+        assert chunk["fruit_event_tick"].tolist() == [0, 0, 1]
+        assert chunk["fruit_event_xy"][2].tolist() == [2.0, 4.0]
+
+    def test_writer_errors_surface(self, tmp_path):
+        """Kiểm tra lỗi ở luồng ghi được báo lại cho luồng mô phỏng"""
+        recorder = TrajectoryRecorder(str(tmp_path / "run"), chunk_ticks=1, temperature_every=0)
+        recorder.directory = str(tmp_path / "missing")
+        recorder.record([Entity(0.0, 0.0)])
+        with pytest.raises(RuntimeError):
+            recorder.close()
+
+    def test_reader_seeks_any_tick(self, tmp_path):
+        """Kiểm tra đọc ngẫu nhiên từng tick khớp trạng thái lúc ghi, kể cả tập quả và khung nhiệt độ"""
+        rng = np.random.default_rng(1)
+        store = FruitStore()
+        weather = FakeWeather()
+        birds = [Entity(float(index), 0.0) for index in range(4)]
+        expected = []
+        recorder = TrajectoryRecorder(str(tmp_path), decimation=3, chunk_ticks=5,
+                                      temperature_every=4, temperature_stride=2)
+        recorder.attach(store)
+        for tick in range(60):
+            weather.tick = tick
+            store.add_many(rng.uniform(0, 100, 2), rng.uniform(0, 100, 2), 0.0)
+            store.remove(rng.choice(store.active_slots(), 1), 'eaten')
+            if tick == 31:
+                store.clear()
+            for bird in birds:
+                bird.position = bird.position + Vector2D(1.0, 0.0)
+            if tick % 3 == 0:
+                fruits = sorted(map(tuple, store.positions().astype(np.float32).tolist()))
+                expected.append((tick, [bird.position.x for bird in birds], fruits))
+            recorder.record(birds, weather)
+        recorder.close()
+
+        with TrajectoryReader(str(tmp_path), open_chunks=1) as reader:
+            assert len(reader) == len(expected) == 20
+            for frame in (19, 0, 7, 11, 5, 12, 18):
+                tick, xs, fruits = expected[frame]
+                data = reader.frame(frame)
+                assert data['tick'] == tick and reader.frame_at_tick(tick + 1) == frame
+                assert data['bird_state'][:, 0].tolist() == xs
+                assert sorted(map(tuple, data['fruit_xy'].tolist())) == fruits
+                # Khung trường ghi mỗi 4 khung, giá trị bằng tick lúc ghi
+                assert data['temperature'].shape == (2, 3)
+                assert data['temperature'][0, 0] == tick - (frame % 4) * 3
+                assert data['wind'].shape == (2, 2, 3)
+            with pytest.raises(IndexError):
+                reader.frame(20)
@@ -0,0 +1,48 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Thư mục chứa module C++ đã biên dịch (đặt cuối để không che gói utils của dự án)
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'model', 'weather', 'python'))
+
+from utils.rng import RngService
+from model.fruit_functions import FruitSpawner
+
+
+class TestRngService:
+    def test_streams_are_reproducible_and_independent(self):
+        """Kiểm tra cùng seed cho cùng chuỗi, và rút ở luồng này không làm đổi luồng khác"""
+        first = RngService(42)
+        fruit = first.stream('fruit').random(5)
+        second = RngService(42)
+        second.stream('birds').random(100)
+        assert np.array_equal(second.stream('fruit').random(5), fruit)
+        assert not np.array_equal(RngService(43).stream('fruit').random(5), fruit)
+        assert first.seed_for('wind') == second.seed_for('wind') != first.seed_for('scenario')
+
+    def test_reseed_and_state_apply_in_place(self):
+        """Kiểm tra đặt lại seed và khôi phục trạng thái áp dụng cho cả Generator đang được giữ"""
+        service = RngService(1)
+        spawner = FruitSpawner(rng=service.stream('fruit'))
+        expected = spawner.rng.random(3)
+        service.reseed(1)
+        assert np.array_equal(spawner.rng.random(3), expected)
+        state = service.get_state()
+        after = spawner.rng.random(3)
+        service.set_state(state)
+        assert np.array_equal(spawner.rng.random(3), after)
+
+
+def test_wind_field_seed():
+    """Kiểm tra WindField cùng seed sinh cùng các xoáy"""
+    cpp_weather = pytest.importorskip("cpp_weather")
+
+    def wind(seed):
+        field = cpp_weather.WindField(30, 20, seed)
+        field.generate_gaussian_field(5, 5.0, 4.0)
+        return field.get_wind_x()
+
+    assert np.array_equal(wind(7), wind(7))
+    assert not np.array_equal(wind(7), wind(8))
@@ -0,0 +1,67 @@
+import os
+
+import numpy as np
+import pytest
+
+from model.weather.main.scenarios import build_scenario, scenario_names
+
+
+class ArrayField:
+    """TemperatureField tối giản trên mảng NumPy, cùng các hàm mà builder dùng"""
+
+    def __init__(self, width, height):
+        self.width, self.height = width, height
+        self.temperature = np.zeros((height, width))
+        self.builds = 0
+
+    def get_width(self):
+        return self.width
+
+    def get_height(self):
+        return self.height
+
+    def get_temperature(self):
+        return self.temperature.copy()
+
+    def get_temperature_view(self):
+        return self.temperature
+
+    def set_temperature(self, values):
+        self.builds += 1
+        self.temperature = np.asarray(values, dtype=float).reshape(self.height, self.width).copy()
+
+    def set_uniform(self, value):
+        self.set_temperature(np.full(self.width * self.height, value))
+
+    def add_heat_sources(self, xs, ys, strengths, radii):
+        for x, y, strength in zip(xs, ys, strengths):
+            self.temperature[int(y), int(x)] += strength
+
+
+class TestScenarios:
+    def test_checkerboard_matches_reference_loop(self):
+        """Kiểm tra builder vector hóa khớp vòng lặp hai tầng cũ"""
+        field = ArrayField(7, 5)
+        build_scenario(field, 'checkerboard', cache_dir=None)
+        expected = [[30.0 if (i + j) % 2 == 0 else 15.0 for j in range(7)] for i in range(5)]
+        assert field.temperature.tolist() == expected
+        assert set(scenario_names()) >= {'default', 'checkerboard', 'random_sources', 'stripe', 'uniform'}
+        with pytest.raises(ValueError):
+            build_scenario(field, 'missing', cache_dir=None)
+
+    def test_disk_cache_keyed_by_size_and_seed(self, tmp_path):
+        """Kiểm tra lần dựng thứ hai đọc từ cache, và seed/kích thước khác dùng khóa khác"""
+        first = ArrayField(40, 30)
+        assert not build_scenario(first, 'random_sources', seed=3, cache_dir=str(tmp_path), min_cells=0)
+        second = ArrayField(40, 30)
+        assert build_scenario(second, 'random_sources', seed=3, cache_dir=str(tmp_path), min_cells=0)
+        assert np.array_equal(second.temperature, first.temperature) and second.builds == 1
+
+        other_seed = ArrayField(40, 30)
+        assert not build_scenario(other_seed, 'random_sources', seed=4, cache_dir=str(tmp_path), min_cells=0)
+        assert not np.array_equal(other_seed.temperature, first.temperature)
+        assert not build_scenario(ArrayField(41, 30), 'random_sources', seed=3, cache_dir=str(tmp_path),
+                                  min_cells=0)
+        # Lưới dưới ngưỡng không ghi cache
+        build_scenario(ArrayField(40, 30), 'stripe', cache_dir=str(tmp_path), min_cells=10_000)
+        assert len(os.listdir(tmp_path)) == 3
@@ -0,0 +1,33 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+from model.weather.main.shared_memory_pool import SharedMemoryWeatherPool
+
+
+def test_pool_matches_full_grid_solver_and_releases_memory(cpp_weather):
+    """Kiểm tra pool worker cho cùng kết quả với một Solver toàn lưới, kể cả khi bật/tắt nguồn, và giải phóng bộ nhớ chung"""
+    width, height = 40, 30
+    rng = np.random.default_rng(9)
+    temperature = rng.uniform(10.0, 30.0, (height, width))
+    wind_x, wind_y = rng.uniform(-2.0, 2.0, (2, height, width))
+    source = rng.uniform(0.0, 1.0, (height, width))
+    solver = cpp_weather.Solver(width, height, 1.0, 0.1, False)
+
+    with SharedMemoryWeatherPool(width, height, 1.0, 0.1, num_workers=3) as pool:
+        pool.set_temperature(temperature)
+        pool.set_wind(wind_x, wind_y)
+        expected = temperature
+        for use_source in (True, False):
+            pool.set_source_term(source if use_source else None)
+            solver.set_source_term(source.ravel() if use_source else None)
+            for _ in range(3):
+                pool.step(0.05)
+                expected = solver.solve_rk4_step(expected, wind_x, wind_y, 0.05)
+            assert np.array_equal(pool.get_temperature(), expected)
+        block_names = [block.name for block in pool._blocks]
+
+    for name in block_names:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
@@ -0,0 +1,157 @@
+import numpy as np
+import pytest
+
+
+def fourier_mode(width, height, kx, ky):
+    """Mode cos(2πkx·x/W)·cos(2πky·y/H) trên lưới tuần hoàn"""
+    ys, xs = np.indices((height, width))
+    return np.cos(2 * np.pi * kx * xs / width) * np.cos(2 * np.pi * ky * ys / height)
+
+
+class TestIMEX:
+    def test_diffusion_matches_spectral_decay(self, cpp_weather):
+        """Kiểm tra IMEX không gió làm tắt mode Fourier đúng hệ số ADI, gần với nghiệm chính xác exp(-κk²t)"""
+        width, height, dx, kappa, dt = 64, 48, 1.0, 0.5, 0.8
+        kx, ky = 2, 1
+        temperature = fourier_mode(width, height, kx, ky)
+        solver = cpp_weather.Solver(width, height, dx, kappa)
+        solver.set_scheme(cpp_weather.Solver.Scheme.IMEX)
+        calm = np.zeros(width * height)
+        steps = 10
+        result = temperature
+        for _ in range(steps):
+            result = solver.solve_step(result, calm, calm, dt)
+
+        # Ký hiệu của δ² và hệ số Crank-Nicolson của mỗi nửa bước ADI (r = κ(dt/2)/dx²)
+        symbol_x = 4 * np.sin(np.pi * kx / width) ** 2
+        symbol_y = 4 * np.sin(np.pi * ky / height) ** 2
+        r = kappa * 0.5 * dt / dx ** 2
+        growth = ((1 - r * symbol_x / 2) * (1 - r * symbol_y / 2)
+                  / ((1 + r * symbol_x / 2) * (1 + r * symbol_y / 2))) ** 2
+        np.testing.assert_allclose(result, growth ** steps * temperature, atol=1e-12)
+
+        wave_number_squared = (2 * np.pi * kx / width) ** 2 + (2 * np.pi * ky / height) ** 2
+        exact = np.exp(-kappa * wave_number_squared * steps * dt)
+        assert growth ** steps == pytest.approx(exact, rel=1e-3)
+
+
+class TestSemiLagrangian:
+    def _solver(self, cpp_weather, width, height, maccormack=False):
+        # kappa = 0: chỉ còn bước đối lưu, không có khuếch tán ADI
+        solver = cpp_weather.Solver(width, height, 1.0, 0.0)
+        solver.set_scheme(cpp_weather.Solver.Scheme.SEMI_LAGRANGIAN)
+        solver.set_maccormack(maccormack)
+        return solver
+
+    def test_integer_shift_is_exact(self, cpp_weather):
+        """Kiểm tra gió đều dịch đúng số nguyên ô mỗi bước thì bước bán Lagrange là phép dịch tuần hoàn chính xác"""
+        width, height = 20, 15
+        temperature = np.random.default_rng(2).uniform(10.0, 30.0, (height, width))
+        solver = self._solver(cpp_weather, width, height)
+        wind_x, wind_y = np.full(width * height, 2.0), np.full(width * height, -1.0)
+        result = solver.solve_step(temperature, wind_x, wind_y, 1.0)
+        assert np.array_equal(result, np.roll(temperature, (-1, 2), axis=(0, 1)))
+
+    def test_maccormack_stays_within_bounds(self, cpp_weather):
+        """Kiểm tra MacCormack có giới hạn không vượt ra ngoài khoảng giá trị ban đầu kể cả với bước nhảy gắt"""
+        width, height = 40, 30
+        rng = np.random.default_rng(4)
+        temperature = np.where(np.indices((height, width)).sum(axis=0) % 7 < 3, 30.0, 10.0)
+        wind_x = rng.uniform(-1.7, 1.7, width * height)
+        wind_y = rng.uniform(-1.7, 1.7, width * height)
+        solver = self._solver(cpp_weather, width, height, maccormack=True)
+        result = temperature
+        for _ in range(20):
+            result = solver.solve_step(result, wind_x, wind_y, 0.7)
+        assert result.min() >= 10.0 and result.max() <= 30.0
+        # Có đối lưu thật sự, không phải trường đứng yên
+        assert not np.array_equal(result, temperature)
+
+
+class TestSinglePrecision:
+    def test_float32_variants_return_float32_read_only_views(self, cpp_weather):
+        """Kiểm tra các lớp 32 bit trả về float32, view không sao chép và chỉ đọc"""
+        width, height = 24, 16
+        field = cpp_weather.TemperatureField32(width, height)
+        field.set_uniform(20.0)
+        wind = cpp_weather.WindField32(width, height, 1)
+        wind.generate_gaussian_field(3, 2.0, 4.0)
+        views = [field.get_temperature_view(), wind.get_wind_x_view(), wind.get_wind_y_view()]
+        for view in views:
+            assert view.dtype == np.float32 and not view.flags.writeable
+            with pytest.raises(ValueError):
+                view[0] = 1.0
+        # View phản ánh thay đổi của trường bên dưới
+        field.set_uniform(25.0)
+        assert views[0].min() == views[0].max() == np.float32(25.0)
+
+        solver = cpp_weather.Solver32(width, height, 1.0, 0.1)
+        result = solver.solve_rk4_step(field.get_temperature(), wind.get_wind_x(), wind.get_wind_y(), 0.1)
+        assert result.dtype == np.float32 and result.shape == (height, width)
+
+
+class TestLastStats:
+    @pytest.mark.parametrize("scheme", ["EXPLICIT_RK4", "IMEX", "SEMI_LAGRANGIAN"])
+    @pytest.mark.parametrize("parallel", [True, False])
+    def test_last_stats_match_numpy(self, cpp_weather, scheme, parallel):
+        """Kiểm tra thống kê tính trong bước giải khớp với NumPy trên trường kết quả"""
+        width, height = 33, 21
+        rng = np.random.default_rng(6)
+        temperature = rng.uniform(10.0, 30.0, (height, width))
+        wind_x, wind_y = rng.uniform(-1.0, 1.0, (2, width * height))
+        solver = cpp_weather.Solver(width, height, 1.0, 0.2, parallel)
+        assert solver.last_stats() is None
+        solver.set_scheme(getattr(cpp_weather.Solver.Scheme, scheme))
+        result = solver.solve_step(temperature, wind_x, wind_y, 0.1)
+        stats = solver.last_stats()
+        assert stats["count"] == result.size
+        assert stats["min"] == result.min() and stats["max"] == result.max()
+        assert stats["sum"] == pytest.approx(result.sum(), rel=1e-12)
+        assert stats["sum_sq"] == pytest.approx((result ** 2).sum(), rel=1e-12)
+        assert stats["mean"] == pytest.approx(result.mean(), rel=1e-12)
+        assert stats["std"] == pytest.approx(result.std(), rel=1e-6)
+
+
+class TestHeatSources:
+    def test_batched_sources_are_bounded_gaussians(self, cpp_weather):
+        """Kiểm tra add_heat_sources trùng với gọi add_heat_source từng nguồn, là Gaussian cắt ở 3 bán kính"""
+        width, height = 50, 40
+        xs, ys = np.array([10.0, 31.5, 45.0]), np.array([12.0, 20.25, 38.0])
+        strengths, radii = np.array([5.0, 3.0, 2.0]), np.array([3.0, 4.0, 2.5])
+        batched = cpp_weather.TemperatureField(width, height)
+        batched.add_heat_sources(xs, ys, strengths, radii)
+        single = cpp_weather.TemperatureField(width, height)
+        for source in zip(xs, ys, strengths, radii):
+            single.add_heat_source(*source)
+        assert np.array_equal(batched.get_temperature(), single.get_temperature())
+
+        rows, columns = np.indices((height, width))
+        expected = np.zeros((height, width))
+        for x, y, strength, radius in zip(xs, ys, strengths, radii):
+            distance_squared = (columns - x) ** 2 + (rows - y) ** 2
+            expected += np.where(distance_squared <= (3 * radius) ** 2,
+                                 strength * np.exp(-distance_squared / (2 * radius ** 2)), 0.0)
+        np.testing.assert_allclose(batched.get_temperature(), expected, rtol=1e-12, atol=1e-15)
+
+    def test_heat_emitters_build_source_term(self, cpp_weather):
+        """Kiểm tra số hạng nguồn của emitter theo vị trí mới khi di chuyển và biến mất khi xóa hết"""
+        width, height = 30, 20
+        solver = cpp_weather.Solver(width, height, 1.0, 0.1)
+        assert solver.get_source_term() is None
+        emitter_id = solver.add_heat_emitter(5.0, 5.0, 2.0, 2.0)
+        other_id = solver.add_heat_emitter(20.0, 10.0, 1.0, 3.0)
+        assert solver.move_heat_emitter(emitter_id, 12.0, 14.0)
+
+        expected = cpp_weather.TemperatureField(width, height)
+        expected.add_heat_source(12.0, 14.0, 2.0, 2.0)
+        expected.add_heat_source(20.0, 10.0, 1.0, 3.0)
+        np.testing.assert_allclose(solver.get_source_term(), expected.get_temperature().ravel(), rtol=1e-12)
+
+        # Nguồn tác động vào bước giải: trường đều không gió chỉ tăng đúng dt * nguồn (theo RK4)
+        calm = np.zeros(width * height)
+        result = solver.solve_rk4_step(np.full((height, width), 20.0), calm, calm, 0.1)
+        np.testing.assert_allclose(result[14, 12] - 20.0, 0.1 * solver.get_source_term()[14 * width + 12], rtol=0.05)
+
+        assert solver.remove_heat_emitter(emitter_id) and solver.remove_heat_emitter(other_id)
+        assert not solver.remove_heat_emitter(other_id)
+        assert solver.get_heat_emitter_count() == 0 and solver.get_source_term() is None
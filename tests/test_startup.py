@@ -0,0 +1,30 @@
+import sys
+
+import pytest
+
+from utils.startup import StartupProfile
+
+
+def test_profile_times_nested_imports(tmp_path, monkeypatch):
+    """Kiểm tra import lồng được đo riêng, thời gian tổng của module cha gồm cả module con"""
+    (tmp_path / "startup_parent.py").write_text("import time\nimport startup_child\ntime.sleep(0.02)\n")
+    (tmp_path / "startup_child.py").write_text("import time\ntime.sleep(0.03)\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    profile = StartupProfile()
+    profile.install()
+    try:
+        with profile.phase("nạp"):
+            import startup_parent
+    finally:
+        profile.uninstall()
+        sys.modules.pop("startup_parent", None)
+        sys.modules.pop("startup_child", None)
+
+    timings = {name: (own, total, depth) for name, own, total, depth in profile.imports}
+    own, total, depth = timings["startup_parent"]
+    assert depth == 0 and timings["startup_child"][2] == 1
+    assert total == pytest.approx(own + timings["startup_child"][1]) and own >= 0.02
+    assert profile.phases[0][0] == "nạp" and profile.phases[0][1] >= total
+    # Loader gốc được trả lại sau khi import xong
+    assert type(startup_parent.__loader__).__name__ == "SourceFileLoader"
+    assert "startup_parent" in profile.format_report()
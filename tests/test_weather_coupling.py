@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from utils.vector import Vector2D
+from model.weather.main.multires import WeatherGrid
+from model.fruit_store import FruitStore
+from model.weather_coupling import (
+    WeatherCoupling, gather_positions, wind_steering_forces, ripening_multipliers
+)
+from utils.config import RIPENING_REFERENCE_TEMPERATURE, RIPENING_MULTIPLIER_MAX
+
+
+class GridWeather:
+    """Trường thời tiết tĩnh trên WeatherGrid, cùng giao diện lấy mẫu với WeatherIntegration"""
+
+    def __init__(self, temperature, wind_x, wind_y):
+        height, width = temperature.shape
+        self.grid = WeatherGrid(width * 10.0, height * 10.0, width, height)
+        self.temperature, self.wind_x, self.wind_y = temperature, wind_x, wind_y
+
+    def sample_temperature(self, xs, ys):
+        return self.grid.sample(self.temperature, xs, ys)
+
+    def sample_wind(self, xs, ys):
+        return self.grid.sample(self.wind_x, xs, ys), self.grid.sample(self.wind_y, xs, ys)
+
+
+class Entity:
+    def __init__(self, x, y):
+        self.position = Vector2D(x, y)
+        self.steering = Vector2D(0, 0)
+        self.max_force = 3.2
+
+    def apply_force(self, force):
+        self.steering = self.steering + force
+
+
+class TestCouplingKernels:
+    def test_wind_force_is_scaled_and_limited(self):
+        """Kiểm tra lực gió tỷ lệ với gió và bị giới hạn theo max_force từng con"""
+        force_x, force_y = wind_steering_forces(np.array([1.0, 30.0, 0.0]), np.array([2.0, 40.0, 0.0]),
+                                                np.array([3.2, 3.2, 3.2]), factor=0.5)
+        assert force_x[0] == pytest.approx(0.5) and force_y[0] == pytest.approx(1.0)
+        assert np.hypot(force_x[1], force_y[1]) == pytest.approx(3.2)
+        assert force_x[2] == 0.0 and force_y[2] == 0.0
+
+    def test_ripening_multiplier_is_one_at_reference(self):
+        """Kiểm tra hệ số chín bằng 1 tại nhiệt độ tham chiếu và bị kẹp ở hai đầu"""
+        multipliers = ripening_multipliers(np.array([RIPENING_REFERENCE_TEMPERATURE, -100.0, 1000.0]))
+        assert multipliers.tolist() == [1.0, 0.0, RIPENING_MULTIPLIER_MAX]
+
+
+class TestWeatherCoupling:
+    def test_apply_matches_per_entity_sampling(self):
+        """Kiểm tra giai đoạn ghép theo lô cho cùng kết quả như lấy mẫu từng con"""
+        rng = np.random.default_rng(0)
+        weather = GridWeather(rng.uniform(10, 35, (8, 12)), rng.uniform(-5, 5, (8, 12)),
+                              rng.uniform(-5, 5, (8, 12)))
+        birds = [Entity(x, y) for x, y in rng.uniform(0, 80, (50, 2))]
+        store = FruitStore()
+        store.add_many(*rng.uniform(0, 80, (2, 20)), creation_time=0.0)
+        WeatherCoupling(weather, wind_factor=0.2).apply(birds, store)
+
+        for bird in birds:
+            wind_x, wind_y = weather.sample_wind(bird.position.x, bird.position.y)
+            force_x, force_y = wind_steering_forces(wind_x, wind_y, bird.max_force, 0.2)
+            assert bird.steering.x == pytest.approx(float(force_x))
+            assert bird.steering.y == pytest.approx(float(force_y))
+        for slot in store.active_slots():
+            temperature = weather.sample_temperature(store.x[slot], store.y[slot])
+            assert store.ripening_multiplier[slot] == pytest.approx(float(ripening_multipliers(temperature)))
+
+    def test_empty_populations(self):
+        """Kiểm tra không có chim hoặc quả thì không làm gì"""
+        weather = GridWeather(np.zeros((4, 4)), np.zeros((4, 4)), np.zeros((4, 4)))
+        coupling = WeatherCoupling(weather)
+        assert coupling.apply_wind([]) is None
+        assert coupling.apply_ripening(FruitStore()) is None
+        xs, ys = gather_positions([])
+        assert xs.shape == ys.shape == (0,)
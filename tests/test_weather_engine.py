@@ -0,0 +1,93 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from model.weather.main.weather_engine import WeatherEngine, parse_solver_mode
+
+
+class TestParseSolverMode:
+    def test_defaults_and_aliases(self):
+        """Kiểm tra giá trị mặc định và tên cũ của backend"""
+        assert parse_solver_mode('rk4') == ('cpp-openmp', 'rk4', 'float64')
+        assert parse_solver_mode('parallel') == ('cpp-openmp', 'rk4', 'float64')
+        assert parse_solver_mode('seq+imex') == ('cpp-seq', 'imex', 'float64')
+        assert parse_solver_mode('thread-pool+float32') == ('thread-pool', 'rk4', 'float32')
+
+    def test_invalid_token(self):
+        """Kiểm tra thành phần không hợp lệ bị từ chối"""
+        with pytest.raises(ValueError):
+            parse_solver_mode('cpp-openmp+gpu')
+
+
+class TestWeatherEngine:
+    @pytest.fixture
+    def fields(self, weather_module):
+        rng = np.random.default_rng(1)
+        height, width = 36, 48
+        temperature = rng.uniform(10.0, 30.0, (height, width))
+        wind_x = rng.uniform(-2.0, 2.0, (height, width))
+        wind_y = rng.uniform(-2.0, 2.0, (height, width))
+        return temperature, wind_x, wind_y
+
+    def _run(self, mode, temperature, wind_x, wind_y):
+        height, width = temperature.shape
+        with WeatherEngine(width, height, 1.0, 0.1, mode, num_workers=3) as engine:
+            engine.set_temperature(temperature)
+            engine.set_wind(wind_x, wind_y)
+            engine.step(0.05)
+            emitter_id = engine.add_heat_emitter(5.0, 1.0, 3.0, 2.0)
+            assert engine.advance(0.2, 0.05) == 4
+            engine.move_heat_emitter(emitter_id, 20.0, 34.0)
+            engine.step(0.05)
+            return engine.get_temperature()
+
+    @pytest.mark.parametrize("mode", ['cpp-openmp', 'thread-pool'])
+    def test_backends_match_sequential(self, fields, mode):
+        """Kiểm tra mọi backend (kể cả nguồn nhiệt duy trì) trùng khớp từng bit với cpp-seq"""
+        expected = self._run('cpp-seq', *fields)
+        assert np.array_equal(self._run(mode, *fields), expected)
+
+    def test_strip_backend_rejects_implicit_scheme(self, fields):
+        """Kiểm tra backend theo dải từ chối sơ đồ khác RK4"""
+        with pytest.raises(ValueError):
+            WeatherEngine(48, 36, 1.0, 0.1, 'thread-pool+imex')
+
+
+# Đếm luồng của tiến trình con trước và sau một bước giải (OMP_NUM_THREADS=4)
+THREAD_COUNT_SCRIPT = """
+import os, sys
+import numpy as np
+from model.weather.main.native import find_cpp_weather
+from model.weather.main.weather_engine import WeatherEngine
+try:
+    find_cpp_weather(fallback=False)
+except ImportError:
+    sys.exit(3)
+counts = [len(os.listdir('/proc/self/task'))]
+for mode in ('cpp-seq', 'cpp-openmp'):
+    with WeatherEngine(64, 48, 1.0, 0.1, mode) as engine:
+        engine.set_temperature(np.full((48, 64), 20.0))
+        engine.set_wind(np.ones((48, 64)), np.ones((48, 64)))
+        engine.step(0.01)
+    counts.append(len(os.listdir('/proc/self/task')))
+print(*counts)
+"""
+
+
+@pytest.mark.skipif(not os.path.isdir('/proc/self/task'), reason="cần /proc để đếm luồng")
+def test_sequential_backend_starts_no_openmp_team():
+    """Kiểm tra bước giải cpp-seq không mở đội luồng OpenMP (chỉ cpp-openmp mới mở)"""
+    root = os.path.join(os.path.dirname(__file__), '..')
+    env = dict(os.environ, OMP_NUM_THREADS='4', PYTHONPATH=os.path.abspath(root))
+    process = subprocess.run([sys.executable, '-c', THREAD_COUNT_SCRIPT], cwd=root, env=env,
+                             capture_output=True, text=True, timeout=60)
+    if process.returncode == 3:
+        pytest.skip("chưa build module C++ cpp_weather")
+    assert process.returncode == 0, process.stderr
+    before, after_sequential, after_parallel = map(int, process.stdout.split()[-3:])
+    if after_parallel == before:
+        pytest.skip("module C++ được build không có OpenMP")
+    assert after_sequential == before
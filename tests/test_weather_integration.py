@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from model.weather.main.weather_integration import WeatherIntegration
+
+
+@pytest.fixture
+def make_weather(weather_module, headless_weather):
+    """Dựng WeatherIntegration lưới nhỏ; cùng seed nên hai lần dựng cho cùng trạng thái ban đầu"""
+    def make():
+        weather = WeatherIntegration(320, 240, mode='cpp-seq', grid_size=(32, 24))
+        assert weather.initialized
+        return weather
+    return make
+
+
+class TestFastForward:
+    def test_matches_repeated_update(self, make_weather):
+        """Kiểm tra tua nhanh cùng bước thời gian cho cùng nhiệt độ và gió như gọi update nhiều lần"""
+        stepped, forwarded = make_weather(), make_weather()
+        for _ in range(5):
+            stepped.update(1 / 60)
+        assert forwarded.fast_forward(stepped.time, max_dt=stepped.time / 5) == 5
+        assert forwarded.steps == stepped.steps == 5
+        assert forwarded.time == pytest.approx(stepped.time)
+        np.testing.assert_allclose(forwarded.get_temperature_field(), stepped.get_temperature_field(), rtol=1e-12)
+        np.testing.assert_allclose(forwarded.wind_field.get_wind_x(), stepped.wind_field.get_wind_x(), rtol=1e-12)
+        assert forwarded.statistics == pytest.approx(stepped.statistics)
+
+    @pytest.mark.parametrize("max_dt, steps", [(0.1, 10), (0.3, 4), (2.0, 1)])
+    def test_step_count_is_exact(self, make_weather, max_dt, steps):
+        """Kiểm tra số bước là số nguyên nhỏ nhất không vượt max_dt, không có bước thừa do cộng dồn số thực"""
+        weather = make_weather()
+        assert weather.fast_forward(1.0, max_dt=max_dt) == steps
+        assert weather.steps == steps and weather.time == pytest.approx(1.0)
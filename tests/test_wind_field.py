@@ -0,0 +1,30 @@
+import numpy as np
+
+
+def evolved_wind(cpp_weather, seed, steps=50):
+    wind = cpp_weather.WindField(40, 30, seed)
+    wind.set_evolution(0.5, 10.0)
+    wind.generate_gaussian_field(6, 3.0, 4.0)
+    for _ in range(steps):
+        wind.evolve(0.5)
+    return wind
+
+
+def test_evolution_is_reproducible_with_seed(cpp_weather):
+    """Kiểm tra cùng seed cho cùng trường gió sau nhiều vòng đời xoáy, seed khác cho trường khác"""
+    first, second = evolved_wind(cpp_weather, 7), evolved_wind(cpp_weather, 7)
+    assert np.array_equal(first.get_wind_x(), second.get_wind_x())
+    assert np.array_equal(first.get_wind_y(), second.get_wind_y())
+    assert first.get_vortex_count() == 6
+    assert not np.array_equal(first.get_wind_x(), evolved_wind(cpp_weather, 8).get_wind_x())
+
+
+def test_vortex_support_is_bounded(cpp_weather):
+    """Kiểm tra một xoáy chỉ tạo gió trong GAUSSIAN_CUTOFF_SIGMAS = 4 bán kính quanh tâm"""
+    wind = cpp_weather.WindField(60, 50, 3)
+    wind.generate_gaussian_field(1, 3.0, 2.0)
+    x, y, _, _, _, radius, _ = wind.get_state()["vortices"][0]
+    ys, xs = np.indices((50, 60))
+    outside = ((xs - x) ** 2 + (ys - y) ** 2 > (4 * radius) ** 2).ravel()
+    speed = np.hypot(wind.get_wind_x(), wind.get_wind_y())
+    assert np.all(speed[outside] == 0.0) and speed[~outside].max() > 0.0
@@ -59,6 +59,8 @@ FRUIT_COLOR_RIPE = (255, 80, 0, 255)     # Đỏ cam nổi bật hơn
 RIPENING_RATE = 0.12                     # Quả chín nhanh hơn
 FRUIT_NUTRITION_VALUE = 2.5              # Giá trị dinh dưỡng tăng nhẹ
 FRUIT_SPAWN_STEP_INTERVAL = 7            # Quả mọc thường xuyên hơn
+FRUIT_SPAWN_CANDIDATES = 10              # Số điểm thử cho mỗi quả (giữ điểm nóng nhất)
+FRUIT_SPAWN_ATTEMPTS = 1                 # Số quả được thử mọc mỗi lượt (tăng cho thế giới lớn)
 
 # -----------------------------
 # Cài đặt cho Weather Module
@@ -69,10 +71,24 @@ GRID_SIZE_X = 100  # Số điểm lưới theo chiều ngang
 GRID_SIZE_Y = 80   # Số điểm lưới theo chiều dọc
 GRID_SPACING_K = 10.0  # Khoảng cách giữa các điểm lưới (đơn vị)
 
+# Lưới đa độ phân giải: lưới thô ở trên độc lập với kích thước cửa sổ, chim/quả
+# và renderer lấy mẫu qua nội suy; có thể bật thêm một vùng lưới mịn lồng vào
+# nơi chim/quả dày đặc
+WEATHER_SAMPLING_MODE = 'bilinear'  # 'bilinear' hoặc 'nearest'
+WEATHER_PATCH_ENABLED = False  # Bật vùng lưới mịn lồng
+WEATHER_PATCH_SIZE = (24, 20)  # Kích thước vùng mịn (số ô thô theo x, y)
+WEATHER_PATCH_REFINEMENT = 4  # Số ô mịn trên mỗi ô thô theo mỗi chiều
+WEATHER_PATCH_FOCUS_INTERVAL = 30  # Số bước giữa hai lần dời vùng mịn theo mật độ chim/quả
+WEATHER_DISPLAY_RESOLUTION = None  # (cột, hàng) của bản đồ nhiệt; None = theo lưới thời tiết
+CPP_WEATHER_CACHE_DIR = "~/.cache/birdsim/cpp_weather"  # Thư mục cache module C++ đã build, theo mã băm mã nguồn
+CPP_WEATHER_FALLBACK = True  # Dùng solver NumPy khi không nạp được module C++ (False: báo lỗi)
+
 # Cài đặt nhiệt độ
 THERMAL_DIFFUSIVITY = 0.92  # Hệ số khuếch tán nhiệt κ, giúp bản đồ nhiệt động hơn
 INITIAL_TEMPERATURE = 18.0  # Nhiệt độ nền thấp hơn, vùng nóng nổi bật hơn
 HOTSPOT_TEMPERATURE = 42.0  # Nhiệt độ tại điểm nóng tăng nhẹ
+SCENARIO_CACHE_DIR = "~/.cache/birdsim/scenarios"  # Thư mục cache trạng thái ban đầu của các kịch bản nhiệt; None để tắt
+SCENARIO_CACHE_MIN_CELLS = 100_000  # Chỉ cache lưới từ ngần này ô trở lên (lưới nhỏ dựng lại nhanh hơn đọc đĩa)
 
 # Cài đặt vật lý
 DELTA_T = 0.1  # Bước thời gian mỗi lần cập nhật (giây)
@@ -81,6 +97,9 @@ T_MAX = 1000.0  # Thời gian mô phỏng tối đa (giây)
 # Cài đặt gió
 WIND_STRENGTH = 5.0  # Cường độ gió
 WIND_ANIMATION_SPEED = 0.1  # Tốc độ thay đổi trường gió
+WIND_MODE = 'evolving'  # 'evolving': xoáy trôi và tắt dần mượt; 'regenerate': tạo lại gió mỗi 20 bước
+WIND_VORTEX_DRIFT_SPEED = 0.2  # Tốc độ trôi của tâm xoáy (ô lưới / đơn vị thời gian)
+WIND_VORTEX_LIFETIME = 60.0  # Vòng đời của một xoáy (đơn vị thời gian mô phỏng)
 
 # Cài đặt hiển thị
 HEATMAP_ALPHA = 180  # Độ đậm của heatmap (0-255)
@@ -93,3 +112,31 @@ WIND_COLOR = (255, 255, 255, 180)  # Màu sắc của mũi tên gió (RGBA)
 # Cài đặt tác động của thời tiết
 RIPENING_TEMPERATURE_FACTOR = 0.07  # Tăng ảnh hưởng của nhiệt độ đến tốc độ chín của quả
 WIND_STEERING_FACTOR = 0.2  # Hệ số ảnh hưởng của gió đến hướng bay của chim
+RIPENING_REFERENCE_TEMPERATURE = 22.0  # Nhiệt độ mà quả chín đúng RIPENING_RATE
+RIPENING_MULTIPLIER_MAX = 3.0  # Giới hạn trên của hệ số tốc độ chín theo nhiệt độ
+WEATHER_COUPLING_ENABLED = True  # Ghép gió vào hướng bay và nhiệt độ vào tốc độ chín mỗi tick
+
+# Cài đặt ghi log
+LOG_LEVEL = "INFO"  # Mức log của mô phỏng ("DEBUG" để in cả thống kê thời tiết mỗi tick)
+LOG_RATE_LIMIT_INTERVAL = 1.0  # Khoảng giây tối thiểu giữa hai lần in cùng một loại thông điệp
+LOG_RING_BUFFER_SIZE = 1000  # Số bản ghi gần nhất giữ trong bộ nhớ
+
+# Cài đặt số ngẫu nhiên
+RNG_SEED = None  # Seed gốc của mọi luồng ngẫu nhiên (main.py --seed); None để lấy từ entropy hệ điều hành
+
+# Cài đặt checkpoint
+CHECKPOINT_PATH = "checkpoint.npz"  # File checkpoint mặc định (F5 lưu, F9 nạp)
+
+# Cài đặt ghi quỹ đạo
+RECORD_DECIMATION = 1  # Ghi mỗi N tick
+RECORD_CHUNK_TICKS = 1000  # Số tick đã ghi trong một chunk nén
+RECORD_TEMPERATURE_EVERY = 10  # Ghi khung nhiệt độ và gió mỗi N tick đã ghi
+RECORD_TEMPERATURE_STRIDE = 2  # Lấy mẫu thưa khung nhiệt độ/gió: mỗi N ô lưới theo mỗi chiều
+RECORD_MAX_PENDING_CHUNKS = 2  # Số chunk chờ ghi tối đa; đầy thì luồng mô phỏng phải đợi
+
+# Cài đặt xem lại bản ghi (replay.py)
+REPLAY_OPEN_CHUNKS = 4  # Số chunk giữ mở (memory-map) cùng lúc khi xem lại
+REPLAY_SPEEDS = (0.25, 0.5, 1, 2, 4, 8, 16, 64)  # Các mức tốc độ phát (khung mỗi lần vẽ)
+
+# Cài đặt đo thời gian khởi động (main.py --profile-startup)
+STARTUP_PROFILE_TOP = 15  # Số module import chậm nhất được liệt kê trong báo cáo
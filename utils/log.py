@@ -0,0 +1,184 @@
+"""
+Ghi log có cấu trúc, giới hạn tần suất theo khóa thông điệp, dùng thay print()
+trong các đường nóng (mỗi tick, mỗi con chim).
+
+- RateLimitFilter: mỗi khóa (extra={"key": ...}, mặc định là chuỗi định dạng
+  của thông điệp) chỉ được in tối đa một lần mỗi interval giây; số bản bị bỏ
+  qua được cộng vào lần in kế tiếp.
+- RingBufferHandler: giữ các bản ghi gần nhất trong bộ nhớ (không giới hạn
+  tần suất) để xem lại khi cần.
+- Ghi ra console qua QueueHandler/QueueListener: luồng mô phỏng chỉ đưa bản
+  ghi vào hàng đợi, việc ghi ra stream do luồng nền đảm nhận.
+
+Thông điệp dùng tham số kiểu %s để chỉ định dạng khi bản ghi thực sự được
+phát; các phép rút gọn chẩn đoán tốn kém (ví dụ np.sum trên cả trường) nên
+bọc trong logger.isEnabledFor(logging.DEBUG).
+
+HƯỚNG DẪN SỬ DỤNG:
+    from utils.log import get_logger, configure_logging
+    configure_logging("INFO")
+    logger = get_logger("weather")
+    logger.info("Chim đã ăn quả, độ đói %.2f", hunger, extra={"key": "bird.ate"})
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("diff New temperature: %s", np.sum(new - old))
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+import unicodedata
+from collections import deque
+
+from utils.config import LOG_LEVEL, LOG_RATE_LIMIT_INTERVAL, LOG_RING_BUFFER_SIZE
+
+# Logger gốc của mô phỏng; mọi logger con nằm dưới tên này
+ROOT_LOGGER_NAME = "birdsim"
+
+_listener = None
+_ring_buffer = None
+
+
+def strip_accents(text):
+    """Bỏ dấu tiếng Việt (dùng khi console không mã hóa được Unicode)."""
+    text = text.replace("đ", "d").replace("Đ", "D")
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+
+
+class RateLimitFilter(logging.Filter):
+    """Cho qua tối đa một bản ghi mỗi interval giây cho mỗi khóa thông điệp."""
+
+    def __init__(self, interval=LOG_RATE_LIMIT_INTERVAL, clock=time.monotonic):
+        """
+        Args:
+            interval (float): Khoảng thời gian tối thiểu giữa hai lần in cùng khóa; <= 0 để tắt
+            clock (callable): Hàm trả về thời gian hiện tại (giây)
+        """
+        super().__init__()
+        self.interval = interval
+        self.clock = clock
+        self._last = {}
+        self._suppressed = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if self.interval <= 0:
+            return True
+        key = getattr(record, "key", None) or (record.name, record.msg)
+        now = self.clock()
+        with self._lock:
+            last = self._last.get(key)
+            if last is not None and now - last < self.interval:
+                self._suppressed[key] = self._suppressed.get(key, 0) + 1
+                return False
+            self._last[key] = now
+            record.suppressed = self._suppressed.pop(key, 0)
+        return True
+
+
+class StructuredFormatter(logging.Formatter):
+    """Định dạng 'thời gian mức tên: thông điệp', thêm các trường fields=... và số bản bị bỏ qua."""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s: %(message)s", "%H:%M:%S")
+
+    def format(self, record):
+        text = super().format(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            text += " " + " ".join(f"{name}={value}" for name, value in fields.items())
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            text += f" (+{suppressed} bản bị bỏ qua)"
+        return text
+
+
+class SafeStreamHandler(logging.StreamHandler):
+    """StreamHandler in bản không dấu khi console không mã hóa được tiếng Việt (như print_safe)."""
+
+    def emit(self, record):
+        try:
+            message = self.format(record)
+            try:
+                self.stream.write(message + self.terminator)
+            except UnicodeEncodeError:
+                self.stream.write(strip_accents(message) + self.terminator)
+            self.flush()
+        except Exception:
+            self.handleError(record)
+
+
+class RingBufferHandler(logging.Handler):
+    """Giữ capacity bản ghi gần nhất trong bộ nhớ."""
+
+    def __init__(self, capacity=LOG_RING_BUFFER_SIZE):
+        super().__init__()
+        self.records = deque(maxlen=capacity)
+
+    def emit(self, record):
+        self.records.append(record)
+
+    def recent(self, count=None):
+        """
+        Args:
+            count (int, optional): Số bản ghi cần lấy, mặc định tất cả
+
+        Returns:
+            list: Các bản ghi gần nhất, cũ trước mới sau
+        """
+        records = list(self.records)
+        return records if count is None else records[-count:]
+
+
+def get_logger(name):
+    """
+    Args:
+        name (str): Tên thành phần, ví dụ "weather" hoặc "main"
+
+    Returns:
+        logging.Logger: Logger con của ROOT_LOGGER_NAME
+    """
+    return logging.getLogger(f"{ROOT_LOGGER_NAME}.{name}")
+
+
+def get_ring_buffer():
+    """Trả về RingBufferHandler đã cài bởi configure_logging (hoặc None)."""
+    return _ring_buffer
+
+
+def configure_logging(level=LOG_LEVEL, rate_limit=LOG_RATE_LIMIT_INTERVAL, ring_size=LOG_RING_BUFFER_SIZE,
+                      stream=None):
+    """
+    Cài đặt logger gốc của mô phỏng: console qua hàng đợi không chặn (có giới
+    hạn tần suất) và bộ đệm vòng. Gọi lại chỉ đổi mức log.
+
+    Args:
+        level (str hoặc int): Mức log, ví dụ "INFO" hoặc "DEBUG"
+        rate_limit (float): Khoảng giây tối thiểu giữa hai lần in cùng khóa
+        ring_size (int): Số bản ghi giữ trong bộ đệm vòng
+        stream: Stream đích của console, mặc định sys.stderr
+
+    Returns:
+        logging.Logger: Logger gốc
+    """
+    global _listener, _ring_buffer
+    root = logging.getLogger(ROOT_LOGGER_NAME)
+    root.setLevel(level.upper() if isinstance(level, str) else level)
+    if _listener is not None:
+        return root
+
+    console = SafeStreamHandler(stream)
+    console.setFormatter(StructuredFormatter())
+    queue_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+    queue_handler.addFilter(RateLimitFilter(rate_limit))
+    _ring_buffer = RingBufferHandler(ring_size)
+    root.addHandler(queue_handler)
+    root.addHandler(_ring_buffer)
+    root.propagate = False
+
+    _listener = logging.handlers.QueueListener(queue_handler.queue, console, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+    return root
@@ -0,0 +1,130 @@
+"""
+Nguồn số ngẫu nhiên có seed dùng chung cho mọi phân hệ, để hai lần chạy cùng
+seed cho cùng kết quả (điều kiện cần cho benchmark và so sánh thí nghiệm).
+
+Mỗi phân hệ rút từ một luồng có tên qua get_rng(name): 'birds' (vị trí, vận
+tốc, màu chim), 'fruit' (quả mọc), 'scenario' (kịch bản nhiệt), 'wind' (bộ
+sinh C++ của WindField, nhận seed 32 bit qua seed_for). Các luồng là
+numpy.random.Generator sinh từ cùng seed gốc qua SeedSequence với spawn_key
+theo tên, nên độc lập với nhau và không phụ thuộc thứ tự tạo: rút thêm ở luồng
+birds không làm đổi quả mọc ở luồng fruit.
+
+Không gọi configure_rng thì seed gốc lấy từ entropy của hệ điều hành; seed đó
+vẫn được giữ trong get_rng_service().seed để tái lập lần chạy sau.
+
+HƯỚNG DẪN SỬ DỤNG:
+    from utils.rng import configure_rng, get_rng, seed_for
+    configure_rng(42)  # main.py --seed 42
+    xs = get_rng("birds").uniform(0, WINDOW_WIDTH, count)
+    wind_field = cpp_weather.WindField(width, height, seed_for("wind"))
+"""
+
+import random
+import zlib
+
+import numpy as np
+
+from utils.config import RNG_SEED
+
+# Các luồng mô phỏng đang dùng
+STREAMS = ('birds', 'fruit', 'wind', 'scenario')
+
+
+def _spawn_key(name):
+    """spawn_key ổn định theo tên luồng (không phụ thuộc hash() của Python)."""
+    return (zlib.crc32(name.encode("utf-8")),)
+
+
+class RngService:
+    """Các luồng số ngẫu nhiên độc lập, có tên, sinh từ một seed gốc."""
+
+    def __init__(self, seed=None):
+        """
+        Args:
+            seed (int, optional): Seed gốc; None để lấy từ entropy hệ điều hành
+        """
+        self.seed = None
+        self._streams = {}
+        self.reseed(seed)
+
+    def _sequence(self, name):
+        return np.random.SeedSequence(self.seed, spawn_key=_spawn_key(name))
+
+    def reseed(self, seed=None):
+        """
+        Đặt seed gốc mới. Các Generator đã phát ra được đặt lại tại chỗ, nên
+        nơi đang giữ tham chiếu (ví dụ FruitSpawner.rng) cũng theo seed mới.
+        """
+        self.seed = int(np.random.SeedSequence().entropy) if seed is None else int(seed)
+        for name, generator in self._streams.items():
+            generator.bit_generator.state = np.random.PCG64(self._sequence(name)).state
+
+    def stream(self, name):
+        """
+        Returns:
+            numpy.random.Generator: Luồng tên name (tạo lần đầu gọi)
+        """
+        generator = self._streams.get(name)
+        if generator is None:
+            generator = self._streams[name] = np.random.Generator(np.random.PCG64(self._sequence(name)))
+        return generator
+
+    def seed_for(self, name):
+        """
+        Returns:
+            int: Seed 32 bit của luồng name, cho bộ sinh ngoài NumPy (std::mt19937)
+        """
+        return int(self._sequence(name).generate_state(1, dtype=np.uint32)[0])
+
+    def get_state(self):
+        """
+        Returns:
+            dict: Seed gốc và trạng thái các luồng đã tạo (tuần tự hóa được bằng JSON)
+        """
+        return {"seed": self.seed,
+                "streams": {name: generator.bit_generator.state for name, generator in self._streams.items()}}
+
+    def set_state(self, state):
+        """Khôi phục từ get_state; các luồng được đặt lại tại chỗ."""
+        self.reseed(state["seed"])
+        for name, stream_state in state["streams"].items():
+            self.stream(name).bit_generator.state = stream_state
+
+
+_service = RngService(RNG_SEED)
+
+
+def get_rng_service():
+    """Dịch vụ số ngẫu nhiên dùng chung của mô phỏng."""
+    return _service
+
+
+def get_rng(name):
+    """
+    Returns:
+        numpy.random.Generator: Luồng số ngẫu nhiên tên name của dịch vụ dùng chung
+    """
+    return _service.stream(name)
+
+
+def seed_for(name):
+    """Seed 32 bit của luồng name, xem RngService.seed_for."""
+    return _service.seed_for(name)
+
+
+def configure_rng(seed=None):
+    """
+    Đặt seed gốc cho mọi luồng. random và numpy.random toàn cục cũng được
+    seed theo, cho các đoạn mã cũ chưa chuyển sang get_rng.
+
+    Args:
+        seed (int, optional): Seed gốc; None để lấy từ entropy hệ điều hành
+
+    Returns:
+        int: Seed gốc đang dùng
+    """
+    _service.reseed(seed)
+    legacy = np.random.SeedSequence(_service.seed, spawn_key=_spawn_key("legacy"))
+    random.seed(int(legacy.generate_state(1, dtype=np.uint64)[0]))
+    np.random.seed(legacy.generate_state(4))
+    return _service.seed
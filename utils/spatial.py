@@ -0,0 +1,48 @@
+"""
+Tìm láng giềng theo lưới ô đều cho các tập điểm 2D.
+
+Mỗi điểm được xếp vào ô vuông cạnh radius; láng giềng của một điểm chỉ có
+thể nằm trong 3x3 ô quanh nó, nên khoảng cách được tính theo khối (các điểm
+cùng ô x các ứng viên trong 9 ô) bằng NumPy thay vì so từng cặp trong toàn đàn.
+"""
+
+import numpy as np
+
+
+def neighbor_indices(xs, ys, radius):
+    """
+    Chỉ số các điểm nằm trong bán kính radius của từng điểm (kể cả chính nó).
+
+    Args:
+        xs, ys (numpy.ndarray): Tọa độ các điểm
+        radius (float): Bán kính tìm kiếm
+
+    Returns:
+        list: Với mỗi điểm, một mảng chỉ số tăng dần (giữ thứ tự gốc để các
+            phép cộng dồn trên láng giềng cho cùng kết quả như duyệt cả đàn)
+    """
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    count = len(xs)
+    if count == 0:
+        return []
+    cell_x = np.floor(xs / radius).astype(np.int64)
+    cell_y = np.floor(ys / radius).astype(np.int64)
+    cells = {}
+    for index, key in enumerate(zip(cell_x.tolist(), cell_y.tolist())):
+        cells.setdefault(key, []).append(index)
+
+    radius_sq = radius * radius
+    result = [None] * count
+    for (column, row), members in cells.items():
+        candidates = [index
+                      for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+                      for index in cells.get((column + dx, row + dy), ())]
+        candidates = np.sort(np.asarray(candidates, dtype=np.intp))
+        members = np.asarray(members, dtype=np.intp)
+        dist_sq = ((xs[members, None] - xs[candidates]) ** 2 +
+                   (ys[members, None] - ys[candidates]) ** 2)
+        within = dist_sq <= radius_sq
+        for member, mask in zip(members.tolist(), within):
+            result[member] = candidates[mask]
+    return result
@@ -0,0 +1,147 @@
+"""
+Đo thời gian khởi động cho main.py --profile-startup: thời gian import từng
+module và thời gian từng giai đoạn khởi tạo (thời tiết, cửa sổ, ...).
+
+StartupProfile.install() đặt một finder ở đầu sys.meta_path; finder này bọc
+loader của mọi module được import sau đó để đo thời gian thực thi module.
+Thời gian tổng của một module gồm cả các import lồng bên trong (như cột
+cumulative của python -X importtime), thời gian riêng là phần còn lại sau khi
+trừ các import con. Module đã import trước khi cài không được đo, nên main.py
+xét cờ trực tiếp trên sys.argv trước mọi import nặng.
+
+HƯỚNG DẪN SỬ DỤNG:
+    profile = StartupProfile()
+    profile.install()
+    import pyglet
+    with profile.phase("weather"):
+        weather = WeatherIntegration(...)
+    profile.report()
+"""
+
+import sys
+import time
+from contextlib import contextmanager
+
+from utils.config import STARTUP_PROFILE_TOP
+from utils.log import get_logger
+
+logger = get_logger("startup")
+
+
+class _TimedLoader:
+    """Bọc loader của một module để đo thời gian tạo và thực thi module."""
+
+    def __init__(self, loader, name, profile):
+        self._loader = loader
+        self._name = name
+        self._profile = profile
+
+    def __getattr__(self, attribute):
+        return getattr(self._loader, attribute)
+
+    def create_module(self, spec):
+        # Module mở rộng (.so/.pyd) được nạp ngay trong create_module
+        self._profile._enter(self._name)
+        try:
+            create_module = getattr(self._loader, "create_module", None)
+            return create_module(spec) if create_module else None
+        except BaseException:
+            self._profile._exit()
+            raise
+
+    def exec_module(self, module):
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profile._exit()
+            # Trả lại loader gốc cho những nơi kiểm tra kiểu loader về sau
+            module.__loader__ = self._loader
+            if getattr(module, "__spec__", None) is not None:
+                module.__spec__.loader = self._loader
+
+
+class _ImportTimer:
+    """Finder đứng đầu sys.meta_path: hỏi các finder còn lại rồi bọc loader tìm được."""
+
+    def __init__(self, profile):
+        self.profile = profile
+
+    def find_spec(self, name, path=None, target=None):
+        for finder in sys.meta_path:
+            find_spec = getattr(finder, "find_spec", None)
+            if finder is self or find_spec is None:
+                continue
+            spec = find_spec(name, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, name, self.profile)
+        return spec
+
+
+class StartupProfile:
+    """Thời gian import từng module và từng giai đoạn khởi động."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        # (tên module, thời gian riêng, thời gian tổng, độ sâu lồng) theo giây
+        self.imports = []
+        # (tên giai đoạn, thời gian) theo giây
+        self.phases = []
+        self._stack = []
+        self._timer = None
+
+    def install(self):
+        """Bắt đầu đo các import từ đây về sau."""
+        if self._timer is None:
+            self._timer = _ImportTimer(self)
+            sys.meta_path.insert(0, self._timer)
+
+    def uninstall(self):
+        """Ngừng đo import."""
+        if self._timer is not None:
+            sys.meta_path.remove(self._timer)
+            self._timer = None
+
+    def _enter(self, name):
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def _exit(self):
+        name, started, children = self._stack.pop()
+        total = time.perf_counter() - started
+        if self._stack:
+            self._stack[-1][2] += total
+        self.imports.append((name, total - children, total, len(self._stack)))
+
+    @contextmanager
+    def phase(self, name):
+        """Đo thời gian một giai đoạn khởi động (các import bên trong vẫn được đo riêng)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - started))
+
+    def format_report(self, top=STARTUP_PROFILE_TOP):
+        """
+        Args:
+            top (int): Số module chậm nhất (theo thời gian tổng) được liệt kê
+
+        Returns:
+            str: Bảng thời gian nhiều dòng
+        """
+        imported = sum(total for _, _, total, depth in self.imports if depth == 0)
+        lines = [f"Khởi động: {(time.perf_counter() - self.start) * 1000:.1f} ms, "
+                 f"import {len(self.imports)} module mất {imported * 1000:.1f} ms"]
+        for name, seconds in self.phases:
+            lines.append(f"  giai đoạn {name:<24} {seconds * 1000:9.1f} ms")
+        lines.append(f"  {'module':<35} {'riêng (ms)':>11} {'tổng (ms)':>11}")
+        for name, own, total, _ in sorted(self.imports, key=lambda entry: entry[2], reverse=True)[:top]:
+            lines.append(f"  {name:<35} {own * 1000:11.1f} {total * 1000:11.1f}")
+        return "\n".join(lines)
+
+    def report(self, top=STARTUP_PROFILE_TOP):
+        """Ghi bảng thời gian khởi động ra log (một bản ghi duy nhất)."""
+        logger.info("%s", self.format_report(top))
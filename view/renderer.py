@@ -1,10 +1,10 @@
 import pyglet
-import random
 import numpy as np
 from utils.vector import Vector2D
 from utils.config import *
+from utils.rng import get_rng
 from model.bird import Bird
-from model.steering import calculate_steering
+from model.flock_pipeline import default_flock_pipeline
 
 class SimpleRenderer:
     """Renderer đơn giản để vẽ các con chim chuyển động"""
@@ -16,59 +16,39 @@ class SimpleRenderer:
         self.birds = []
         self.food_positions = []  # Vị trí các thức ăn
         self.food_ripeness = []   # Độ chín của các thức ăn
+        # Các giai đoạn cập nhật đàn; có thể thay từng giai đoạn qua pipeline.replace
+        self.pipeline = default_flock_pipeline()
         self.create_birds(INITIAL_BIRD_COUNT)  # Sử dụng số lượng chim cấu hình
     
     def create_birds(self, num_birds):
         """Tạo các con chim với vị trí, màu sắc và vận tốc ngẫu nhiên"""
-        for _ in range(num_birds):
-            # Tạo vị trí ngẫu nhiên
-            x = random.randint(50, self.window_width - 50)
-            y = random.randint(50, self.window_height - 50)
-            
-            # Tạo vận tốc ngẫu nhiên
-            vx = random.uniform(-1, 1)
-            vy = random.uniform(-1, 1)
-            velocity = Vector2D(vx, vy).normalize() * random.uniform(MIN_SPEED, MAX_SPEED)
-            
+        # Rút cho cả nhóm một lần từ luồng 'birds'
+        rng = get_rng('birds')
+        xs = rng.integers(50, self.window_width - 50, num_birds, endpoint=True).tolist()
+        ys = rng.integers(50, self.window_height - 50, num_birds, endpoint=True).tolist()
+        directions = rng.uniform(-1, 1, (num_birds, 2)).tolist()
+        speeds = rng.uniform(MIN_SPEED, MAX_SPEED, num_birds).tolist()
+        colors = rng.integers(len(BIRD_COLORS), size=num_birds).tolist()
+        
+        for x, y, (vx, vy), speed, color in zip(xs, ys, directions, speeds, colors):
             # Tạo đối tượng Bird mới
-            bird = Bird(x, y, velocity)
+            bird = Bird(x, y, Vector2D(vx, vy).normalize() * speed)
             
             # Gán màu ngẫu nhiên từ BIRD_COLORS
-            bird.color = random.choice(BIRD_COLORS)
+            bird.color = BIRD_COLORS[color]
             
             self.birds.append(bird)
     
     def update(self, dt):
-        """Cập nhật trạng thái của tất cả các con chim"""
-        # Áp dụng các quy tắc boids nếu có đủ chim
-        if len(self.birds) >= 1:
-            self.apply_boid_rules()
-        
-        # Tạo một danh sách chim còn sống sau khi update
-        living_birds = []
-        
-        for bird in self.birds:
-            # Truyền thông tin thức ăn nếu có
-            food_positions = getattr(self, 'food_positions', None)
-            food_ripeness = getattr(self, 'food_ripeness', None)
-            
-            # Kiểm tra xem bird.update có nhận tham số food không
-            import inspect
-            bird_update_params = inspect.signature(bird.update).parameters
-            
-            if len(bird_update_params) >= 4 and food_positions is not None:
-                bird.update(dt, self.birds, food_positions, food_ripeness)
-            else:
-                bird.update(dt, self.birds)
-            
-            # Kiểm tra biên
-            bird.edges()
-            
-            # Chỉ giữ lại chim còn sống
-            if not bird.is_dead and bird.is_alive():
-                living_birds.append(bird)
-        
-        self.birds = living_birds
+        """Cập nhật trạng thái của tất cả các con chim qua pipeline các giai đoạn"""
+        context = self.pipeline.run(
+            birds=self.birds,
+            dt=dt,
+            food_positions=self.food_positions,
+            food_ripeness=self.food_ripeness
+        )
+        # Giai đoạn cull trả về danh sách chim còn sống
+        self.birds = context["birds"]
     
     def draw(self):
         """Vẽ tất cả các con chim"""
@@ -82,21 +62,62 @@ class SimpleRenderer:
     def get_bird_count(self):
         """Trả về số lượng chim hiện tại"""
         return len(self.birds)
-    
-    def apply_boid_rules(self):
-        """Áp dụng các quy tắc boids: separation, alignment, cohesion"""
-        for bird in self.birds:
-            # Truyền thông tin thức ăn nếu có
-            food_positions = getattr(self, 'food_positions', None)
-            food_ripeness = getattr(self, 'food_ripeness', None)
-            
-            # Đảm bảo truyền đúng các tham số
-            calculate_steering(
-                bird, 
-                self.birds, 
-                SEPARATION_RADIUS, 
-                ALIGNMENT_RADIUS, 
-                COHESION_RADIUS, 
-                food_positions,
-                food_ripeness
-            )
\ No newline at end of file
+
+
+class ReplayRenderer:
+    """Vẽ một khung của bản ghi quỹ đạo (TrajectoryReader.frame) bằng batch, không mô phỏng"""
+
+    def __init__(self):
+        """Khởi tạo batch và các nhóm hình dùng lại giữa các khung"""
+        self.batch = pyglet.graphics.Batch()
+        self.triangles = []
+        self.circles = []
+        # Bảng màu theo mã chim (màu gốc của từng con không được ghi lại)
+        self.palette = np.array(BIRD_COLORS, dtype=np.int64)
+
+    @staticmethod
+    def _resize(shapes, count, factory):
+        """Dùng lại các hình đã tạo, chỉ tạo thêm khi thiếu và ẩn phần thừa"""
+        while len(shapes) < count:
+            shapes.append(factory())
+        for index, shape in enumerate(shapes):
+            shape.visible = index < count
+
+    def set_frame(self, frame):
+        """
+        Cập nhật các hình theo một khung.
+
+        Args:
+            frame (dict): Kết quả của TrajectoryReader.frame
+        """
+        state = np.asarray(frame['bird_state'], dtype=np.float64)
+        x, y, vx, vy, hunger = state.T
+        # Cùng hình tam giác với Bird.get_vertices, tính cho cả đàn một lần
+        angle = np.arctan2(vy, vx)
+        side = BIRD_SIZE * 0.7
+        vertices = np.column_stack((
+            x + BIRD_SIZE * np.cos(angle), y + BIRD_SIZE * np.sin(angle),
+            x + side * np.cos(angle + 2.5), y + side * np.sin(angle + 2.5),
+            x + side * np.cos(angle - 2.5), y + side * np.sin(angle - 2.5),
+        )).tolist()
+        colors = self.palette[np.asarray(frame['bird_id']) % len(self.palette)]
+        # Như Bird.get_color, nhưng năng lượng không được ghi nên chỉ theo độ đói
+        opacity = (colors[:, 3] * np.clip(hunger, 0.0, 1.0)).astype(np.int64).tolist()
+        colors = colors[:, :3].tolist()
+
+        self._resize(self.triangles, len(vertices),
+                     lambda: pyglet.shapes.Triangle(0, 0, 0, 0, 0, 0, batch=self.batch))
+        for triangle, points, color, alpha in zip(self.triangles, vertices, colors, opacity):
+            triangle.x, triangle.y, triangle.x2, triangle.y2, triangle.x3, triangle.y3 = points
+            triangle.color = tuple(color)
+            triangle.opacity = alpha
+
+        fruits = np.asarray(frame['fruit_xy'], dtype=np.float64).tolist()
+        self._resize(self.circles, len(fruits),
+                     lambda: pyglet.shapes.Circle(0, 0, FRUIT_RADIUS, color=FRUIT_COLOR_RIPE[:3], batch=self.batch))
+        for circle, (fx, fy) in zip(self.circles, fruits):
+            circle.x, circle.y = fx, fy
+
+    def draw(self):
+        """Vẽ khung hiện tại"""
+        self.batch.draw()